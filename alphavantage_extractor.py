@@ -16,6 +16,7 @@ import time
 from datetime import datetime
 from typing import Dict, Optional, Any
 from dotenv import load_dotenv
+from utils.http_session import http_get
 
 # Load environment variables
 load_dotenv()
@@ -165,7 +166,7 @@ class AlphaVantageExtractor:
             params.update(extra_params)
         
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=15)
+            response = http_get(self.BASE_URL, params=params, timeout=15)
             self._last_request_time = time.time()
             self._daily_calls += 1
             
@@ -17,6 +17,8 @@ from dataclasses import dataclass
 from enum import Enum
 import logging
 
+from utils.financials_panel import get_panel
+
 logger = logging.getLogger(__name__)
 
 
@@ -93,6 +95,10 @@ class FCFCalculator:
         for key in possible_keys:
             if key in self.financials and self.financials[key] is not None:
                 return float(self.financials[key])
+        # Full extraction result: fall back to the statement line items
+        panel = get_panel(self.financials)
+        if panel is not None:
+            return panel.first(possible_keys)
         return None
     
     def calculate_simple_fcf(self) -> Optional[FCFResult]:
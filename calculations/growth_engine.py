@@ -0,0 +1,201 @@
+"""
+Growth Engine for ATLAS Financial Intelligence
+===============================================
+
+Growth measures for every statement line at once, over one FinancialsPanel
+or a whole batch of them (one ticker per panel) in a single vectorized pass.
+
+Per line:
+- Latest / Oldest reported values, number of Periods and the Span in years
+- Dollar_Change, Pct_Change and CAGR from oldest to latest
+- YoY (same period a year earlier) and QoQ (previous quarter)
+- CAGR_3Y / CAGR_5Y / CAGR_10Y anchored at the latest value
+- Sign_Change (latest and oldest of opposite sign) and Gap (periods
+  missing between oldest and latest) flags
+
+Periods are matched by date, not position, so a missing year leaves the
+windows that need it NaN instead of silently shifting them. Growth from a
+non-positive base is NaN (masked), as are CAGRs beyond +/-1000%, which are
+data errors in practice. Percentages are in percent, like the legacy dict.
+
+Usage:
+    from calculations.growth_engine import get_growth_frame, compute_growth_batch
+    frame = get_growth_frame(financials)          # fields x measures
+    frame.loc["revenue", "CAGR_5Y"]
+    batch = compute_growth_batch({"AAPL": panel_a, "MSFT": panel_m})
+    batch.xs("revenue", level="field")["YoY"]     # one row per ticker
+
+Author: ATLAS Financial Intelligence
+Date: 2026-10-16
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.financials_panel import CANONICAL_IDS, FinancialsPanel, get_panel
+
+
+GROWTH_WINDOWS = (3, 5, 10)            # Years for the windowed CAGRs
+PERIOD_TOLERANCE = 0.15                # Years a period may sit off its target date (52/53-week years)
+MAX_GROWTH_PCT = 1000                  # Larger moves are treated as data errors
+
+MEASURES = (
+    "Latest", "Oldest", "Periods", "Span_Years", "Dollar_Change", "Pct_Change", "CAGR",
+    "YoY", "QoQ", *(f"CAGR_{years}Y" for years in GROWTH_WINDOWS), "Sign_Change", "Gap",
+)
+
+
+def period_years(periods: Sequence[Any]) -> np.ndarray:
+    """
+    Period labels as fractional years: fiscal-year ints as-is, dates as
+    year + day fraction. Labels that are neither fall back to one year per
+    position (most recent first).
+    """
+    if not len(periods):
+        return np.zeros(0)
+    if all(isinstance(p, (int, np.integer)) for p in periods):
+        return np.asarray(periods, dtype=np.float64)
+    try:
+        dates = pd.to_datetime(list(periods))
+        return (dates.year + (dates.dayofyear - 1) / 365.25).to_numpy(dtype=np.float64)
+    except (TypeError, ValueError):
+        return -np.arange(len(periods), dtype=np.float64)
+
+
+def _take(values: np.ndarray, index: np.ndarray) -> np.ndarray:
+    return np.take_along_axis(values, index[..., None], axis=-1)[..., 0]
+
+
+def _growth_pct(end: np.ndarray, start: np.ndarray, years: Optional[np.ndarray] = None) -> np.ndarray:
+    """Percent growth (annualized when years is given), NaN unless both ends are positive."""
+    valid = (start > 0) & (end > 0)
+    if years is not None:
+        valid &= years > 0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        ratio = np.where(valid, end / np.where(valid, start, 1.0), np.nan)
+        out = (ratio ** (1.0 / years) - 1) * 100 if years is not None else (ratio - 1) * 100
+        out[np.abs(out) > MAX_GROWTH_PCT] = np.nan
+    return out
+
+
+def _value_years_back(values: np.ndarray, times: np.ndarray, anchor: np.ndarray,
+                      years: float) -> np.ndarray:
+    """Value of each line at anchor - years (NaN if no reported period within tolerance)."""
+    target = anchor - years                                                 # (tickers, lines)
+    distance = np.abs(times[:, None, :] - target[..., None])                # (tickers, lines, periods)
+    distance[np.isnan(values) | np.isnan(distance)] = np.inf
+    nearest = np.argmin(distance, axis=-1)
+    found = _take(distance, nearest) <= PERIOD_TOLERANCE
+    return np.where(found, _take(values, nearest), np.nan)
+
+
+def _growth_cube(values: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """
+    Core computation.
+
+    Args:
+        values: (tickers, lines, periods), most recent period first, NaN = not reported
+        times: (tickers, periods) period_years of each ticker's columns, NaN = padding
+
+    Returns:
+        (tickers, lines, len(MEASURES)) float64 array
+    """
+    reported = ~np.isnan(values)
+    has_any = reported.any(axis=-1)
+    n_periods = values.shape[-1]
+    first = np.argmax(reported, axis=-1)                                    # latest reported
+    last = n_periods - 1 - np.argmax(reported[..., ::-1], axis=-1)          # oldest reported
+    line_times = np.broadcast_to(times[:, None, :], values.shape)
+
+    latest = np.where(has_any, _take(values, first), np.nan)
+    oldest = np.where(has_any, _take(values, last), np.nan)
+    t_latest, t_oldest = _take(line_times, first), _take(line_times, last)
+    count = reported.sum(axis=-1).astype(np.float64)
+    multi = count >= 2
+    span = np.where(multi, t_latest - t_oldest, np.nan)
+
+    # Expected periods from the span: annual if the gaps average >= ~1 year, else quarterly
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_year = np.where(span / np.maximum(count - 1, 1) > 0.75, 1.0, 4.0)
+        gap = multi & (count < np.round(span * per_year) + 1)
+
+    out = {
+        "Latest": latest,
+        "Oldest": np.where(multi, oldest, np.nan),
+        "Periods": count,
+        "Span_Years": span,
+        "Dollar_Change": np.where(multi, latest - oldest, np.nan),
+        "Pct_Change": np.where(multi, _growth_pct(latest, oldest), np.nan),
+        "CAGR": np.where(multi, _growth_pct(latest, oldest, span), np.nan),
+        "YoY": _growth_pct(latest, _value_years_back(values, times, t_latest, 1.0)),
+        "QoQ": _growth_pct(latest, _value_years_back(values, times, t_latest, 0.25)),
+        "Sign_Change": (multi & (latest * oldest < 0)).astype(np.float64),
+        "Gap": gap.astype(np.float64),
+    }
+    for years in GROWTH_WINDOWS:
+        start = _value_years_back(values, times, t_latest, float(years))
+        out[f"CAGR_{years}Y"] = _growth_pct(latest, start, np.full(latest.shape, float(years)))
+    return np.stack([out[name] for name in MEASURES], axis=-1)
+
+
+def compute_growth(panel: FinancialsPanel) -> pd.DataFrame:
+    """Growth measures for every line of one panel (fields x MEASURES)."""
+    cube = _growth_cube(panel.values[None, ...], period_years(panel.periods)[None, :])
+    return pd.DataFrame(cube[0], index=pd.Index(panel.fields, name="field"), columns=list(MEASURES))
+
+
+def compute_growth_batch(panels: Mapping[str, FinancialsPanel],
+                         fields: Sequence[str] = CANONICAL_IDS) -> pd.DataFrame:
+    """
+    Growth measures for many tickers in one pass.
+
+    Panels share the canonical row order, so their canonical blocks stack
+    into one (tickers x fields x periods) cube; periods are padded to the
+    longest history.
+
+    Args:
+        panels: {ticker: panel}
+        fields: Canonical ids to compute (default: all)
+
+    Returns:
+        DataFrame indexed by (ticker, field), columns = MEASURES
+    """
+    tickers = list(panels)
+    if not tickers:
+        return pd.DataFrame(columns=list(MEASURES),
+                            index=pd.MultiIndex.from_arrays([[], []], names=["ticker", "field"]))
+    rows = [CANONICAL_IDS.index(field) for field in fields]
+    width = max(len(panel.periods) for panel in panels.values())
+    values = np.full((len(tickers), len(rows), width), np.nan)
+    times = np.full((len(tickers), width), np.nan)
+    for i, ticker in enumerate(tickers):
+        panel = panels[ticker]
+        n = len(panel.periods)
+        values[i, :, :n] = panel.values[rows, :]
+        times[i, :n] = period_years(panel.periods)
+    cube = _growth_cube(values, times)
+    index = pd.MultiIndex.from_product([tickers, list(fields)], names=["ticker", "field"])
+    return pd.DataFrame(cube.reshape(-1, len(MEASURES)), index=index, columns=list(MEASURES))
+
+
+def get_growth_frame(financials: Optional[Dict]) -> Optional[pd.DataFrame]:
+    """
+    Growth frame of an extraction result: the stored one, else computed
+    from its panel now and stored as financials["growth_frame"].
+
+    Returns:
+        DataFrame, or None when financials has no statement data
+    """
+    if not isinstance(financials, dict):
+        return None
+    frame = financials.get("growth_frame")
+    if isinstance(frame, pd.DataFrame):
+        return frame
+    panel = get_panel(financials)
+    if panel is None or not len(panel.periods):
+        return None
+    frame = compute_growth(panel)
+    financials["growth_frame"] = frame
+    return frame
@@ -0,0 +1,168 @@
+"""
+Ratio Engine for ATLAS Financial Intelligence
+==============================================
+
+Computes every statement ratio for every available period in one pass over
+the FinancialsPanel rows, returning a (ratios x periods) DataFrame. Periods
+are positions within each statement (FinancialsPanel.by_position), so an
+income statement ending in September and a balance sheet ending in
+December still pair their latest years, as the legacy per-statement
+fiscal_year_offset lookup did.
+USAFinancialExtractor.calculate_ratios(financials, fiscal_year_offset)
+reads one column of it, so trend views asking for several years slice the
+same frame instead of recomputing.
+
+Rows:
+- Ratios: margins, returns, leverage, liquidity, free cash flow, and the
+  price / EV multiples at the current market price (NaN where a ratio's
+  inputs don't qualify, e.g. negative equity)
+- Components: the statement inputs, 0 where not reported - the legacy
+  calculate_ratios defaults
+
+Usage:
+    from calculations.ratio_engine import get_ratio_frame
+    frame = get_ratio_frame(financials)
+    frame.loc["ROE"]                  # ROE for every period
+    frame.iloc[:, 1]                  # everything for the prior year
+
+Author: ATLAS Financial Intelligence
+Date: 2026-10-16
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.financials_panel import FinancialsPanel, get_panel
+
+
+# Statement inputs: component row -> (statement, labels tried in order)
+STATEMENT_INPUTS: Dict[str, tuple] = {
+    "Revenue": ("income_statement", ["Total Revenue", "Revenue", "Sales Revenue Net"]),
+    "Gross_Profit": ("income_statement", ["Gross Profit", "GrossProfit"]),
+    "Operating_Income": ("income_statement", ["Operating Income", "EBIT", "Operating Income Or Loss"]),
+    "Net_Income": ("income_statement", ["Net Income", "Normalized Income",
+                                        "Net Income From Continuing Operation Net Minority Interest"]),
+    "Total_Assets": ("balance_sheet", ["Total Assets", "TotalAssets"]),
+    "Total_Equity": ("balance_sheet", ["Stockholders Equity", "Total Equity", "Total Stockholders Equity"]),
+    "Total_Liabilities": ("balance_sheet", ["Total Liabilities", "TotalLiabilitiesNetMinorityInterest",
+                                            "Total Liabilities Net Minority Interest"]),
+    "Total_Debt": ("balance_sheet", ["Total Debt", "TotalDebt", "Long Term Debt And Capital Lease Obligation"]),
+    "Current_Assets": ("balance_sheet", ["Current Assets", "TotalCurrentAssets", "Total Current Assets"]),
+    "Current_Liabilities": ("balance_sheet", ["Current Liabilities", "TotalCurrentLiabilities",
+                                              "Total Current Liabilities"]),
+    "Cash": ("balance_sheet", ["Cash And Cash Equivalents", "Cash", "CashAndCashEquivalentsAtCarryingValue"]),
+    "Operating_Cash_Flow": ("cash_flow", ["Operating Cash Flow", "Cash Flow From Operating Activities"]),
+    "Capex": ("cash_flow", ["Capital Expenditure", "Capex"]),
+    "Free_Cash_Flow_Reported": ("cash_flow", ["Free Cash Flow", "FreeCashFlow"]),
+}
+
+RATIO_ROWS = (
+    "Gross_Margin", "Operating_Margin", "Net_Margin", "ROE", "ROA", "Debt_to_Equity",
+    "Total_Debt_to_Equity", "Current_Ratio", "Free_Cash_Flow", "PE_Ratio", "Price_to_Book", "Price_to_Sales",
+    "EV_to_Sales", "EV_to_EBITDA", "EV_to_EBIT",
+)
+
+
+def _line(panel: FinancialsPanel, positions: np.ndarray, statement: str, names: Sequence[str]) -> np.ndarray:
+    """All positions of the first label present, NaN -> 0 (legacy get_metric default)."""
+    for name in names:
+        row = panel.row(name, statement)
+        if row is not None:
+            return np.nan_to_num(positions[row], nan=0.0)
+    return np.zeros(positions.shape[1])
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """numerator / denominator where valid, NaN elsewhere (no divide warnings)."""
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=valid & (denominator != 0))
+    return out
+
+
+def compute_ratio_frame(panel: FinancialsPanel, current_price: float = 0, market_cap: float = 0,
+                        shares_outstanding: float = 0) -> pd.DataFrame:
+    """
+    Every ratio for every period of a panel.
+
+    Args:
+        panel: Statement data
+        current_price, market_cap, shares_outstanding: Market inputs for the
+            price and EV multiples (0 = not available, multiples left NaN)
+
+    Returns:
+        DataFrame indexed by RATIO_ROWS then the STATEMENT_INPUTS components,
+        columns = panel.position_periods() (most recent first); a statement
+        with fewer periods repeats its oldest one, like the legacy clamp
+    """
+    positions = panel.by_position(clamp=True)
+    c = {name: _line(panel, positions, statement, names) for name, (statement, names) in STATEMENT_INPUTS.items()}
+    rev, gp, oi, ni = c["Revenue"], c["Gross_Profit"], c["Operating_Income"], c["Net_Income"]
+    assets, equity, liabilities = c["Total_Assets"], c["Total_Equity"], c["Total_Liabilities"]
+    ocf, capex, fcf_reported = c["Operating_Cash_Flow"], c["Capex"], c["Free_Cash_Flow_Reported"]
+    price, cap, shares = float(current_price or 0), float(market_cap or 0), float(shares_outstanding or 0)
+    nan = np.full(rev.shape, np.nan)
+
+    rows = {
+        "Gross_Margin": _ratio(gp, rev, (rev > 0) & (gp > 0)),
+        "Operating_Margin": _ratio(oi, rev, (rev > 0) & (oi > 0)),
+        "Net_Margin": _ratio(ni, rev, (rev > 0) & (ni > 0)),
+        "ROE": _ratio(ni, equity, (equity > 0) & (ni > 0)),
+        "ROA": _ratio(ni, assets, (assets > 0) & (ni > 0)),
+        "Debt_to_Equity": _ratio(liabilities, equity, (equity > 0) & (liabilities > 0)),
+        # Debt-only leverage, the definition of Yahoo's debtToEquity and Damodaran's D/E
+        "Total_Debt_to_Equity": _ratio(c["Total_Debt"], equity, (equity > 0) & (c["Total_Debt"] > 0)),
+        "Current_Ratio": _ratio(c["Current_Assets"], c["Current_Liabilities"],
+                                (c["Current_Liabilities"] > 0) & (c["Current_Assets"] > 0)),
+        # Reported FCF first, else OCF - |CapEx| (OCF may be negative, e.g. banks)
+        "Free_Cash_Flow": np.where(fcf_reported != 0, fcf_reported,
+                                   np.where(ocf != 0, ocf - np.abs(capex), np.nan)),
+    }
+
+    # Price multiples per share at today's price
+    if price > 0 and shares > 0:
+        prices = np.full(rev.shape, price)
+        rows["PE_Ratio"] = _ratio(prices, ni / shares, ni > 0)
+        rows["Price_to_Book"] = _ratio(prices, equity / shares, equity > 0)
+        rows["Price_to_Sales"] = _ratio(prices, rev / shares, rev > 0)
+    else:
+        rows["PE_Ratio"] = rows["Price_to_Book"] = rows["Price_to_Sales"] = nan
+
+    # EV multiples (EBITDA approximated by operating income, as before)
+    if cap > 0:
+        ev = cap + c["Total_Debt"] - c["Cash"]
+        rows["EV_to_Sales"] = _ratio(ev, rev, (ev > 0) & (rev > 0))
+        rows["EV_to_EBITDA"] = rows["EV_to_EBIT"] = _ratio(ev, oi, (ev > 0) & (oi > 0))
+    else:
+        rows["EV_to_Sales"] = rows["EV_to_EBITDA"] = rows["EV_to_EBIT"] = nan
+
+    index = list(RATIO_ROWS) + list(STATEMENT_INPUTS)
+    values = np.vstack([rows[name] for name in RATIO_ROWS] + [c[name] for name in STATEMENT_INPUTS])
+    return pd.DataFrame(values, index=pd.Index(index, name="ratio"), columns=list(panel.position_periods()))
+
+
+def get_ratio_frame(financials: Optional[Dict]) -> Optional[pd.DataFrame]:
+    """
+    Ratio frame of an extraction result: the stored one if it was computed
+    from the current market_data, else computed from its panel and
+    market_data now and stored as financials["ratio_frame"] (the market
+    inputs it used are kept in frame.attrs["market_inputs"]).
+
+    Returns:
+        DataFrame, or None when financials has no statement data
+    """
+    if not isinstance(financials, dict):
+        return None
+    market = financials.get("market_data") or {}
+    inputs = tuple(float(market.get(key) or 0) for key in ("current_price", "market_cap", "shares_outstanding"))
+    frame = financials.get("ratio_frame")
+    if isinstance(frame, pd.DataFrame) and frame.attrs.get("market_inputs") == inputs:
+        return frame
+    panel = get_panel(financials)
+    if panel is None or not len(panel.periods):
+        return None
+    frame = compute_ratio_frame(panel, *inputs)
+    frame.attrs["market_inputs"] = inputs
+    financials["ratio_frame"] = frame
+    return frame
@@ -237,7 +237,8 @@ def render_compare_tab(ticker: str, financials: Dict, extractor, visualizer) ->
                     st.markdown("### Side-by-Side Comparison")
                     
                     # Select metrics to display
-                    available_metrics = [col for col in df.columns if col not in ['Ticker', 'Company', 'Sector', 'Industry', 'Is_Primary']]
+                    from peer_comparison import META_COLUMNS
+                    available_metrics = [col for col in df.columns if col not in META_COLUMNS]
                     
                     selected_metrics = st.multiselect(
                         "Select Metrics to Display",
@@ -247,7 +248,9 @@ def render_compare_tab(ticker: str, financials: Dict, extractor, visualizer) ->
                     )
                     
                     if selected_metrics:
-                        display_df = df[['Ticker', 'Company'] + selected_metrics].copy()
+                        # Which rows carry annual SEC figures vs Yahoo TTM figures
+                        id_cols = ['Ticker', 'Company'] + (['Data Source'] if 'Data Source' in df.columns else [])
+                        display_df = df[id_cols + selected_metrics].copy()
                         
                         # Format numbers
                         from format_helpers import format_dataframe_for_display
@@ -279,6 +282,12 @@ def render_compare_tab(ticker: str, financials: Dict, extractor, visualizer) ->
                     if not primary_row.empty:
                         percentile_cols = [col for col in df_with_percentiles.columns if col.endswith('_Percentile')]
                         
+                        # Rank across the whole S&P 500 from the fundamentals cube (when built)
+                        sp500_percentiles = comp_data.get('sp500_percentiles')
+                        sp500_row = None
+                        if isinstance(sp500_percentiles, pd.DataFrame) and current_ticker.upper() in sp500_percentiles.index:
+                            sp500_row = sp500_percentiles.loc[current_ticker.upper()]
+                        
                         # Create percentile summary
                         percentile_data = []
                         
@@ -307,11 +316,14 @@ def render_compare_tab(ticker: str, financials: Dict, extractor, visualizer) ->
                                     rank_category = "🔴 Bottom 20%"
                                     color = "red"
                                 
+                                sp500_percentile = sp500_row.get(metric_name) if sp500_row is not None else None
+                                
                                 percentile_data.append({
                                     'Metric': metric_name,
                                     'Actual Value': f"{actual_value:.2f}" if actual_value else "N/A",
                                     'Percentile': f"{percentile:.1f}",
-                                    'Rank': rank_category
+                                    'Rank': rank_category,
+                                    'S&P 500 Percentile': f"{sp500_percentile:.1f}" if pd.notna(sp500_percentile) else "N/A"
                                 })
                         
                         if percentile_data:
@@ -475,18 +487,20 @@ def render_compare_tab(ticker: str, financials: Dict, extractor, visualizer) ->
         col1, col2 = st.columns([3, 1])
         
         with col1:
-            compare_ticker = st.text_input(
+            compare_input = st.text_input(
                 "Add Company to Comparison",
-                placeholder="Enter ticker (e.g., MSFT, GOOGL)",
+                placeholder="Enter ticker(s) (e.g., MSFT or MSFT, GOOGL, AMZN)",
                 key="manual_compare_ticker"
-            ).upper().strip()
+            ).upper()
+            compare_tickers = list(dict.fromkeys(t for t in compare_input.replace(',', ' ').split() if t))
         
         with col2:
             st.write("")  # Spacing
             st.write("")  # Spacing
             add_button = st.button("➕ Add", use_container_width=True, key="manual_add_button")
         
-        if add_button and compare_ticker:
+        if add_button and len(compare_tickers) == 1:
+            compare_ticker = compare_tickers[0]
             if compare_ticker not in st.session_state.comparison_data:
                 with st.spinner(f"Adding {compare_ticker}... (cached for 1 hour)"):
                     try:
@@ -507,6 +521,29 @@ def render_compare_tab(ticker: str, financials: Dict, extractor, visualizer) ->
             else:
                 st.warning(f"{compare_ticker} already in comparison")
         
+        elif add_button and len(compare_tickers) > 1:
+            # Several tickers: extract concurrently, report each as it finishes
+            new_tickers = [t for t in compare_tickers if t not in st.session_state.comparison_data]
+            if new_tickers:
+                progress_bar = st.progress(0)
+                status_text = st.empty()
+                failed = []
+                
+                for i, result in enumerate(extractor.extract_many(new_tickers), start=1):
+                    progress_bar.progress(i / len(new_tickers))
+                    status_text.text(f"Fetched {result.ticker} ({i}/{len(new_tickers)})")
+                    if result.ok:
+                        st.session_state.comparison_data[result.ticker] = result.financials
+                    else:
+                        failed.append(f"{result.ticker} ({result.error})")
+                
+                if failed:
+                    st.error("❌ Failed: " + "; ".join(failed))
+                else:
+                    st.rerun()
+            else:
+                st.warning("All of these companies are already in comparison")
+        
         # Show current companies
         if st.session_state.comparison_data:
             st.markdown("### Companies in Comparison:")
@@ -31,7 +31,8 @@ from .sector_benchmarks import (
     ComparisonStatus,
     get_sector_benchmarks,
     compare_to_industry,
-    enrich_financials_with_benchmarks
+    enrich_financials_with_benchmarks,
+    get_sp500_standing
 )
 
 from .sec_edgar import (
@@ -43,6 +44,28 @@ from .sec_edgar import (
     get_insider_filing_dates
 )
 
+from .cik_index import (
+    CIKIndex,
+    get_cik_index,
+    lookup_cik
+)
+
+from .sec_facts_store import (
+    CompanyFactsStore,
+    get_facts_store
+)
+
+from .facts_warehouse import (
+    FactsWarehouse,
+    get_facts_warehouse
+)
+
+from .fundamentals_cube import (
+    FundamentalsCube,
+    build_cube,
+    get_fundamentals_cube
+)
+
 from .fmp_earnings import (
     FMPEarningsClient,
     get_fmp_client,
@@ -78,6 +101,7 @@ __all__ = [
     'get_sector_benchmarks',
     'compare_to_industry',
     'enrich_financials_with_benchmarks',
+    'get_sp500_standing',
     # SEC EDGAR
     'SECEdgarClient',
     'get_sec_client',
@@ -85,6 +109,20 @@ __all__ = [
     'get_company_info',
     'get_form4_count',
     'get_insider_filing_dates',
+    # CIK Index
+    'CIKIndex',
+    'get_cik_index',
+    'lookup_cik',
+    # Companyfacts Store
+    'CompanyFactsStore',
+    'get_facts_store',
+    # Fundamentals Warehouse
+    'FactsWarehouse',
+    'get_facts_warehouse',
+    # Fundamentals Cube
+    'FundamentalsCube',
+    'build_cube',
+    'get_fundamentals_cube',
     # FMP Earnings
     'FMPEarningsClient',
     'get_fmp_client',
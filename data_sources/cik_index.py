@@ -0,0 +1,273 @@
+"""
+SEC TICKER -> CIK INDEX
+=======================
+Process-wide ticker to CIK lookup shared by every SEC caller.
+
+SEC publishes the full mapping (~10k entries) at company_tickers.json.
+Instead of every module downloading and scanning it on each call, the
+index is:
+- Loaded once per process (thread-safe, lazy)
+- Persisted to data_sources/cache so restarts don't re-download
+- Refreshed when the on-disk copy is older than REFRESH_SECONDS
+- Seeded from sp500_ciks.SP500_CIKS when SEC is unreachable
+
+Lookups are plain dict hits (O(1)).
+
+Usage:
+    from data_sources.cik_index import lookup_cik
+    cik = lookup_cik("AAPL")   # '0000320193'
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import json
+import time
+import threading
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from utils.rate_limiter import get_sec_limiter
+from utils.http_session import http_get
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("CIKIndex")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("CIKIndex")
+
+
+SEC_COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+SEC_USER_AGENT = "AtlasFinancialIntelligence/2.0 (Educational Research; Contact: research@atlas-fi.com)"
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+CACHE_FILE = "sec_company_tickers.json"
+
+REFRESH_SECONDS = 86400       # SEC regenerates the file daily
+RETRY_SECONDS = 3600          # Min gap between SEC downloads after a failure or a lookup miss
+
+
+def _normalize(ticker: str) -> str:
+    """Upper-case and strip a ticker; SEC uses '-' for share classes (BRK-B)."""
+    return ticker.upper().strip().replace(".", "-")
+
+
+class CIKIndex:
+    """
+    Ticker -> CIK index backed by SEC's company_tickers.json.
+
+    Usage:
+        index = CIKIndex()
+        index.lookup("MSFT")        # '0000789019'
+        index.get_title("MSFT")     # 'MICROSOFT CORP'
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, refresh_seconds: int = REFRESH_SECONDS):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.refresh_seconds = refresh_seconds
+
+        self._lock = threading.Lock()
+        self._ciks: Dict[str, str] = {}
+        self._titles: Dict[str, str] = {}
+        self._loaded_at: float = 0.0      # Timestamp of the data currently held
+        self._last_attempt: float = 0.0   # Last network refresh attempt
+        self._source: str = "empty"
+
+    # ==========================================
+    # LOADING & PERSISTENCE
+    # ==========================================
+
+    @property
+    def cache_path(self) -> str:
+        return os.path.join(self.cache_dir, CACHE_FILE)
+
+    def _parse(self, data: Dict) -> None:
+        """Build lookup dicts from SEC payload: {idx: {cik_str, ticker, title}}."""
+        ciks, titles = {}, {}
+        for entry in data.values():
+            ticker = entry.get("ticker")
+            cik = entry.get("cik_str")
+            if not ticker or cik is None:
+                continue
+            key = _normalize(ticker)
+            # SEC lists the primary listing first; keep it on duplicates
+            if key not in ciks:
+                ciks[key] = str(cik).zfill(10)
+                titles[key] = entry.get("title", "")
+        self._ciks = ciks
+        self._titles = titles
+
+    def _load_from_disk(self) -> bool:
+        """Load the persisted copy. Returns True if something usable was loaded."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._parse(data)
+            self._loaded_at = os.path.getmtime(self.cache_path)
+            self._source = "disk"
+            _logger.debug(f"Loaded {len(self._ciks)} CIKs from {self.cache_path}")
+            return bool(self._ciks)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            _logger.warning(f"Corrupt CIK cache at {self.cache_path}: {e}")
+            return False
+
+    def _download(self) -> bool:
+        """Fetch a fresh mapping from SEC and persist it atomically."""
+        self._last_attempt = time.time()
+        try:
+            get_sec_limiter().acquire()
+            resp = http_get(
+                SEC_COMPANY_TICKERS_URL,
+                headers={"User-Agent": SEC_USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+                timeout=10,
+            )
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception as e:
+            _logger.warning(f"CIK index download failed: {e}")
+            return False
+
+        self._parse(data)
+        self._loaded_at = time.time()
+        self._source = "sec"
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            _logger.warning(f"Could not persist CIK index: {e}")
+
+        _logger.info(f"CIK index refreshed from SEC ({len(self._ciks)} tickers)")
+        return True
+
+    def _load_seed(self) -> None:
+        """Last resort: the hardcoded S&P 500 subset."""
+        try:
+            from sp500_ciks import SP500_CIKS
+        except ImportError:
+            return
+        self._ciks = {_normalize(t): cik for t, cik in SP500_CIKS.items()}
+        self._titles = {}
+        self._source = "seed"
+        _logger.warning(f"CIK index using offline seed ({len(self._ciks)} tickers)")
+
+    def _is_stale(self) -> bool:
+        return time.time() - self._loaded_at > self.refresh_seconds
+
+    def _ensure_loaded(self) -> None:
+        """Load on first use; refresh when the data is past its refresh window."""
+        if self._ciks and not self._is_stale():
+            return
+
+        with self._lock:
+            if self._ciks and not self._is_stale():
+                return
+
+            if not self._ciks:
+                self._load_from_disk()
+
+            if not self._ciks or self._is_stale():
+                # Don't hammer SEC if it's down - stale data beats no data
+                if time.time() - self._last_attempt >= RETRY_SECONDS or not self._ciks:
+                    if not self._download() and not self._ciks:
+                        self._load_seed()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Re-download the mapping from SEC.
+
+        Args:
+            force: Download even if the current data is within its refresh window
+
+        Returns:
+            True if a fresh copy was fetched
+        """
+        with self._lock:
+            if not force and self._ciks and not self._is_stale():
+                return False
+            return self._download()
+
+    # ==========================================
+    # LOOKUPS
+    # ==========================================
+
+    def lookup(self, ticker: str) -> Optional[str]:
+        """
+        Get the 10-digit, zero-padded CIK for a ticker.
+
+        Args:
+            ticker: Stock symbol (BRK.B and BRK-B are treated the same)
+
+        Returns:
+            CIK string or None if not found
+        """
+        if not ticker:
+            return None
+        self._ensure_loaded()
+        key = _normalize(ticker)
+        cik = self._ciks.get(key)
+
+        if cik is None and self._source != "sec":
+            # New listing or we're on a stale/seed copy - one rate-limited retry
+            if time.time() - self._last_attempt >= RETRY_SECONDS:
+                with self._lock:
+                    self._download()
+                cik = self._ciks.get(key)
+
+        return cik
+
+    def get_title(self, ticker: str) -> Optional[str]:
+        """Get SEC registrant name for a ticker."""
+        self._ensure_loaded()
+        return self._titles.get(_normalize(ticker)) or None
+
+    def as_dict(self) -> Mapping[str, str]:
+        """Read-only view of the full ticker -> CIK mapping."""
+        self._ensure_loaded()
+        return MappingProxyType(self._ciks)
+
+    def stats(self) -> Dict:
+        """Index metadata for diagnostics."""
+        return {
+            "tickers": len(self._ciks),
+            "source": self._source,
+            "age_seconds": round(time.time() - self._loaded_at) if self._loaded_at else None,
+            "cache_path": self.cache_path,
+        }
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._ciks)
+
+    def __contains__(self, ticker: str) -> bool:
+        return self.lookup(ticker) is not None
+
+
+# ==========================================
+# PROCESS-WIDE SINGLETON
+# ==========================================
+
+_index: Optional[CIKIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_cik_index() -> CIKIndex:
+    """Get or create the shared CIK index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CIKIndex()
+    return _index
+
+
+def lookup_cik(ticker: str) -> Optional[str]:
+    """Get CIK for a ticker from the shared index."""
+    return get_cik_index().lookup(ticker)
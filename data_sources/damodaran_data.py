@@ -18,11 +18,12 @@ Created: 2025-12-07 (TASK-E002)
 
 import os
 import pandas as pd
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Tuple
 import json
 
+from utils.http_session import http_get
+
 # Import centralized logging
 try:
     from utils.logging_config import EngineLogger
@@ -208,7 +209,7 @@ class DamodaranData:
         
         try:
             # Download Excel file
-            response = requests.get(url, timeout=30)
+            response = http_get(url, timeout=30)
             response.raise_for_status()
             
             # Parse Excel (usually first sheet has the data)
@@ -0,0 +1,457 @@
+"""
+SEC FUNDAMENTALS WAREHOUSE
+==========================
+Local columnar store built from SEC's nightly bulk companyfacts.zip.
+
+Universe-wide work (S&P 500 screens, peer tables, batch validation) would
+otherwise cost one rate-limited companyfacts request per ticker. Instead,
+one bulk job ingests the archive (~18k filers) into Parquet files
+partitioned by CIK range:
+
+    data_sources/cache/facts_warehouse/
+        manifest.json                  # filers, entity names, build metadata
+        bucket=0000/facts.parquet      # CIKs 0 .. BUCKET_WIDTH-1
+        bucket=0001/facts.parquet      # ...
+
+Rows are sorted by CIK inside each file, so a single-filer read only
+touches the row groups holding that CIK. A rebuild is staged next to the
+live warehouse and swapped in when complete.
+
+Requires pyarrow.
+
+Usage:
+    python -m data_sources.facts_warehouse                      # download + ingest
+    python -m data_sources.facts_warehouse --archive companyfacts.zip
+
+    from data_sources.facts_warehouse import get_facts_warehouse
+    facts = get_facts_warehouse().get_fact_table("0000320193")   # XBRLFactTable or None
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import zipfile
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from data_sources.xbrl_facts import XBRLFactTable, parse_companyfacts_stream
+from data_sources.cik_index import SEC_USER_AGENT
+from utils.rate_limiter import get_sec_limiter
+from utils.http_session import http_get
+
+# === OPTIONAL DEPENDENCIES ===
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("FactsWarehouse")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("FactsWarehouse")
+
+
+SEC_BULK_COMPANYFACTS_URL = "https://www.sec.gov/Archives/edgar/daily-index/xbrl/companyfacts.zip"
+
+WAREHOUSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "facts_warehouse")
+WAREHOUSE_ENV_VAR = "ATLAS_FACTS_WAREHOUSE"   # Overrides WAREHOUSE_DIR
+
+MANIFEST_FILE = "manifest.json"
+DATA_FILE = "facts.parquet"
+MANIFEST_VERSION = 1
+
+BUCKET_WIDTH = 20000          # CIKs per partition (~100 partitions for the current CIK range)
+ROW_GROUP_ROWS = 100_000      # Rows buffered before a Parquet row group is flushed
+MAX_AGE_SECONDS = 2 * 86400   # Older builds are ignored by the extractor (SEC rebuilds nightly)
+
+_MEMBER_PATTERN = re.compile(r"CIK(\d{10})\.json$")
+
+
+def _bucket_for(cik: str) -> int:
+    return int(cik) // BUCKET_WIDTH
+
+
+def _arrow_schema():
+    return pa.schema([
+        ("cik", pa.int64()),
+        ("tag", pa.string()),
+        ("unit", pa.string()),
+        ("form", pa.string()),
+        ("fy", pa.int32()),
+        ("fp", pa.string()),
+        ("end", pa.date32()),
+        ("filed", pa.date32()),
+        ("accn", pa.string()),
+        ("val", pa.float64()),
+    ])
+
+
+class _PartitionWriter:
+    """Buffers fact frames for one CIK-range partition and writes row groups."""
+
+    def __init__(self, path: str, schema):
+        self.path = path
+        self.schema = schema
+        self.rows = 0
+        self._frames: List[pd.DataFrame] = []
+        self._buffered = 0
+        self._writer = None
+
+    def append(self, frame: pd.DataFrame) -> None:
+        self._frames.append(frame)
+        self._buffered += len(frame)
+        if self._buffered >= ROW_GROUP_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._frames:
+            return
+        frame = pd.concat(self._frames, ignore_index=True)
+        table = pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        self._writer.write_table(table)
+        self.rows += len(frame)
+        self._frames, self._buffered = [], 0
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+class FactsWarehouse:
+    """
+    Partitioned Parquet warehouse of companyfacts, keyed by CIK.
+
+    Usage:
+        warehouse = FactsWarehouse()
+        warehouse.ingest("companyfacts.zip", tags=USAFinancialExtractor._requested_xbrl_tags())
+        facts = warehouse.get_fact_table("0000019617")
+    """
+
+    def __init__(self, root: Optional[str] = None, max_age_seconds: int = MAX_AGE_SECONDS):
+        self.root = root or WAREHOUSE_DIR
+        self.max_age_seconds = max_age_seconds
+
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict] = None
+        self._manifest_mtime: float = 0.0
+
+    # ==========================================
+    # MANIFEST
+    # ==========================================
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILE)
+
+    def _partition_path(self, root: str, bucket: int) -> str:
+        return os.path.join(root, f"bucket={bucket:04d}", DATA_FILE)
+
+    def manifest(self) -> Optional[Dict]:
+        """Build metadata of the live warehouse (reloaded after a rebuild), or None."""
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+        except OSError:
+            return None
+        with self._lock:
+            if self._manifest is None or mtime != self._manifest_mtime:
+                try:
+                    with open(self.manifest_path, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError) as e:
+                    _logger.warning(f"Unreadable warehouse manifest {self.manifest_path}: {e}")
+                    return None
+                if manifest.get("version") != MANIFEST_VERSION:
+                    return None
+                self._manifest, self._manifest_mtime = manifest, mtime
+            return self._manifest
+
+    @property
+    def available(self) -> bool:
+        return PYARROW_AVAILABLE and self.manifest() is not None
+
+    def is_fresh(self) -> bool:
+        """True if a build exists and is younger than max_age_seconds."""
+        manifest = self.manifest()
+        if not PYARROW_AVAILABLE or manifest is None:
+            return False
+        return time.time() - manifest.get("ingested_at", 0) < self.max_age_seconds
+
+    def covers(self, tags: Iterable[str]) -> bool:
+        """True if the build kept every one of these tags (a full build covers all)."""
+        manifest = self.manifest()
+        if manifest is None:
+            return False
+        if manifest.get("tags") is None:
+            return True
+        return set(tags) <= set(manifest["tags"])
+
+    def __contains__(self, cik: str) -> bool:
+        manifest = self.manifest()
+        return manifest is not None and str(cik).zfill(10) in manifest["companies"]
+
+    # ==========================================
+    # READ PATH
+    # ==========================================
+
+    def _read_frame(self, bucket: int, ciks: List[int], tags: Optional[Iterable[str]]) -> pd.DataFrame:
+        filters = [("cik", "in", ciks)]
+        if tags is not None:
+            filters.append(("tag", "in", list(tags)))
+        table = pq.read_table(self._partition_path(self.root, bucket), filters=filters)
+        return table.to_pandas(date_as_object=False)
+
+    def get_fact_tables(self, ciks: Iterable[str],
+                        tags: Optional[Iterable[str]] = None) -> Dict[str, XBRLFactTable]:
+        """
+        Load fact tables for many filers, reading each partition once.
+
+        Args:
+            ciks: CIKs (any padding)
+            tags: Optional subset of tags to load
+
+        Returns:
+            Dict of 10-digit CIK -> XBRLFactTable (filers not in the warehouse are omitted)
+        """
+        manifest = self.manifest()
+        if manifest is None or not PYARROW_AVAILABLE:
+            return {}
+        tags = list(tags) if tags is not None else None
+        companies = manifest["companies"]
+
+        by_bucket: Dict[int, List[str]] = {}
+        for cik in ciks:
+            cik = str(cik).zfill(10)
+            if companies.get(cik, {}).get("rows"):
+                by_bucket.setdefault(_bucket_for(cik), []).append(cik)
+
+        tables = {}
+        for bucket, bucket_ciks in sorted(by_bucket.items()):
+            try:
+                frame = self._read_frame(bucket, [int(c) for c in bucket_ciks], tags)
+            except (OSError, pa.ArrowException) as e:
+                _logger.warning(f"Warehouse partition {bucket} unreadable: {e}")
+                continue
+            for cik_int, rows in frame.groupby("cik", sort=False):
+                cik = str(cik_int).zfill(10)
+                tables[cik] = XBRLFactTable.from_frame(
+                    rows.reset_index(drop=True), entity_name=companies[cik].get("name", ""), cik=cik
+                )
+        return tables
+
+    def get_fact_table(self, cik: str, tags: Optional[Iterable[str]] = None) -> Optional[XBRLFactTable]:
+        """Load one filer's facts, or None if the warehouse doesn't have it."""
+        cik = str(cik).zfill(10)
+        return self.get_fact_tables([cik], tags=tags).get(cik)
+
+    # ==========================================
+    # BULK INGESTION
+    # ==========================================
+
+    def download_archive(self, dest_path: Optional[str] = None, timeout: int = 60) -> str:
+        """
+        Download SEC's nightly companyfacts.zip (~1 GB), streamed to disk.
+
+        Returns:
+            Path of the downloaded archive
+        """
+        dest_path = dest_path or os.path.join(os.path.dirname(self.root), "companyfacts.zip")
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        tmp_path = dest_path + ".part"
+
+        _logger.info(f"Downloading {SEC_BULK_COMPANYFACTS_URL}")
+        get_sec_limiter().acquire()
+        with http_get(
+            SEC_BULK_COMPANYFACTS_URL,
+            headers={"User-Agent": SEC_USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+            stream=True,
+            timeout=timeout,
+        ) as resp:
+            resp.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+        os.replace(tmp_path, dest_path)
+        return dest_path
+
+    def ingest(self, archive_path: str, tags: Optional[Iterable[str]] = None,
+               ciks: Optional[Iterable[str]] = None, taxonomy: str = "us-gaap") -> Dict:
+        """
+        Rebuild the warehouse from a companyfacts.zip archive.
+
+        Each member is stream-parsed (only `tags` are materialized) and appended
+        to its CIK-range partition. The new build is staged and swapped in
+        atomically; readers keep using the old build until then.
+
+        Args:
+            archive_path: Path to companyfacts.zip (or any zip of CIK##########.json files)
+            tags: XBRL tags to keep (None = every tag in the taxonomy)
+            ciks: Optional subset of filers to ingest
+            taxonomy: XBRL taxonomy to index
+
+        Returns:
+            Build summary (companies, rows, skipped, partitions, seconds)
+
+        Raises:
+            ImportError: pyarrow is not installed
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to build the facts warehouse")
+
+        t0 = time.time()
+        tags = sorted(set(tags)) if tags is not None else None
+        wanted = {str(c).zfill(10) for c in ciks} if ciks is not None else None
+        schema = _arrow_schema()
+
+        staging = self.root + ".staging"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        companies: Dict[str, Dict] = {}
+        skipped = partitions = rows = 0
+        writer: Optional[_PartitionWriter] = None
+        writer_bucket = -1
+
+        with zipfile.ZipFile(archive_path) as archive:
+            members = []
+            for info in archive.infolist():
+                match = _MEMBER_PATTERN.search(info.filename)
+                if match and (wanted is None or match.group(1) in wanted):
+                    members.append((match.group(1), info))
+            # CIK order keeps exactly one partition open at a time
+            members.sort(key=lambda m: m[0])
+
+            for i, (cik, info) in enumerate(members, start=1):
+                try:
+                    with archive.open(info) as f:
+                        table = parse_companyfacts_stream(f, tags=tags, taxonomy=taxonomy)
+                except (ValueError, OSError, zipfile.BadZipFile) as e:
+                    _logger.warning(f"Skipping {info.filename}: {e}")
+                    skipped += 1
+                    continue
+
+                companies[cik] = {"name": table.entity_name, "rows": len(table)}
+                if len(table):
+                    bucket = _bucket_for(cik)
+                    if bucket != writer_bucket:
+                        if writer is not None:
+                            writer.close()
+                            rows += writer.rows
+                        writer = _PartitionWriter(self._partition_path(staging, bucket), schema)
+                        writer_bucket = bucket
+                        partitions += 1
+                    frame = table.to_frame()
+                    frame.insert(0, "cik", int(cik))
+                    writer.append(frame)
+
+                if i % 1000 == 0:
+                    _logger.info(f"Warehouse ingest: {i}/{len(members)} filers")
+
+        if writer is not None:
+            writer.close()
+            rows += writer.rows
+
+        summary = {
+            "companies": len(companies),
+            "rows": rows,
+            "skipped": skipped,
+            "partitions": partitions,
+            "seconds": round(time.time() - t0, 1),
+        }
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "source": os.path.abspath(archive_path),
+            "source_mtime": os.path.getmtime(archive_path),
+            "ingested_at": time.time(),
+            "taxonomy": taxonomy,
+            "tags": tags,
+            "bucket_width": BUCKET_WIDTH,
+            "summary": summary,
+            "companies": companies,
+        }
+        with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        self._swap_in(staging)
+        _logger.info(f"Warehouse rebuilt: {summary}")
+        return summary
+
+    def _swap_in(self, staging: str) -> None:
+        """Replace the live build with the staged one."""
+        retired = self.root + ".old"
+        shutil.rmtree(retired, ignore_errors=True)
+        if os.path.exists(self.root):
+            os.replace(self.root, retired)
+        os.replace(staging, self.root)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    def stats(self) -> Dict:
+        """Build metadata for diagnostics."""
+        manifest = self.manifest()
+        if manifest is None:
+            return {"available": False, "root": self.root}
+        return {
+            "available": PYARROW_AVAILABLE,
+            "root": self.root,
+            "fresh": self.is_fresh(),
+            "age_seconds": round(time.time() - manifest["ingested_at"]),
+            "tags": len(manifest["tags"]) if manifest.get("tags") is not None else "all",
+            **manifest.get("summary", {}),
+        }
+
+
+# ==========================================
+# PROCESS-WIDE SINGLETON
+# ==========================================
+
+_warehouse: Optional[FactsWarehouse] = None
+_warehouse_lock = threading.Lock()
+
+
+def get_facts_warehouse() -> FactsWarehouse:
+    """Get or create the shared warehouse (location overridable via ATLAS_FACTS_WAREHOUSE)."""
+    global _warehouse
+    if _warehouse is None:
+        with _warehouse_lock:
+            if _warehouse is None:
+                _warehouse = FactsWarehouse(root=os.getenv(WAREHOUSE_ENV_VAR) or None)
+    return _warehouse
+
+
+# ==========================================
+# BULK JOB
+# ==========================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the local SEC fundamentals warehouse")
+    parser.add_argument("--archive", help="Local companyfacts.zip (downloaded from SEC if omitted)")
+    parser.add_argument("--root", help="Warehouse directory")
+    parser.add_argument("--all-tags", action="store_true",
+                        help="Keep every us-gaap tag instead of only those the extractor uses")
+    args = parser.parse_args()
+
+    warehouse = FactsWarehouse(root=args.root or os.getenv(WAREHOUSE_ENV_VAR) or None)
+    archive_path = args.archive or warehouse.download_archive()
+
+    tags = None
+    if not args.all_tags:
+        from usa_backend import USAFinancialExtractor
+        tags = USAFinancialExtractor._requested_xbrl_tags()
+
+    print(warehouse.ingest(archive_path, tags=tags))
@@ -23,6 +23,7 @@ import streamlit as st
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
+from utils.http_session import http_get
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,7 @@ class FMPEarningsClient:
             request_params.update(params)
         
         try:
-            response = requests.get(url, params=request_params, timeout=10)
+            response = http_get(url, params=request_params, timeout=10)
             self._request_count += 1
             
             if response.status_code == 200:
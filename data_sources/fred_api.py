@@ -18,11 +18,12 @@ Created: 2025-12-07 (TASK-E007)
 """
 
 import os
-import requests
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple
 import json
 
+from utils.http_session import http_get
+
 # Import centralized logging
 try:
     from utils.logging_config import EngineLogger
@@ -225,7 +226,7 @@ class FREDClient:
         
         url = f"{FRED_BASE_URL}/series/observations"
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -0,0 +1,450 @@
+"""
+FUNDAMENTALS CUBE - Cross-Sectional S&P 500 Metrics
+===================================================
+One (metrics x periods x tickers) float64 array for the whole universe,
+built nightly from the warmed extraction results and stored as plain .npy
+files that load memory-mapped:
+
+    data_sources/cache/fundamentals_cube/
+        manifest.json              # tickers, sectors, metrics, build metadata
+        values.npy                 # (metrics, periods, tickers)
+        percentile.npy             # rank within the universe, 0-100
+        sector_percentile.npy      # rank within the ticker's sector, 0-100
+        zscore.npy                 # (value - sector mean) / sector std
+        sector_median.npy          # (metrics, periods, sectors)
+        period_years.npy           # (periods, tickers) fiscal year of each column
+
+Tickers are the innermost axis, so one metric for one period across the
+universe - the slice every peer table, percentile and sector comparison
+needs - is a contiguous read. Percentiles, sector medians and z-scores are
+precomputed at build time; a comparison is an in-memory slice instead of
+one info request per peer.
+
+- Metrics: the canonical panel fields, the ratio engine rows and a few
+  growth rates (decimals, latest period only)
+- Periods: positional, most recent first (0 = latest reported)
+- Percentiles rank higher values higher; callers flip lower-is-better
+  metrics (P/E, Debt/Equity, ...) themselves
+- Sector statistics need MIN_SECTOR_SIZE reporting tickers, else NaN
+
+Usage:
+    python -m data_sources.fundamentals_cube --max 50      # build from the extraction cache
+
+    from data_sources.fundamentals_cube import get_fundamentals_cube
+    cube = get_fundamentals_cube()                          # None until a build exists
+    cube.metric("ROE")                                      # Series: ticker -> latest ROE
+    cube.profile("AAPL")                                    # metrics x value/percentile/zscore/...
+    cube.sector_median("Technology", "PE_Ratio")
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import json
+import time
+import shutil
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from calculations.growth_engine import compute_growth_batch, period_years
+from calculations.ratio_engine import RATIO_ROWS, get_ratio_frame
+from utils.financials_panel import CANONICAL_IDS, FinancialsPanel, get_panel
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("FundamentalsCube")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("FundamentalsCube")
+
+
+CUBE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "fundamentals_cube")
+CUBE_ENV_VAR = "ATLAS_FUNDAMENTALS_CUBE"      # Overrides CUBE_DIR
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+MAX_PERIODS = 10              # Most recent periods kept per ticker
+MIN_SECTOR_SIZE = 3           # Reporting tickers needed for sector medians / z-scores
+UNKNOWN_SECTOR = "Unknown"
+
+# Growth metric -> (canonical field, growth engine measure); stored as decimals
+GROWTH_METRICS: Dict[str, tuple] = {
+    "Revenue_Growth": ("revenue", "YoY"),
+    "Revenue_CAGR_3Y": ("revenue", "CAGR_3Y"),
+    "Revenue_CAGR_5Y": ("revenue", "CAGR_5Y"),
+    "Earnings_Growth": ("net_income", "YoY"),
+    "FCF_Growth": ("free_cash_flow", "YoY"),
+}
+
+METRICS = tuple(CANONICAL_IDS) + tuple(RATIO_ROWS) + tuple(GROWTH_METRICS)
+
+STATS = ("value", "percentile", "sector_percentile", "zscore")
+
+
+def cube_root() -> str:
+    """Live cube directory (ATLAS_FUNDAMENTALS_CUBE or CUBE_DIR)."""
+    return os.getenv(CUBE_ENV_VAR) or CUBE_DIR
+
+
+def _cross_sectional_stats(values: np.ndarray, codes: np.ndarray, n_sectors: int) -> Dict[str, np.ndarray]:
+    """
+    Percentiles, sector percentiles, z-scores and sector medians of a
+    (metrics, periods, tickers) array; codes[t] is the sector index of
+    ticker t (-1 = unknown sector, excluded from sector statistics).
+    """
+    n_metrics, n_periods, n_tickers = values.shape
+    # One column per (metric, period), one row per ticker
+    flat = pd.DataFrame(values.reshape(n_metrics * n_periods, n_tickers).T)
+    percentile = flat.rank(pct=True).to_numpy() * 100
+
+    known = codes >= 0
+    grouped = flat[known].groupby(codes[known])
+    counts = grouped.transform("count")
+    sector_percentile = np.full(flat.shape, np.nan)
+    zscore = np.full(flat.shape, np.nan)
+    enough = (counts >= MIN_SECTOR_SIZE).to_numpy()
+    sector_percentile[known] = np.where(enough, grouped.rank(pct=True).to_numpy() * 100, np.nan)
+    std = grouped.transform("std").to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (flat[known].to_numpy() - grouped.transform("mean").to_numpy()) / std
+    zscore[known] = np.where(enough & (std > 0), z, np.nan)
+
+    sizes = grouped.count()
+    medians = grouped.median().where(sizes >= MIN_SECTOR_SIZE).reindex(range(n_sectors))
+
+    def back(array: np.ndarray, width: int = n_tickers) -> np.ndarray:
+        return np.ascontiguousarray(array.T.reshape(n_metrics, n_periods, width))
+
+    return {
+        "percentile": back(percentile),
+        "sector_percentile": back(sector_percentile),
+        "zscore": back(zscore),
+        "sector_median": back(medians.to_numpy(dtype=np.float64), n_sectors),
+    }
+
+
+# ==========================================
+# CUBE
+# ==========================================
+
+class FundamentalsCube:
+    """
+    Universe-wide metrics with precomputed cross-sectional statistics.
+
+    Args:
+        tickers: Ticker of each column of the ticker axis
+        sectors: Sector of each ticker (normalized S&P 500 sector names)
+        values: (metrics, periods, tickers) array, NaN = not reported
+        period_years: (periods, tickers) fiscal year of each value
+        metrics: Metric names along the first axis
+        stats: Precomputed statistics (computed from values when omitted)
+        manifest: Build metadata
+    """
+
+    def __init__(self, tickers: Sequence[str], sectors: Sequence[str], values: np.ndarray,
+                 period_years: np.ndarray, metrics: Sequence[str] = METRICS,
+                 stats: Optional[Dict[str, np.ndarray]] = None, manifest: Optional[Dict] = None):
+        self.tickers = [t.upper() for t in tickers]
+        self.sectors = list(sectors)
+        self.metrics = list(metrics)
+        self.sector_names = sorted(set(self.sectors) - {UNKNOWN_SECTOR})
+        self.values = values
+        self.period_years = period_years
+        self.manifest = manifest or {}
+
+        self._ticker_index = {t: i for i, t in enumerate(self.tickers)}
+        self._metric_index = {m: i for i, m in enumerate(self.metrics)}
+        self._sector_index = {s: i for i, s in enumerate(self.sector_names)}
+        if stats is None:
+            codes = np.array([self._sector_index.get(s, -1) for s in self.sectors], dtype=np.int64)
+            stats = _cross_sectional_stats(values, codes, len(self.sector_names))
+        self.percentile = stats["percentile"]
+        self.sector_percentile = stats["sector_percentile"]
+        self.zscore = stats["zscore"]
+        self._sector_median = stats["sector_median"]
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __contains__(self, ticker: str) -> bool:
+        return str(ticker).upper() in self._ticker_index
+
+    @property
+    def n_periods(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.values, self.percentile, self.sector_percentile,
+                                      self.zscore, self._sector_median, self.period_years))
+
+    def _array(self, stat: str) -> np.ndarray:
+        if stat not in STATS:
+            raise ValueError(f"Unknown statistic '{stat}' (expected one of {STATS})")
+        return self.values if stat == "value" else getattr(self, stat)
+
+    def _metric_row(self, metric: str) -> int:
+        try:
+            return self._metric_index[metric]
+        except KeyError:
+            raise KeyError(f"Metric '{metric}' is not in the fundamentals cube") from None
+
+    # ==========================================
+    # SLICES
+    # ==========================================
+
+    def sector_of(self, ticker: str) -> Optional[str]:
+        i = self._ticker_index.get(str(ticker).upper())
+        return None if i is None else self.sectors[i]
+
+    def metric(self, metric: str, period: int = 0, stat: str = "value") -> pd.Series:
+        """One metric for every ticker (NaN where not reported)."""
+        row = self._array(stat)[self._metric_row(metric), period]
+        return pd.Series(np.array(row), index=pd.Index(self.tickers, name="ticker"), name=metric)
+
+    def peers(self, tickers: Iterable[str], metrics: Optional[Sequence[str]] = None,
+              period: int = 0, stat: str = "value") -> pd.DataFrame:
+        """
+        tickers x metrics table; tickers missing from the cube are dropped.
+        """
+        metrics = list(metrics) if metrics is not None else self.metrics
+        present = [t.upper() for t in tickers if t.upper() in self._ticker_index]
+        columns = [self._ticker_index[t] for t in present]
+        rows = [self._metric_row(m) for m in metrics]
+        block = self._array(stat)[rows, period][:, columns]
+        return pd.DataFrame(block.T, index=pd.Index(present, name="ticker"), columns=metrics)
+
+    def profile(self, ticker: str, period: int = 0) -> Optional[pd.DataFrame]:
+        """
+        Every metric of one ticker with its cross-sectional context.
+
+        Returns:
+            DataFrame indexed by metric: Value, Percentile, Sector_Percentile,
+            Z_Score, Sector_Median; None if the ticker is not in the cube
+        """
+        i = self._ticker_index.get(str(ticker).upper())
+        if i is None:
+            return None
+        s = self._sector_index.get(self.sectors[i])
+        median = self._sector_median[:, period, s] if s is not None else np.full(len(self.metrics), np.nan)
+        return pd.DataFrame({
+            "Value": self.values[:, period, i],
+            "Percentile": self.percentile[:, period, i],
+            "Sector_Percentile": self.sector_percentile[:, period, i],
+            "Z_Score": self.zscore[:, period, i],
+            "Sector_Median": median,
+        }, index=pd.Index(self.metrics, name="metric"))
+
+    def sector_median(self, sector: str, metric: str, period: int = 0) -> Optional[float]:
+        """Median of a metric across a sector (None if unknown or too few reporters)."""
+        from sp500_sector_map import normalize_sector
+        s = self._sector_index.get(normalize_sector(sector))
+        if s is None:
+            return None
+        value = self._sector_median[self._metric_row(metric), period, s]
+        return None if np.isnan(value) else float(value)
+
+    # ==========================================
+    # STORAGE
+    # ==========================================
+
+    def save(self, root: Optional[str] = None) -> str:
+        """Write the cube to root, replacing any live build atomically."""
+        root = root or cube_root()
+        staging = f"{root}.{os.getpid()}.staging"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        arrays = {"values": self.values, "percentile": self.percentile,
+                  "sector_percentile": self.sector_percentile, "zscore": self.zscore,
+                  "sector_median": self._sector_median, "period_years": self.period_years}
+        for name, array in arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(array, dtype=np.float64))
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "built_at": self.manifest.get("built_at", time.time()),
+            "tickers": self.tickers,
+            "sectors": self.sectors,
+            "metrics": self.metrics,
+            "periods": self.n_periods,
+        }
+        with open(os.path.join(staging, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        retired = root + ".old"
+        shutil.rmtree(retired, ignore_errors=True)
+        if os.path.exists(root):
+            os.replace(root, retired)
+        os.replace(staging, root)
+        shutil.rmtree(retired, ignore_errors=True)
+        self.manifest = manifest
+        return root
+
+    @classmethod
+    def load(cls, root: Optional[str] = None, mmap: bool = True) -> "FundamentalsCube":
+        """
+        Open a saved cube. With mmap (default) the arrays are read-only
+        memory maps: pages are read on first touch and shared between
+        processes.
+        """
+        root = root or cube_root()
+        with open(os.path.join(root, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported fundamentals cube version {manifest.get('version')}")
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(root, f"{name}.npy"), mmap_mode=mode)
+                  for name in ("values", "percentile", "sector_percentile", "zscore",
+                               "sector_median", "period_years")}
+        stats = {name: arrays[name] for name in ("percentile", "sector_percentile", "zscore", "sector_median")}
+        return cls(manifest["tickers"], manifest["sectors"], arrays["values"], arrays["period_years"],
+                   metrics=manifest["metrics"], stats=stats, manifest=manifest)
+
+    def stats(self) -> Dict:
+        """Build metadata for diagnostics."""
+        return {
+            "tickers": len(self.tickers),
+            "metrics": len(self.metrics),
+            "periods": self.n_periods,
+            "sectors": len(self.sector_names),
+            "built_at": self.manifest.get("built_at"),
+            "nbytes": self.nbytes,
+        }
+
+
+# ==========================================
+# BUILD
+# ==========================================
+
+def _default_extract() -> Callable[[str], Dict]:
+    from usa_backend import USAFinancialExtractor
+    from utils.cache_warmer import EXTRACT_KWARGS
+    extractor = USAFinancialExtractor()
+    return lambda ticker: extractor.extract_financials(ticker, **EXTRACT_KWARGS)
+
+
+def _ticker_block(panel: FinancialsPanel, ratios: Optional[pd.DataFrame], n_periods: int) -> np.ndarray:
+    """(canonical + ratio metrics, n_periods) values of one ticker, NaN-padded."""
+    block = np.full((len(CANONICAL_IDS) + len(RATIO_ROWS), n_periods), np.nan)
+    n = min(len(panel.position_periods()), n_periods)
+    block[:len(CANONICAL_IDS), :n] = panel.by_position()[:len(CANONICAL_IDS), :n]
+    if ratios is not None:
+        block[len(CANONICAL_IDS):, :n] = ratios.loc[list(RATIO_ROWS)].to_numpy(dtype=np.float64)[:, :n]
+    return block
+
+
+def build_cube(universe: Optional[Sequence[str]] = None, extract: Optional[Callable[[str], Dict]] = None,
+               sectors: Optional[Dict[str, str]] = None, root: Optional[str] = None,
+               save: bool = True, max_periods: int = MAX_PERIODS) -> Optional[FundamentalsCube]:
+    """
+    Build the cube from extraction results.
+
+    Args:
+        universe: Tickers (default: S&P 500)
+        extract: ticker -> financials (default: USAFinancialExtractor with the
+            warm-up arguments, so a run after the cache warmer hits the cache)
+        sectors: ticker -> sector (default: SP500_SECTOR_MAP)
+        root: Output directory (default: cube_root())
+        save: Write the cube to root
+        max_periods: Most recent periods kept per ticker
+
+    Returns:
+        The cube, or None (nothing written) when no ticker had statement data
+    """
+    if universe is None:
+        from sp500_tickers import SP500_TICKERS
+        universe = SP500_TICKERS
+    if sectors is None:
+        from sp500_sector_map import SP500_SECTOR_MAP
+        sectors = SP500_SECTOR_MAP
+    extract = extract or _default_extract()
+
+    start = time.time()
+    panels: Dict[str, FinancialsPanel] = {}
+    blocks: List[np.ndarray] = []
+    years: List[np.ndarray] = []
+    for ticker in dict.fromkeys(t.strip().upper() for t in universe):
+        try:
+            financials = extract(ticker)
+        except Exception as e:
+            _logger.debug(f"Cube: extraction failed for {ticker}: {e}")
+            continue
+        if not isinstance(financials, dict) or financials.get("status") == "error":
+            continue
+        panel = get_panel(financials)
+        if panel is None or not len(panel.position_periods()):
+            continue
+        # Positions within each statement, like the ratio frame's columns
+        periods = panel.position_periods()[:max_periods]
+        panels[ticker] = panel
+        blocks.append(_ticker_block(panel, get_ratio_frame(financials), max_periods))
+        column = np.full(max_periods, np.nan)
+        column[:len(periods)] = period_years(periods)
+        years.append(column)
+
+    if not panels:
+        _logger.warning("Fundamentals cube not built: no ticker had statement data")
+        return None
+
+    tickers = list(panels)
+    values = np.full((len(METRICS), max_periods, len(tickers)), np.nan)
+    values[:len(CANONICAL_IDS) + len(RATIO_ROWS)] = np.stack(blocks, axis=-1)
+    fields = sorted({field for field, _ in GROWTH_METRICS.values()})
+    growth = compute_growth_batch(panels, fields=fields)
+    for name, (field, measure) in GROWTH_METRICS.items():
+        values[METRICS.index(name), 0] = growth.xs(field, level="field")[measure].to_numpy() / 100
+
+    cube = FundamentalsCube(tickers, [sectors.get(t, UNKNOWN_SECTOR) for t in tickers], values,
+                            np.stack(years, axis=-1), manifest={"built_at": time.time()})
+    if save:
+        cube.save(root)
+    _logger.info(f"Fundamentals cube built: {len(tickers)} tickers in {time.time() - start:.1f}s")
+    return cube
+
+
+# ==========================================
+# PROCESS-WIDE SINGLETON
+# ==========================================
+
+_cube: Optional[FundamentalsCube] = None
+_cube_key: Optional[tuple] = None
+_cube_lock = threading.Lock()
+
+
+def get_fundamentals_cube() -> Optional[FundamentalsCube]:
+    """
+    The live cube, memory-mapped (reopened after a rebuild), or None when
+    no cube has been built.
+    """
+    global _cube, _cube_key
+    root = cube_root()
+    try:
+        key = (root, os.path.getmtime(os.path.join(root, MANIFEST_FILE)))
+    except OSError:
+        return None
+    if _cube is None or _cube_key != key:
+        with _cube_lock:
+            if _cube is None or _cube_key != key:
+                try:
+                    _cube, _cube_key = FundamentalsCube.load(root), key
+                except (OSError, ValueError, KeyError) as e:
+                    _logger.warning(f"Unreadable fundamentals cube {root}: {e}")
+                    return None
+    return _cube
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the S&P 500 fundamentals cube")
+    parser.add_argument("--max", type=int, default=None, help="Only the first N universe tickers")
+    parser.add_argument("--root", help="Cube directory")
+    args = parser.parse_args()
+
+    from sp500_tickers import SP500_TICKERS
+    built = build_cube(universe=SP500_TICKERS[:args.max], root=args.root)
+    print(json.dumps(built.stats() if built else {"built": False}, indent=2))
@@ -7,7 +7,7 @@ Official SEC data access for:
 - Company info (CIK mapping)
 - Filing metadata
 
-Rate Limit: 10 requests/second
+Rate Limit: 10 requests/second (enforced by utils.rate_limiter.get_sec_limiter)
 Required: User-Agent header with contact info
 
 Author: ATLAS Financial Intelligence
@@ -17,24 +17,23 @@ Created: 2025-12-08 (TASK-A014)
 import requests
 import pandas as pd
 import streamlit as st
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
-import time
+
+from data_sources.cik_index import get_cik_index
+from utils.rate_limiter import get_sec_limiter, parse_retry_after
+from utils.http_session import http_get
 
 logger = logging.getLogger(__name__)
 
 
 # SEC API base URLs
 SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
-SEC_COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 
 # Required User-Agent header
 SEC_USER_AGENT = "ATLAS Financial Intelligence support@atlas-finance.com"
 
-# Rate limiting
-RATE_LIMIT_DELAY = 0.1  # 100ms between requests (10 req/sec)
-
 
 class SECEdgarClient:
     """
@@ -48,15 +47,11 @@ class SECEdgarClient:
     
     def __init__(self):
         """Initialize the SEC EDGAR client."""
-        self._ticker_cik_cache = None
-        self._last_request_time = 0
+        self._limiter = get_sec_limiter()
     
     def _rate_limit(self):
-        """Enforce rate limiting."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < RATE_LIMIT_DELAY:
-            time.sleep(RATE_LIMIT_DELAY - elapsed)
-        self._last_request_time = time.time()
+        """Enforce rate limiting (process-wide budget shared with all SEC callers)."""
+        self._limiter.acquire()
     
     def _make_request(self, url: str) -> Optional[Dict]:
         """Make a rate-limited request to SEC API."""
@@ -68,13 +63,13 @@ class SECEdgarClient:
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 429:
                 logger.warning("SEC rate limit hit, waiting...")
-                time.sleep(1)
+                self._limiter.penalize(parse_retry_after(response.headers.get('Retry-After')))
                 return self._make_request(url)
             else:
                 logger.warning(f"SEC API returned {response.status_code}")
@@ -84,33 +79,17 @@ class SECEdgarClient:
             logger.error(f"SEC API error: {e}")
             return None
     
-    @st.cache_data(ttl=86400)  # Cache for 24 hours
-    def get_ticker_cik_map(_self) -> Dict[str, str]:
+    def get_ticker_cik_map(self) -> Mapping[str, str]:
         """
         Get mapping of tickers to CIK numbers.
         
+        Backed by the process-wide CIK index shared with the extractor
+        and governance module.
+        
         Returns:
-            Dict mapping ticker -> CIK (zero-padded to 10 digits)
+            Read-only mapping ticker -> CIK (zero-padded to 10 digits)
         """
-        if _self._ticker_cik_cache:
-            return _self._ticker_cik_cache
-        
-        data = _self._make_request(SEC_COMPANY_TICKERS_URL)
-        
-        if not data:
-            logger.error("Failed to fetch ticker-CIK mapping")
-            return {}
-        
-        # Parse response: {index: {cik_str, ticker, title}}
-        mapping = {}
-        for entry in data.values():
-            ticker = entry.get('ticker', '').upper()
-            cik = str(entry.get('cik_str', ''))
-            if ticker and cik:
-                mapping[ticker] = cik.zfill(10)
-        
-        _self._ticker_cik_cache = mapping
-        return mapping
+        return get_cik_index().as_dict()
     
     def get_cik(self, ticker: str) -> Optional[str]:
         """
@@ -122,8 +101,7 @@ class SECEdgarClient:
         Returns:
             CIK (10-digit, zero-padded) or None
         """
-        mapping = self.get_ticker_cik_map()
-        return mapping.get(ticker.upper())
+        return get_cik_index().lookup(ticker)
     
     @st.cache_data(ttl=3600)  # Cache for 1 hour
     def get_company_info(_self, ticker: str) -> Optional[Dict]:
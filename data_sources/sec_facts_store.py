@@ -0,0 +1,376 @@
+"""
+SEC COMPANYFACTS STORE
+======================
+Persistent, compressed on-disk store for SEC XBRL companyfacts payloads.
+
+companyfacts/CIK##########.json is 5-30 MB for large filers. Each payload
+is kept gzip-compressed under data_sources/cache/companyfacts together
+with its ETag / Last-Modified validators, so:
+- Within MAX_AGE_SECONDS the stored copy is used with no network at all
+- After that, the submissions index is checked first: if no 10-K/10-Q has
+  been filed since the last sync, the stored copy is kept and the refresh
+  costs one small (usually 304) request
+- Otherwise a conditional GET is sent; an unchanged company costs a 304
+- If SEC is unreachable, the last stored copy is served (stale)
+
+SEC publishes no per-filing facts document - companyfacts is cumulative - so
+a new filing still means one full companyfacts download, which supersedes
+the stored copy.
+
+Usage:
+    from data_sources.sec_facts_store import get_facts_store
+    store = get_facts_store()
+    data = store.get_company_facts("0000320193", request_fn)
+    facts = store.read_company_facts("0000320193", request_fn, reader)   # streamed
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import json
+import gzip
+import time
+import threading
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+import requests
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("SECFactsStore")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("SECFactsStore")
+
+
+SEC_COMPANYFACTS_URL = "https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "companyfacts")
+
+MAX_AGE_SECONDS = 3600   # Serve without revalidating for 1 hour
+COMPRESS_LEVEL = 6
+
+# Filings that change the financial statements in companyfacts
+FINANCIAL_FORMS = frozenset({"10-K", "10-K/A", "10-Q", "10-Q/A", "20-F", "20-F/A", "40-F", "40-F/A"})
+
+# request_fn(url, headers=..., timeout=...) -> requests.Response
+RequestFn = Callable[..., requests.Response]
+
+
+class CompanyFactsStore:
+    """
+    Disk store for companyfacts JSON keyed by CIK, with HTTP revalidation.
+
+    Usage:
+        store = CompanyFactsStore()
+        data = store.get_company_facts(cik, request_fn)
+        store.stats()   # hits / misses / bytes_saved
+
+    Args:
+        cache_dir: Directory for payloads and metadata
+        max_age_seconds: Serve the stored copy without any request for this long
+        check_filings: Consult the submissions index before revalidating companyfacts
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_age_seconds: int = MAX_AGE_SECONDS,
+                 check_filings: bool = True):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.max_age_seconds = max_age_seconds
+        self.check_filings = check_filings
+
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "fresh_hits": 0,        # Served from disk, no request
+            "revalidated": 0,       # 304 Not Modified
+            "filings_unchanged": 0, # No new 10-K/10-Q since last sync - companyfacts not requested
+            "filing_checks": 0,     # Submissions index requests
+            "misses": 0,            # Full download (200)
+            "stale_served": 0,      # SEC failed, stored copy returned
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,       # Payload bytes not re-downloaded thanks to the store
+        }
+
+    # ==========================================
+    # PATHS & METADATA
+    # ==========================================
+
+    def _data_path(self, cik: str) -> str:
+        return os.path.join(self.cache_dir, f"CIK{cik}.json.gz")
+
+    def _meta_path(self, cik: str) -> str:
+        return os.path.join(self.cache_dir, f"CIK{cik}.meta.json")
+
+    def _lock_for(self, cik: str) -> threading.Lock:
+        with self._locks_guard:
+            if cik not in self._locks:
+                self._locks[cik] = threading.Lock()
+            return self._locks[cik]
+
+    def _count(self, **increments) -> None:
+        with self._stats_lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def get_metadata(self, cik: str) -> Optional[Dict]:
+        """
+        Get stored validators for a CIK.
+
+        Returns:
+            Dict with etag, last_modified, fetched_at, checked_at, size_bytes and
+            (once the filings index has been seen) last_accession, last_form,
+            last_filed, filings_etag - or None
+        """
+        try:
+            with open(self._meta_path(cik), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._data_path(cik)):
+            return None
+        return meta
+
+    def _write_metadata(self, cik: str, meta: Dict) -> None:
+        tmp_path = self._meta_path(cik) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(cik))
+
+    def _write_payload(self, cik: str, content: bytes) -> None:
+        tmp_path = self._data_path(cik) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(content, compresslevel=COMPRESS_LEVEL))
+        os.replace(tmp_path, self._data_path(cik))
+
+    # ==========================================
+    # FILINGS INDEX
+    # ==========================================
+
+    def _latest_filing(self, cik: str, meta: Optional[Dict], request_fn: RequestFn,
+                       timeout: int) -> Optional[Dict]:
+        """
+        Most recent financial filing from the submissions index.
+
+        Sent as a conditional GET against the stored filings ETag, so an
+        unchanged index costs a 304.
+
+        Returns:
+            Dict with accession, form, filed, etag - or None if the index is
+            unavailable or lists no financial filing
+        """
+        headers = {}
+        if meta and meta.get("filings_etag") and meta.get("last_accession"):
+            headers["If-None-Match"] = meta["filings_etag"]
+
+        self._count(filing_checks=1)
+        try:
+            resp = request_fn(SEC_SUBMISSIONS_URL.format(cik=cik), headers=headers, timeout=timeout)
+            if resp.status_code == 304 and headers:
+                return {"accession": meta["last_accession"], "form": meta.get("last_form"),
+                        "filed": meta.get("last_filed"), "etag": meta["filings_etag"]}
+            resp.raise_for_status()
+            recent = json.loads(resp.content)["filings"]["recent"]
+            # "recent" lists newest first, as parallel arrays
+            for accession, form, filed in zip(recent["accessionNumber"], recent["form"],
+                                              recent["filingDate"]):
+                if form in FINANCIAL_FORMS:
+                    return {"accession": accession, "form": form, "filed": filed,
+                            "etag": resp.headers.get("ETag")}
+            return None
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+            _logger.debug(f"submissions CIK {cik}: filings index unavailable ({e})")
+            return None
+
+    @staticmethod
+    def _record_filing(meta: Dict, latest: Optional[Dict]) -> None:
+        if latest is None:
+            return
+        meta.update(last_accession=latest["accession"], last_form=latest["form"],
+                    last_filed=latest["filed"], filings_etag=latest["etag"])
+
+    # ==========================================
+    # READ PATH
+    # ==========================================
+
+    def open_payload(self, cik: str):
+        """Open the stored payload as a binary file object (decompressed on read)."""
+        return gzip.open(self._data_path(cik), "rb")
+
+    def load(self, cik: str) -> Optional[Dict]:
+        """Load the stored payload without touching the network."""
+        try:
+            with self.open_payload(cik) as f:
+                return json.load(f)
+        except (OSError, ValueError, EOFError) as e:
+            _logger.warning(f"Unreadable companyfacts for CIK {cik}: {e}")
+            return None
+
+    def refresh(self, cik: str, request_fn: RequestFn, timeout: int = 15) -> Optional[Dict]:
+        """
+        Make sure the stored copy is current, revalidating with SEC if needed.
+
+        Args:
+            cik: 10-digit CIK
+            request_fn: Callable(url, headers=..., timeout=...) returning a Response
+            timeout: Request timeout in seconds
+
+        Returns:
+            Stored metadata after refresh
+
+        Raises:
+            requests.exceptions.HTTPError: SEC error with no stored copy to fall back on
+        """
+        with self._lock_for(cik):
+            meta = self.get_metadata(cik)
+            now = time.time()
+
+            if meta and now - meta.get("checked_at", 0) < self.max_age_seconds:
+                self._count(fresh_hits=1, bytes_saved=meta.get("size_bytes", 0))
+                return meta
+
+            latest = self._latest_filing(cik, meta, request_fn, timeout) if self.check_filings else None
+            if meta and latest and latest["accession"] == meta.get("last_accession"):
+                # Nothing filed since the last sync - the stored facts are current
+                meta["checked_at"] = now
+                self._record_filing(meta, latest)
+                self._write_metadata(cik, meta)
+                self._count(filings_unchanged=1, bytes_saved=meta.get("size_bytes", 0))
+                _logger.debug(f"companyfacts CIK {cik}: no new filings since {meta.get('last_filed')}")
+                return meta
+
+            headers = {}
+            if meta:
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+            url = SEC_COMPANYFACTS_URL.format(cik=cik)
+            try:
+                resp = request_fn(url, headers=headers, timeout=timeout)
+                if resp.status_code == 304 and meta:
+                    meta["checked_at"] = now
+                    if not meta.get("last_accession"):
+                        # First filings sync for this copy. A new accession with a 304
+                        # means companyfacts lags the filing - keep checking until it lands.
+                        self._record_filing(meta, latest)
+                    self._write_metadata(cik, meta)
+                    self._count(revalidated=1, bytes_saved=meta.get("size_bytes", 0))
+                    _logger.debug(f"companyfacts CIK {cik}: 304 Not Modified")
+                    return meta
+                resp.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                if meta:
+                    _logger.warning(f"companyfacts CIK {cik}: SEC unavailable, serving stored copy ({e})")
+                    self._count(stale_served=1)
+                    return meta
+                raise
+
+            content = resp.content
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write_payload(cik, content)
+            meta = {
+                "cik": cik,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "fetched_at": now,
+                "checked_at": now,
+                "size_bytes": len(content),
+            }
+            self._record_filing(meta, latest)
+            self._write_metadata(cik, meta)
+            self._count(misses=1, bytes_downloaded=len(content))
+            _logger.info(f"companyfacts CIK {cik}: downloaded {len(content) / 1e6:.1f} MB")
+            return meta
+
+    def read_company_facts(self, cik: str, request_fn: RequestFn,
+                           reader: Callable[[BinaryIO], Any], timeout: int = 15) -> Any:
+        """
+        Refresh the stored copy, then hand its decompressed byte stream to reader.
+
+        Lets callers parse incrementally instead of materializing the whole JSON.
+
+        Args:
+            cik: 10-digit CIK
+            request_fn: Callable(url, headers=..., timeout=...) returning a Response
+            reader: Callable(binary_stream) -> parsed result; raise ValueError on bad input
+            timeout: Request timeout in seconds
+
+        Returns:
+            Whatever reader returns
+        """
+        self.refresh(cik, request_fn, timeout=timeout)
+        try:
+            with self.open_payload(cik) as f:
+                return reader(f)
+        except (gzip.BadGzipFile, ValueError, EOFError) as e:
+            # Corrupt file on disk - drop it and download again
+            _logger.warning(f"Unreadable companyfacts for CIK {cik}: {e}")
+            self.invalidate(cik)
+            self.refresh(cik, request_fn, timeout=timeout)
+            with self.open_payload(cik) as f:
+                return reader(f)
+
+    def get_company_facts(self, cik: str, request_fn: RequestFn, timeout: int = 15) -> Dict:
+        """
+        Get the companyfacts payload for a CIK, using the store when possible.
+
+        Args:
+            cik: 10-digit CIK
+            request_fn: Callable(url, headers=..., timeout=...) returning a Response
+            timeout: Request timeout in seconds
+
+        Returns:
+            Parsed companyfacts JSON
+        """
+        self.refresh(cik, request_fn, timeout=timeout)
+        data = self.load(cik)
+        if data is None:
+            # Corrupt file on disk - drop it and download again
+            self.invalidate(cik)
+            self.refresh(cik, request_fn, timeout=timeout)
+            data = self.load(cik) or {}
+        return data
+
+    # ==========================================
+    # MANAGEMENT
+    # ==========================================
+
+    def invalidate(self, cik: str) -> None:
+        """Remove a stored payload."""
+        with self._lock_for(cik):
+            for path in (self._data_path(cik), self._meta_path(cik)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict:
+        """Hit/miss/bytes counters since process start."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["hits"] = stats["fresh_hits"] + stats["revalidated"] + stats["filings_unchanged"]
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 3) if total else 0.0
+        return stats
+
+
+# ==========================================
+# PROCESS-WIDE SINGLETON
+# ==========================================
+
+_store: Optional[CompanyFactsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_facts_store() -> CompanyFactsStore:
+    """Get or create the shared companyfacts store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CompanyFactsStore()
+    return _store
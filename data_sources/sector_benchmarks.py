@@ -7,6 +7,8 @@ Integrates Damodaran industry data with ATLAS to provide:
 - Percentile rankings
 - Above/Below industry indicators
 - Benchmark context for valuation
+- S&P 500 percentile, z-score and sector median context from the
+  fundamentals cube (when built)
 
 Author: ATLAS Financial Intelligence
 Created: 2025-12-07 (TASK-A005)
@@ -437,6 +439,71 @@ def compare_to_industry(
     return sb.compare_metric(metric, company_value, sector, industry)
 
 
+# ==========================================
+# S&P 500 CROSS-SECTION
+# ==========================================
+
+# Benchmark metric -> fundamentals cube metric
+CUBE_METRICS = {
+    'roe': 'ROE',
+    'roa': 'ROA',
+    'gross_margin': 'Gross_Margin',
+    'operating_margin': 'Operating_Margin',
+    'net_margin': 'Net_Margin',
+    'pe_ratio': 'PE_Ratio',
+    'ev_ebitda': 'EV_to_EBITDA',
+    'debt_equity': 'Total_Debt_to_Equity',      # Debt-based, like the Damodaran D/E benchmark
+}
+
+
+def get_sp500_standing(ticker: str, metrics: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Where a company stands in the S&P 500, sliced from the fundamentals cube.
+    
+    Percentiles are direction-aware like compare_metric: 100 = best in the
+    universe (lowest P/E, highest ROE).
+    
+    Args:
+        ticker: Stock ticker
+        metrics: Benchmark metric names (default: all of CUBE_METRICS)
+        
+    Returns:
+        Dict of metric -> value, percentile, sector_percentile, zscore,
+        sector_median; empty when no cube is built or the ticker isn't in it
+    """
+    try:
+        from data_sources.fundamentals_cube import get_fundamentals_cube
+        cube = get_fundamentals_cube()
+    except Exception as e:
+        logger.debug(f"Fundamentals cube unavailable: {e}")
+        return {}
+    profile = cube.profile(ticker) if cube is not None else None
+    if profile is None:
+        return {}
+    
+    def clean(value) -> Optional[float]:
+        return None if value is None or value != value else float(value)
+    
+    standing = {}
+    for metric in (metrics or list(CUBE_METRICS)):
+        if metric not in CUBE_METRICS:
+            continue
+        row = profile.loc[CUBE_METRICS[metric]]
+        if row['Value'] != row['Value']:
+            continue
+        percentile, sector_percentile = row['Percentile'], row['Sector_Percentile']
+        if SectorBenchmarks.METRIC_DIRECTIONS.get(metric) == 'lower':
+            percentile, sector_percentile = 100 - percentile, 100 - sector_percentile
+        standing[metric] = {
+            'value': float(row['Value']),
+            'percentile': clean(percentile),
+            'sector_percentile': clean(sector_percentile),
+            'zscore': clean(row['Z_Score']),
+            'sector_median': clean(row['Sector_Median']),
+        }
+    return standing
+
+
 # ==========================================
 # INTEGRATION WITH ATLAS
 # ==========================================
@@ -455,7 +522,8 @@ def enrich_financials_with_benchmarks(
         industry: Optional GICS industry
         
     Returns:
-        Financials dict with added 'benchmarks' section
+        Financials dict with added 'industry_benchmarks' and 'sp500_standing'
+        sections
     """
     sb = SectorBenchmarks()
     
@@ -491,6 +559,7 @@ def enrich_financials_with_benchmarks(
     
     # Add to financials
     financials['industry_benchmarks'] = benchmarks_result
+    financials['sp500_standing'] = get_sp500_standing(financials.get('ticker', ''))
     
     return financials
 
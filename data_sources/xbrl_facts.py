@@ -0,0 +1,497 @@
+"""
+XBRL FACT TABLE
+===============
+Columnar index over an SEC companyfacts payload.
+
+The payload is walked once and flattened into NumPy arrays - one row per
+reported fact:
+
+    tag | unit | form | fy | fp | end | filed | accn | val
+
+tag/unit/form/fp are stored as integer codes into small vocabularies, dates
+as datetime64[D] and values as float64. Statement builders are then
+vectorized selections on those arrays instead of per-tag list scans.
+
+For large filers the payload can also be parsed straight from a file
+stream (parse_companyfacts_stream): only the requested tags are turned into
+Python objects, everything else is tokenized and skipped. Requires ijson;
+without it the stream is json-loaded and filtered afterwards.
+
+Every version of a fact is kept with its filing date and accession, so
+as_of(date) rebuilds what was on file at that date (restatements filed
+later excluded) from a filing-date index built once per table.
+
+Usage:
+    from data_sources.xbrl_facts import XBRLFactTable
+    facts = XBRLFactTable.from_companyfacts(data)
+    income = facts.statement({"Revenue": ["Revenues", "SalesRevenueNet"]}, ["10-K"])
+    income_2019 = facts.as_of("2019-06-30").statement({"Revenue": ["Revenues"]}, ["10-K"])
+
+    with open("CIK0000320193.json", "rb") as f:
+        facts = parse_companyfacts_stream(f, tags={"Revenues", "NetIncomeLoss"})
+
+Author: ATLAS Financial Intelligence
+"""
+
+import json
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# === OPTIONAL DEPENDENCIES ===
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+
+FACT_COLUMNS = ("tag", "unit", "form", "fy", "fp", "end", "filed", "accn", "val")
+
+# Metric name -> candidate XBRL tags, in preference order
+SearchMap = Dict[str, Sequence[str]]
+
+
+def _encode(values: List, vocab: Dict[str, int]) -> np.ndarray:
+    """Map strings to integer codes, growing the vocabulary as needed (None -> -1)."""
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = -1
+            continue
+        code = vocab.get(value)
+        if code is None:
+            code = vocab[value] = len(vocab)
+        codes[i] = code
+    return codes
+
+
+def _parse_dates(values: List) -> np.ndarray:
+    """ISO date strings -> datetime64[D]; missing or malformed dates become NaT."""
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except ValueError:
+        out = np.empty(len(values), dtype="datetime64[D]")
+        for i, value in enumerate(values):
+            try:
+                out[i] = np.datetime64(value, "D")
+            except (ValueError, TypeError):
+                out[i] = np.datetime64("NaT")
+        return out
+
+
+class _ColumnBuilder:
+    """Accumulates fact blocks (one per tag/unit) and concatenates once at the end."""
+
+    def __init__(self):
+        self.tag_vocab: Dict[str, int] = {}
+        self.unit_vocab: Dict[str, int] = {}
+        self.form_vocab: Dict[str, int] = {}
+        self.fp_vocab: Dict[str, int] = {}
+        self.blocks: Dict[str, List] = {name: [] for name in FACT_COLUMNS}
+
+    def add_block(self, tag: str, unit: str, items: List[Dict]) -> None:
+        n = len(items)
+        if not n:
+            return
+        tag_code = self.tag_vocab.setdefault(tag, len(self.tag_vocab))
+        unit_code = self.unit_vocab.setdefault(unit, len(self.unit_vocab))
+
+        b = self.blocks
+        b["tag"].append(np.full(n, tag_code, dtype=np.int32))
+        b["unit"].append(np.full(n, unit_code, dtype=np.int32))
+        b["form"].append(_encode([it.get("form") for it in items], self.form_vocab))
+        b["fp"].append(_encode([it.get("fp") for it in items], self.fp_vocab))
+        b["fy"].append(np.array([it.get("fy") or 0 for it in items], dtype=np.int32))
+        b["end"].append(_parse_dates([it.get("end") for it in items]))
+        b["filed"].append(_parse_dates([it.get("filed") for it in items]))
+        b["accn"].append(np.array([it.get("accn") or "" for it in items], dtype=object))
+        b["val"].append(np.array([it.get("val", np.nan) for it in items], dtype=np.float64))
+
+    def build(self, **kwargs) -> "XBRLFactTable":
+        columns = {}
+        for name in FACT_COLUMNS:
+            blocks = self.blocks[name]
+            columns[name] = np.concatenate(blocks) if blocks else _empty_column(name)
+        return XBRLFactTable(
+            columns,
+            tags=_vocab_list(self.tag_vocab),
+            units=_vocab_list(self.unit_vocab),
+            forms=_vocab_list(self.form_vocab),
+            fps=_vocab_list(self.fp_vocab),
+            **kwargs,
+        )
+
+
+def _vocab_list(vocab: Dict[str, int]) -> List[str]:
+    return sorted(vocab, key=vocab.get)
+
+
+def _empty_column(name: str) -> np.ndarray:
+    if name in ("end", "filed"):
+        return np.array([], dtype="datetime64[D]")
+    if name == "val":
+        return np.array([], dtype=np.float64)
+    if name == "accn":
+        return np.array([], dtype=object)
+    return np.array([], dtype=np.int32)
+
+
+class XBRLFactTable:
+    """
+    Columnar fact table for one filer.
+
+    Attributes:
+        columns: Dict of equal-length NumPy arrays keyed by FACT_COLUMNS
+        tags, units, forms, fps: Vocabularies for the coded columns
+        entity_name, cik: Filer metadata from the payload
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], tags: List[str], units: List[str],
+                 forms: List[str], fps: List[str], entity_name: str = "", cik: Optional[str] = None):
+        self.columns = columns
+        self.tags = tags
+        self.units = units
+        self.forms = forms
+        self.fps = fps
+        self.entity_name = entity_name
+        self.cik = cik
+
+        self._tag_codes = {t: i for i, t in enumerate(tags)}
+        self._unit_codes = {u: i for i, u in enumerate(units)}
+        self._form_codes = {f: i for i, f in enumerate(forms)}
+
+        # Filing-date index for as_of(), built on first use
+        self._filed_order: Optional[np.ndarray] = None
+        self._filed_sorted: Optional[np.ndarray] = None
+
+    # ==========================================
+    # CONSTRUCTION
+    # ==========================================
+
+    @classmethod
+    def from_companyfacts(cls, data: Dict, taxonomy: str = "us-gaap",
+                          tags: Optional[Iterable[str]] = None) -> "XBRLFactTable":
+        """
+        Build the table from a parsed companyfacts payload in a single pass.
+
+        Args:
+            data: companyfacts JSON ({"cik", "entityName", "facts": {taxonomy: {...}}})
+            taxonomy: XBRL taxonomy to index
+            tags: Optional subset of tags to keep (None = all)
+        """
+        concepts = data.get("facts", {}).get(taxonomy, {})
+        table = cls.from_concepts(concepts, tags=tags)
+        table.entity_name = data.get("entityName", "")
+        cik = data.get("cik")
+        table.cik = str(cik).zfill(10) if cik is not None else None
+        return table
+
+    @classmethod
+    def from_concepts(cls, concepts: Dict, tags: Optional[Iterable[str]] = None) -> "XBRLFactTable":
+        """Build the table from a {tag: {"units": {unit: [facts]}}} mapping (e.g. us_gaap)."""
+        wanted = set(tags) if tags is not None else None
+        builder = _ColumnBuilder()
+        for tag, concept in concepts.items():
+            if wanted is not None and tag not in wanted:
+                continue
+            for unit, items in concept.get("units", {}).items():
+                builder.add_block(tag, unit, items)
+        return builder.build()
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, entity_name: str = "",
+                   cik: Optional[str] = None) -> "XBRLFactTable":
+        """Rebuild the table from a to_frame()-shaped DataFrame (row order is kept)."""
+        columns, vocabs = {}, {}
+        for name in ("tag", "unit", "form", "fp"):
+            codes, uniques = pd.factorize(frame[name], use_na_sentinel=True)
+            columns[name] = codes.astype(np.int32)
+            vocabs[name] = [str(u) for u in uniques]
+        columns["fy"] = frame["fy"].fillna(0).to_numpy(dtype=np.int32)
+        for name in ("end", "filed"):
+            columns[name] = pd.to_datetime(frame[name]).to_numpy().astype("datetime64[D]")
+        columns["accn"] = frame["accn"].fillna("").to_numpy(dtype=object)
+        columns["val"] = frame["val"].to_numpy(dtype=np.float64)
+        return cls(columns, tags=vocabs["tag"], units=vocabs["unit"], forms=vocabs["form"],
+                   fps=vocabs["fp"], entity_name=entity_name, cik=cik)
+
+    # ==========================================
+    # SELECTION
+    # ==========================================
+
+    def __len__(self) -> int:
+        return len(self.columns["val"])
+
+    def has_tag(self, tag: str) -> bool:
+        return tag in self._tag_codes
+
+    def _codes(self, names: Iterable[str], lookup: Dict[str, int]) -> np.ndarray:
+        return np.array([lookup[n] for n in names if n in lookup], dtype=np.int32)
+
+    def mask(self, tag: Optional[str] = None, unit: Optional[str] = None,
+             forms: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Boolean row mask for a tag / unit / set of forms (None = any). Rows without a value are excluded."""
+        cols = self.columns
+        m = ~np.isnan(cols["val"])
+        if tag is not None:
+            code = self._tag_codes.get(tag)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            m &= cols["tag"] == code
+        if unit is not None:
+            code = self._unit_codes.get(unit)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            m &= cols["unit"] == code
+        if forms is not None:
+            m &= np.isin(cols["form"], self._codes(forms, self._form_codes))
+        return m
+
+    def select(self, candidate_tags: Sequence[str], forms: Optional[Iterable[str]] = None,
+               units: Sequence[str] = ("USD",)) -> Tuple[Optional[str], np.ndarray]:
+        """
+        Pick the first candidate tag (and unit) that has facts for the given forms.
+
+        Returns:
+            (tag, row_indices) - tag is None when nothing matched
+        """
+        forms = list(forms) if forms is not None else None
+        for tag in candidate_tags:
+            if tag not in self._tag_codes:
+                continue
+            for unit in units:
+                rows = np.flatnonzero(self.mask(tag, unit, forms))
+                if rows.size:
+                    return tag, rows
+        return None, np.array([], dtype=np.int64)
+
+    def statement(self, search_map: SearchMap, forms: Iterable[str],
+                  units: Sequence[str] = ("USD",)) -> pd.DataFrame:
+        """
+        Build a fiscal-year x metric DataFrame (most recent year first).
+
+        For each metric the first tag with data wins. Within a fiscal year the
+        last fact in filing order wins (later filings restate earlier ones);
+        zero values and facts without a fiscal year are ignored.
+        """
+        forms = list(forms)
+        names, parts = [], []
+        for metric_name, candidate_tags in search_map.items():
+            _, rows = self.select(candidate_tags, forms, units)
+            if rows.size:
+                names.append(metric_name)
+                parts.append(rows)
+
+        if not parts:
+            return pd.DataFrame()
+
+        rows = np.concatenate(parts)
+        metric = np.repeat(np.arange(len(names)), [len(p) for p in parts])
+        fy = self.columns["fy"][rows]
+        val = self.columns["val"][rows]
+
+        keep = (fy != 0) & (val != 0)
+        metric, fy, val = metric[keep], fy[keep], val[keep]
+        if not len(val):
+            df = pd.DataFrame()
+            df.index.name = "Year"
+            return df
+
+        # Last occurrence of each (metric, fy) pair
+        years, year_pos = np.unique(fy, return_inverse=True)
+        key = metric * len(years) + year_pos
+        _, last_rev = np.unique(key[::-1], return_index=True)
+        last = len(key) - 1 - last_rev
+
+        matrix = np.full((len(years), len(names)), np.nan)
+        matrix[year_pos[last], metric[last]] = val[last]
+
+        present = ~np.all(np.isnan(matrix), axis=0)
+        df = pd.DataFrame(
+            matrix[::-1][:, present],
+            index=pd.Index(years[::-1].astype(np.int64), name="Year"),
+            columns=[n for n, p in zip(names, present) if p],
+        )
+        return df
+
+    # ==========================================
+    # POINT-IN-TIME
+    # ==========================================
+
+    def take(self, rows: np.ndarray) -> "XBRLFactTable":
+        """New table with the given rows (vocabularies are shared, so codes stay valid)."""
+        columns = {name: col[rows] for name, col in self.columns.items()}
+        return XBRLFactTable(columns, tags=self.tags, units=self.units, forms=self.forms,
+                             fps=self.fps, entity_name=self.entity_name, cik=self.cik)
+
+    def _filed_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row order by filing date (stable; undated facts sort last) and the sorted dates."""
+        if self._filed_order is None:
+            filed = self.columns["filed"]
+            order = np.argsort(filed, kind="stable")
+            self._filed_sorted = filed[order]
+            self._filed_order = order
+        return self._filed_order, self._filed_sorted
+
+    def as_of(self, when) -> "XBRLFactTable":
+        """
+        Facts that had been filed by `when` (inclusive), as a new table.
+
+        Row order is kept, so statement() picks the fact it would have picked
+        on that date. Facts without a filing date are dropped.
+
+        Args:
+            when: Date, datetime, Timestamp or ISO date string
+        """
+        order, filed_sorted = self._filed_index()
+        cutoff = np.datetime64(pd.Timestamp(when).date(), "D")
+        count = np.searchsorted(filed_sorted, cutoff, side="right")
+        return self.take(np.sort(order[:count]))
+
+    def filing_dates(self, forms: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Distinct filing dates (ascending), optionally for some forms only - snapshot points for as_of()."""
+        filed = self.columns["filed"]
+        if forms is not None:
+            filed = filed[np.isin(self.columns["form"], self._codes(forms, self._form_codes))]
+        return np.unique(filed[~np.isnat(filed)])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Decode the table into a plain DataFrame (for inspection / export)."""
+        cols = self.columns
+
+        def decode(codes, vocab):
+            lookup = np.array(vocab + [None], dtype=object)
+            return lookup[codes]
+
+        return pd.DataFrame({
+            "tag": decode(cols["tag"], self.tags),
+            "unit": decode(cols["unit"], self.units),
+            "form": decode(cols["form"], self.forms),
+            "fy": cols["fy"],
+            "fp": decode(cols["fp"], self.fps),
+            "end": cols["end"],
+            "filed": cols["filed"],
+            "accn": cols["accn"],
+            "val": cols["val"],
+        })
+
+
+# ==========================================
+# STREAMING PARSER
+# ==========================================
+
+_SCALAR_EVENTS = frozenset(("string", "number", "boolean", "null"))
+
+
+def _skip_value(events: Iterator, first_event: str) -> None:
+    """Consume one JSON value whose first event was already read, building nothing."""
+    if first_event not in ("start_map", "start_array"):
+        return
+    depth = 1
+    for event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _map_keys(events: Iterator) -> Iterator[str]:
+    """Yield keys of a map whose start_map was consumed; the caller consumes each value."""
+    for event, value in events:
+        if event == "map_key":
+            yield value
+        elif event == "end_map":
+            return
+
+
+def _read_fact_items(events: Iterator) -> List[Dict]:
+    """Read an array of flat fact objects (start_array already consumed)."""
+    items = []
+    for event, _ in events:
+        if event == "end_array":
+            return items
+        if event != "start_map":
+            _skip_value(events, event)
+            continue
+        item = {}
+        for key in _map_keys(events):
+            event, value = next(events)
+            if event in _SCALAR_EVENTS:
+                item[key] = value
+            else:
+                _skip_value(events, event)
+        items.append(item)
+    return items
+
+
+def parse_companyfacts_stream(stream: BinaryIO, tags: Optional[Iterable[str]] = None,
+                              taxonomy: str = "us-gaap") -> XBRLFactTable:
+    """
+    Build an XBRLFactTable from a companyfacts JSON byte stream.
+
+    Only facts for the requested tags are materialized; other concepts (and
+    labels/descriptions) are skipped at the token level, so peak memory scales
+    with the tags needed rather than the filer's full history.
+
+    Args:
+        stream: Binary file object positioned at the start of the JSON document
+        tags: XBRL tags to keep (None = all)
+        taxonomy: XBRL taxonomy to index
+
+    Raises:
+        ValueError: Malformed or truncated JSON
+    """
+    if not IJSON_AVAILABLE:
+        # No incremental parser - full load, then keep only the requested tags
+        return XBRLFactTable.from_companyfacts(json.load(stream), taxonomy=taxonomy, tags=tags)
+
+    wanted = set(tags) if tags is not None else None
+    builder = _ColumnBuilder()
+    entity_name, cik = "", None
+
+    events = iter(ijson.basic_parse(stream, use_float=True))
+    try:
+        event, _ = next(events)
+        if event != "start_map":
+            raise ValueError("companyfacts document is not a JSON object")
+
+        for key in _map_keys(events):
+            event, value = next(events)
+            if key == "entityName" and event == "string":
+                entity_name = value
+            elif key == "cik" and event in ("number", "string"):
+                cik = str(int(value)).zfill(10)
+            elif key == "facts" and event == "start_map":
+                for namespace in _map_keys(events):
+                    event, _ = next(events)
+                    if namespace != taxonomy or event != "start_map":
+                        _skip_value(events, event)
+                        continue
+                    for tag in _map_keys(events):
+                        event, _ = next(events)
+                        if (wanted is not None and tag not in wanted) or event != "start_map":
+                            _skip_value(events, event)
+                            continue
+                        for field in _map_keys(events):
+                            event, _ = next(events)
+                            if field != "units" or event != "start_map":
+                                _skip_value(events, event)
+                                continue
+                            for unit in _map_keys(events):
+                                event, _ = next(events)
+                                if event != "start_array":
+                                    _skip_value(events, event)
+                                    continue
+                                builder.add_block(tag, unit, _read_fact_items(events))
+            else:
+                _skip_value(events, event)
+    except StopIteration:
+        raise ValueError("Truncated companyfacts document")
+    except ijson.JSONError as e:
+        raise ValueError(f"Malformed companyfacts document: {e}") from e
+
+    return builder.build(entity_name=entity_name, cik=cik)
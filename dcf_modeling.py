@@ -18,6 +18,7 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import usa_dictionary as usa_dict
+from utils.financials_panel import STATEMENTS, get_panel
 
 # Import centralized logging
 from utils.logging_config import EngineLogger
@@ -111,6 +112,14 @@ class DCFModel:
         if df.empty:
             return 0
         
+        # Exact label matches come straight from the panel (either format)
+        panel = get_panel(self.financials) if latest_col is None else None
+        if panel is not None:
+            statement = next((name for name in STATEMENTS if self.financials.get(name) is df), None)
+            value = panel.first(keywords, statement=statement) if statement else None
+            if value is not None:
+                return value
+        
         try:
             # Check if yfinance format (rows are metrics)
             if len(df.index) > 0 and isinstance(df.index[0], str):
@@ -887,33 +896,40 @@ def quick_dcf(ticker: str, financials: Optional[Dict] = None) -> Dict:
     return model.run_all_scenarios()
 
 
-def compare_valuations(tickers: List[str]) -> pd.DataFrame:
+def compare_valuations(tickers: List[str], max_workers: int = 6) -> pd.DataFrame:
     """
     Compare DCF valuations for multiple companies.
     
+    Financials are extracted concurrently (USAFinancialExtractor.extract_many);
+    rows keep the order of `tickers`, failed tickers are skipped.
+    
     Usage:
         comparison = compare_valuations(["AAPL", "MSFT", "GOOGL"])
         print(comparison)
     """
-    from usa_backend import quick_extract
-    
-    results = []
-    for ticker in tickers:
-        print(f"\n[INFO] Processing {ticker}...")
+    from usa_backend import USAFinancialExtractor
+    
+    extractor = USAFinancialExtractor()
+    rows = {}
+    for result in extractor.extract_many(tickers, max_workers=max_workers):
+        print(f"\n[INFO] Processing {result.ticker}...")
+        if not result.ok:
+            print(f"❌ {result.ticker} failed: {result.error}")
+            continue
         try:
-            financials = quick_extract(ticker)
-            model = DCFModel(financials)
+            model = DCFModel(result.financials)
             scenario_results = model.run_all_scenarios()
             
-            results.append({
-                "Ticker": ticker,
+            rows[result.ticker] = {
+                "Ticker": result.ticker,
                 "Conservative": scenario_results["conservative"]["value_per_share"],
                 "Base": scenario_results["base"]["value_per_share"],
                 "Aggressive": scenario_results["aggressive"]["value_per_share"],
                 "Weighted Avg": scenario_results["weighted_average"]
-            })
+            }
         except Exception as e:
-            print(f"❌ {ticker} failed: {e}")
+            print(f"❌ {result.ticker} failed: {e}")
     
-    return pd.DataFrame(results)
+    ordered = dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip())
+    return pd.DataFrame([rows[t] for t in ordered if t in rows])
 
@@ -27,9 +27,12 @@ from datetime import datetime, timedelta
 
 # Import centralized cache to prevent Yahoo rate limiting
 from utils.ticker_cache import get_ticker_info, get_ticker
+# Coalesce concurrent analyses of the same ticker
+from utils.single_flight import single_flight
 
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
+@single_flight()
 def analyze_earnings_history(ticker: str, periods: int = 8, _financials: Dict = None) -> Dict:
     """
     Analyze earnings history, surprises, and trends
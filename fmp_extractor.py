@@ -15,6 +15,7 @@ import time
 from datetime import datetime
 from typing import Dict, Optional, List, Any
 from dotenv import load_dotenv
+from utils.http_session import http_get
 
 # Load environment variables
 load_dotenv()
@@ -228,7 +229,7 @@ class FMPExtractor:
         params['apikey'] = self.api_key
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = http_get(url, params=params, timeout=10)
             self._last_request_time = time.time()
             self._daily_calls += 1
             
@@ -16,6 +16,8 @@ Theory:
 from typing import Dict, Optional
 import pandas as pd
 
+from utils.financials_panel import get_panel
+
 
 class ForensicShield:
     """
@@ -38,6 +40,10 @@ class ForensicShield:
         
     def _get_metric(self, statement: str, field_names: list, year_idx: int = 0) -> Optional[float]:
         """Extract metric from financial statement"""
+        panel = get_panel(self.financials)
+        if panel is not None:
+            # Works for both SEC and yfinance layouts; prior years past the data -> None
+            return panel.first(field_names, period=year_idx, statement=statement)
         try:
             df = self.financials.get(statement)
             if df is None or df.empty:
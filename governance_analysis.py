@@ -24,15 +24,19 @@ Date: November 2025
 import yfinance as yf
 import pandas as pd
 import numpy as np
-import requests
 from typing import Dict, List, Optional
 import streamlit as st
 
 # Import centralized cache to prevent Yahoo rate limiting
 from utils.ticker_cache import get_ticker_info, get_ticker
+# Coalesce concurrent analyses of the same ticker
+from utils.single_flight import single_flight
+# Shared ticker -> CIK index
+from data_sources.cik_index import lookup_cik
 
 
 @st.cache_data(ttl=86400)  # Cache for 24 hours (governance changes slowly)
+@single_flight()
 def analyze_governance(ticker: str) -> Dict:
     """
     Comprehensive governance analysis
@@ -518,66 +522,22 @@ def get_cik(ticker: str) -> Optional[str]:
     Get CIK (Central Index Key) for a ticker from SEC
     
     Multi-tier approach:
-    1. Check local hardcoded dictionary (S&P 500 + popular stocks)
-    2. Query SEC API (requires proper User-Agent)
-    3. Fallback to yfinance
-    
-    ⚠️ PRIORITY FIX REQUIRED:
-    - Replace placeholder email: contact@placeholder.com
-    - Register with SEC: https://www.sec.gov/os/accessing-edgar-data
-    - Update User-Agent with real contact information
-    - SEC Fair Access Policy requires declared identity (FREE, no cost)
+    1. Shared SEC CIK index (persisted company_tickers.json, S&P 500 seed offline)
+    2. Fallback to yfinance
     """
     
-    ticker_upper = ticker.upper().strip()
-    
-    # ==========================================
-    # TIER 1: Local Hardcoded CIKs (Instant)
-    # ==========================================
-    try:
-        from sp500_ciks import get_cik_from_local
-        local_cik = get_cik_from_local(ticker_upper)
-        if local_cik:
-            return local_cik
-    except Exception:
-        pass
-    
     # ==========================================
-    # TIER 2: SEC API (Free, requires registration)
+    # TIER 1: Shared CIK Index (O(1) after first load)
     # ==========================================
     try:
-        url = "https://www.sec.gov/files/company_tickers.json"
-        
-        # TODO: Replace with real email after SEC registration
-        headers = {
-            'User-Agent': 'AtlasFinancialIntelligence/1.0 (Atlasfinancialintel@gmail.com)',
-            'Accept-Encoding': 'gzip, deflate',
-            'Host': 'www.sec.gov'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Search for ticker
-            for item in data.values():
-                if item.get('ticker', '').upper().strip() == ticker_upper:
-                    # CIK must be 10 digits, padded with zeros
-                    cik = str(item['cik_str']).zfill(10)
-                    return cik
-        
-        elif response.status_code == 403:
-            # SEC blocking - need proper User-Agent registration
-            pass
-        
-    except (requests.Timeout, requests.ConnectionError):
-        pass
+        cik = lookup_cik(ticker)
+        if cik:
+            return cik
     except Exception:
         pass
     
     # ==========================================
-    # TIER 3: YFinance Fallback
+    # TIER 2: YFinance Fallback
     # ==========================================
     try:
         # Use centralized cache to prevent Yahoo rate limiting
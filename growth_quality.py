@@ -25,9 +25,12 @@ from typing import Dict, Optional
 
 # Import centralized cache to prevent Yahoo rate limiting
 from utils.ticker_cache import get_ticker_info, get_ticker
+# Coalesce concurrent analyses of the same ticker
+from utils.single_flight import single_flight
 
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
+@single_flight()
 def analyze_growth_quality(ticker: str, _financials_dict: Dict = None) -> Dict:
     """
     Comprehensive growth quality analysis
@@ -18,6 +18,14 @@ import numpy as np
 import plotly.graph_objects as go
 from typing import Dict, List, Tuple, Any
 
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("InvestmentSummary")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("InvestmentSummary")
+
 # Import UI enhancement components with fallback
 try:
     from ui_components import render_gauge, render_radar_chart, ECHARTS_AVAILABLE
@@ -556,11 +564,11 @@ class InvestmentSummaryGenerator:
     def generate_peer_comparison(self) -> Dict:
         """
         Generate comparable company valuation data
-        Note: This is a simplified version using sector averages
-        In production, would fetch real peer data from API
+        Sector figures are S&P 500 sector medians from the fundamentals cube
+        when one is built, else large-cap market averages
         
         Returns:
-            Dict with company and peer metrics
+            Dict with company and peer metrics (plus the sector used and its source)
         """
         def get_ratio(key):
             if not self.ratios.empty and key in self.ratios.index:
@@ -572,13 +580,35 @@ class InvestmentSummaryGenerator:
         price_to_book = get_ratio('Price_to_Book')
         roe = get_ratio('ROE')
         debt_equity = get_ratio('Debt_to_Equity')
+        # Company D/E is Yahoo's debt/equity unless it fell back to liabilities/equity
+        de_metric = ('Debt_to_Equity' if get_ratio('Debt_to_Equity_Source') == 'calculated'
+                     else 'Total_Debt_to_Equity')
         
-        # Estimate sector averages (in production, fetch from API)
-        # These are reasonable market averages for large-cap stocks
+        # Fallback: reasonable market averages for large-cap stocks
         sector_pe = 20.0
         sector_pb = 3.5
         sector_roe = 0.15
         sector_de = 1.2
+        sector_source = 'market_average'
+        
+        # Sector medians from the precomputed S&P 500 cube (no network calls)
+        sector_name = (self.financials.get('info') or {}).get('sector')
+        try:
+            from data_sources.fundamentals_cube import get_fundamentals_cube
+            cube = get_fundamentals_cube()
+            if cube is not None:
+                sector_name = sector_name or cube.sector_of(self.ticker)
+                if sector_name:
+                    medians = {metric: cube.sector_median(sector_name, metric)
+                               for metric in ('PE_Ratio', 'Price_to_Book', 'ROE', de_metric)}
+                    if any(v is not None for v in medians.values()):
+                        sector_pe = medians['PE_Ratio'] or sector_pe
+                        sector_pb = medians['Price_to_Book'] or sector_pb
+                        sector_roe = medians['ROE'] or sector_roe
+                        sector_de = medians[de_metric] or sector_de
+                        sector_source = 'sp500_sector_median'
+        except Exception as e:
+            _logger.debug(f"Sector medians unavailable for {self.ticker}: {e}")
         
         # Calculate premium/discount
         pe_premium = ((pe_ratio / sector_pe) - 1) * 100 if pe_ratio and sector_pe else None
@@ -600,7 +630,9 @@ class InvestmentSummaryGenerator:
             'premium': {
                 'PE': pe_premium,
                 'PB': pb_premium
-            }
+            },
+            'sector_name': sector_name,
+            'sector_source': sector_source
         }
     
     def generate_catalyst_timeline(self) -> List[Dict]:
@@ -26,9 +26,12 @@ from typing import Dict, Optional
 
 # Import centralized cache to prevent Yahoo rate limiting
 from utils.ticker_cache import get_ticker_info
+# Coalesce concurrent analyses of the same ticker
+from utils.single_flight import single_flight
 
 
 @st.cache_data(ttl=3600)  # Cache for 1 hour
+@single_flight()
 def analyze_management_effectiveness(ticker: str, _financials: Dict = None) -> Dict:
     """
     Comprehensive management effectiveness analysis
@@ -10,7 +10,8 @@ Features:
 - Interactive heatmap visualization
 - Export to Excel/CSV
 
-Data Sources: Yahoo Finance (yfinance)
+Data Sources: Yahoo Finance (yfinance), gaps filled from the S&P 500
+fundamentals cube (data_sources/fundamentals_cube.py) when one is built
 Author: Atlas Financial Intelligence
 Date: November 2025
 Phase: 6C-A (Foundation)
@@ -25,7 +26,7 @@ import warnings
 warnings.filterwarnings('ignore')
 
 # Use centralized ticker cache to avoid rate limiting
-from utils.ticker_cache import get_ticker_info
+from utils.ticker_cache import get_ticker_info, get_ticker_info_many
 
 
 # Related industries mapping - industries that are similar enough to be valid peers
@@ -172,6 +173,65 @@ RELATED_INDUSTRIES = {
     'Lumber & Wood Production': ['Lumber & Wood Production', 'Paper & Paper Products', 'Building Materials'],
 }
 
+# Metrics where a lower value ranks better
+LOWER_IS_BETTER = ['P/E (TTM)', 'Forward P/E', 'P/B', 'P/S', 'EV/EBITDA', 'PEG Ratio', 'Debt/Equity']
+
+# Comparison column -> fundamentals cube metric. Cube figures come from the
+# latest annual filing (P/B and P/S at today's price) while Yahoo's info
+# fields are TTM / most recent quarter, so each row records its source.
+# P/E (TTM), EV/EBITDA (cube: EV / operating income) and Revenue Growth
+# (cube: annual, Yahoo: quarterly YoY) have no cube equivalent.
+CUBE_METRICS = {
+    'P/B': 'Price_to_Book',
+    'P/S': 'Price_to_Sales',
+    'Net Margin': 'Net_Margin',
+    'Gross Margin': 'Gross_Margin',
+    'Operating Margin': 'Operating_Margin',
+    'ROE': 'ROE',
+    'ROA': 'ROA',
+    'Current Ratio': 'Current_Ratio',
+    'Free Cash Flow': 'Free_Cash_Flow',
+    'Operating Cash Flow': 'operating_cash_flow',
+    'Total Revenue': 'revenue',
+}
+
+SOURCE_CUBE = 'SEC annual (S&P 500 cube)'
+SOURCE_YAHOO = 'Yahoo Finance (TTM)'
+
+# Comparison table columns that aren't metrics
+META_COLUMNS = ['Ticker', 'Company', 'Sector', 'Industry', 'Data Source', 'Is_Primary']
+
+
+def get_sp500_context(tickers: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Latest values and S&P 500 percentile ranks (0 = worst, 100 = best) for
+    the CUBE_METRICS columns, sliced from the fundamentals cube
+    
+    Args:
+        tickers: Tickers to look up
+        
+    Returns:
+        (values, percentiles) DataFrames indexed by ticker with comparison
+        column names; empty when no cube is built
+    """
+    empty = pd.DataFrame(columns=list(CUBE_METRICS))
+    try:
+        from data_sources.fundamentals_cube import get_fundamentals_cube
+        cube = get_fundamentals_cube()
+    except Exception as e:
+        print(f"[WARN] Fundamentals cube unavailable: {str(e)}")
+        return empty, empty.copy()
+    if cube is None:
+        return empty, empty.copy()
+    
+    names = {metric: column for column, metric in CUBE_METRICS.items()}
+    values = cube.peers(tickers, list(CUBE_METRICS.values())).rename(columns=names)
+    percentiles = cube.peers(tickers, list(CUBE_METRICS.values()), stat='percentile').rename(columns=names)
+    for col in LOWER_IS_BETTER:
+        if col in percentiles.columns:
+            percentiles[col] = 100 - percentiles[col]
+    return values, percentiles
+
 
 @st.cache_data(ttl=86400)  # Cache for 24 hours
 def discover_peers(ticker: str, max_peers: int = 10) -> Dict:
@@ -217,10 +277,11 @@ def discover_peers(ticker: str, max_peers: int = 10) -> Dict:
         peers = []
         same_industry_count = 0
         
-        # Now fetch detailed info only for candidates (using cache to prevent rate limiting)
+        # Now fetch detailed info only for candidates (one batched cache lookup for all of them)
+        candidate_infos = get_ticker_info_many(candidate_tickers)
         for peer_ticker in candidate_tickers:
             try:
-                peer_info = get_ticker_info(peer_ticker)
+                peer_info = candidate_infos.get(peer_ticker.upper(), {})
                 
                 peer_industry = peer_info.get('industry', 'Unknown')
                 peer_market_cap = peer_info.get('marketCap', 0)
@@ -348,10 +409,13 @@ def get_peer_comparison_data(ticker: str, peer_tickers: List[str]) -> Dict:
             'totalRevenue'
         ]
         
+        # Statement metrics are slices of the S&P 500 cube; info (one batched
+        # cache lookup) supplies names, market fields and non-cube tickers
+        cube_values, cube_percentiles = get_sp500_context(all_tickers)
+        all_infos = get_ticker_info_many(all_tickers)
         for t in all_tickers:
             try:
-                # Use cached ticker info to prevent rate limiting
-                info = get_ticker_info(t)
+                info = all_infos.get(t.upper(), {})
                 
                 row = {
                     'Ticker': t,
@@ -382,6 +446,15 @@ def get_peer_comparison_data(ticker: str, peer_tickers: List[str]) -> Dict:
                 row['Operating Cash Flow'] = info.get('operatingCashflow')
                 row['Total Revenue'] = info.get('totalRevenue')
                 
+                # Cube tickers take every CUBE_METRICS column from the cube so a
+                # row never mixes annual and TTM figures
+                row['Data Source'] = SOURCE_YAHOO
+                if t.upper() in cube_values.index:
+                    row['Data Source'] = SOURCE_CUBE
+                    for col in CUBE_METRICS:
+                        cube_value = cube_values.at[t.upper(), col]
+                        row[col] = float(cube_value) if pd.notna(cube_value) else None
+                
                 comparison_data.append(row)
                 print(f"[OK] Fetched data for {t}")
                 
@@ -399,7 +472,8 @@ def get_peer_comparison_data(ticker: str, peer_tickers: List[str]) -> Dict:
             'status': 'success',
             'ticker': ticker,
             'data': df,
-            'metrics_count': len(df.columns) - 5  # Exclude Ticker, Company, Sector, Industry, Is_Primary
+            'metrics_count': len(df.columns) - len(META_COLUMNS),
+            'sp500_percentiles': cube_percentiles
         }
         
         print(f"[OK] Comparison data ready: {len(df)} companies, {result['metrics_count']} metrics")
@@ -427,9 +501,8 @@ def calculate_percentile_ranks(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
     """
     
     try:
-        # Get numeric columns only (exclude Ticker, Company, Sector, Industry, Is_Primary)
-        exclude_cols = ['Ticker', 'Company', 'Sector', 'Industry', 'Is_Primary']
-        numeric_cols = [col for col in df.columns if col not in exclude_cols]
+        # Get numeric columns only
+        numeric_cols = [col for col in df.columns if col not in META_COLUMNS]
         
         # Create percentile rank columns
         percentile_df = df.copy()
@@ -442,10 +515,7 @@ def calculate_percentile_ranks(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
             
             # Calculate percentile rank (0-100)
             # Higher is better for most metrics except P/E, P/B, P/S, Debt/Equity
-            
-            lower_is_better = ['P/E (TTM)', 'Forward P/E', 'P/B', 'P/S', 'EV/EBITDA', 'PEG Ratio', 'Debt/Equity']
-            
-            if col in lower_is_better:
+            if col in LOWER_IS_BETTER:
                 # For these metrics, lower values get higher percentile
                 percentile_df[f'{col}_Percentile'] = df[col].rank(ascending=True, pct=True) * 100
             else:
@@ -471,8 +541,7 @@ def calculate_statistics(df: pd.DataFrame) -> Dict:
     """
     
     try:
-        exclude_cols = ['Ticker', 'Company', 'Sector', 'Industry', 'Is_Primary']
-        numeric_cols = [col for col in df.columns if col not in exclude_cols and not col.endswith('_Percentile')]
+        numeric_cols = [col for col in df.columns if col not in META_COLUMNS and not col.endswith('_Percentile')]
         
         stats = {}
         
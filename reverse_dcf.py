@@ -26,6 +26,8 @@ import numpy as np
 from scipy.optimize import minimize_scalar, minimize
 from typing import Dict, Optional, Tuple
 
+from utils.financials_panel import get_panel
+
 
 class ReverseDCF:
     """
@@ -107,6 +109,9 @@ class ReverseDCF:
     
     def _get_latest_metric(self, statement: str, field_names: list) -> Optional[float]:
         """Helper to extract latest value from financial statement"""
+        panel = get_panel(self.financials)
+        if panel is not None:
+            return panel.first(field_names, statement=statement)
         try:
             df = self.financials.get(statement)
             if df is None or df.empty:
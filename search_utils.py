@@ -10,10 +10,13 @@ Features:
 - Fuzzy matching for better UX
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional
 import re
 
+from utils.financials_panel import get_panel
+
 
 def build_search_index(financials: Dict) -> List[Dict]:
     """
@@ -36,57 +39,24 @@ def build_search_index(financials: Dict) -> List[Dict]:
     if not financials:
         return index
     
-    # 1. Income Statement metrics
-    income = financials.get("income_statement", pd.DataFrame())
-    if not income.empty:
-        for metric_name in income.index:
-            try:
-                # Get latest year value (first column in yfinance format)
-                value = income.loc[metric_name].iloc[0] if len(income.columns) > 0 else None
-                if pd.notna(value):
-                    index.append({
-                        "metric": str(metric_name),
-                        "value": value,
-                        "category": "Income Statement",
-                        "location": "Data Tab → Income Statement",
-                        "icon": "📊"
-                    })
-            except (KeyError, TypeError, AttributeError):
-                pass  # Metric not found in income statement
-    
-    # 2. Balance Sheet metrics
-    balance = financials.get("balance_sheet", pd.DataFrame())
-    if not balance.empty:
-        for metric_name in balance.index:
-            try:
-                value = balance.loc[metric_name].iloc[0] if len(balance.columns) > 0 else None
-                if pd.notna(value):
-                    index.append({
-                        "metric": str(metric_name),
-                        "value": value,
-                        "category": "Balance Sheet",
-                        "location": "Data Tab → Balance Sheet",
-                        "icon": "🏦"
-                    })
-            except (KeyError, TypeError, AttributeError):
-                pass  # Metric not found in balance sheet
-    
-    # 3. Cash Flow metrics
-    cashflow = financials.get("cash_flow", pd.DataFrame())
-    if not cashflow.empty:
-        for metric_name in cashflow.index:
-            try:
-                value = cashflow.loc[metric_name].iloc[0] if len(cashflow.columns) > 0 else None
-                if pd.notna(value):
-                    index.append({
-                        "metric": str(metric_name),
-                        "value": value,
-                        "category": "Cash Flow",
-                        "location": "Data Tab → Cash Flow",
-                        "icon": "💵"
-                    })
-            except (KeyError, TypeError, AttributeError):
-                pass  # Metric not found in cash flow
+    # 1-3. Statement line items, latest value of each (panel covers SEC and yfinance formats)
+    panel = get_panel(financials)
+    statement_sections = [
+        ("income_statement", "Income Statement", "Data Tab → Income Statement", "📊"),
+        ("balance_sheet", "Balance Sheet", "Data Tab → Balance Sheet", "🏦"),
+        ("cash_flow", "Cash Flow", "Data Tab → Cash Flow", "💵"),
+    ]
+    for statement, category, location, icon in (statement_sections if panel is not None else []):
+        for row in panel.statement_rows(statement):
+            reported = panel.values[row][~np.isnan(panel.values[row])]
+            if len(reported):
+                index.append({
+                    "metric": str(panel.labels[row]),
+                    "value": float(reported[0]),
+                    "category": category,
+                    "location": location,
+                    "icon": icon
+                })
     
     # 4. Ratios (from ratios DataFrame)
     ratios = financials.get("ratios", pd.DataFrame())
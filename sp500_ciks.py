@@ -2,7 +2,8 @@
 S&P 500 CIK MAPPING
 ================================================================================
 Complete mapping of S&P 500 tickers to SEC CIK numbers.
-Used as fallback for governance_analysis.py SEC filing links.
+Offline seed for data_sources.cik_index when SEC is unreachable;
+live lookups should go through the shared CIK index.
 
 Source: SEC EDGAR company_tickers.json
 Last Updated: November 2025
@@ -162,7 +163,10 @@ SP500_CIKS = {
 
 def get_cik_from_local(ticker: str) -> str:
     """
-    Get CIK from local dictionary
+    Get CIK from local dictionary (S&P 500 only, no network).
+    
+    For any SEC filer use data_sources.cik_index.lookup_cik, which
+    falls back to this dictionary when SEC is unreachable.
     
     Args:
         ticker: Stock ticker symbol
@@ -5,7 +5,6 @@ Tests all companies with visible output and progress tracking.
 """
 
 import sys
-import time
 from datetime import datetime
 from test_config import TEST_COMPANIES
 
@@ -25,47 +24,46 @@ def test_all_companies():
     extractor = USAFinancialExtractor()
     results = []
     
-    for i, ticker in enumerate(TEST_COMPANIES, 1):
-        print(f"\n[{i}/{len(TEST_COMPANIES)}] Testing {ticker}...", flush=True)
+    # Extract concurrently; results arrive in completion order
+    for i, batch_result in enumerate(extractor.extract_many(TEST_COMPANIES, max_workers=4), 1):
+        ticker = batch_result.ticker
+        duration = batch_result.elapsed
+        print(f"\n[{i}/{len(TEST_COMPANIES)}] Tested {ticker}...", flush=True)
         print("-" * 60, flush=True)
         
-        try:
-            start = time.time()
-            data = extractor.extract_financials(ticker)
-            duration = time.time() - start
-            
-            if data and isinstance(data, dict):
-                data_size = len(str(data))
-                keys = len(data)
-                
-                result = {
-                    'ticker': ticker,
-                    'status': 'PASS',
-                    'duration': duration,
-                    'data_size': data_size,
-                    'keys': keys
-                }
-                
-                print(f"✅ {ticker}: SUCCESS", flush=True)
-                print(f"   Time: {duration:.2f}s", flush=True)
-                print(f"   Data: {data_size:,} bytes, {keys} keys", flush=True)
-                
-            else:
-                result = {
-                    'ticker': ticker,
-                    'status': 'FAIL',
-                    'duration': duration,
-                    'error': 'No data returned'
-                }
-                print(f"❌ {ticker}: FAILED - No data")
-                
-        except Exception as e:
+        data = batch_result.financials
+        if batch_result.status == "timeout" or (data is None and batch_result.error):
             result = {
                 'ticker': ticker,
                 'status': 'ERROR',
-                'error': str(e)
+                'error': batch_result.error
+            }
+            print(f"❌ {ticker}: ERROR - {batch_result.error}")
+            
+        elif data and isinstance(data, dict):
+            data_size = len(str(data))
+            keys = len(data)
+            
+            result = {
+                'ticker': ticker,
+                'status': 'PASS',
+                'duration': duration,
+                'data_size': data_size,
+                'keys': keys
+            }
+            
+            print(f"✅ {ticker}: SUCCESS", flush=True)
+            print(f"   Time: {duration:.2f}s", flush=True)
+            print(f"   Data: {data_size:,} bytes, {keys} keys", flush=True)
+            
+        else:
+            result = {
+                'ticker': ticker,
+                'status': 'FAIL',
+                'duration': duration,
+                'error': 'No data returned'
             }
-            print(f"❌ {ticker}: ERROR - {e}")
+            print(f"❌ {ticker}: FAILED - No data")
         
         results.append(result)
     
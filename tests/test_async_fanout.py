@@ -0,0 +1,131 @@
+"""
+Async Fan-Out Tests
+===================
+Tests for utils/async_fanout.py and the prefetched gap-fill merge in usa_backend
+
+Run with: pytest tests/test_async_fanout.py -v
+"""
+
+import sys
+import os
+import time
+import asyncio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils.async_fanout import fan_out, SourceResult
+from usa_backend import USAFinancialExtractor
+
+
+def _sleeper(seconds, value):
+    def fetch():
+        time.sleep(seconds)
+        return value
+    return fetch
+
+
+class TestFanOut:
+
+    def test_wall_clock_is_slowest_source(self):
+        t0 = time.time()
+        results = fan_out({
+            "a": _sleeper(0.3, 1),
+            "b": _sleeper(0.3, 2),
+            "c": _sleeper(0.3, 3),
+        })
+        assert time.time() - t0 < 0.6
+        assert {name: r.value for name, r in results.items()} == {"a": 1, "b": 2, "c": 3}
+        assert all(r.ok for r in results.values())
+
+    def test_per_source_timeout(self):
+        t0 = time.time()
+        results = fan_out(
+            {"slow": _sleeper(2.0, "late"), "fast": _sleeper(0.0, "ok")},
+            timeouts={"slow": 0.2},
+        )
+        # The slow source doesn't hold up the result
+        assert time.time() - t0 < 1.0
+        assert results["slow"].status == "timeout"
+        assert results["slow"].value is None
+        assert results["fast"].ok
+
+    def test_errors_are_isolated(self):
+        def boom():
+            raise RuntimeError("source down")
+
+        results = fan_out({"bad": boom, "good": _sleeper(0.0, {"x": 1})})
+        assert results["bad"].status == "error"
+        assert "source down" in results["bad"].error
+        assert results["good"].value == {"x": 1}
+
+    def test_inside_running_loop(self):
+        async def caller():
+            return fan_out({"a": _sleeper(0.0, 42)})
+
+        assert asyncio.run(caller())["a"].value == 42
+
+    def test_empty(self):
+        assert fan_out({}) == {}
+
+
+def _prefetched(**payloads):
+    return {name: SourceResult(name, "ok", value) for name, value in payloads.items()}
+
+
+class TestPrefetchedGapFill:
+
+    @pytest.fixture
+    def extractor(self):
+        return USAFinancialExtractor()
+
+    def test_field_priority_decides_winner(self, extractor):
+        prefetched = _prefetched(
+            yfinance_info={"returnOnEquity": 0.25, "targetMeanPrice": 200.0},
+            fmp={"roe": 0.30, "target_price": 210.0, "roic": 0.18},
+            alphavantage={"roe": 0.35},
+        )
+        financials = extractor._fill_data_gaps("TEST", {}, "sec", prefetched=prefetched)
+
+        # roe: yfinance first; target_price: FMP first; roic: FMP only
+        assert financials["roe"] == 0.25
+        assert financials["_sources"]["roe"] == "yfinance"
+        assert financials["target_price"] == 210.0
+        assert financials["_sources"]["target_price"] == "fmp"
+        assert financials["_sources"]["roic"] == "fmp"
+        assert financials["info"]["returnOnEquity"] == 0.25
+
+    def test_unlisted_sources_are_last_resort(self, extractor):
+        # pe_ratio priority lists no Alpha Vantage, but it still fills the gap
+        prefetched = _prefetched(yfinance_info={}, fmp={}, alphavantage={"pe_ratio": 31.5})
+        financials = extractor._fill_data_gaps("TEST", {}, "sec", prefetched=prefetched)
+        assert financials["pe_ratio"] == 31.5
+        assert financials["_sources"]["pe_ratio"] == "alphavantage"
+
+    def test_paid_fallbacks_not_fanned_out(self, extractor, monkeypatch):
+        import usa_backend
+        fanned = []
+
+        def record(fetchers, timeouts=None):
+            fanned.extend(fetchers)
+            return {name: SourceResult(name, "error", error="offline") for name in fetchers}
+
+        monkeypatch.setattr(usa_backend, "fan_out", record)
+        monkeypatch.setattr(extractor, "validate_ticker", lambda ticker: (True, "Test Co"))
+        monkeypatch.setattr(extractor, "_fill_data_gaps", lambda ticker, financials, *a, **kw: financials)
+        extractor.extract_financials("TEST", use_cache=False)
+        assert "sec" in fanned and "fmp" not in fanned and "alphavantage" not in fanned
+
+    def test_timed_out_source_not_refetched(self, extractor, monkeypatch):
+        def no_network(*args, **kwargs):
+            raise AssertionError("timed-out source was fetched again")
+
+        monkeypatch.setattr(extractor, "_fetch_fmp", no_network)
+        prefetched = _prefetched(yfinance_info={"beta": 1.1}, alphavantage={})
+        prefetched["fmp"] = SourceResult("fmp", "timeout", error="Timed out after 30s")
+
+        financials = extractor._fill_data_gaps("TEST", {}, "sec", prefetched=prefetched)
+        assert financials["beta"] == 1.1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
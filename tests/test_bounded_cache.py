@@ -0,0 +1,140 @@
+"""
+Bounded Cache Tests
+===================
+Tests for utils/bounded_cache.py and the USAFinancialExtractor cache wrappers
+
+Run with: pytest tests/test_bounded_cache.py -v
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.bounded_cache import BoundedTTLCache, estimate_size
+from usa_backend import USAFinancialExtractor
+
+
+def _frame(rows=1000, cols=10):
+    return pd.DataFrame(np.random.rand(rows, cols))
+
+
+class TestEstimateSize:
+
+    def test_dataframe_dominates(self):
+        df = _frame()                       # 80 KB of float64
+        size = estimate_size({"income_statement": df, "ticker": "AAPL"})
+        assert 80_000 <= size < 100_000
+
+    def test_shared_objects_counted_once(self):
+        df = _frame()
+        assert estimate_size([df, df]) < 1.2 * estimate_size([df])
+
+    def test_object_columns_use_deep_size(self):
+        df = pd.DataFrame({"name": ["x" * 100] * 1000})
+        assert estimate_size(df) > 100_000
+
+
+class TestBoundedTTLCache:
+
+    def test_get_set(self):
+        cache = BoundedTTLCache(max_bytes=10_000_000, sweep=False)
+        cache.set("a", {"x": 1})
+        assert cache.get("a") == {"x": 1}
+        assert cache.get("missing") is None
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    def test_lru_eviction_by_bytes(self):
+        cache = BoundedTTLCache(max_bytes=250_000, sweep=False)
+        for key in ("a", "b", "c"):
+            cache.set(key, _frame())        # ~80 KB each
+        cache.get("a")                      # a is now most recently used
+        cache.set("d", _frame())
+        assert "b" not in cache
+        assert all(k in cache for k in ("a", "c", "d"))
+        assert cache.size_bytes <= 250_000
+        assert cache.stats()["evictions"] == 1
+
+    def test_max_entries(self):
+        cache = BoundedTTLCache(max_entries=2, sweep=False)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        assert len(cache) == 2 and "a" not in cache
+
+    def test_oversized_value_rejected(self):
+        cache = BoundedTTLCache(max_bytes=10_000, sweep=False)
+        cache.set("small", 1)
+        assert cache.set("huge", _frame()) is False
+        assert "huge" not in cache and "small" in cache
+        assert cache.stats()["rejected"] == 1
+
+    def test_ttl_expiry_on_read(self):
+        cache = BoundedTTLCache(sweep=False)
+        cache.set("a", 1, ttl=0.05)
+        time.sleep(0.1)
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert cache.size_bytes == 0
+
+    def test_stale_window(self):
+        cache = BoundedTTLCache(sweep=False)
+        cache.set("a", 1, ttl=0.05, stale_ttl=0.2)
+        time.sleep(0.1)
+        assert cache.get("a") is None and "a" not in cache
+        value, fresh_until = cache.get_entry("a")
+        assert value == 1 and fresh_until < time.time()
+        assert cache.stats()["stale_count"] == 1 and cache.stats()["stale_hits"] == 1
+        time.sleep(0.2)
+        assert cache.get_entry("a") is None
+        assert cache.size_bytes == 0
+
+    def test_sweep_frees_unread_entries(self):
+        cache = BoundedTTLCache(sweep=False)
+        cache.set("old", _frame(), ttl=0.05)
+        cache.set("fresh", 1, ttl=60)
+        time.sleep(0.1)
+        assert cache.stats()["expired_count"] == 1
+        assert cache.sweep() == 1
+        assert len(cache) == 1 and cache.size_bytes < 1000
+
+    def test_overwrite_updates_bytes(self):
+        cache = BoundedTTLCache(sweep=False)
+        cache.set("a", _frame())
+        cache.set("a", 1)
+        assert cache.size_bytes < 1000
+
+    def test_stats_by_category(self):
+        cache = BoundedTTLCache(sweep=False)
+        cache.set("f", _frame(), category="financials")
+        cache.set("m", {"price": 1.0}, category="market_data")
+        stats = cache.stats()
+        assert stats["entries_by_type"] == {"financials": 1, "market_data": 1}
+        assert stats["bytes_by_type"]["financials"] > stats["bytes_by_type"]["market_data"]
+
+
+class TestExtractorCache:
+
+    def test_wrappers_use_result_cache(self, tmp_path):
+        from utils.tiered_cache import TieredCache
+
+        extractor = USAFinancialExtractor()
+        extractor._cache = TieredCache(l1=BoundedTTLCache(max_bytes=1024 * 1024, sweep=False),
+                                       disk_dir=str(tmp_path))
+
+        extractor._cache_set("AAPL_auto", {"income_statement": _frame()}, cache_type="financials")
+        assert extractor._cache_get("AAPL_auto") is not None
+        stats = extractor._cache_stats()
+        assert stats["entries_by_type"] == {"financials": 1}
+        assert stats["hits"] == 1
+        assert "companyfacts_store" in stats
+
+        extractor._cache_clear("AAPL_auto")
+        assert extractor._cache_get("AAPL_auto") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
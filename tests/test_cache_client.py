@@ -0,0 +1,167 @@
+"""
+Cache Client Tests
+==================
+Tests for utils/cache_client.py, batched ticker info lookups and
+TieredCache.get_many (Redis exercised with an in-memory stand-in)
+
+Run with: pytest tests/test_cache_client.py -v
+"""
+
+import sys
+import os
+import time
+import fnmatch
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils import ticker_cache
+from utils.bounded_cache import BoundedTTLCache
+from utils.cache_client import CacheClient, cache_key
+from utils.revalidation import stale_window
+from utils.tiered_cache import TieredCache
+
+
+class CountingRedis:
+    """Just enough of redis.Redis (bytes mode), counting network round-trips."""
+
+    def __init__(self):
+        self.store = {}
+        self.round_trips = 0
+
+    def _live(self, key):
+        value, expires_at = self.store.get(key, (None, 0))
+        return value if expires_at > time.time() else None
+
+    def get(self, key):
+        self.round_trips += 1
+        return self._live(key)
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self._live(k) for k in keys]
+
+    def pttl(self, key):
+        self.round_trips += 1
+        return int((self.store[key][1] - time.time()) * 1000) if key in self.store else -2
+
+    def setex(self, key, ttl, value):
+        self.round_trips += 1
+        self.store[key] = (value, time.time() + ttl)
+
+    def delete(self, *keys):
+        self.round_trips += 1
+        return sum(1 for k in keys if self.store.pop(k, None))
+
+    def scan_iter(self, pattern, count=None):
+        return [k for k in list(self.store) if fnmatch.fnmatch(k, pattern)]
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client, self.calls = client, []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+            return self
+        return queue
+
+    def execute(self):
+        replies = [getattr(self.client, name)(*args) for name, args in self.calls]
+        self.client.round_trips -= len(self.calls) - 1       # one round-trip for the batch
+        return replies
+
+
+class TestCacheClient:
+
+    def test_get_many_is_one_round_trip(self):
+        redis = CountingRedis()
+        client = CacheClient(redis_client=redis)
+        keys = [cache_key("info", f"T{i}") for i in range(50)]
+        client.set_many({k: {"marketCap": i} for i, k in enumerate(keys)}, ttl=60)
+        assert redis.round_trips == 1
+
+        found = client.get_many(keys + [cache_key("info", "MISSING")])
+        assert redis.round_trips == 2
+        assert len(found) == 50 and found[keys[7]] == {"marketCap": 7}
+        stats = client.stats()
+        assert stats["hits"] == 50 and stats["misses"] == 1
+        assert stats["keys_per_round_trip"] == 25.5
+
+    def test_namespace(self):
+        assert cache_key("info", "aapl") == "atlas:info:AAPL"
+
+    def test_memory_fallback(self):
+        client = CacheClient(connect=False)
+        assert not client.connected
+        client.set("atlas:info:AAPL", {"sector": "Technology"}, ttl=60)
+        assert client.get("atlas:info:AAPL") == {"sector": "Technology"}
+        client.delete("atlas:info:AAPL")
+        assert client.get("atlas:info:AAPL") is None
+        assert client.stats()["backend"] == "memory"
+
+    def test_undecodable_value_is_miss(self):
+        redis = CountingRedis()
+        redis.setex("atlas:info:BAD", 60, b"AC\xff\x00\x00garbage")
+        client = CacheClient(redis_client=redis)
+        assert client.get_many(["atlas:info:BAD"]) == {}
+
+    def test_scan_delete_namespace(self):
+        redis = CountingRedis()
+        client = CacheClient(redis_client=redis)
+        client.set_many({"atlas:info:A": {"x": 1}, "atlas:holders:A": {"x": 2}}, ttl=60)
+        redis.setex("other:key", 60, b"keep")
+        assert client.scan_delete() == 2
+        assert list(redis.store) == ["other:key"]
+
+
+class TestTickerInfoMany:
+
+    def test_hits_batched_and_misses_written_back(self, monkeypatch):
+        redis = CountingRedis()
+        client = CacheClient(redis_client=redis)
+        client.set_many({cache_key("info", t): {"symbol": t} for t in ["AAPL", "MSFT"]}, ttl=60,
+                        stale_ttl=stale_window(ticker_cache.INFO_CATEGORY))
+        fetched = []
+        monkeypatch.setattr(ticker_cache, "get_cache_client", lambda: client)
+        monkeypatch.setattr(ticker_cache, "_fetch_info",
+                            lambda t: fetched.append(t) or ({"symbol": t} if t != "NONE" else {}))
+
+        redis.round_trips = 0
+        infos = ticker_cache.get_ticker_info_many(["aapl", "MSFT", "GOOGL", "NONE", "AAPL"])
+        assert infos == {"AAPL": {"symbol": "AAPL"}, "MSFT": {"symbol": "MSFT"},
+                         "GOOGL": {"symbol": "GOOGL"}, "NONE": {}}
+        assert sorted(fetched) == ["GOOGL", "NONE"]
+        assert redis.round_trips == 2                      # one GET+PTTL pipeline + one SETEX pipeline
+        assert cache_key("info", "GOOGL") in redis.store
+        assert cache_key("info", "NONE") not in redis.store
+
+
+class TestTieredGetMany:
+
+    def test_l3_lookups_share_one_round_trip(self, tmp_path):
+        redis = CountingRedis()
+        writer = TieredCache(l1=BoundedTTLCache(sweep=False), redis_client=redis, name="w")
+        for i in range(10):
+            writer.set(f"T{i}_auto_10-K", {"ticker": f"T{i}"}, ttl=60)
+
+        reader = TieredCache(l1=BoundedTTLCache(sweep=False), disk_dir=str(tmp_path),
+                             redis_client=redis, name="r")
+        reader.l1.set("T0_auto_10-K", {"ticker": "T0"})
+        redis.round_trips = 0
+        found = reader.get_many([f"T{i}_auto_10-K" for i in range(12)])
+
+        assert len(found) == 10 and found["T9_auto_10-K"] == {"ticker": "T9"}
+        assert redis.round_trips == 1
+        tiers = reader.stats()["tiers"]
+        assert tiers["l1_hits"] == 1 and tiers["l3_hits"] == 9 and tiers["misses"] == 2
+        # Promoted: a second batch needs no Redis at all
+        reader.get_many([f"T{i}_auto_10-K" for i in range(10)])
+        assert redis.round_trips == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
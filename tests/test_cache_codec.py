@@ -0,0 +1,113 @@
+"""
+Cache Codec Tests
+=================
+Tests for utils/cache_codec.py
+
+Run with: pytest tests/test_cache_codec.py -v
+"""
+
+import sys
+import os
+import json
+import datetime as dt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.cache_codec import CacheCodec, CodecError, MSGPACK_AVAILABLE, MAGIC, CODEC_VERSION
+
+needs_msgpack = pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+
+
+def _statement():
+    return pd.DataFrame(
+        np.random.rand(3, 2) * 1e9,
+        index=["Total Revenue", "Net Income", "EBITDA"],
+        columns=pd.to_datetime(["2024-09-30", "2023-09-30"]),
+    )
+
+
+class TestCacheCodec:
+
+    @needs_msgpack
+    def test_financials_round_trip_keeps_types(self):
+        codec = CacheCodec()
+        value = {
+            "income_statement": _statement(),
+            "prices": pd.Series([1.0, 2.0], index=pd.to_datetime(["2024-01-02", "2024-01-03"]), name="Close"),
+            "filed": pd.Timestamp("2024-11-01 16:30", tz="US/Eastern"),
+            "missing_date": pd.NaT,
+            "period_end": dt.date(2024, 9, 28),
+            "shares": np.int64(15_000_000_000),
+            "matrix": np.arange(6, dtype=np.float64).reshape(2, 3),
+            "by_date": {pd.Timestamp("2024-09-30"): 1.5},
+            "name": "Apple Inc.",
+        }
+        got = codec.decode(codec.encode(value))
+
+        pd.testing.assert_frame_equal(got["income_statement"], value["income_statement"])
+        pd.testing.assert_series_equal(got["prices"], value["prices"])
+        assert got["filed"] == value["filed"] and str(got["filed"].tz) == "US/Eastern"
+        assert got["missing_date"] is pd.NaT
+        assert got["period_end"] == dt.date(2024, 9, 28)
+        assert got["shares"] == 15_000_000_000
+        np.testing.assert_array_equal(got["matrix"], value["matrix"])
+        assert got["by_date"] == {pd.Timestamp("2024-09-30"): 1.5}
+
+    @needs_msgpack
+    def test_mixed_object_frame_falls_back(self):
+        codec = CacheCodec()
+        df = pd.DataFrame({"value": [1, "n/a", 2.5]}, index=["a", "b", "c"])
+        got = codec.decode(codec.encode(df))
+        assert got["value"].tolist() == [1, "n/a", 2.5]
+        assert got.index.tolist() == ["a", "b", "c"]
+
+    def test_header_and_compression(self):
+        codec = CacheCodec(compression="zlib")
+        small = codec.encode({"a": 1})
+        large = codec.encode({"summary": "x" * 10_000})
+        assert small[:2] == MAGIC and small[2] == CODEC_VERSION
+        assert small[4] == 0                 # below the threshold: stored uncompressed
+        assert large[4] == 1 and len(large) < 1000
+        assert codec.decode(large)["summary"] == "x" * 10_000
+
+    def test_legacy_json_values_still_read(self):
+        codec = CacheCodec()
+        legacy = json.dumps({"marketCap": 3e12}).encode("utf-8")
+        assert codec.decode(legacy) == {"marketCap": 3e12}
+        assert codec.stats()["legacy_decoded"] == 1
+
+    def test_unknown_version_rejected(self):
+        codec = CacheCodec()
+        blob = bytearray(codec.encode({"a": 1}))
+        blob[2] = CODEC_VERSION + 1
+        with pytest.raises(CodecError):
+            codec.decode(bytes(blob))
+
+    def test_corrupt_payload_raises_codec_error(self):
+        codec = CacheCodec(compression="zlib")
+        blob = codec.encode({"summary": "x" * 10_000})
+        with pytest.raises(CodecError):
+            codec.decode(blob[:20])
+
+    def test_json_serializer_rejects_frames(self):
+        codec = CacheCodec(serializer="json")
+        assert codec.decode(codec.encode({"ts": pd.Timestamp("2024-01-01")})) == {"ts": "2024-01-01T00:00:00"}
+        with pytest.raises(TypeError):
+            codec.encode({"df": _statement()})
+
+    def test_stats_report_sizes_and_timings(self):
+        codec = CacheCodec()
+        for _ in range(3):
+            codec.decode(codec.encode({"summary": "y" * 5000}))
+        stats = codec.stats()
+        assert stats["encoded"] == 3 and stats["decoded"] == 3
+        assert stats["raw_bytes"] > stats["stored_bytes"] > 0
+        assert stats["compression_ratio"] > 1
+        assert stats["avg_encode_ms"] >= 0 and stats["avg_decode_ms"] >= 0
+        assert stats["codec"] == codec.description
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+"""
+Cache Warmer Tests
+==================
+Tests for utils/cache_warmer.py (extraction stubbed - no network)
+
+Run with: pytest tests/test_cache_warmer.py -v
+"""
+
+import sys
+import os
+import json
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils.cache_warmer import CacheWarmer, DemandTracker
+from utils.ttl_policy import NY_TZ
+
+UNIVERSE = ["A", "AAPL", "MSFT", "JPM", "XOM"]
+
+
+@pytest.fixture(autouse=True)
+def no_info_fetch(monkeypatch):
+    monkeypatch.setattr(CacheWarmer, "_warm_info", lambda self, tickers: None)
+
+
+def _warmer(tmp_path, extract=None, watchlist=(), demand=None, **kwargs):
+    calls = []
+
+    def default_extract(ticker):
+        calls.append(ticker)
+        return {"ticker": ticker}
+
+    warmer = CacheWarmer(universe=UNIVERSE, watchlist=list(watchlist),
+                         state_path=str(tmp_path / "state.json"),
+                         demand=demand or DemandTracker(path=str(tmp_path / "demand.json")),
+                         extract=extract or default_extract, analyses=[],
+                         rate_per_minute=60_000, **kwargs)
+    return warmer, calls
+
+
+class TestCacheWarmer:
+
+    def test_priority_watchlist_then_demand_then_universe(self, tmp_path):
+        demand = DemandTracker(path=str(tmp_path / "demand.json"))
+        for ticker in ["xom", "XOM", "JPM"]:
+            demand.record(ticker)
+        warmer, _ = _warmer(tmp_path, watchlist=["MSFT"], demand=demand)
+        assert warmer.queue() == ["MSFT", "XOM", "JPM", "A", "AAPL"]
+
+    def test_resume_after_restart(self, tmp_path):
+        warmer, calls = _warmer(tmp_path)
+        assert warmer.run(max_tickers=2, force=True)["warmed"] == 2
+        assert calls == ["A", "AAPL"]
+
+        restarted, calls = _warmer(tmp_path)        # same checkpoint file
+        summary = restarted.run(force=True)
+        assert calls == ["MSFT", "JPM", "XOM"]
+        assert summary["remaining"] == 0
+
+    def test_failures_retried_then_skipped(self, tmp_path):
+        def extract(ticker):
+            return {"status": "error", "message": "No data"} if ticker == "JPM" else {"ticker": ticker}
+
+        warmer, _ = _warmer(tmp_path, extract=extract)
+        assert warmer.run(force=True)["failed"] == 1
+        assert warmer.queue() == ["JPM"]
+        warmer.run(force=True)
+        assert warmer.queue() == []
+
+    def test_rate_limit_backs_off(self, tmp_path):
+        warmer, _ = _warmer(tmp_path, extract=lambda t: {"status": "error", "message": "Rate limited (429)"})
+        with pytest.raises(RuntimeError):
+            warmer.warm("AAPL")
+        assert warmer.bucket.stats()["penalties"] == 1
+
+    def test_off_peak_windows(self, tmp_path):
+        warmer, _ = _warmer(tmp_path)
+        assert not warmer.is_off_peak(datetime(2024, 3, 28, 11, 0, tzinfo=NY_TZ))    # market open
+        assert warmer.is_off_peak(datetime(2024, 3, 30, 11, 0, tzinfo=NY_TZ))        # Saturday
+
+        nightly, _ = _warmer(tmp_path, off_peak_hours=(20, 7))
+        assert nightly.is_off_peak(datetime(2024, 3, 28, 23, 0, tzinfo=NY_TZ))
+        assert not nightly.is_off_peak(datetime(2024, 3, 30, 12, 0, tzinfo=NY_TZ))
+
+    def test_outside_window_does_nothing(self, tmp_path, monkeypatch):
+        warmer, calls = _warmer(tmp_path)
+        monkeypatch.setattr(warmer, "is_off_peak", lambda now=None: False)
+        assert warmer.run()["warmed"] == 0 and calls == []
+
+    def test_demand_flush_merges(self, tmp_path):
+        path = str(tmp_path / "demand.json")
+        first, second = DemandTracker(path=path, flush_every=1), DemandTracker(path=path, flush_every=1)
+        first.record("AAPL")
+        second.record("aapl")
+        with open(path) as f:
+            assert json.load(f) == {"AAPL": 2}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
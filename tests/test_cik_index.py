@@ -0,0 +1,122 @@
+"""
+CIK Index Tests
+===============
+Tests for data_sources/cik_index.py (no network - SEC calls are stubbed).
+
+Run with: pytest tests/test_cik_index.py -v
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import requests
+from data_sources import cik_index
+from data_sources.cik_index import CIKIndex
+
+
+SEC_PAYLOAD = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 789019, "ticker": "MSFT", "title": "MICROSOFT CORP"},
+    "2": {"cik_str": 1067983, "ticker": "BRK-B", "title": "BERKSHIRE HATHAWAY INC"},
+}
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def sec_calls(monkeypatch):
+    """Stub the SEC download and count calls."""
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return _FakeResponse(SEC_PAYLOAD)
+
+    monkeypatch.setattr(cik_index, "http_get", fake_get)
+    return calls
+
+
+@pytest.fixture
+def sec_down(monkeypatch):
+    def fake_get(url, **kwargs):
+        raise requests.exceptions.ConnectionError("offline")
+
+    monkeypatch.setattr(cik_index, "http_get", fake_get)
+
+
+class TestCIKIndex:
+
+    def test_lookup_pads_cik(self, tmp_path, sec_calls):
+        index = CIKIndex(cache_dir=str(tmp_path))
+        assert index.lookup("AAPL") == "0000320193"
+        assert index.lookup("msft ") == "0000789019"
+
+    def test_share_class_separator(self, tmp_path, sec_calls):
+        index = CIKIndex(cache_dir=str(tmp_path))
+        assert index.lookup("BRK.B") == index.lookup("BRK-B") == "0001067983"
+
+    def test_downloads_once(self, tmp_path, sec_calls):
+        index = CIKIndex(cache_dir=str(tmp_path))
+        for _ in range(50):
+            index.lookup("AAPL")
+        assert len(sec_calls) == 1
+
+    def test_persisted_copy_reused(self, tmp_path, sec_calls):
+        CIKIndex(cache_dir=str(tmp_path)).lookup("AAPL")
+        fresh = CIKIndex(cache_dir=str(tmp_path))
+        assert fresh.lookup("MSFT") == "0000789019"
+        assert fresh.stats()["source"] == "disk"
+        assert len(sec_calls) == 1
+
+    def test_stale_copy_refreshed(self, tmp_path, sec_calls):
+        CIKIndex(cache_dir=str(tmp_path)).lookup("AAPL")
+        old = os.path.getmtime(tmp_path / cik_index.CACHE_FILE) - 2 * 86400
+        os.utime(tmp_path / cik_index.CACHE_FILE, (old, old))
+
+        index = CIKIndex(cache_dir=str(tmp_path))
+        index.lookup("AAPL")
+        assert len(sec_calls) == 2
+        assert index.stats()["source"] == "sec"
+
+    def test_stale_copy_kept_when_sec_down(self, tmp_path, sec_down):
+        path = tmp_path / cik_index.CACHE_FILE
+        path.write_text(json.dumps(SEC_PAYLOAD))
+        old = os.path.getmtime(path) - 2 * 86400
+        os.utime(path, (old, old))
+
+        index = CIKIndex(cache_dir=str(tmp_path))
+        assert index.lookup("AAPL") == "0000320193"
+
+    def test_seed_fallback_when_offline(self, tmp_path, sec_down):
+        index = CIKIndex(cache_dir=str(tmp_path))
+        assert index.lookup("JPM") == "0000019617"
+        assert index.stats()["source"] == "seed"
+
+    def test_unknown_ticker(self, tmp_path, sec_calls):
+        index = CIKIndex(cache_dir=str(tmp_path))
+        assert index.lookup("NOTREAL") is None
+        assert index.lookup("") is None
+
+    def test_title_and_mapping(self, tmp_path, sec_calls):
+        index = CIKIndex(cache_dir=str(tmp_path))
+        assert index.get_title("MSFT") == "MICROSOFT CORP"
+        mapping = index.as_dict()
+        assert mapping["AAPL"] == "0000320193"
+        with pytest.raises(TypeError):
+            mapping["AAPL"] = "x"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
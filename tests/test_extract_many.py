@@ -0,0 +1,108 @@
+"""
+Batch Extraction Tests
+======================
+Tests for USAFinancialExtractor.extract_many (extract_financials is stubbed - no network).
+
+Run with: pytest tests/test_extract_many.py -v
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from usa_backend import USAFinancialExtractor
+from utils.bounded_cache import BoundedTTLCache
+from utils.tiered_cache import TieredCache
+
+
+class StubExtractor(USAFinancialExtractor):
+    """extract_financials replaced by a scripted delay/outcome per ticker."""
+
+    def __init__(self, script):
+        super().__init__()
+        self._cache = TieredCache(l1=BoundedTTLCache(sweep=False))     # no disk/Redis tiers
+        self.script = script
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._guard = threading.Lock()
+
+    def extract_financials(self, ticker, **kwargs):
+        with self._guard:
+            self.calls.append((ticker, kwargs))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay, outcome = self.script[ticker]
+            time.sleep(delay)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        finally:
+            with self._guard:
+                self.in_flight -= 1
+
+
+OK = {"ticker": "X", "extraction_time": "0.01s"}
+
+
+class TestExtractMany:
+
+    def test_results_stream_in_completion_order(self):
+        extractor = StubExtractor({"SLOW": (0.3, OK), "FAST": (0.0, OK)})
+        order = [r.ticker for r in extractor.extract_many(["SLOW", "FAST"], max_workers=2)]
+        assert order == ["FAST", "SLOW"]
+
+    def test_partial_failures_reported(self):
+        extractor = StubExtractor({
+            "AAPL": (0.0, OK),
+            "BAD": (0.0, {"status": "error", "message": "CIK not found"}),
+            "BOOM": (0.0, RuntimeError("parser crashed")),
+        })
+        results = {r.ticker: r for r in extractor.extract_many(["AAPL", "BAD", "BOOM"])}
+        assert results["AAPL"].ok and results["AAPL"].financials == OK
+        assert results["BAD"].status == "error" and results["BAD"].error == "CIK not found"
+        assert results["BOOM"].status == "error" and "parser crashed" in results["BOOM"].error
+
+    def test_concurrency_limit(self):
+        tickers = [f"T{i}" for i in range(8)]
+        extractor = StubExtractor({t: (0.05, OK) for t in tickers})
+        assert len(list(extractor.extract_many(tickers, max_workers=3))) == 8
+        assert extractor.max_in_flight == 3
+
+    def test_timeout(self):
+        extractor = StubExtractor({"HANG": (3.0, OK), "FAST": (0.0, OK)})
+        t0 = time.time()
+        results = {r.ticker: r for r in extractor.extract_many(["HANG", "FAST"], timeout=0.2)}
+        assert time.time() - t0 < 2.5
+        assert results["HANG"].status == "timeout"
+        assert results["FAST"].ok
+
+    def test_dedup_and_kwargs_passthrough(self):
+        extractor = StubExtractor({"AAPL": (0.0, OK)})
+        results = list(extractor.extract_many(["aapl", "AAPL ", ""], filing_types=["10-Q"]))
+        assert len(results) == 1
+        assert extractor.calls == [("AAPL", {"filing_types": ["10-Q"]})]
+
+    def test_cached_tickers_skip_the_pool(self):
+        extractor = StubExtractor({"MSFT": (0.0, OK)})
+        extractor._cache_set(extractor._extraction_cache_key("AAPL", filing_types=["10-Q"]),
+                             {"ticker": "AAPL"}, cache_type="financials")
+        results = {r.ticker: r for r in extractor.extract_many(["AAPL", "MSFT"], filing_types=["10-Q"])}
+        assert results["AAPL"].ok and results["AAPL"].financials == {"ticker": "AAPL"}
+        assert [call[0] for call in extractor.calls] == ["MSFT"]
+
+    def test_as_of_batch_ignores_cached_latest_result(self):
+        extractor = StubExtractor({"AAPL": (0.0, OK)})
+        extractor._cache_set(extractor._extraction_cache_key("AAPL"), {"ticker": "AAPL"},
+                             cache_type="financials")
+        results = list(extractor.extract_many(["AAPL"], as_of="2015-01-01"))
+        assert results[0].financials == OK                               # extracted as of 2015
+        assert extractor.calls == [("AAPL", {"as_of": "2015-01-01"})]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
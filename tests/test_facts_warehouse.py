@@ -0,0 +1,124 @@
+"""
+Fundamentals Warehouse Tests
+============================
+Tests for data_sources/facts_warehouse.py (built from a small synthetic companyfacts.zip).
+
+Run with: pytest tests/test_facts_warehouse.py -v
+"""
+
+import sys
+import os
+import json
+import zipfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data_sources.facts_warehouse import FactsWarehouse, BUCKET_WIDTH
+from data_sources.xbrl_facts import XBRLFactTable
+
+
+def _fact(fy, val, form="10-K", fp="FY", filed=None):
+    return {"fy": fy, "val": val, "form": form, "fp": fp, "accn": f"0000000000-{fy % 100:02d}-000001",
+            "end": f"{fy}-12-31", "filed": filed or f"{fy + 1}-02-15"}
+
+
+def _companyfacts(cik, name, revenue):
+    return {
+        "cik": cik,
+        "entityName": name,
+        "facts": {"us-gaap": {
+            "Revenues": {"label": "Revenues", "units": {"USD": [
+                _fact(2022, revenue), _fact(2023, revenue * 1.1),
+                _fact(2023, revenue * 1.2, filed="2025-02-15"),        # Restated
+                _fact(2023, revenue / 4, form="10-Q", fp="Q1"),
+            ]}},
+            "NetIncomeLoss": {"units": {"USD": [_fact(2023, revenue / 10)]}},
+            "EarningsPerShareBasic": {"units": {"USD/shares": [_fact(2023, 6.1)]}},
+        }},
+    }
+
+
+PAYLOADS = {
+    "0000320193": _companyfacts(320193, "Apple Inc.", 380.0),
+    "0000320194": _companyfacts(320194, "Neighbour Corp", 5.0),                  # Same partition
+    "0000019617": _companyfacts(19617, "JPMORGAN CHASE & CO", 150.0),           # Different partition
+}
+
+SEARCH_MAP = {"Revenue": ["Revenues"], "Net_Income": ["NetIncomeLoss"]}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "companyfacts.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        for cik, payload in PAYLOADS.items():
+            zf.writestr(f"CIK{cik}.json", json.dumps(payload))
+        zf.writestr("CIK0000000001.json", '{"cik": 1, "facts": {')   # Truncated member
+    return str(path)
+
+
+@pytest.fixture
+def warehouse(tmp_path, archive):
+    warehouse = FactsWarehouse(root=str(tmp_path / "warehouse"))
+    warehouse.ingest(archive)
+    return warehouse
+
+
+class TestFactsWarehouse:
+
+    def test_ingest_summary(self, tmp_path, archive):
+        summary = FactsWarehouse(root=str(tmp_path / "warehouse")).ingest(archive)
+        assert summary["companies"] == 3
+        assert summary["skipped"] == 1
+        assert summary["partitions"] == 2
+        assert summary["rows"] == 3 * 6
+
+    def test_partitioned_by_cik_range(self, warehouse):
+        buckets = sorted(d for d in os.listdir(warehouse.root) if d.startswith("bucket="))
+        assert buckets == [f"bucket={19617 // BUCKET_WIDTH:04d}", f"bucket={320193 // BUCKET_WIDTH:04d}"]
+
+    def test_matches_api_parse(self, warehouse):
+        for cik, payload in PAYLOADS.items():
+            stored = warehouse.get_fact_table(cik)
+            expected = XBRLFactTable.from_companyfacts(payload)
+            assert stored.entity_name == expected.entity_name
+            assert stored.cik == cik
+            assert stored.statement(SEARCH_MAP, ["10-K"]).equals(expected.statement(SEARCH_MAP, ["10-K"]))
+
+    def test_batch_read(self, warehouse):
+        tables = warehouse.get_fact_tables(["320193", "19617", "9999999"])
+        assert set(tables) == {"0000320193", "0000019617"}
+
+    def test_unknown_cik(self, warehouse):
+        assert warehouse.get_fact_table("0000999999") is None
+        assert "0000999999" not in warehouse
+        assert "0000320193" in warehouse
+
+    def test_tag_subset_build(self, tmp_path, archive):
+        warehouse = FactsWarehouse(root=str(tmp_path / "subset"))
+        warehouse.ingest(archive, tags=["Revenues"])
+        assert warehouse.covers(["Revenues"])
+        assert not warehouse.covers(["Revenues", "NetIncomeLoss"])
+        assert warehouse.get_fact_table("0000320193").tags == ["Revenues"]
+
+    def test_freshness(self, tmp_path, archive):
+        warehouse = FactsWarehouse(root=str(tmp_path / "warehouse"), max_age_seconds=3600)
+        assert not warehouse.available and not warehouse.is_fresh()
+        warehouse.ingest(archive)
+        assert warehouse.is_fresh()
+        warehouse.max_age_seconds = 0
+        assert not warehouse.is_fresh()
+
+    def test_rebuild_swaps_in(self, warehouse, archive):
+        assert warehouse.get_fact_table("0000019617") is not None
+        warehouse.ingest(archive, ciks=["320193"])
+        assert warehouse.get_fact_table("0000019617") is None
+        assert warehouse.get_fact_table("0000320193") is not None
+        assert not os.path.exists(warehouse.root + ".staging")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,80 @@
+"""
+Field Mapper Tests
+==================
+Tests for utils/field_mapper.py (alias resolution and compiled schema resolvers)
+
+Run with: pytest tests/test_field_mapper.py -v
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import utils.field_mapper as field_mapper
+from utils.field_mapper import get_field, get_any_of, get_resolver, clear_resolver_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_resolvers():
+    clear_resolver_cache()
+    yield
+    clear_resolver_cache()
+
+
+class TestGetField:
+
+    def test_alias_and_normalized_lookups(self):
+        data = {"pe_trailing": 25.5, "ROE": 0.15, "Total_Revenue": 1e9}
+        assert get_field(data, "pe_ratio") == 25.5
+        assert get_field(data, "return_on_equity") == 0.15
+        assert get_field(data, "Total Revenue") == 1e9
+        assert get_field(data, "xyz_unknown", default="N/A") == "N/A"
+
+    def test_invalid_values_skipped(self):
+        data = {"trailingPE": "N/A", "pe_trailing": 25.5}
+        assert get_field(data, "trailingPE") == 25.5
+        assert get_field({"trailingPE": None}, "pe_ratio") is None
+
+    def test_same_keys_new_values(self):
+        assert get_field({"ROE": 0.15, "x": 1}, "return_on_equity") == 0.15
+        assert get_field({"ROE": float("nan"), "x": 1}, "return_on_equity") is None
+        assert get_any_of({"ROE": None, "x": 2}, "return_on_equity", "x") == 2
+
+
+class TestSchemaResolver:
+
+    def test_compiled_once_per_schema(self, monkeypatch):
+        first = {"ROE": 0.15, "Total_Revenue": 1e9}
+        get_field(first, "missing_field")
+        calls = []
+        original = field_mapper._normalize_key
+        monkeypatch.setattr(field_mapper, "_normalize_key", lambda key: calls.append(key) or original(key))
+
+        second = {"ROE": 0.2, "Total_Revenue": 2e9}      # Same schema, new dict
+        for _ in range(100):
+            assert get_field(second, "missing_field") is None
+        assert get_field(second, "Total Revenue") == 2e9
+        assert calls == ["Total Revenue"]                 # only the first-seen name was compiled
+        assert get_resolver(second) is get_resolver(first)
+
+    def test_alias_hit_skips_resolver(self, monkeypatch):
+        data = {f"key_{i}": i for i in range(300)}
+        data["totalRevenue"] = 1e9
+        calls = []
+        original = field_mapper.get_resolver
+        monkeypatch.setattr(field_mapper, "get_resolver", lambda d: calls.append(1) or original(d))
+        for _ in range(10):
+            assert get_field(data, "revenue") == 1e9
+        assert calls == []
+        assert get_field(data, "missing_field") is None and calls == [1]
+
+    def test_absent_marker(self):
+        resolver = get_resolver({"ROE": 0.15})
+        assert resolver.candidates("missing_field") == ()
+        assert resolver.canonical["return_on_equity"] == ("ROE",)
+        assert resolver.canonical["pe_ratio"] == ()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+Financials Panel Tests
+======================
+Tests for utils/financials_panel.py (canonical field x period matrix)
+
+Run with: pytest tests/test_financials_panel.py -v
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.financials_panel import CANONICAL_IDS, FinancialsPanel, get_panel
+from utils.cache_codec import get_codec
+from forensic_shield import ForensicShield
+from search_utils import build_search_index
+
+YEARS = pd.to_datetime(["2023-09-30", "2022-09-30"])
+
+
+def _yfinance():
+    return {
+        "income_statement": pd.DataFrame([[383.3e9, 394.3e9], [97.0e9, 99.8e9], [114.3e9, 119.4e9]],
+                                         index=["Total Revenue", "Net Income", "Operating Income"],
+                                         columns=YEARS),
+        "balance_sheet": pd.DataFrame([[352.6e9, 352.8e9], [np.nan, -3.1e9]],
+                                      index=["Total Assets", "Retained Earnings"], columns=YEARS),
+        "cash_flow": pd.DataFrame([[110.5e9, 122.2e9], [-11.0e9, -10.7e9]],
+                                  index=["Operating Cash Flow", "Capital Expenditure"], columns=YEARS),
+    }
+
+
+def _sec():
+    years = pd.Index([2023, 2022], name="Year")
+    return {
+        "income_statement": pd.DataFrame({"Revenue": [383.3e9, 394.3e9], "Net Income": [97.0e9, 99.8e9],
+                                          "Operating Income": [114.3e9, 119.4e9]}, index=years),
+        "balance_sheet": pd.DataFrame({"Total Assets": [352.6e9, 352.8e9],
+                                       "Retained Earnings": [np.nan, -3.1e9]}, index=years),
+        "cash_flow": pd.DataFrame({"Operating Cash Flow": [110.5e9, 122.2e9],
+                                   "Capital Expenditure": [-11.0e9, -10.7e9]}, index=years),
+    }
+
+
+class TestFinancialsPanel:
+
+    def test_orientations_agree(self):
+        yf, sec = FinancialsPanel.from_financials(_yfinance()), FinancialsPanel.from_financials(_sec())
+        for field in ["revenue", "net_income", "total_assets", "operating_cash_flow", "capital_expenditures"]:
+            assert yf.get(field) == sec.get(field)
+            assert yf.get(field, period=1) == sec.get(field, period=1)
+        assert list(sec.periods) == [2023, 2022]
+        assert yf.fields[:len(CANONICAL_IDS)] == sec.fields[:len(CANONICAL_IDS)] == CANONICAL_IDS
+
+    def test_label_lookups(self):
+        panel = FinancialsPanel.from_financials(_sec())
+        assert panel.get("Total Revenue") == panel.get("revenue") == 383.3e9     # alias of a canonical row
+        assert panel.get("Net_Income") == 97.0e9                                 # normalized label
+        assert panel.first(["EBITDA", "Operating Income"], statement="income_statement") == 114.3e9
+        assert panel.first(["Total Assets"], statement="cash_flow") is None
+        assert "ebitda" not in panel                                             # canonical but not reported
+
+    def test_periods_and_missing_values(self):
+        panel = FinancialsPanel.from_financials(_yfinance())
+        assert panel.get("retained_earnings", default=0) == 0                    # NaN -> default
+        assert panel.get("total_assets", period=5) is None
+        assert panel.get("total_assets", period=5, clamp=True) == 352.8e9
+        assert list(panel.series("revenue")) == [383.3e9, 394.3e9]
+
+    def test_misaligned_statement_periods(self):
+        # Income statement through September, balance sheet through December
+        financials = _yfinance()
+        financials["balance_sheet"].columns = pd.to_datetime(["2024-12-31", "2023-12-31"])
+        panel = FinancialsPanel.from_financials(financials)
+        assert len(panel.periods) == 4
+        assert panel.get("revenue") == 383.3e9 and panel.get("revenue", period=1) == 394.3e9
+        assert panel.get("total_assets") == 352.6e9
+        assert panel.get("revenue", period=2) is None
+        assert panel.first(["Total Revenue"], period=2, clamp=True) == 394.3e9
+        restored = FinancialsPanel.from_dict(panel.to_dict())
+        assert restored.get("revenue") == 383.3e9
+        legacy = panel.to_dict()
+        del legacy["statement_columns"]                                           # cached before the field existed
+        assert FinancialsPanel.from_dict(legacy).get("revenue", period=1) == 394.3e9
+
+    def test_codec_round_trip(self):
+        panel = FinancialsPanel.from_financials(_yfinance())
+        decoded = get_codec().decode(get_codec().encode({"panel": panel}))["panel"]
+        assert decoded.fields == panel.fields and decoded.labels == panel.labels
+        np.testing.assert_array_equal(decoded.values, panel.values)
+
+    def test_get_panel_memoized(self):
+        financials = _sec()
+        panel = get_panel(financials)
+        assert get_panel(financials) is panel is financials["panel"]
+        assert get_panel({"income_statement": pd.DataFrame()}) is None
+
+
+class TestConsumers:
+
+    def test_forensic_reads_sec_layout(self):
+        shield = ForensicShield(_sec())
+        assert shield._get_metric("income_statement", ["Total Revenue", "Revenue"], 1) == 394.3e9
+        assert shield._get_metric("income_statement", ["Revenue"], 2) is None
+
+    def test_search_index_uses_metric_labels(self):
+        metrics = {item["metric"]: item["value"] for item in build_search_index(_sec())}
+        assert metrics["Revenue"] == 383.3e9
+        assert metrics["Retained Earnings"] == -3.1e9                            # latest reported value
+        assert 2023 not in metrics and "2023" not in metrics
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,197 @@
+"""
+Fundamentals Cube Tests
+=======================
+Tests for data_sources/fundamentals_cube.py and its consumers (extraction stubbed - no network)
+
+Run with: pytest tests/test_fundamentals_cube.py -v
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from data_sources.fundamentals_cube import (
+    CUBE_ENV_VAR, MANIFEST_FILE, METRICS, FundamentalsCube, build_cube, get_fundamentals_cube,
+)
+from data_sources.sector_benchmarks import get_sp500_standing
+from investment_summary import InvestmentSummaryGenerator
+import peer_comparison
+from peer_comparison import SOURCE_CUBE, SOURCE_YAHOO, get_sp500_context
+from utils.cache_warmer import CacheWarmer, DemandTracker
+
+SECTORS = {"AAA": "Technology", "BBB": "Technology", "CCC": "Technology", "DDD": "Technology",
+           "EEE": "Energy"}
+
+
+def _financials(revenue, net_income, equity):
+    years = pd.Index([2023, 2022, 2021], name="Year")
+    income = pd.DataFrame({"Revenue": revenue, "Net Income": net_income}, index=years)
+    balance = pd.DataFrame({"Total Equity": equity, "Total Liabilities": [e / 2 for e in equity],
+                            "Total Debt": [e / 4 for e in equity]}, index=years)
+    return {"income_statement": income, "balance_sheet": balance,
+            "market_data": {"current_price": 10.0, "shares_outstanding": 10.0, "market_cap": 100.0}}
+
+
+UNIVERSE = {
+    "AAA": _financials([100.0, 80.0, 70.0], [10.0, 8.0, 7.0], [50.0, 50.0, 50.0]),
+    "BBB": _financials([200.0, 100.0, 90.0], [40.0, 20.0, 9.0], [100.0, 100.0, 100.0]),
+    "CCC": _financials([50.0, 50.0, 40.0], [5.0, 5.0, 4.0], [100.0, 90.0, 80.0]),
+    "DDD": _financials([10.0, 10.0, 10.0], [4.0, 1.0, 1.0], [10.0, 10.0, 10.0]),
+    "EEE": _financials([30.0, 20.0, 10.0], [3.0, 2.0, 1.0], [10.0, 10.0, 10.0]),
+    "ZZZ": {"status": "error", "message": "No data"},
+}
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    path = str(tmp_path / "cube")
+    monkeypatch.setenv(CUBE_ENV_VAR, path)
+    return path
+
+
+@pytest.fixture
+def cube(root):
+    return build_cube(list(UNIVERSE), extract=UNIVERSE.get, sectors=SECTORS)
+
+
+class TestBuild:
+
+    def test_layout(self, cube):
+        assert cube.tickers == ["AAA", "BBB", "CCC", "DDD", "EEE"] and "ZZZ" not in cube
+        assert cube.values.shape[0] == len(METRICS) and cube.values.shape[2] == 5
+        assert cube.metric("revenue").tolist() == [100.0, 200.0, 50.0, 10.0, 30.0]
+        assert cube.metric("ROE", period=1)["BBB"] == pytest.approx(0.2)
+        assert cube.metric("Revenue_Growth")["AAA"] == pytest.approx(0.25)
+        assert np.isnan(cube.metric("Revenue_Growth", period=1)).all()     # latest period only
+        assert cube.period_years[:3, 0].tolist() == [2023.0, 2022.0, 2021.0]
+
+    def test_misaligned_statements_share_positions(self, root):
+        income = pd.DataFrame([[100.0, 90.0], [20.0, 18.0]], index=["Total Revenue", "Net Income"],
+                              columns=pd.to_datetime(["2024-09-30", "2023-09-30"]))
+        balance = pd.DataFrame([[200.0, 180.0]], index=["Stockholders Equity"],
+                               columns=pd.to_datetime(["2024-12-31", "2023-12-31"]))
+        cube = build_cube(["FYE"], extract=lambda t: {"income_statement": income, "balance_sheet": balance},
+                          sectors={}, save=False)
+        assert cube.metric("revenue")["FYE"] == 100.0 and cube.metric("total_equity")["FYE"] == 200.0
+        assert cube.metric("ROE")["FYE"] == pytest.approx(0.1)
+
+    def test_nothing_to_build(self, root):
+        assert build_cube(["ZZZ"], extract=UNIVERSE.get, sectors=SECTORS) is None
+        assert not os.path.exists(root)
+
+
+class TestStatistics:
+
+    def test_percentiles(self, cube):
+        assert cube.metric("revenue", stat="percentile").tolist() == [80.0, 100.0, 60.0, 20.0, 40.0]
+        # Sector ranks among the four Technology tickers; Energy has too few
+        assert cube.metric("revenue", stat="sector_percentile").tolist()[:4] == [75.0, 100.0, 50.0, 25.0]
+        assert np.isnan(cube.metric("revenue", stat="sector_percentile")["EEE"])
+
+    def test_zscores_and_medians(self, cube):
+        tech = np.array([100.0, 200.0, 50.0, 10.0])
+        expected = (tech - tech.mean()) / tech.std(ddof=1)
+        assert cube.metric("revenue", stat="zscore").tolist()[:4] == pytest.approx(expected.tolist())
+        assert cube.sector_median("Information Technology", "revenue") == 75.0
+        assert cube.sector_median("Energy", "revenue") is None
+        profile = cube.profile("aaa")
+        assert profile.loc["revenue", "Sector_Median"] == 75.0 and profile.loc["revenue", "Percentile"] == 80.0
+
+    def test_peers(self, cube):
+        table = cube.peers(["BBB", "XYZ", "aaa"], ["revenue", "ROE"])
+        assert list(table.index) == ["BBB", "AAA"]
+        assert table.loc["AAA", "ROE"] == pytest.approx(0.2)
+
+
+class TestStorage:
+
+    def test_load_memory_mapped(self, cube, root):
+        loaded = FundamentalsCube.load(root)
+        assert isinstance(loaded.values, np.memmap)
+        assert loaded.tickers == cube.tickers and loaded.sector_names == cube.sector_names
+        np.testing.assert_array_equal(loaded.zscore, cube.zscore)
+        assert loaded.sector_median("Technology", "revenue") == 75.0
+
+    def test_singleton_reloads_after_rebuild(self, root):
+        assert get_fundamentals_cube() is None
+        build_cube(["AAA", "BBB"], extract=UNIVERSE.get, sectors=SECTORS)
+        first = get_fundamentals_cube()
+        assert len(first) == 2 and get_fundamentals_cube() is first
+        build_cube(list(UNIVERSE), extract=UNIVERSE.get, sectors=SECTORS)
+        os.utime(os.path.join(root, MANIFEST_FILE), (0, 12345))
+        assert len(get_fundamentals_cube()) == 5
+
+
+class TestConsumers:
+
+    def test_investment_summary_sector_medians(self, cube):
+        financials = {"ticker": "AAA", "ratios": pd.DataFrame({"Value": [30.0]}, index=["PE_Ratio"])}
+        peer = InvestmentSummaryGenerator(financials).generate_peer_comparison()
+        assert peer["sector_source"] == "sp500_sector_median" and peer["sector_name"] == "Technology"
+        assert peer["sector"]["PE"] == cube.sector_median("Technology", "PE_Ratio")
+        assert peer["premium"]["PE"] == pytest.approx((30.0 / peer["sector"]["PE"] - 1) * 100)
+
+    def test_investment_summary_debt_to_equity_definitions(self, cube):
+        # Yahoo's D/E is debt-based; the statement fallback is liabilities-based
+        market = pd.DataFrame({"Value": [0.3, "market"]}, index=["Debt_to_Equity", "Debt_to_Equity_Source"])
+        peer = InvestmentSummaryGenerator({"ticker": "AAA", "ratios": market}).generate_peer_comparison()
+        assert peer["sector"]["DE"] == pytest.approx(0.25)
+        calculated = pd.DataFrame({"Value": [0.6, "calculated"]}, index=["Debt_to_Equity", "Debt_to_Equity_Source"])
+        peer = InvestmentSummaryGenerator({"ticker": "AAA", "ratios": calculated}).generate_peer_comparison()
+        assert peer["sector"]["DE"] == pytest.approx(0.5)
+
+    def test_investment_summary_fallback(self, root):
+        peer = InvestmentSummaryGenerator({"ticker": "AAA"}).generate_peer_comparison()
+        assert peer["sector_source"] == "market_average" and peer["sector"]["PE"] == 20.0
+
+    def test_standing_is_direction_aware(self, cube):
+        standing = get_sp500_standing("BBB")
+        assert standing["roe"]["percentile"] == cube.metric("ROE", stat="percentile")["BBB"]
+        assert standing["pe_ratio"]["percentile"] == 100 - cube.metric("PE_Ratio", stat="percentile")["BBB"]
+        assert standing["debt_equity"]["value"] == pytest.approx(0.25)            # total debt / equity
+        assert get_sp500_standing("XYZ") == {}
+
+    def test_peer_context(self, cube):
+        values, percentiles = get_sp500_context(["AAA", "EEE"])
+        assert values.loc["EEE", "Total Revenue"] == 30.0
+        assert percentiles.loc["AAA", "Total Revenue"] == 80.0
+
+    def test_peer_table_sources(self, cube, monkeypatch):
+        infos = {"AAA": {"longName": "Aaa", "trailingPE": 25.0, "profitMargins": 0.5, "forwardPE": 20.0},
+                 "XYZ": {"longName": "Xyz", "trailingPE": 15.0, "profitMargins": 0.3}}
+        monkeypatch.setattr(peer_comparison, "get_ticker_info_many", lambda tickers: infos)
+        result = peer_comparison.get_peer_comparison_data.__wrapped__("AAA", ["XYZ"])
+        rows = result["data"].set_index("Ticker")
+        assert rows.loc["AAA", "Data Source"] == SOURCE_CUBE and rows.loc["XYZ", "Data Source"] == SOURCE_YAHOO
+        assert rows.loc["AAA", "Net Margin"] == pytest.approx(0.1)                 # annual filing, not TTM
+        assert rows.loc["AAA", "P/E (TTM)"] == 25.0 and rows.loc["AAA", "Forward P/E"] == 20.0
+        assert rows.loc["XYZ", "Net Margin"] == 0.3
+        assert "Data Source" not in peer_comparison.calculate_statistics(result["data"])
+
+    def test_warmer_builds_once_per_cycle(self, root, tmp_path, monkeypatch):
+        monkeypatch.setattr(CacheWarmer, "_warm_info", lambda self, tickers: None)
+        warmer = CacheWarmer(universe=["AAA", "BBB", "ZZZ"], watchlist=[],
+                             state_path=str(tmp_path / "state.json"),
+                             demand=DemandTracker(path=str(tmp_path / "demand.json")),
+                             extract=UNIVERSE.get, analyses=[], rate_per_minute=60_000, cube_root=root)
+        assert "cube" not in warmer.run(max_tickers=1, force=True)       # cycle not finished
+        warmer.run(force=True)
+        assert warmer.run(force=True)["cube"] == 2                      # ZZZ failed twice, skipped
+        assert warmer.run(force=True)["cube"] is None                   # already built this cycle
+        assert FundamentalsCube.load(root).tickers == ["AAA", "BBB"]
+
+    def test_warmer_cube_excludes_watchlist(self, root, tmp_path, monkeypatch):
+        monkeypatch.setattr(CacheWarmer, "_warm_info", lambda self, tickers: None)
+        warmer = CacheWarmer(universe=["AAA", "BBB"], watchlist=["EEE"],
+                             state_path=str(tmp_path / "state.json"),
+                             demand=DemandTracker(path=str(tmp_path / "demand.json")),
+                             extract=UNIVERSE.get, analyses=[], rate_per_minute=60_000, cube_root=root)
+        assert warmer.run(force=True)["cube"] == 2
+        assert "EEE" in warmer.state["done"] and "EEE" not in FundamentalsCube.load(root)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
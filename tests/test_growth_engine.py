@@ -0,0 +1,101 @@
+"""
+Growth Engine Tests
+===================
+Tests for calculations/growth_engine.py and calculate_growth_rates built on it
+
+Run with: pytest tests/test_growth_engine.py -v
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from calculations.growth_engine import compute_growth, compute_growth_batch, get_growth_frame, period_years
+from utils.financials_panel import FinancialsPanel
+from usa_backend import USAFinancialExtractor
+
+
+def _sec(revenue, net_income, years):
+    index = pd.Index(years, name="Year")
+    return {"income_statement": pd.DataFrame({"Revenue": revenue, "Net Income": net_income}, index=index)}
+
+
+def _annual():
+    # 2019 missing; net income dips negative in 2022
+    return _sec([200.0, 180.0, 150.0, 120.0, 100.0, 90.0], [10.0, -5.0, 8.0, 6.0, 5.0, 4.0],
+                [2023, 2022, 2021, 2020, 2018, 2017])
+
+
+class TestGrowthEngine:
+
+    def test_windows_and_full_span(self):
+        frame = compute_growth(FinancialsPanel.from_financials(_annual()))
+        revenue = frame.loc["revenue"]
+        assert revenue["YoY"] == pytest.approx(100 / 9)
+        assert revenue["CAGR_3Y"] == pytest.approx(((200 / 120) ** (1 / 3) - 1) * 100)
+        assert revenue["CAGR"] == pytest.approx(((200 / 90) ** (1 / 6) - 1) * 100)   # 6 years, not 5 periods
+        assert revenue["Gap"] == 1 and np.isnan(revenue["CAGR_10Y"])
+
+    def test_masks(self):
+        frame = compute_growth(FinancialsPanel.from_financials(_annual()))
+        assert np.isnan(frame.loc["net_income", "YoY"])                  # negative base
+        assert np.isnan(frame.loc["revenue", "QoQ"])                     # annual data
+        gap = compute_growth(FinancialsPanel.from_financials(_sec([3.0, 2.0], [1.0, 1.0], [2023, 2021])))
+        assert np.isnan(gap.loc["revenue", "YoY"])                       # no 2022 to compare with
+        flipped = compute_growth(FinancialsPanel.from_financials(_sec([3.0, 2.0], [-1.0, 1.0], [2023, 2022])))
+        assert flipped.loc["net_income", "Sign_Change"] == 1 and np.isnan(flipped.loc["net_income", "CAGR"])
+
+    def test_quarterly_dates(self):
+        quarters = pd.to_datetime(["2024-03-31", "2023-12-31", "2023-09-30", "2023-06-30", "2023-03-31"])
+        income = pd.DataFrame([[110.0, 105.0, 102.0, 101.0, 100.0]], index=["Total Revenue"], columns=quarters)
+        frame = compute_growth(FinancialsPanel.from_financials({"income_statement": income}))
+        assert frame.loc["revenue", "QoQ"] == pytest.approx(110 / 105 * 100 - 100)
+        assert frame.loc["revenue", "YoY"] == pytest.approx(10.0)
+        assert frame.loc["revenue", "Gap"] == 0
+
+    def test_batch_matches_single(self):
+        panels = {"AAA": FinancialsPanel.from_financials(_annual()),
+                  "BBB": FinancialsPanel.from_financials(_sec([3.0, 2.0], [1.0, 1.0], [2023, 2022]))}
+        batch = compute_growth_batch(panels, fields=["revenue", "net_income"])
+        assert list(batch.index.get_level_values("ticker").unique()) == ["AAA", "BBB"]
+        for ticker, panel in panels.items():
+            single = compute_growth(panel).loc[["revenue", "net_income"]]
+            pd.testing.assert_frame_equal(batch.loc[ticker], single, check_names=False)
+
+    def test_period_years(self):
+        assert period_years([2023, 2022]).tolist() == [2023.0, 2022.0]
+        assert period_years(pd.to_datetime(["2023-01-01"]))[0] == 2023.0
+
+    def test_memoized_on_result(self):
+        financials = _annual()
+        assert get_growth_frame(financials) is get_growth_frame(financials) is financials["growth_frame"]
+
+
+class TestCalculateGrowthRates:
+
+    def test_legacy_keys(self):
+        growth = USAFinancialExtractor().calculate_growth_rates(_annual())
+        assert growth["Total_Revenue_Latest_Value"] == 200.0
+        assert growth["Total_Revenue_Oldest_Value"] == 90.0
+        assert growth["Total_Revenue_Dollar_Change"] == 110.0
+        assert growth["Total_Revenue_CAGR_5Y"] == round(((200 / 100) ** (1 / 5) - 1) * 100, 2)
+        assert "Total_Revenue_QoQ" not in growth and "Net_Income_CAGR" in growth
+
+    def test_nopat(self):
+        financials = _annual()
+        financials["income_statement"]["Operating Income"] = [40.0, 30.0, 25.0, 20.0, 18.0, 16.0]
+        growth = USAFinancialExtractor().calculate_growth_rates(financials)
+        assert growth["NOPAT_Effective_Tax_Rate"] == 21.0
+        assert growth["NOPAT_Latest_Value"] == pytest.approx(40.0 * 0.79)
+        assert growth["NOPAT_CAGR"] == growth["Operating_Profit_CAGR"]
+
+    def test_no_statements(self):
+        growth = USAFinancialExtractor().calculate_growth_rates({"income_statement": pd.DataFrame()})
+        assert growth["status"] == "error"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
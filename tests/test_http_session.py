@@ -0,0 +1,109 @@
+"""
+HTTP Session Registry Tests
+===========================
+Tests for utils/http_session.py against a local HTTP/1.1 server (no internet).
+
+Run with: pytest tests/test_http_session.py -v
+"""
+
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils.http_session import SessionRegistry, DEFAULT_TIMEOUT
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # Keep-alive
+
+    def do_GET(self):
+        body = json.dumps({
+            "path": self.path,
+            "accept_encoding": self.headers.get("Accept-Encoding"),
+            "client_port": self.client_address[1],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestSessionRegistry:
+
+    def test_connection_reused(self, server):
+        registry = SessionRegistry()
+        ports = {registry.get(f"{server}/item/{i}").json()["client_port"] for i in range(5)}
+        assert len(ports) == 1
+        assert registry.stats()[server] == {"requests": 5, "connections_opened": 1}
+        registry.close()
+
+    def test_one_session_per_host(self, server):
+        registry = SessionRegistry()
+        assert registry.session_for(f"{server}/a") is registry.session_for(f"{server}/b?x=1")
+        assert registry.session_for("https://data.sec.gov/x") is not registry.session_for(server)
+        registry.close()
+
+    def test_gzip_and_params(self, server):
+        registry = SessionRegistry()
+        data = registry.get(f"{server}/obs", params={"series_id": "DGS10"}).json()
+        assert data["path"] == "/obs?series_id=DGS10"
+        assert "gzip" in data["accept_encoding"]
+        registry.close()
+
+    def test_default_timeout_applied(self, monkeypatch):
+        registry = SessionRegistry()
+        seen = {}
+
+        def fake_request(method, url, timeout=None, **kwargs):
+            seen["timeout"] = timeout
+
+        session = registry.session_for("https://api.stlouisfed.org/fred")
+        monkeypatch.setattr(session, "request", fake_request)
+        registry.get("https://api.stlouisfed.org/fred/series")
+        assert seen["timeout"] == DEFAULT_TIMEOUT
+        registry.get("https://api.stlouisfed.org/fred/series", timeout=3)
+        assert seen["timeout"] == 3
+
+    def test_concurrent_requests_pooled(self, server):
+        registry = SessionRegistry(pool_maxsize=4)
+        errors = []
+
+        def worker():
+            try:
+                for i in range(5):
+                    registry.get(f"{server}/t/{i}").raise_for_status()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors
+        stats = registry.stats()[server]
+        assert stats["requests"] == 20
+        assert stats["connections_opened"] <= 4
+        registry.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+"""
+Rate Limiter Tests
+==================
+Tests for utils/rate_limiter.py
+
+Run with: pytest tests/test_rate_limiter.py -v
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils.rate_limiter import TokenBucket, FCNTL_AVAILABLE, parse_retry_after
+
+
+def _max_in_window(timestamps, window=1.0):
+    timestamps = sorted(timestamps)
+    best, start = 0, 0
+    for end in range(len(timestamps)):
+        while timestamps[end] - timestamps[start] >= window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+class TestTokenBucket:
+
+    def test_burst_is_free(self):
+        bucket = TokenBucket(rate=5, capacity=3)
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.stats()["delayed"] == 0
+
+    def test_sustained_rate(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        t0 = time.time()
+        for _ in range(11):
+            bucket.acquire()
+        # First token is free, the next 10 take 10 / 20 s
+        assert 0.45 <= time.time() - t0 < 0.8
+
+    def test_threads_share_budget(self):
+        bucket = TokenBucket(rate=40, capacity=2)
+        stamps, guard = [], threading.Lock()
+
+        def worker():
+            for _ in range(10):
+                bucket.acquire()
+                with guard:
+                    stamps.append(time.time())
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(stamps) == 60
+        # capacity + rate bounds any 1-second window (small slack for timer jitter)
+        assert _max_in_window(stamps) <= 42 + 1
+
+    def test_penalize_pauses(self):
+        bucket = TokenBucket(rate=100, capacity=5)
+        bucket.penalize(0.2)
+        assert bucket.acquire() >= 0.15
+        assert bucket.stats()["penalties"] == 1
+
+    def test_stats(self):
+        bucket = TokenBucket(rate=50, capacity=1, name="test")
+        for _ in range(5):
+            bucket.acquire()
+        stats = bucket.stats()
+        assert stats["name"] == "test"
+        assert stats["acquired"] == 5
+        assert stats["delayed"] == 4
+        assert stats["max_wait_seconds"] > 0
+        assert stats["avg_wait_ms"] > 0
+
+    @pytest.mark.skipif(not FCNTL_AVAILABLE, reason="cross-process mode needs fcntl")
+    def test_shared_state_file(self, tmp_path):
+        # Two buckets on one state file behave like two processes sharing a budget
+        path = str(tmp_path / "sec.rate")
+        a = TokenBucket(rate=20, capacity=1, state_path=path)
+        b = TokenBucket(rate=20, capacity=1, state_path=path)
+        t0 = time.time()
+        for _ in range(5):
+            a.acquire()
+            b.acquire()
+        assert time.time() - t0 >= 9 / 20 - 0.05
+        assert a.stats()["shared"]
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) == 1.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", default=2.0) == 2.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""
+Ratio Engine Tests
+==================
+Tests for calculations/ratio_engine.py and the calculate_ratios slices built on it
+
+Run with: pytest tests/test_ratio_engine.py -v
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from calculations.ratio_engine import RATIO_ROWS, STATEMENT_INPUTS, compute_ratio_frame, get_ratio_frame
+from utils.financials_panel import FinancialsPanel
+from usa_backend import USAFinancialExtractor
+
+YEARS = pd.to_datetime(["2023-12-31", "2022-12-31", "2021-12-31"])
+
+
+def _financials():
+    income = pd.DataFrame([[1000.0, 800.0, 600.0], [400.0, 300.0, 200.0],
+                           [200.0, 120.0, -50.0], [150.0, 90.0, -80.0]],
+                          index=["Total Revenue", "Gross Profit", "Operating Income", "Net Income"],
+                          columns=YEARS)
+    balance = pd.DataFrame([[2000.0, 1800.0, 1500.0], [800.0, 600.0, -100.0], [1200.0, 1200.0, 1600.0],
+                            [300.0, 300.0, 300.0], [100.0, 50.0, 20.0]],
+                           index=["Total Assets", "Stockholders Equity", "Total Liabilities",
+                                  "Total Debt", "Cash And Cash Equivalents"],
+                           columns=YEARS)
+    cashflow = pd.DataFrame([[250.0, 150.0, -40.0], [-50.0, -40.0, -30.0]],
+                            index=["Operating Cash Flow", "Capital Expenditure"], columns=YEARS)
+    return {"income_statement": income, "balance_sheet": balance, "cash_flow": cashflow,
+            "market_data": {"current_price": 30.0, "market_cap": 3000.0, "shares_outstanding": 100.0},
+            "info": {}}
+
+
+class TestRatioFrame:
+
+    def test_shape_and_values(self):
+        frame = get_ratio_frame(_financials())
+        assert list(frame.index) == list(RATIO_ROWS) + list(STATEMENT_INPUTS)
+        assert list(frame.columns) == list(YEARS)
+        assert frame.loc["Gross_Margin"].tolist() == pytest.approx([0.4, 0.375, 200 / 600])
+        assert frame.loc["ROE"].iloc[0] == pytest.approx(150 / 800)
+        assert frame.loc["Free_Cash_Flow"].tolist() == [200.0, 110.0, -70.0]
+        assert frame.loc["PE_Ratio"].iloc[0] == pytest.approx(30.0 / 1.5)
+        assert frame.loc["EV_to_Sales"].iloc[0] == pytest.approx((3000 + 300 - 100) / 1000)
+
+    def test_disqualified_inputs_are_nan(self):
+        frame = get_ratio_frame(_financials())
+        oldest = frame.iloc[:, 2]                       # loss year with negative equity
+        assert np.isnan(oldest["Operating_Margin"]) and np.isnan(oldest["ROE"])
+        assert np.isnan(oldest["Price_to_Book"]) and np.isnan(oldest["EV_to_EBIT"])
+
+    def test_no_market_data(self):
+        panel = FinancialsPanel.from_financials(_financials())
+        frame = compute_ratio_frame(panel)
+        assert frame.loc["PE_Ratio"].isna().all() and frame.loc["EV_to_Sales"].isna().all()
+        assert not frame.loc["Net_Margin"].isna().all()
+
+    def test_memoized_on_result(self):
+        financials = _financials()
+        assert get_ratio_frame(financials) is get_ratio_frame(financials) is financials["ratio_frame"]
+        assert get_ratio_frame({"income_statement": pd.DataFrame()}) is None
+
+    def test_recomputed_when_market_data_changes(self):
+        financials = _financials()
+        stale = get_ratio_frame(financials)
+        financials["market_data"] = {"current_price": 60.0, "market_cap": 6000.0, "shares_outstanding": 100.0}
+        fresh = get_ratio_frame(financials)
+        assert fresh is not stale and fresh.loc["PE_Ratio"].iloc[0] == pytest.approx(60.0 / 1.5)
+        assert get_ratio_frame(financials) is fresh
+
+
+class TestCalculateRatios:
+
+    @pytest.fixture
+    def extractor(self):
+        return USAFinancialExtractor()
+
+    def test_offsets_slice_one_frame(self, extractor, monkeypatch):
+        financials = _financials()
+        calls = []
+        import calculations.ratio_engine as ratio_engine
+        original = ratio_engine.compute_ratio_frame
+        monkeypatch.setattr(ratio_engine, "compute_ratio_frame",
+                            lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs))
+
+        by_year = [extractor.calculate_ratios(financials, fiscal_year_offset=k) for k in range(4)]
+        assert len(calls) == 1
+        assert by_year[1]["Net_Margin"] == pytest.approx(90 / 800)
+        assert by_year[1]["_components"]["revenue"] == 800.0
+        assert by_year[3]["Revenue"] == by_year[2]["Revenue"] == 600.0      # clamped to the oldest year
+
+    def test_misaligned_statement_periods(self, extractor):
+        # Fiscal year ends in September, the latest balance sheet is a December quarter
+        income = pd.DataFrame([[1000.0, 900.0], [200.0, 150.0]], index=["Total Revenue", "Net Income"],
+                              columns=pd.to_datetime(["2024-09-30", "2023-09-30"]))
+        balance = pd.DataFrame([[5000.0, 4000.0, 3000.0], [2000.0, 1500.0, 1000.0]],
+                               index=["Total Assets", "Stockholders Equity"],
+                               columns=pd.to_datetime(["2024-12-31", "2023-12-31", "2022-12-31"]))
+        financials = {"income_statement": income, "balance_sheet": balance, "info": {}}
+        ratios = extractor.calculate_ratios(financials)
+        assert ratios["Net_Margin"] == pytest.approx(0.2)
+        assert ratios["ROE"] == pytest.approx(0.1) and ratios["ROA"] == pytest.approx(0.04)
+        oldest = extractor.calculate_ratios(financials, fiscal_year_offset=2)
+        assert oldest["Revenue"] == 900.0 and oldest["Total_Equity"] == 1000.0   # income clamped, balance not
+
+    def test_legacy_defaults_and_sources(self, extractor):
+        ratios = extractor.calculate_ratios(_financials(), fiscal_year_offset=2)
+        assert ratios["ROE"] == 0 and ratios["Operating_Margin"] == 0
+        assert "PE_Ratio" not in ratios and "Price_to_Book" not in ratios
+        latest = extractor.calculate_ratios(_financials())
+        assert latest["Debt_to_Equity_Source"] == "calculated"
+        assert latest["PE_Ratio_Source"] == "calculated_annual"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
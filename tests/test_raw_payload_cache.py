@@ -0,0 +1,176 @@
+"""
+Raw Payload Cache Tests
+=======================
+Tests for the per-ticker raw source layer under USAFinancialExtractor.extract_financials
+(upstream fetches are stubbed - no network).
+
+Run with: pytest tests/test_raw_payload_cache.py -v
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+import pytest
+import usa_backend
+from usa_backend import USAFinancialExtractor
+from data_sources.xbrl_facts import XBRLFactTable
+from utils.bounded_cache import BoundedTTLCache
+from utils.tiered_cache import TieredCache
+from utils.ttl_policy import TTLPolicy
+
+
+def _fact(val, fy, form, fp, filed):
+    return {"val": val, "fy": fy, "form": form, "fp": fp, "end": f"{fy}-09-30", "filed": filed,
+            "accn": f"0000320193-{fy % 100}-{form[-1]}{fp}"}
+
+
+COMPANYFACTS = {
+    "cik": 320193, "entityName": "Apple Inc.",
+    "facts": {"us-gaap": {
+        "Revenues": {"units": {"USD": [
+            _fact(365.8e9, 2021, "10-K", "FY", "2021-10-29"),
+            _fact(394.3e9, 2022, "10-K", "FY", "2022-10-28"),
+            _fact(97.3e9, 2023, "10-Q", "Q1", "2023-02-03"),
+        ]}},
+        "NetIncomeLoss": {"units": {"USD": [
+            _fact(94.7e9, 2021, "10-K", "FY", "2021-10-29"),
+            _fact(99.8e9, 2022, "10-K", "FY", "2022-10-28"),
+            _fact(30.0e9, 2023, "10-Q", "Q1", "2023-02-03"),
+        ]}},
+    }},
+}
+
+YEARS = pd.to_datetime(["2023-09-30", "2022-09-30", "2021-09-30"])
+YF_RAW = {
+    "income_statement": pd.DataFrame([[383.3e9, 394.3e9, 365.8e9], [97.0e9, 99.8e9, 94.7e9]],
+                                     index=["Total Revenue", "Net Income"], columns=YEARS),
+    "balance_sheet": pd.DataFrame([[352.6e9, 352.8e9, 351.0e9]], index=["Total Assets"], columns=YEARS),
+    "cash_flow": pd.DataFrame([[110.5e9, 122.2e9, 104.0e9]], index=["Operating Cash Flow"], columns=YEARS),
+    "historical_prices": pd.DataFrame({"Close": [150.0, 190.0]},
+                                      index=pd.to_datetime(["2023-01-03", "2023-12-29"])),
+    "info": {"longName": "Apple Inc.", "currentPrice": 190.0, "sharesOutstanding": 15.5e9},
+}
+
+
+class StubExtractor(USAFinancialExtractor):
+    """Upstream SEC / yfinance / quant fetches replaced by counted stubs."""
+
+    def __init__(self):
+        super().__init__()
+        self._cache = TieredCache(l1=BoundedTTLCache(sweep=False))     # no disk/Redis tiers
+        self._ttl_policy = TTLPolicy(base_ttls=self._cache_ttl, earnings_dates=lambda t: [])
+        self.fetches = []
+        self._guard = threading.Lock()
+
+    def _count(self, source):
+        with self._guard:
+            self.fetches.append(source)
+
+    def validate_ticker(self, ticker):
+        return True, "Apple Inc."
+
+    def get_cik_from_ticker(self, ticker):
+        return "0000320193"
+
+    def _fetch_sec_facts(self, cik):
+        self._count("sec")
+        facts = XBRLFactTable.from_companyfacts(COMPANYFACTS)
+        return {"cik": cik, "entity_name": facts.entity_name, "facts": facts.to_frame()}
+
+    def _fetch_yfinance_statements(self, ticker):
+        self._count("yfinance")
+        time.sleep(0.05)
+        return dict(YF_RAW)
+
+
+class StubQuant:
+    runs = 0
+
+    def analyze_stock(self, ticker):
+        StubQuant.runs += 1
+        return {"ticker": ticker, "alpha": 0.01}
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(usa_backend, "get_ticker_info", lambda ticker: dict(YF_RAW["info"]))
+    monkeypatch.setattr(usa_backend, "FMP_AVAILABLE", False)
+    monkeypatch.setattr(usa_backend, "ALPHAVANTAGE_AVAILABLE", False)
+    monkeypatch.setattr(usa_backend, "QUANT_ENGINE_AVAILABLE", True)
+    monkeypatch.setattr(usa_backend, "QuantEngine", StubQuant, raising=False)
+    StubQuant.runs = 0
+    return StubExtractor()
+
+
+class TestRawPayloadCache:
+
+    def test_view_options_reuse_raw_payloads(self, extractor):
+        annual = extractor.extract_financials("AAPL", filing_types=["10-K"])
+        assert sorted(extractor.fetches) == ["sec", "yfinance"]
+
+        both = extractor.extract_financials("AAPL", filing_types=["10-K", "10-Q"],
+                                            include_quant=True, fiscal_year_offset=1)
+        assert sorted(extractor.fetches) == ["sec", "yfinance"]      # no second download
+        assert StubQuant.runs == 1
+        assert 2023 not in annual["income_statement"].index
+        assert 2023 in both["income_statement"].index
+        assert both["quant_analysis"]["alpha"] == 0.01
+
+        extractor.extract_financials("AAPL", filing_types=["10-Q"], include_quant=True)
+        assert StubQuant.runs == 1
+
+    def test_use_cache_false_refetches(self, extractor):
+        extractor.extract_financials("AAPL")
+        extractor.extract_financials("AAPL", use_cache=False)
+        assert extractor.fetches.count("sec") == 2
+
+    def test_yfinance_offsets_share_one_fetch(self, extractor):
+        latest = extractor.extract_from_yfinance("AAPL", fiscal_year_offset=0)
+        previous = extractor.extract_from_yfinance("AAPL", fiscal_year_offset=1)
+        assert extractor.fetches == ["yfinance"]
+        assert latest["market_data"]["market_cap"] == previous["market_data"]["market_cap"] == 190.0 * 15.5e9
+
+    def test_concurrent_misses_share_one_fetch(self, extractor):
+        threads = [threading.Thread(target=extractor.extract_from_yfinance, args=("AAPL", offset))
+                   for offset in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert extractor.fetches == ["yfinance"]
+
+    def test_errors_not_cached(self, extractor, monkeypatch):
+        monkeypatch.setattr(extractor, "_fetch_yfinance_statements",
+                            lambda ticker: extractor._count("yfinance") or 1 / 0)
+        assert extractor.extract_from_yfinance("AAPL")["status"] == "error"
+        assert extractor.extract_from_yfinance("AAPL")["status"] == "error"
+        assert extractor.fetches == ["yfinance", "yfinance"]
+
+
+class TestAsOf:
+
+    def test_point_in_time_statements(self, extractor):
+        before = extractor.extract_financials("AAPL", filing_types=["10-K", "10-Q"], as_of="2022-06-30")
+        after = extractor.extract_financials("AAPL", filing_types=["10-K", "10-Q"], as_of="2023-02-03")
+        assert list(before["income_statement"].index) == [2021]
+        assert list(after["income_statement"].index) == [2023, 2022, 2021]
+        assert before["as_of"] == "2022-06-30"
+        assert "info" not in before and "quant_analysis" not in before     # no live data leaks in
+
+    def test_snapshots_share_one_table(self, extractor):
+        for day in pd.date_range("2021-01-01", "2023-06-30", freq="MS"):
+            extractor.extract_financials("AAPL", as_of=day)
+        assert extractor.fetches == ["sec"]
+        assert len(extractor._fact_tables) == 1
+
+    def test_bad_requests(self, extractor):
+        assert extractor.extract_financials("AAPL", as_of="not a date")["status"] == "error"
+        assert extractor.extract_financials("AAPL", source="yfinance", as_of="2022-01-01")["status"] == "error"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Revalidation Tests
+==================
+Tests for utils/revalidation.py and the stale-while-revalidate paths in
+ticker_cache and USAFinancialExtractor (no network)
+
+Run with: pytest tests/test_revalidation.py -v
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils import ticker_cache
+from utils.bounded_cache import BoundedTTLCache
+from utils.cache_client import CacheClient, cache_key
+from utils.revalidation import Revalidator, stale_window, STALE_WINDOWS
+from utils.tiered_cache import TieredCache
+
+
+def _wait_idle(revalidator, timeout=5.0):
+    deadline = time.time() + timeout
+    while revalidator.pending() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestRevalidator:
+
+    def test_one_refresh_per_key(self):
+        revalidator = Revalidator(max_workers=2)
+        release = threading.Event()
+        runs = []
+
+        def refresh():
+            runs.append(1)
+            release.wait(5)
+
+        assert revalidator.submit("AAPL", refresh)
+        assert not revalidator.submit("AAPL", refresh)
+        release.set()
+        _wait_idle(revalidator)
+        assert len(runs) == 1
+        stats = revalidator.stats()
+        assert stats["refreshed"] == 1 and stats["deduplicated"] == 1
+        # Done - the next expiry can schedule again
+        assert revalidator.submit("AAPL", lambda: None)
+
+    def test_failure_is_contained(self):
+        revalidator = Revalidator(max_workers=1)
+        revalidator.submit("X", lambda: 1 / 0)
+        _wait_idle(revalidator)
+        assert revalidator.stats()["failed"] == 1 and revalidator.pending() == 0
+
+    def test_window_override(self, monkeypatch):
+        monkeypatch.setenv("ATLAS_STALE_MARKET_DATA_SECONDS", "0")
+        assert stale_window("market_data") == 0
+        assert stale_window("unknown") == STALE_WINDOWS["default"]
+
+
+class TestStaleTickerInfo:
+
+    def test_stale_info_served_and_refreshed(self, monkeypatch):
+        client = CacheClient(connect=False)
+        revalidator = Revalidator(max_workers=1)
+        monkeypatch.setattr(ticker_cache, "get_cache_client", lambda: client)
+        monkeypatch.setattr(ticker_cache, "get_revalidator", lambda: revalidator)
+        monkeypatch.setattr(ticker_cache, "_fetch_info", lambda t: {"price": 2})
+        client.set(cache_key("info", "AAPL"), {"price": 1}, ttl=0.05, stale_ttl=60)
+        time.sleep(0.1)
+
+        assert ticker_cache.get_ticker_info("aapl") == {"price": 1}    # no wait on Yahoo
+        _wait_idle(revalidator)
+        assert ticker_cache.get_ticker_info("AAPL") == {"price": 2}
+        assert revalidator.stats()["refreshed"] == 1
+
+
+class TestStaleExtraction:
+
+    def test_stale_result_served_while_reextracting(self):
+        from usa_backend import USAFinancialExtractor
+
+        extractor = USAFinancialExtractor()
+        extractor._cache = TieredCache(l1=BoundedTTLCache(sweep=False))
+        key = extractor._extraction_cache_key("AAPL")
+        extractor._cache.set(key, {"ticker": "AAPL"}, ttl=0.05, stale_ttl=60, category="financials")
+        time.sleep(0.1)
+
+        refreshed = threading.Event()
+        assert extractor._cache_get(key, revalidate=refreshed.set, cache_type="financials") == {"ticker": "AAPL"}
+        assert refreshed.wait(5)
+        assert extractor._cache_get(key, cache_type="financials") is None    # plain reads ignore stale
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
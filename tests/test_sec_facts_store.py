@@ -0,0 +1,196 @@
+"""
+Companyfacts Store Tests
+========================
+Tests for data_sources/sec_facts_store.py (SEC responses are stubbed).
+
+Run with: pytest tests/test_sec_facts_store.py -v
+"""
+
+import sys
+import os
+import json
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import requests
+from data_sources.sec_facts_store import CompanyFactsStore
+
+
+CIK = "0000320193"
+PAYLOAD = {"cik": 320193, "entityName": "Apple Inc.", "facts": {"us-gaap": {}}}
+
+
+class _FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class FakeSEC:
+    """
+    Serves PAYLOAD with an ETag and honours If-None-Match.
+
+    The submissions index 404s unless `filings` is set to [(accession, form, date), ...],
+    newest first; its requests are recorded separately in `index_calls`.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.index_calls = []
+        self.etag = '"v1"'
+        self.filings = None
+        self.down = False
+
+    def __call__(self, url, headers=None, timeout=None):
+        if self.down:
+            raise requests.exceptions.ConnectionError("offline")
+        if "/submissions/" in url:
+            return self._submissions(headers or {})
+        self.calls.append(dict(headers or {}))
+        if headers and headers.get("If-None-Match") == self.etag:
+            return _FakeResponse(304)
+        body = json.dumps(PAYLOAD).encode()
+        return _FakeResponse(200, body, {"ETag": self.etag, "Last-Modified": "Mon, 01 Dec 2025 00:00:00 GMT"})
+
+    def _submissions(self, headers):
+        self.index_calls.append(dict(headers))
+        if self.filings is None:
+            return _FakeResponse(404)
+        etag = f'"idx{len(self.filings)}"'
+        if headers.get("If-None-Match") == etag:
+            return _FakeResponse(304)
+        accessions, forms, dates = zip(*self.filings) if self.filings else ((), (), ())
+        recent = {"accessionNumber": list(accessions), "form": list(forms), "filingDate": list(dates)}
+        return _FakeResponse(200, json.dumps({"filings": {"recent": recent}}).encode(), {"ETag": etag})
+
+
+FILINGS = [("0000320193-25-000079", "10-K", "2025-10-31"), ("0000320193-25-000073", "8-K", "2025-10-30")]
+
+
+@pytest.fixture
+def sec():
+    return FakeSEC()
+
+
+class TestCompanyFactsStore:
+
+    def test_first_call_downloads_and_compresses(self, tmp_path, sec):
+        store = CompanyFactsStore(cache_dir=str(tmp_path))
+        assert store.get_company_facts(CIK, sec) == PAYLOAD
+        assert (tmp_path / f"CIK{CIK}.json.gz").exists()
+        assert store.stats()["misses"] == 1
+
+    def test_fresh_copy_skips_network(self, tmp_path, sec):
+        store = CompanyFactsStore(cache_dir=str(tmp_path))
+        store.get_company_facts(CIK, sec)
+        store.get_company_facts(CIK, sec)
+        assert len(sec.calls) == 1
+        assert store.stats()["fresh_hits"] == 1
+
+    def test_conditional_get_304(self, tmp_path, sec):
+        store = CompanyFactsStore(cache_dir=str(tmp_path), max_age_seconds=0)
+        store.get_company_facts(CIK, sec)
+        time.sleep(0.01)
+        assert store.get_company_facts(CIK, sec) == PAYLOAD
+
+        assert sec.calls[1]["If-None-Match"] == '"v1"'
+        assert "If-Modified-Since" in sec.calls[1]
+        stats = store.stats()
+        assert stats["revalidated"] == 1
+        assert stats["bytes_saved"] == len(json.dumps(PAYLOAD).encode())
+
+    def test_changed_payload_redownloaded(self, tmp_path, sec):
+        store = CompanyFactsStore(cache_dir=str(tmp_path), max_age_seconds=0)
+        store.get_company_facts(CIK, sec)
+        sec.etag = '"v2"'
+        store.get_company_facts(CIK, sec)
+        assert store.stats()["misses"] == 2
+        assert store.get_metadata(CIK)["etag"] == '"v2"'
+
+    def test_survives_restart(self, tmp_path, sec):
+        CompanyFactsStore(cache_dir=str(tmp_path)).get_company_facts(CIK, sec)
+        restarted = CompanyFactsStore(cache_dir=str(tmp_path))
+        assert restarted.get_company_facts(CIK, sec) == PAYLOAD
+        assert len(sec.calls) == 1
+
+    def test_stale_served_when_sec_down(self, tmp_path, sec):
+        store = CompanyFactsStore(cache_dir=str(tmp_path), max_age_seconds=0)
+        store.get_company_facts(CIK, sec)
+        sec.down = True
+        assert store.get_company_facts(CIK, sec) == PAYLOAD
+        assert store.stats()["stale_served"] == 1
+
+    def test_error_without_copy_raises(self, tmp_path, sec):
+        sec.down = True
+        store = CompanyFactsStore(cache_dir=str(tmp_path))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            store.get_company_facts(CIK, sec)
+
+
+    def test_read_with_stream_reader(self, tmp_path, sec):
+        store = CompanyFactsStore(cache_dir=str(tmp_path))
+        name = store.read_company_facts(CIK, sec, lambda f: json.load(f)["entityName"])
+        assert name == "Apple Inc."
+
+    def test_corrupt_copy_redownloaded(self, tmp_path, sec):
+        store = CompanyFactsStore(cache_dir=str(tmp_path))
+        store.get_company_facts(CIK, sec)
+        (tmp_path / f"CIK{CIK}.json.gz").write_bytes(b"not gzip")
+        assert store.read_company_facts(CIK, sec, json.load) == PAYLOAD
+        assert store.stats()["misses"] == 2
+
+
+class TestIncrementalRefresh:
+
+    def test_no_new_filing_skips_companyfacts(self, tmp_path, sec):
+        sec.filings = list(FILINGS)
+        store = CompanyFactsStore(cache_dir=str(tmp_path), max_age_seconds=0)
+        store.get_company_facts(CIK, sec)
+        assert store.get_metadata(CIK)["last_accession"] == "0000320193-25-000079"
+
+        sec.filings.insert(0, ("0000320193-25-000081", "8-K", "2025-11-05"))   # not financial
+        time.sleep(0.01)
+        assert store.get_company_facts(CIK, sec) == PAYLOAD
+        assert store.get_company_facts(CIK, sec) == PAYLOAD
+        assert len(sec.calls) == 1
+        assert sec.index_calls[-1]["If-None-Match"] == '"idx3"'   # unchanged index costs a 304
+        stats = store.stats()
+        assert stats["filings_unchanged"] == 2 and stats["misses"] == 1
+
+    def test_new_10q_refetches(self, tmp_path, sec):
+        sec.filings = list(FILINGS)
+        store = CompanyFactsStore(cache_dir=str(tmp_path), max_age_seconds=0)
+        store.get_company_facts(CIK, sec)
+        sec.etag = '"v2"'
+        sec.filings.insert(0, ("0000320193-26-000006", "10-Q", "2026-01-30"))
+        store.get_company_facts(CIK, sec)
+        meta = store.get_metadata(CIK)
+        assert store.stats()["misses"] == 2
+        assert (meta["etag"], meta["last_accession"], meta["last_form"]) == ('"v2"', "0000320193-26-000006", "10-Q")
+
+    def test_lagging_companyfacts_rechecked(self, tmp_path, sec):
+        sec.filings = list(FILINGS)
+        store = CompanyFactsStore(cache_dir=str(tmp_path), max_age_seconds=0)
+        store.get_company_facts(CIK, sec)
+        sec.filings.insert(0, ("0000320193-26-000006", "10-Q", "2026-01-30"))
+        store.get_company_facts(CIK, sec)                     # companyfacts still 304
+        assert store.get_metadata(CIK)["last_accession"] == "0000320193-25-000079"
+        store.get_company_facts(CIK, sec)
+        assert len(sec.calls) == 3 and store.stats()["filings_unchanged"] == 0
+
+    def test_index_unavailable_falls_back_to_conditional_get(self, tmp_path, sec):
+        store = CompanyFactsStore(cache_dir=str(tmp_path), max_age_seconds=0)
+        store.get_company_facts(CIK, sec)
+        store.get_company_facts(CIK, sec)
+        assert sec.calls[1]["If-None-Match"] == '"v1"'
+        assert store.stats()["revalidated"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
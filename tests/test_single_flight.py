@@ -0,0 +1,139 @@
+"""
+Single Flight Tests
+===================
+Tests for utils/single_flight.py
+
+Run with: pytest tests/test_single_flight.py -v
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils.single_flight import SingleFlight, single_flight
+
+
+def _run_concurrently(fn, args_list):
+    results, errors = [None] * len(args_list), [None] * len(args_list)
+    barrier = threading.Barrier(len(args_list))
+
+    def worker(i, args):
+        barrier.wait()
+        try:
+            results[i] = fn(*args)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i, a)) for i, a in enumerate(args_list)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+class TestSingleFlight:
+
+    def test_concurrent_callers_share_one_run(self):
+        group = SingleFlight("test")
+        runs = []
+
+        @single_flight(group=group)
+        def extract(ticker, _financials=None):
+            runs.append(ticker)
+            time.sleep(0.2)
+            return {"ticker": ticker}
+
+        # _financials differs per caller but is not part of the key
+        results, errors = _run_concurrently(extract, [("AAPL", {"n": i}) for i in range(8)])
+        assert runs == ["AAPL"]
+        assert errors == [None] * 8
+        assert all(r == {"ticker": "AAPL"} for r in results)
+        stats = group.stats()
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 7
+        assert stats["in_flight"] == 0
+
+    def test_different_keys_run_separately(self):
+        group = SingleFlight("test")
+        runs = []
+
+        @single_flight(group=group)
+        def extract(ticker):
+            runs.append(ticker)
+            time.sleep(0.1)
+            return ticker
+
+        results, _ = _run_concurrently(extract, [("AAPL",), ("MSFT",)])
+        assert sorted(runs) == ["AAPL", "MSFT"]
+        assert results == ["AAPL", "MSFT"]
+
+    def test_waiters_get_leader_exception(self):
+        group = SingleFlight("test")
+        runs = []
+
+        @single_flight(group=group)
+        def extract(ticker):
+            runs.append(ticker)
+            time.sleep(0.2)
+            raise RuntimeError("rate limited")
+
+        _, errors = _run_concurrently(extract, [("AAPL",)] * 4)
+        assert len(runs) == 1
+        assert all(isinstance(e, RuntimeError) for e in errors)
+
+    def test_no_caching_after_completion(self):
+        group = SingleFlight("test")
+        calls = []
+
+        @single_flight(group=group)
+        def extract(ticker):
+            calls.append(ticker)
+            return len(calls)
+
+        assert extract("AAPL") == 1
+        assert extract("AAPL") == 2
+
+    def test_custom_key(self):
+        group = SingleFlight("test")
+        runs = []
+
+        @single_flight(key=lambda ticker, ttl=3600: ticker.upper(), group=group)
+        def info(ticker, ttl=3600):
+            runs.append(ticker)
+            time.sleep(0.2)
+            return ticker.upper()
+
+        results, _ = _run_concurrently(info, [("aapl",), ("AAPL",), ("Aapl", 60)])
+        assert len(runs) == 1
+        assert results == ["AAPL"] * 3
+
+    def test_reentrant_call_does_not_deadlock(self):
+        group = SingleFlight("test")
+
+        def inner():
+            return group.do("k", lambda: "inner")
+
+        assert group.do("k", inner) == "inner"
+
+    def test_methods_share_across_instances(self):
+        group = SingleFlight("test")
+
+        class Extractor:
+            runs = []
+
+            @single_flight(group=group)
+            def extract_financials(self, ticker, source="auto"):
+                self.runs.append(ticker)
+                time.sleep(0.2)
+                return ticker
+
+        _run_concurrently(lambda t: Extractor().extract_financials(t), [("AAPL",)] * 3)
+        assert Extractor.runs == ["AAPL"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
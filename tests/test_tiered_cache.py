@@ -0,0 +1,184 @@
+"""
+Tiered Cache Tests
+==================
+Tests for utils/tiered_cache.py (Redis tier exercised with an in-memory stand-in)
+
+Run with: pytest tests/test_tiered_cache.py -v
+"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from utils.bounded_cache import BoundedTTLCache
+from utils.tiered_cache import TieredCache
+
+
+class MemoryRedis:
+    """Just enough of redis.Redis (bytes mode) for the L3 tier."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        value, expires_at = self.store.get(key, (None, 0))
+        return value if expires_at > time.time() else None
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def pttl(self, key):
+        if key not in self.store:
+            return -2
+        return int((self.store[key][1] - time.time()) * 1000)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = (value, time.time() + ttl)
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.store.pop(key, None))
+
+    def scan_iter(self, match="*", count=None):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.store) if key.startswith(prefix)]
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client, self.calls = client, []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+            return self
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.calls]
+
+
+def _financials():
+    return {
+        "ticker": "AAPL",
+        "income_statement": pd.DataFrame(np.random.rand(5, 4), index=list("abcde")),
+        "filed": pd.Timestamp("2024-11-01"),
+    }
+
+
+def _cache(tmp_path, redis_client=None, name="node"):
+    return TieredCache(l1=BoundedTTLCache(sweep=False), disk_dir=str(tmp_path / name),
+                       redis_client=redis_client, name=name)
+
+
+class TestTieredCache:
+
+    def test_l1_hit(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.set("k", _financials(), ttl=60)
+        assert cache.get("k")["ticker"] == "AAPL"
+        assert cache.stats()["tiers"]["l1_hits"] == 1
+
+    def test_restart_gets_disk_hit(self, tmp_path):
+        value = _financials()
+        _cache(tmp_path).set("k", value, ttl=60)
+
+        restarted = _cache(tmp_path)              # same disk dir, empty memory
+        got = restarted.get("k")
+        pd.testing.assert_frame_equal(got["income_statement"], value["income_statement"])
+        assert got["filed"] == value["filed"]
+        assert restarted.stats()["tiers"]["l2_hits"] == 1
+        # Promoted into L1
+        assert "k" in restarted
+
+    def test_replica_gets_redis_hit(self, tmp_path):
+        shared = MemoryRedis()
+        _cache(tmp_path, shared, name="replica1").set("k", _financials(), ttl=60)
+
+        replica = _cache(tmp_path, shared, name="replica2")   # different disk, same Redis
+        assert replica.get("k")["ticker"] == "AAPL"
+        assert replica.stats()["tiers"]["l3_hits"] == 1
+        # Promoted into L1 and L2 with the remaining TTL
+        assert replica.get("k") is not None
+        assert replica.stats()["tiers"]["l1_hits"] == 1
+        assert os.listdir(tmp_path / "replica2")
+
+    def test_expired_on_disk_is_miss(self, tmp_path):
+        _cache(tmp_path).set("k", {"x": 1}, ttl=0.05)
+        time.sleep(0.1)
+        restarted = _cache(tmp_path)
+        assert restarted.get("k") is None
+        assert restarted.stats()["tiers"]["misses"] == 1
+
+    def test_corrupt_disk_file_is_dropped(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.set("k", {"x": 1}, ttl=60)
+        path = cache._disk_path("k")
+        with open(path, "wb") as f:
+            f.write(b"garbage")
+        assert _cache(tmp_path).get("k") is None
+        assert not os.path.exists(path)
+
+    def test_unserializable_stays_in_memory(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache.set("k", {"fn": lambda: 1}, ttl=60)
+        assert cache.get("k") is not None
+        assert cache.stats()["tiers"]["unserializable"] == 1
+
+    def test_delete_removes_all_tiers(self, tmp_path):
+        shared = MemoryRedis()
+        cache = _cache(tmp_path, shared)
+        cache.set("k", {"x": 1}, ttl=60)
+        assert cache.delete("k")
+        assert cache.get("k") is None
+        assert not shared.store
+
+    def test_clear_scope(self, tmp_path):
+        shared = MemoryRedis()
+        cache = _cache(tmp_path, shared)
+        cache.set("k", {"x": 1}, ttl=60)
+        assert cache.clear() == 0
+        assert cache.get("k") == {"x": 1}                 # promoted back from Redis
+        assert cache.clear(shared=True) == 1
+        assert cache.get("k") is None and not shared.store
+
+    def test_stale_entry_survives_restart(self, tmp_path):
+        _cache(tmp_path).set("k", {"x": 1}, ttl=0.05, stale_ttl=60)
+        time.sleep(0.1)
+        restarted = _cache(tmp_path)
+        assert restarted.get("k") is None                 # get() only returns fresh values
+        value, fresh_until = restarted.get_entry("k")
+        assert value == {"x": 1} and fresh_until < time.time()
+        assert restarted.stats()["tiers"]["stale_hits"] == 1
+
+    def test_fresher_replica_copy_beats_local_stale(self, tmp_path):
+        shared = MemoryRedis()
+        local = _cache(tmp_path, shared, name="local")
+        local.set("k", {"v": "old"}, ttl=0.05, stale_ttl=60)
+        time.sleep(0.1)
+        _cache(tmp_path, shared, name="other").set("k", {"v": "new"}, ttl=60, stale_ttl=60)
+        value, fresh_until = local.get_entry("k")
+        assert value == {"v": "new"} and fresh_until > time.time()
+        assert local.get("k") == {"v": "new"}             # promoted into L1
+
+    def test_prune_disk_budget(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.disk_max_bytes = 3000
+        for i in range(5):
+            cache.set(f"k{i}", "x" * 1000, ttl=60)
+            time.sleep(0.01)
+        cache.prune_disk()
+        remaining = os.listdir(tmp_path / "node")
+        assert 0 < len(remaining) < 5
+        # Newest entry survives
+        assert os.path.basename(cache._disk_path("k4")) in remaining
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,92 @@
+"""
+TTL Policy Tests
+================
+Tests for utils/ttl_policy.py (NYSE calendar and earnings-aware TTLs)
+
+Run with: pytest tests/test_ttl_policy.py -v
+"""
+
+import sys
+import os
+from datetime import date, datetime, timedelta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils.ttl_policy import (
+    NYSECalendar, TTLPolicy, nyse_holidays, nyse_early_closes, NY_TZ,
+    INTRADAY_TTL, FILING_WINDOW_TTL, QUIET_TTL, EARNINGS_GRACE,
+)
+
+
+def _ny(*args):
+    return datetime(*args, tzinfo=NY_TZ)
+
+
+class TestNYSECalendar:
+
+    def test_2024_holidays(self):
+        assert nyse_holidays(2024) == {
+            date(2024, 1, 1), date(2024, 1, 15), date(2024, 2, 19), date(2024, 3, 29),
+            date(2024, 5, 27), date(2024, 6, 19), date(2024, 7, 4), date(2024, 9, 2),
+            date(2024, 11, 28), date(2024, 12, 25),
+        }
+        assert nyse_early_closes(2024) == {date(2024, 7, 3), date(2024, 11, 29), date(2024, 12, 24)}
+
+    def test_observed_rules(self):
+        assert date(2021, 12, 31) not in nyse_holidays(2021)     # Jan 1 2022 is a Saturday
+        assert date(2022, 6, 20) in nyse_holidays(2022)          # Juneteenth on a Sunday
+        assert date(2026, 7, 3) in nyse_holidays(2026)           # July 4 on a Saturday
+        assert date(2026, 7, 3) not in nyse_early_closes(2026)
+
+    def test_sessions(self):
+        cal = NYSECalendar()
+        assert cal.is_open(_ny(2024, 3, 28, 10, 0))
+        assert not cal.is_open(_ny(2024, 3, 29, 10, 0))          # Good Friday
+        assert not cal.is_open(_ny(2024, 11, 29, 13, 30))        # Early close
+        assert cal.next_open(_ny(2024, 3, 28, 17, 0)) == _ny(2024, 4, 1, 9, 30)
+        assert cal.last_close(_ny(2024, 3, 30, 12, 0)) == _ny(2024, 3, 28, 16, 0)
+
+
+class TestTTLPolicy:
+
+    def test_market_data_intraday_capped_at_close(self):
+        policy = TTLPolicy()
+        assert policy.ttl("market_data", now=_ny(2024, 3, 28, 11, 0)) == INTRADAY_TTL
+        assert policy.ttl("market_data", now=_ny(2024, 3, 28, 15, 55)) == 360
+
+    def test_market_data_closed_until_next_open(self):
+        policy = TTLPolicy()
+        thursday_night = _ny(2024, 3, 28, 20, 0)                  # Before Good Friday
+        assert policy.ttl("market_data", now=thursday_night) == int(
+            (_ny(2024, 4, 1, 9, 30) - thursday_night).total_seconds())
+        assert policy.ttl("market_data", now=_ny(2024, 3, 28, 16, 10)) == INTRADAY_TTL   # settling
+
+    def test_financials_follow_earnings_calendar(self):
+        now = _ny(2024, 5, 10, 12, 0)
+        released = TTLPolicy(earnings_dates=lambda t: [_ny(2024, 5, 2, 16, 30)])
+        assert released.ttl("financials", "AAPL", now) == FILING_WINDOW_TTL
+
+        quiet = TTLPolicy(earnings_dates=lambda t: [_ny(2024, 3, 1, 16, 30), _ny(2024, 7, 30, 16, 30)])
+        assert quiet.ttl("financials", "AAPL", now) == QUIET_TTL
+
+        soon = _ny(2024, 5, 11, 8, 0)
+        imminent = TTLPolicy(earnings_dates=lambda t: [_ny(2024, 3, 1, 16, 30), soon])
+        assert imminent.ttl("financials", "AAPL", now) == int((soon - now).total_seconds()) + EARNINGS_GRACE
+
+    def test_financials_from_info_without_fetching(self, monkeypatch):
+        import utils.ticker_cache as ticker_cache
+        monkeypatch.setattr(ticker_cache, "get_ticker_info", lambda t: pytest.fail("fetched ticker info"))
+        now = _ny(2024, 5, 10, 12, 0)
+        info = {"earningsTimestamp": _ny(2024, 5, 2, 16, 30).timestamp()}
+        assert TTLPolicy().ttl("financials", "AAPL", now, info=info) == FILING_WINDOW_TTL
+        assert TTLPolicy().ttl("financials", "AAPL", now) == 86400          # no info: base TTL
+
+    def test_fixed_categories_and_unknown_calendar(self):
+        policy = TTLPolicy(base_ttls={"company_info": 1234}, earnings_dates=lambda t: [])
+        assert policy.ttl("company_info") == 1234
+        assert policy.ttl("financials", "XYZ") == 86400
+        assert policy.ttl("something_else") == 3600
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,169 @@
+"""
+XBRL Fact Table Tests
+=====================
+Tests for data_sources/xbrl_facts.py
+
+Run with: pytest tests/test_xbrl_facts.py -v
+"""
+
+import sys
+import os
+import io
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from data_sources.xbrl_facts import XBRLFactTable, parse_companyfacts_stream
+
+
+def _fact(fy, val, form="10-K", fp="FY", end=None, filed=None, accn="0000320193-00-000001"):
+    return {
+        "fy": fy, "val": val, "form": form, "fp": fp, "accn": accn,
+        "end": end or f"{fy}-09-30", "filed": filed or f"{fy}-11-01",
+    }
+
+
+COMPANYFACTS = {
+    "cik": 320193,
+    "entityName": "Apple Inc.",
+    "facts": {
+        "us-gaap": {
+            "Revenues": {"label": "Revenues", "description": "Total {revenue}.", "units": {"USD": [
+                _fact(2022, 390.0),
+                _fact(2023, 380.0),
+                _fact(2023, 383.0, filed="2024-11-01"),   # Restated in later 10-K
+                _fact(2023, 90.0, form="10-Q", fp="Q1"),
+            ]}},
+            "SalesRevenueNet": {"units": {"USD": [_fact(2010, 65.0)]}},
+            "NetIncomeLoss": {"units": {"USD": [_fact(2022, 99.0), _fact(2023, 0)]}},
+            "EarningsPerShareBasic": {"units": {"USD/shares": [_fact(2023, 6.16)]}},
+            "Assets": {"units": {"USD": [_fact(None, 1.0, end="2023-09-30", filed="not-a-date")]}},
+        },
+        "dei": {"EntityCommonStockSharesOutstanding": {"units": {"shares": [_fact(2023, 15.5e9)]}}},
+    }
+}
+
+SEARCH_MAP = {
+    "Revenue": ["Revenues", "SalesRevenueNet"],
+    "Net_Income": ["NetIncomeLoss"],
+    "Total_Assets": ["Assets"],
+}
+
+
+@pytest.fixture
+def facts():
+    return XBRLFactTable.from_companyfacts(COMPANYFACTS)
+
+
+class TestFactTable:
+
+    def test_single_pass_columns(self, facts):
+        assert len(facts) == 9
+        assert facts.entity_name == "Apple Inc."
+        assert facts.cik == "0000320193"
+        assert facts.columns["val"].dtype == np.float64
+        assert facts.columns["filed"].dtype == np.dtype("datetime64[D]")
+
+    def test_bad_dates_become_nat(self, facts):
+        assert np.isnat(facts.columns["filed"]).sum() == 1
+
+    def test_tag_subset(self):
+        table = XBRLFactTable.from_companyfacts(COMPANYFACTS, tags=["NetIncomeLoss"])
+        assert len(table) == 2
+        assert not table.has_tag("Revenues")
+
+    def test_select_prefers_first_tag(self, facts):
+        tag, rows = facts.select(["Revenues", "SalesRevenueNet"], ["10-K"])
+        assert tag == "Revenues"
+        assert len(rows) == 3
+
+    def test_select_unit_fallback(self, facts):
+        tag, rows = facts.select(["EarningsPerShareBasic"], ["10-K"], units=("USD", "USD/shares"))
+        assert tag == "EarningsPerShareBasic"
+        assert len(rows) == 1
+
+
+class TestStatement:
+
+    def test_years_descending(self, facts):
+        df = facts.statement(SEARCH_MAP, ["10-K"])
+        assert list(df.index) == [2023, 2022]
+        assert df.index.name == "Year"
+
+    def test_later_filing_wins(self, facts):
+        df = facts.statement(SEARCH_MAP, ["10-K"])
+        assert df.loc[2023, "Revenue"] == 383.0
+
+    def test_zero_and_missing_year_ignored(self, facts):
+        df = facts.statement(SEARCH_MAP, ["10-K"])
+        assert np.isnan(df.loc[2023, "Net_Income"])
+        assert "Total_Assets" not in df.columns
+
+    def test_form_filter(self, facts):
+        df = facts.statement(SEARCH_MAP, ["10-Q"])
+        assert list(df.columns) == ["Revenue"]
+        assert df.loc[2023, "Revenue"] == 90.0
+
+    def test_no_matches(self, facts):
+        assert facts.statement({"Capex": ["PaymentsToAcquirePropertyPlantAndEquipment"]}, ["10-K"]).empty
+
+    def test_to_frame_roundtrip(self, facts):
+        frame = facts.to_frame()
+        assert set(frame["tag"]) == {"Revenues", "SalesRevenueNet", "NetIncomeLoss",
+                                     "EarningsPerShareBasic", "Assets"}
+        assert frame["val"].sum() == pytest.approx(facts.columns["val"].sum())
+
+
+class TestAsOf:
+
+    def test_restatement_hidden_until_filed(self, facts):
+        assert facts.as_of("2024-10-31").statement(SEARCH_MAP, ["10-K"]).loc[2023, "Revenue"] == 380.0
+        assert facts.as_of("2024-11-01").statement(SEARCH_MAP, ["10-K"]).loc[2023, "Revenue"] == 383.0
+
+    def test_no_lookahead(self, facts):
+        df = facts.as_of("2023-06-30").statement(SEARCH_MAP, ["10-K"])
+        assert list(df.index) == [2022]
+        assert facts.as_of("2000-01-01").statement(SEARCH_MAP, ["10-K"]).empty
+
+    def test_undated_facts_dropped_and_source_untouched(self, facts):
+        total = len(facts)
+        assert len(facts.as_of("2100-01-01")) == total - 1
+        assert len(facts) == total
+
+    def test_filing_dates(self, facts):
+        dates = facts.filing_dates(["10-K"])
+        assert [str(d) for d in dates] == ["2010-11-01", "2022-11-01", "2023-11-01", "2024-11-01"]
+
+
+class TestStreamingParser:
+
+    @staticmethod
+    def _stream(payload=COMPANYFACTS):
+        return io.BytesIO(json.dumps(payload).encode())
+
+    def test_matches_full_parse(self):
+        streamed = parse_companyfacts_stream(self._stream())
+        full = XBRLFactTable.from_companyfacts(COMPANYFACTS)
+        assert streamed.entity_name == full.entity_name
+        assert streamed.cik == full.cik == "0000320193"
+        assert streamed.to_frame().equals(full.to_frame())
+        assert streamed.statement(SEARCH_MAP, ["10-K"]).equals(full.statement(SEARCH_MAP, ["10-K"]))
+
+    def test_only_requested_tags_materialized(self):
+        streamed = parse_companyfacts_stream(self._stream(), tags={"NetIncomeLoss", "Missing"})
+        assert streamed.tags == ["NetIncomeLoss"]
+        assert len(streamed) == 2
+
+    def test_other_taxonomy(self):
+        streamed = parse_companyfacts_stream(self._stream(), taxonomy="dei")
+        assert streamed.tags == ["EntityCommonStockSharesOutstanding"]
+
+    def test_truncated_payload_raises(self):
+        body = json.dumps(COMPANYFACTS).encode()
+        with pytest.raises(ValueError):
+            parse_companyfacts_stream(io.BytesIO(body[: len(body) // 2]))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -145,6 +145,11 @@ from validation_engine import DataValidator
 from app_css import inject_all_css, get_search_button_css
 from app_landing import render_landing_page, render_ticker_display, render_no_ticker_placeholder
 from app_themes import inject_theme_css, render_theme_selector, get_current_theme
+from utils.cache_warmer import record_ticker_request, get_cache_warmer
+
+# Off-peak cache warm-up (opt-in; the warmer thread is started once per process)
+if os.getenv("ATLAS_WARMUP_ENABLED", "").lower() in ("1", "true", "yes"):
+    get_cache_warmer().start()
 
 # Import flip cards (MILESTONE-008)
 try:
@@ -215,19 +220,25 @@ def validate_and_enrich(ticker: str, financials: dict) -> tuple:
 # ==========================================
 # CACHING - Prevent Rate Limiting
 # ==========================================
-# Cache financial data for 1 hour to prevent Yahoo Finance rate limiting
+# Two layers: st.cache_data (1 hour, this process) in front of the extractor's
+# shared result cache (memory/disk/Redis, market-hours and earnings-aware TTLs)
 @st.cache_data(ttl=3600, show_spinner=False)
 def cached_extract_financials(
     ticker: str, 
     source: str = "auto",
     fiscal_year_offset: int = 0,
     filing_types: tuple = ("10-K", "10-Q"),  # Must be tuple for caching (hashable)
-    include_quant: bool = False  # Default to False - quant is lazy-loaded when user views Quant tab
+    include_quant: bool = False,  # Default to False - quant is lazy-loaded when user views Quant tab
+    use_cache: bool = True  # False = bypass the extractor's result and raw payload caches
 ) -> dict:
     """
     Cached wrapper for financial extraction.
-    TTL=3600 seconds (1 hour) - data is refreshed hourly.
-    This prevents rate limiting on Streamlit Cloud.
+    st.cache_data keeps results for 1 hour; behind it the extractor's shared
+    result cache keeps them until their TTL (up to days for financials outside
+    earnings season, see utils.ttl_policy). Prevents rate limiting on Streamlit Cloud.
+    
+    use_cache=False re-fetches every source and overwrites the shared cache
+    entries with the fresh result (force refresh).
     
     Note: filing_types must be tuple (not list) for Streamlit caching.
     IMPORTANT: Error results raise exceptions (not cached).
@@ -238,7 +249,8 @@ def cached_extract_financials(
         source=source,
         fiscal_year_offset=fiscal_year_offset,
         filing_types=list(filing_types),  # Convert back to list for the backend
-        include_quant=include_quant
+        include_quant=include_quant,
+        use_cache=use_cache
     )
     
     # DON'T cache error results - raise exception instead
@@ -254,7 +266,10 @@ def get_cache_key(ticker: str) -> str:
     return hashlib.md5(f"{ticker}_{datetime.now().strftime('%Y%m%d%H')}".encode()).hexdigest()[:8]
 
 def clear_ticker_cache(ticker: str):
-    """Clear cache for a specific ticker (for force refresh)"""
+    """
+    Clear the Streamlit layer (for force refresh). The shared result cache is
+    bypassed by calling cached_extract_financials(..., use_cache=False).
+    """
     cached_extract_financials.clear()
 
 # ==========================================
@@ -614,7 +629,10 @@ with st.sidebar:
                 clear_ticker_cache(ticker_input)
                 st.toast("Cache cleared - fetching fresh data")
             
-            cache_status = "fetching fresh data" if force_refresh else "cached for 1 hour"
+            # Most searched tickers are warmed first by the cache warmer
+            record_ticker_request(ticker_input)
+            
+            cache_status = "fetching fresh data" if force_refresh else "using cached data if available"
             with st.spinner(f"Extracting {ticker_input}... ({cache_status})"):
                 try:
                     # Use cached extraction to prevent rate limiting
@@ -622,7 +640,8 @@ with st.sidebar:
                         ticker_input, 
                         source=source_map[data_source],
                         filing_types=tuple(filing_types),  # Convert to tuple for caching
-                        include_quant=include_quant
+                        include_quant=include_quant,
+                        use_cache=not force_refresh
                     )
                     
                     if "status" in result and result["status"] == "error":
@@ -15,12 +15,15 @@ Speed: < 5 seconds for full 10-year history
 import os
 import json
 import time
+import threading
 import requests
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Callable, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Callable, Any
 from functools import wraps
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import usa_dictionary as usa_dict
 
 # Import centralized logging
@@ -29,6 +32,33 @@ from utils.logging_config import EngineLogger, log_error, log_warning, log_info
 from utils.ticker_mapper import normalize_ticker, PROBLEMATIC_TICKERS
 # Import centralized ticker cache to prevent Yahoo rate limiting
 from utils.ticker_cache import get_ticker_info, get_ticker_financials, get_ticker
+# Shared ticker -> CIK index (one download per process, persisted to disk)
+from data_sources.cik_index import lookup_cik
+# Persistent companyfacts store with ETag/Last-Modified revalidation
+from data_sources.sec_facts_store import get_facts_store
+# Local Parquet warehouse built from SEC's bulk companyfacts.zip
+from data_sources.facts_warehouse import get_facts_warehouse
+# Pooled keep-alive HTTP sessions (one per host)
+from utils.http_session import http_get
+# Process-wide SEC fair-access limiter (shared by every SEC-bound request)
+from utils.rate_limiter import get_sec_limiter, parse_retry_after
+# Concurrent source fetches with per-source timeouts
+from utils.async_fanout import fan_out
+# Concurrent extractions of the same ticker share one run
+from utils.single_flight import single_flight, get_flight_group
+# Extraction results cache: memory -> local disk -> Redis
+from utils.tiered_cache import get_result_cache
+# Stale-while-revalidate windows and background refresh
+from utils.revalidation import get_revalidator, stale_window
+# Market-hours / earnings-aware cache expirations
+from utils.ttl_policy import TTLPolicy
+# Columnar XBRL fact index for vectorized statement building
+from data_sources.xbrl_facts import XBRLFactTable, parse_companyfacts_stream, IJSON_AVAILABLE
+# Canonical field x period matrix stored next to the statement DataFrames
+from utils.financials_panel import FinancialsPanel, get_panel
+# Vectorized multi-period ratio and growth frames built from the panel
+from calculations.ratio_engine import get_ratio_frame
+from calculations.growth_engine import GROWTH_WINDOWS, get_growth_frame
 
 # Initialize logger for this module
 _logger = EngineLogger.get_logger("USABackend")
@@ -186,6 +216,29 @@ try:
 except ImportError:
     ALPHAVANTAGE_AVAILABLE = False
 
+# ==========================================
+# BATCH EXTRACTION RESULT
+# ==========================================
+
+BATCH_MAX_WORKERS = 6          # Concurrent tickers in extract_many()
+BATCH_TICKER_TIMEOUT = 120     # Seconds before a single ticker is reported as timed out
+FACT_TABLE_MEMO_SIZE = 32      # Fact tables (with their as-of index) kept per extractor
+
+
+@dataclass
+class BatchExtractionResult:
+    """Outcome of one ticker in USAFinancialExtractor.extract_many()."""
+    ticker: str
+    status: str                        # "success", "error" or "timeout"
+    financials: Optional[Dict] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "success"
+
+
 class USAFinancialExtractor:
     """
     Extracts financial data from USA public companies using multiple sources.
@@ -309,6 +362,75 @@ class USAFinancialExtractor:
         'free_cash_flow': ['freeCashflow', 'freeCashFlow', 'free_cash_flow', 'operatingCashFlow'],
     }
     
+    # ========== yfinance info keys per field (gap filling) ==========
+    YF_FIELD_MAP = {
+        'current_price': ['currentPrice', 'regularMarketPrice', 'price'],
+        'market_cap': ['marketCap', 'marketCapitalization'],
+        'pe_ratio': ['trailingPE', 'peRatio'],
+        'forward_pe': ['forwardPE', 'forwardPriceEarningsRatio'],
+        'peg_ratio': ['pegRatio'],
+        'price_to_book': ['priceToBook', 'pbRatio'],
+        'price_to_sales': ['priceToSalesTrailing12Months', 'psRatio'],
+        'ev_to_ebitda': ['enterpriseToEbitda'],
+        'ev_to_sales': ['enterpriseToRevenue'],
+        'roe': ['returnOnEquity'],
+        'roa': ['returnOnAssets'],
+        'roic': ['returnOnCapital'],
+        'debt_to_equity': ['debtToEquity', 'totalDebtToEquity'],
+        'current_ratio': ['currentRatio'],
+        'quick_ratio': ['quickRatio'],
+        'interest_coverage': ['interestCoverage'],
+        'revenue_growth': ['revenueGrowth', 'revenueQuarterlyGrowth'],
+        'earnings_growth': ['earningsGrowth', 'earningsQuarterlyGrowth'],
+        'dividend_yield': ['dividendYield', 'trailingAnnualDividendYield'],
+        'dividend_per_share': ['dividendRate', 'trailingAnnualDividendRate'],
+        'payout_ratio': ['payoutRatio'],
+        'beta': ['beta'],
+        'sector': ['sector', 'gicsSector'],
+        'industry': ['industry', 'gicsSubIndustry'],
+        'employees': ['fullTimeEmployees'],
+        'fifty_two_week_high': ['fiftyTwoWeekHigh', '52WeekHigh'],
+        'fifty_two_week_low': ['fiftyTwoWeekLow', '52WeekLow'],
+        'shares_outstanding': ['sharesOutstanding', 'impliedSharesOutstanding'],
+        'target_price': ['targetMeanPrice', 'targetMedianPrice'],
+        'target_price_avg': ['targetMeanPrice'],
+        'recommendation': ['recommendationKey', 'recommendationMean'],
+        'eps_estimate_avg': ['forwardEps'],
+        'enterprise_value': ['enterpriseValue'],
+        'average_volume': ['averageVolume', 'averageDailyVolume10Day'],
+        'gross_margin': ['grossMargins'],
+        'operating_margin': ['operatingMargins'],
+        'profit_margin': ['profitMargins'],
+        'ebitda': ['ebitda'],
+        'free_cash_flow': ['freeCashflow', 'operatingCashflow'],
+        'eps': ['trailingEps'],
+        'eps_diluted': ['trailingEps'],
+        'website': ['website'],
+        'description': ['longBusinessSummary', 'description'],
+        'company_name': ['longName', 'shortName'],
+    }
+    
+    # ========== PER-SOURCE FETCH TIMEOUTS (auto-mode fan-out, seconds) ==========
+    SOURCE_TIMEOUTS = {
+        'sec': 60,
+        'yfinance_info': 20,
+        'yfinance_statements': 45,
+    }
+    
+    # Gap-fill sources, in the order used for fields missing from FIELD_SOURCE_PRIORITY
+    GAP_FILL_SOURCES = ['yfinance', 'fmp', 'alphavantage']
+    
+    # ========== RAW SOURCE PAYLOADS (cached per ticker, see _raw_payload) ==========
+    # Cache category per source: SEC facts only change with a filing,
+    # the other payloads carry prices
+    RAW_SOURCE_CATEGORIES = {
+        'sec': 'financials',
+        'yfinance_statements': 'market_data',
+        'fmp': 'market_data',
+        'alphavantage_all': 'market_data',
+        'quant': 'market_data',
+    }
+    
     def __init__(self, user_agent: str = "AtlasFinancialIntelligence/2.0 (Educational Research; Python 3.13; Contact: research@atlas-fi.com)"):
         """
         Initialize extractor with SEC API headers.
@@ -326,30 +448,51 @@ class USAFinancialExtractor:
         }
         self.sec_base_url = "https://data.sec.gov/api/xbrl"
         
-        # TTL-based cache for market data
-        # Format: {key: {"data": value, "timestamp": datetime, "ttl_seconds": int}}
-        self._cache = {}
+        # Tiered cache for extraction results, shared by all extractors in the process:
+        # size-bounded LRU memory tier, then local disk, then Redis (warm across restarts/replicas)
+        self._cache = get_result_cache()
         self._cache_ttl = {
             "market_data": 3600,      # 1 hour for real-time market data
             "financials": 86400,       # 24 hours for financial statements
             "company_info": 604800,    # 7 days for company info
             "default": 3600            # 1 hour default
         }
+        # Refines the base TTLs above by NYSE session and earnings calendar
+        self._ttl_policy = TTLPolicy(base_ttls=self._cache_ttl)
         
         # Track extraction sources for transparency
         self._extraction_sources = {}
+        
+        # Persistent companyfacts store (shared across instances, survives restarts)
+        self._facts_store = get_facts_store()
+        
+        # Stream-parse companyfacts, materializing only the tags in the search maps
+        self.stream_facts = IJSON_AVAILABLE
+        
+        # Bulk-ingested fundamentals warehouse (read instead of the API when fresh)
+        self._warehouse = get_facts_warehouse()
+        self.use_warehouse = True
+        
+        # CIK -> (cached fact frame, table built from it); see _fact_table
+        self._fact_tables: "OrderedDict[str, Tuple[pd.DataFrame, XBRLFactTable]]" = OrderedDict()
+        self._fact_tables_lock = threading.Lock()
     
     # ==========================================
     # API REQUEST HELPERS WITH RETRY
     # ==========================================
     
-    def _make_sec_request(self, url: str, timeout: int = 15) -> requests.Response:
+    def _make_sec_request(self, url: str, timeout: int = 15,
+                          headers: Optional[Dict[str, str]] = None) -> requests.Response:
         """
         Make a request to SEC API with retry logic.
         
+        Every attempt waits on the process-wide SEC limiter; a 429 pauses it
+        for Retry-After seconds so other threads back off too.
+        
         Args:
             url: The SEC API URL
             timeout: Request timeout in seconds
+            headers: Extra headers merged over the defaults (e.g. If-None-Match)
         
         Returns:
             Response object
@@ -359,13 +502,18 @@ class USAFinancialExtractor:
         """
         max_retries = 3
         last_exception = None
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        
+        limiter = get_sec_limiter()
         
         for attempt in range(max_retries + 1):
             try:
-                resp = requests.get(url, headers=self.headers, timeout=timeout)
+                limiter.acquire()
+                resp = http_get(url, headers=request_headers, timeout=timeout)
                 
                 # Check for rate limiting
                 if resp.status_code == 429:
+                    limiter.penalize(parse_retry_after(resp.headers.get('Retry-After')))
                     raise requests.exceptions.RequestException(
                         f"SEC API rate limited (HTTP 429). Retry-After: {resp.headers.get('Retry-After', 'unknown')}"
                     )
@@ -404,92 +552,133 @@ class USAFinancialExtractor:
     # TTL-BASED CACHING
     # ==========================================
     
-    def _cache_get(self, key: str) -> Optional[Any]:
+    def _cache_get(self, key: str, revalidate: Optional[Callable[[], Any]] = None,
+                   cache_type: str = "default") -> Optional[Any]:
         """
         Get a value from cache if it exists and hasn't expired.
         
+        With `revalidate`, an entry past its TTL but inside its stale window
+        is returned immediately and revalidate() is run in the background to
+        refresh it (stale-while-revalidate).
+        
         Args:
             key: Cache key
+            revalidate: Recomputes and re-caches the value (optional)
+            cache_type: Type of cache the entry was stored as
         
         Returns:
             Cached data or None if expired/not found
         """
-        if key not in self._cache:
+        if revalidate is None:
+            data = self._cache.get(key, category=cache_type)
+            if data is not None:
+                _logger.debug(f"Cache hit for key: {key}")
+            return data
+        
+        entry = self._cache.get_entry(key, category=cache_type)
+        if entry is None:
             return None
-        
-        entry = self._cache[key]
-        timestamp = entry.get("timestamp")
-        ttl = entry.get("ttl_seconds", self._cache_ttl["default"])
-        
-        # Check if expired
-        if timestamp:
-            age = (datetime.now() - timestamp).total_seconds()
-            if age > ttl:
-                _logger.debug(f"Cache expired for key: {key} (age: {age:.0f}s, ttl: {ttl}s)")
-                del self._cache[key]
-                return None
-        
-        _logger.debug(f"Cache hit for key: {key}")
-        return entry.get("data")
+        data, fresh_until = entry
+        if fresh_until <= time.time():
+            _logger.debug(f"Stale cache hit for key: {key}, revalidating in background")
+            get_revalidator().submit(key, revalidate)
+        else:
+            _logger.debug(f"Cache hit for key: {key}")
+        return data
     
-    def _cache_set(self, key: str, data: Any, cache_type: str = "default"):
+    def _cache_set(self, key: str, data: Any, cache_type: str = "default", ticker: Optional[str] = None):
         """
         Store a value in cache with TTL.
         
+        Written to every cache tier; in memory, least recently used entries
+        are evicted once the byte budget is full. Entries are kept for the
+        cache type's stale window past the TTL (see _cache_get).
+        
         Args:
             key: Cache key
             data: Data to cache
             cache_type: Type of cache ("market_data", "financials", "company_info", "default")
+            ticker: Company the entry belongs to (earnings-aware TTL for financials
+                    whose data carries yfinance info; base TTL otherwise)
         """
-        ttl = self._cache_ttl.get(cache_type, self._cache_ttl["default"])
+        # Earnings-aware TTL from the info already in the payload (never fetched here)
+        info = data.get("info") if isinstance(data, dict) else None
+        ttl = self._ttl_policy.ttl(cache_type, ticker, info=info)
         
-        self._cache[key] = {
-            "data": data,
-            "timestamp": datetime.now(),
-            "ttl_seconds": ttl,
-            "cache_type": cache_type
-        }
-        _logger.debug(f"Cache set for key: {key} (ttl: {ttl}s)")
+        if self._cache.set(key, data, ttl=ttl, category=cache_type, stale_ttl=stale_window(cache_type)):
+            _logger.debug(f"Cache set for key: {key} (ttl: {ttl}s)")
     
     def _cache_clear(self, key: Optional[str] = None):
         """
         Clear cache entries.
         
         Args:
-            key: Specific key to clear, or None to clear all
+            key: Specific key to clear, or None to clear all (every tier,
+                 including the Redis tier shared with other replicas)
         """
         if key:
-            if key in self._cache:
-                del self._cache[key]
+            if self._cache.delete(key):
                 _logger.info(f"Cache cleared for key: {key}")
         else:
-            self._cache.clear()
+            self._cache.clear(shared=True)
             _logger.info("Cache cleared (all entries)")
     
+    @staticmethod
+    def _raw_cache_key(source: str, ticker: str) -> str:
+        """Cache key of one source's raw payload for a ticker (independent of view options)."""
+        return f"raw:{source}:{ticker.upper()}"
+    
+    def _raw_payload(self, source: str, ticker: str, fetch: Callable[[], Any],
+                     use_cache: bool = True) -> Any:
+        """
+        Raw upstream payload of one source, cached once per ticker.
+        
+        extract_financials() results are cached per view (filing types,
+        fiscal year offset, quant); the payloads they are computed from are
+        cached here, so another view of the same ticker needs no network.
+        Concurrent misses for the same payload share one fetch. Error
+        payloads and exceptions are not cached.
+        
+        Args:
+            source: Key in RAW_SOURCE_CATEGORIES
+            ticker: Stock symbol
+            fetch: Downloads the payload
+            use_cache: False to bypass the cache (the fresh payload is still stored)
+        
+        Returns:
+            The payload returned by fetch() (or its cached copy)
+        """
+        key = self._raw_cache_key(source, ticker)
+        category = self.RAW_SOURCE_CATEGORIES.get(source, "default")
+        if use_cache:
+            cached = self._cache_get(
+                key, cache_type=category,
+                revalidate=lambda: self._raw_payload(source, ticker, fetch, use_cache=False))
+            if cached is not None:
+                return cached
+        return get_flight_group().do(("raw", key), self._fetch_raw_payload, key, category, ticker, fetch)
+    
+    def _fetch_raw_payload(self, key: str, category: str, ticker: str, fetch: Callable[[], Any]) -> Any:
+        payload = fetch()
+        if payload and not (isinstance(payload, dict) and payload.get("status") == "error"):
+            self._cache_set(key, payload, cache_type=category, ticker=ticker)
+        return payload
+    
     def _cache_stats(self) -> Dict:
         """
         Get cache statistics.
         
         Returns:
-            Dict with cache stats
+            Dict with cache stats (entries/bytes per type, hits, misses, evictions,
+            hits per tier)
         """
-        now = datetime.now()
-        stats = {
-            "total_entries": len(self._cache),
-            "entries_by_type": {},
-            "expired_count": 0
-        }
-        
-        for key, entry in self._cache.items():
-            cache_type = entry.get("cache_type", "default")
-            stats["entries_by_type"][cache_type] = stats["entries_by_type"].get(cache_type, 0) + 1
-            
-            # Check if expired
-            timestamp = entry.get("timestamp")
-            ttl = entry.get("ttl_seconds", 3600)
-            if timestamp and (now - timestamp).total_seconds() > ttl:
-                stats["expired_count"] += 1
-        
+        stats = self._cache.stats()
+        stats.update(
+            companyfacts_store=self._facts_store.stats(),
+            facts_warehouse=self._warehouse.stats(),
+            sec_rate_limiter=get_sec_limiter().stats(),
+            revalidation=get_revalidator().stats(),
+        )
         return stats
     
     # ==========================================
@@ -593,6 +782,9 @@ class USAFinancialExtractor:
         """
         Convert stock ticker to SEC CIK number.
         
+        Uses the process-wide CIK index (loaded once, persisted to disk),
+        so repeated extractions don't re-download company_tickers.json.
+        
         Args:
             ticker: Stock symbol (e.g., "AAPL", "MSFT")
             
@@ -600,21 +792,7 @@ class USAFinancialExtractor:
             10-digit CIK string or None if not found
         """
         try:
-            # SEC maintains a ticker-to-CIK mapping
-            url = "https://www.sec.gov/files/company_tickers.json"
-            resp = self._make_sec_request(url, timeout=10)
-            resp.raise_for_status()
-            
-            data = resp.json()
-            ticker_upper = ticker.upper().strip()
-            
-            # Search through mapping
-            for item in data.values():
-                if item.get("ticker") == ticker_upper:
-                    cik = str(item["cik_str"]).zfill(10)  # Pad to 10 digits
-                    return cik
-            
-            return None
+            return lookup_cik(ticker)
         except Exception as e:
             print(f"[ERROR] CIK Lookup Failed: {e}")
             return None
@@ -647,7 +825,8 @@ class USAFinancialExtractor:
     # 2. SEC EDGAR API EXTRACTION
     # ==========================================
     
-    def extract_from_sec(self, ticker: str, years: int = 5, filing_types: List[str] = ["10-K"]) -> Dict:
+    def extract_from_sec(self, ticker: str, years: int = 5, filing_types: List[str] = ["10-K"],
+                         use_cache: bool = True, as_of: Optional[Any] = None) -> Dict:
         """
         Extract financial data from SEC EDGAR API using XBRL format.
         This is the most accurate source for USA companies.
@@ -655,6 +834,9 @@ class USAFinancialExtractor:
         Args:
             ticker: Stock symbol
             years: Number of years of historical data
+            filing_types: SEC forms the statements are built from
+            use_cache: Reuse the fact table cached for this ticker (any filing types)
+            as_of: Only use facts filed on or before this date (point-in-time view)
             
         Returns:
             Dictionary with financial statements (income, balance, cashflow)
@@ -669,33 +851,31 @@ class USAFinancialExtractor:
             _logger.warning(f"CIK not found for ticker: {ticker}")
             return {"status": "error", "message": "CIK not found"}
         
-        # 2. Fetch Company Facts (XBRL data) with retry logic
+        # 2. Fact table for the requested tags, cached per ticker for every filing type
         try:
-            url = f"{self.sec_base_url}/companyfacts/CIK{cik}.json"
-            resp = self._make_sec_request(url, timeout=15)
-            resp.raise_for_status()
-            data = resp.json()
-            
-            # 3. Extract Facts
-            facts = data.get("facts", {})
-            us_gaap = facts.get("us-gaap", {})
+            raw = self._raw_payload('sec', ticker, lambda: self._fetch_sec_facts(cik), use_cache=use_cache)
+            facts = self._fact_table(raw)
+            if as_of is not None:
+                facts = facts.as_of(as_of)
             
-            # 4. Build Financial Statements
+            # 3. Build Financial Statements
             filing_label = " + ".join(filing_types)
             _logger.debug(f"Extracting {filing_label} filings for {ticker}")
             print(f"   Extracting {filing_label} filings...")
             
             financials = {
                 "ticker": ticker.upper(),
-                "company_name": data.get("entityName", ticker),
+                "company_name": facts.entity_name or ticker,
                 "cik": cik,
                 "filing_types": filing_types,
                 "extraction_time": f"{time.time() - t0:.2f}s",
-                "income_statement": self._extract_income_statement(us_gaap, filing_types),
-                "balance_sheet": self._extract_balance_sheet(us_gaap, filing_types),
-                "cash_flow": self._extract_cash_flow(us_gaap, filing_types),
-                "per_share_data": self._extract_per_share_data(us_gaap, filing_types)
+                "income_statement": self._extract_income_statement(facts, filing_types),
+                "balance_sheet": self._extract_balance_sheet(facts, filing_types),
+                "cash_flow": self._extract_cash_flow(facts, filing_types),
+                "per_share_data": self._extract_per_share_data(facts, filing_types)
             }
+            if as_of is not None:
+                financials["as_of"] = pd.Timestamp(as_of).date().isoformat()
             
             # Normalize DataFrame indices from SEC format (underscores) to yfinance format (spaces)
             financials = self._normalize_financials(financials)
@@ -722,163 +902,149 @@ class USAFinancialExtractor:
             EngineLogger.log_data_extraction(ticker, success=False, error=str(e))
             return {"status": "error", "message": f"Extraction failed: {e}"}
     
-    def _extract_income_statement(self, us_gaap: Dict, filing_types: List[str] = ["10-K"]) -> pd.DataFrame:
+    # XBRL tag search maps: metric -> candidate tags in preference order
+    INCOME_STATEMENT_TAGS = {
+        "Revenue": ["Revenues", "SalesRevenueNet", "RevenueFromContractWithCustomerExcludingAssessedTax"],
+        "Cost_of_Revenue": ["CostOfRevenue", "CostOfGoodsAndServicesSold"],
+        "Gross_Profit": ["GrossProfit"],
+        "Operating_Expenses": ["OperatingExpenses"],
+        "Operating_Income": ["OperatingIncomeLoss"],
+        "Interest_Expense": ["InterestExpense"],
+        "Pretax_Income": ["IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest"],
+        "Tax_Expense": ["IncomeTaxExpenseBenefit"],
+        "Net_Income": ["NetIncomeLoss", "ProfitLoss"]
+    }
+    
+    BALANCE_SHEET_TAGS = {
+        "Total_Assets": ["Assets"],
+        "Total_Liabilities": ["Liabilities"],
+        "Total_Equity": ["StockholdersEquity", "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest"],
+        "Cash": ["CashAndCashEquivalentsAtCarryingValue"],
+        "Total_Debt": ["LongTermDebtAndCapitalLeaseObligations", "DebtCurrent"],
+        "Current_Assets": ["AssetsCurrent"],
+        "Current_Liabilities": ["LiabilitiesCurrent"]
+    }
+    
+    CASH_FLOW_TAGS = {
+        "Operating_Cash_Flow": ["NetCashProvidedByUsedInOperatingActivities"],
+        "Investing_Cash_Flow": ["NetCashProvidedByUsedInInvestingActivities"],
+        "Financing_Cash_Flow": ["NetCashProvidedByUsedInFinancingActivities"],
+        "Capex": ["PaymentsToAcquirePropertyPlantAndEquipment"]
+    }
+    
+    PER_SHARE_TAGS = {
+        "Basic_EPS": ["EarningsPerShareBasic"],
+        "Diluted_EPS": ["EarningsPerShareDiluted"],
+        "Shares_Outstanding": ["WeightedAverageNumberOfSharesOutstandingBasic"]
+    }
+    # EPS might be in USD/shares or just shares
+    PER_SHARE_UNITS = ("USD/shares", "shares", "pure")
+    
+    @classmethod
+    def _requested_xbrl_tags(cls) -> frozenset:
+        """All XBRL tags referenced by the statement search maps."""
+        tag_maps = (cls.INCOME_STATEMENT_TAGS, cls.BALANCE_SHEET_TAGS,
+                    cls.CASH_FLOW_TAGS, cls.PER_SHARE_TAGS)
+        return frozenset(tag for search_map in tag_maps
+                         for candidates in search_map.values() for tag in candidates)
+    
+    def _facts_from_warehouse(self, cik: str) -> Optional[XBRLFactTable]:
+        """Load facts from the bulk warehouse if it is fresh and has the tags we need."""
+        tags = self._requested_xbrl_tags()
+        if not self._warehouse.is_fresh() or not self._warehouse.covers(tags):
+            return None
+        try:
+            return self._warehouse.get_fact_table(cik, tags=tags)
+        except Exception as e:
+            _logger.warning(f"Warehouse read failed for CIK {cik}: {e}")
+            return None
+    
+    def _fetch_sec_facts(self, cik: str) -> Dict:
+        """
+        Raw SEC payload for _raw_payload(): the requested tags as a fact frame.
+        
+        Company Facts come from the local warehouse, else the disk store
+        (refreshed only when the filings index shows a new 10-K/10-Q), and
+        are indexed once into a columnar table.
+        """
+        tags = self._requested_xbrl_tags()
+        facts = self._facts_from_warehouse(cik) if self.use_warehouse else None
+        if facts is not None:
+            _logger.debug(f"CIK {cik}: companyfacts served from local warehouse")
+        elif self.stream_facts:
+            facts = self._facts_store.read_company_facts(
+                cik, self._make_sec_request,
+                lambda stream: parse_companyfacts_stream(stream, tags=tags),
+                timeout=15,
+            )
+        else:
+            data = self._facts_store.get_company_facts(cik, self._make_sec_request, timeout=15)
+            facts = XBRLFactTable.from_companyfacts(data, tags=tags)
+        return {"cik": cik, "entity_name": facts.entity_name, "facts": facts.to_frame()}
+    
+    def _fact_table(self, raw: Dict) -> XBRLFactTable:
+        """
+        XBRLFactTable for a cached raw SEC payload.
+        
+        Built once per payload object, so repeated calls - e.g. a backtest
+        asking for hundreds of as-of dates - reuse the table and its
+        filing-date index instead of rebuilding them.
+        """
+        cik, frame = raw["cik"], raw["facts"]
+        with self._fact_tables_lock:
+            memo = self._fact_tables.get(cik)
+            if memo is not None and memo[0] is frame:
+                self._fact_tables.move_to_end(cik)
+                return memo[1]
+        
+        table = XBRLFactTable.from_frame(frame, entity_name=raw["entity_name"], cik=cik)
+        with self._fact_tables_lock:
+            self._fact_tables[cik] = (frame, table)
+            self._fact_tables.move_to_end(cik)
+            while len(self._fact_tables) > FACT_TABLE_MEMO_SIZE:
+                self._fact_tables.popitem(last=False)
+        return table
+    
+    @staticmethod
+    def _as_fact_table(facts) -> XBRLFactTable:
+        """Accept a prebuilt XBRLFactTable or a raw us-gaap concepts dict."""
+        if isinstance(facts, XBRLFactTable):
+            return facts
+        return XBRLFactTable.from_concepts(facts or {})
+    
+    def _extract_income_statement(self, facts, filing_types: List[str] = ["10-K"]) -> pd.DataFrame:
         """
         Extract income statement line items from XBRL data
         
         Args:
-            us_gaap: XBRL data dictionary
+            facts: XBRLFactTable (or raw us-gaap dict)
             filing_types: List of SEC filing types to extract
                          ["10-K"] = Annual only
                          ["10-Q"] = Quarterly only
                          ["10-K", "10-Q"] = Both annual and quarterly
                          ["S-1"] = IPO filings
         """
-        metrics = {}
-        
-        # Define what we're looking for (using XBRL tags)
-        search_map = {
-            "Revenue": ["Revenues", "SalesRevenueNet", "RevenueFromContractWithCustomerExcludingAssessedTax"],
-            "Cost_of_Revenue": ["CostOfRevenue", "CostOfGoodsAndServicesSold"],
-            "Gross_Profit": ["GrossProfit"],
-            "Operating_Expenses": ["OperatingExpenses"],
-            "Operating_Income": ["OperatingIncomeLoss"],
-            "Interest_Expense": ["InterestExpense"],
-            "Pretax_Income": ["IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest"],
-            "Tax_Expense": ["IncomeTaxExpenseBenefit"],
-            "Net_Income": ["NetIncomeLoss", "ProfitLoss"]
-        }
-        
-        # Search for each metric
-        for metric_name, xbrl_tags in search_map.items():
-            for tag in xbrl_tags:
-                if tag in us_gaap:
-                    # Extract values for specified filing types
-                    values = us_gaap[tag].get("units", {})
-                    if "USD" in values:
-                        # Filter by filing type
-                        filtered_data = [
-                            item for item in values["USD"]
-                            if item.get("form") in filing_types and "val" in item
-                        ]
-                        if filtered_data:
-                            metrics[metric_name] = filtered_data
-                            break
-        
-        # Convert to DataFrame
-        return self._format_time_series(metrics)
-    
-    def _extract_balance_sheet(self, us_gaap: Dict, filing_types: List[str] = ["10-K"]) -> pd.DataFrame:
+        return self._as_fact_table(facts).statement(self.INCOME_STATEMENT_TAGS, filing_types)
+    
+    def _extract_balance_sheet(self, facts, filing_types: List[str] = ["10-K"]) -> pd.DataFrame:
         """Extract balance sheet items from XBRL data"""
-        metrics = {}
-        
-        search_map = {
-            "Total_Assets": ["Assets"],
-            "Total_Liabilities": ["Liabilities"],
-            "Total_Equity": ["StockholdersEquity", "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest"],
-            "Cash": ["CashAndCashEquivalentsAtCarryingValue"],
-            "Total_Debt": ["LongTermDebtAndCapitalLeaseObligations", "DebtCurrent"],
-            "Current_Assets": ["AssetsCurrent"],
-            "Current_Liabilities": ["LiabilitiesCurrent"]
-        }
-        
-        for metric_name, xbrl_tags in search_map.items():
-            for tag in xbrl_tags:
-                if tag in us_gaap:
-                    values = us_gaap[tag].get("units", {})
-                    if "USD" in values:
-                        filtered_data = [
-                            item for item in values["USD"]
-                            if item.get("form") in filing_types and "val" in item
-                        ]
-                        if filtered_data:
-                            metrics[metric_name] = filtered_data
-                            break
-        
-        return self._format_time_series(metrics)
-    
-    def _extract_cash_flow(self, us_gaap: Dict, filing_types: List[str] = ["10-K"]) -> pd.DataFrame:
+        return self._as_fact_table(facts).statement(self.BALANCE_SHEET_TAGS, filing_types)
+    
+    def _extract_cash_flow(self, facts, filing_types: List[str] = ["10-K"]) -> pd.DataFrame:
         """Extract cash flow statement from XBRL data"""
-        metrics = {}
-        
-        search_map = {
-            "Operating_Cash_Flow": ["NetCashProvidedByUsedInOperatingActivities"],
-            "Investing_Cash_Flow": ["NetCashProvidedByUsedInInvestingActivities"],
-            "Financing_Cash_Flow": ["NetCashProvidedByUsedInFinancingActivities"],
-            "Capex": ["PaymentsToAcquirePropertyPlantAndEquipment"]
-        }
-        
-        for metric_name, xbrl_tags in search_map.items():
-            for tag in xbrl_tags:
-                if tag in us_gaap:
-                    values = us_gaap[tag].get("units", {})
-                    if "USD" in values:
-                        filtered_data = [
-                            item for item in values["USD"]
-                            if item.get("form") in filing_types and "val" in item
-                        ]
-                        if filtered_data:
-                            metrics[metric_name] = filtered_data
-                            break
-        
-        return self._format_time_series(metrics)
-    
-    def _extract_per_share_data(self, us_gaap: Dict, filing_types: List[str] = ["10-K"]) -> pd.DataFrame:
+        return self._as_fact_table(facts).statement(self.CASH_FLOW_TAGS, filing_types)
+    
+    def _extract_per_share_data(self, facts, filing_types: List[str] = ["10-K"]) -> pd.DataFrame:
         """Extract EPS and other per-share metrics"""
-        metrics = {}
-        
-        search_map = {
-            "Basic_EPS": ["EarningsPerShareBasic"],
-            "Diluted_EPS": ["EarningsPerShareDiluted"],
-            "Shares_Outstanding": ["WeightedAverageNumberOfSharesOutstandingBasic"]
-        }
-        
-        for metric_name, xbrl_tags in search_map.items():
-            for tag in xbrl_tags:
-                if tag in us_gaap:
-                    # EPS might be in USD/shares or just shares
-                    for unit_type in ["USD/shares", "shares", "pure"]:
-                        values = us_gaap[tag].get("units", {})
-                        if unit_type in values:
-                            filtered_data = [
-                                item for item in values[unit_type]
-                                if item.get("form") in filing_types and "val" in item
-                            ]
-                            if filtered_data:
-                                metrics[metric_name] = filtered_data
-                                break
-        
-        return self._format_time_series(metrics)
-    
-    def _format_time_series(self, metrics: Dict) -> pd.DataFrame:
-        """Convert raw XBRL data to clean time-series DataFrame"""
-        if not metrics:
-            return pd.DataFrame()
-        
-        # Build rows for each year
-        rows = {}
-        for metric_name, data_points in metrics.items():
-            for point in data_points:
-                year = point.get("fy")  # Fiscal year
-                value = point.get("val")
-                
-                if year and value:
-                    if year not in rows:
-                        rows[year] = {}
-                    rows[year][metric_name] = value
-        
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(rows, orient="index")
-        df.index.name = "Year"
-        df = df.sort_index(ascending=False)  # Most recent first
-        
-        return df
+        return self._as_fact_table(facts).statement(self.PER_SHARE_TAGS, filing_types,
+                                                    units=self.PER_SHARE_UNITS)
     
     # ==========================================
     # 3. YFINANCE FALLBACK EXTRACTION
     # ==========================================
     
-    def extract_from_yfinance(self, ticker: str, fiscal_year_offset: int = 0) -> Dict:
+    def extract_from_yfinance(self, ticker: str, fiscal_year_offset: int = 0,
+                              use_cache: bool = True) -> Dict:
         """
         Fallback extractor using yfinance (Yahoo Finance).
         Faster but less comprehensive than SEC API.
@@ -886,6 +1052,7 @@ class USAFinancialExtractor:
         Args:
             ticker: Stock symbol
             fiscal_year_offset: Which fiscal year to extract (0=latest, 1=previous year, etc.)
+            use_cache: Reuse the raw yfinance payload cached for this ticker (any offset)
         """
         if not YFINANCE_AVAILABLE:
             _logger.warning("yfinance not available for extraction")
@@ -896,69 +1063,11 @@ class USAFinancialExtractor:
         t0 = time.time()
         
         try:
-            stock = yf.Ticker(ticker)
-            
-            # Get financial statements with retry logic for rate limiting
-            def get_financials_with_retry():
-                """Fetch financials with retry on rate limit"""
-                max_retries = 3
-                for attempt in range(max_retries + 1):
-                    try:
-                        income = stock.financials
-                        bal = stock.balance_sheet
-                        cf = stock.cashflow
-                        return income, bal, cf
-                    except Exception as e:
-                        error_str = str(e).lower()
-                        if 'rate limit' in error_str or 'too many requests' in error_str or '429' in error_str:
-                            if attempt < max_retries:
-                                delay = 2.0 * (2 ** attempt)
-                                _logger.warning(f"yfinance rate limited, retry {attempt + 1}/{max_retries} after {delay:.1f}s")
-                                print(f"   [RETRY] Rate limited, waiting {delay:.1f}s...")
-                                time.sleep(delay)
-                            else:
-                                raise
-                        else:
-                            raise
-                return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-            
-            income_stmt, balance, cashflow = get_financials_with_retry()
-            
-            # Get historical prices (back to 1990 or IPO) with retry
-            print(f"   Fetching historical prices...")
-            historical_prices = pd.DataFrame()
-            for attempt in range(3):
-                try:
-                    historical_prices = stock.history(period="max", start="1990-01-01")
-                    break
-                except Exception as e:
-                    if 'rate limit' in str(e).lower() or '429' in str(e):
-                        if attempt < 2:
-                            delay = 2.0 * (2 ** attempt)
-                            _logger.warning(f"yfinance history rate limited, retry after {delay:.1f}s")
-                            time.sleep(delay)
-                        else:
-                            _logger.error(f"Failed to fetch history after retries: {e}")
-                    else:
-                        raise
-            
-            # Get current market data with explicit error handling and retry
-            info = {}
-            for attempt in range(3):
-                try:
-                    info = stock.info
-                    break
-                except Exception as e:
-                    if 'rate limit' in str(e).lower() or '429' in str(e):
-                        if attempt < 2:
-                            delay = 2.0 * (2 ** attempt)
-                            _logger.warning(f"yfinance info rate limited, retry after {delay:.1f}s")
-                            time.sleep(delay)
-                        else:
-                            _logger.error(f"Failed to fetch info after retries: {e}")
-                            info = {}
-                    else:
-                        raise
+            raw = self._raw_payload('yfinance_statements', ticker,
+                                    lambda: self._fetch_yfinance_statements(ticker), use_cache=use_cache)
+            income_stmt, balance, cashflow = raw["income_statement"], raw["balance_sheet"], raw["cash_flow"]
+            historical_prices = raw["historical_prices"]
+            info = raw["info"] or {}
             
             current_price = info.get("currentPrice", info.get("regularMarketPrice", 0))
             shares = info.get("sharesOutstanding", 0)
@@ -1026,22 +1135,114 @@ class USAFinancialExtractor:
             EngineLogger.log_data_extraction(ticker, success=False, error=str(e))
             return {"status": "error", "message": f"yfinance extraction failed: {e}"}
     
+    def _fetch_yfinance_statements(self, ticker: str) -> Dict:
+        """
+        Raw yfinance payload for _raw_payload(): annual statements, full price
+        history and info, before any fiscal-year selection.
+        
+        Raises:
+            Exception: yfinance failures other than exhausted rate-limit retries
+        """
+        stock = yf.Ticker(ticker)
+        
+        # Get financial statements with retry logic for rate limiting
+        def get_financials_with_retry():
+            """Fetch financials with retry on rate limit"""
+            max_retries = 3
+            for attempt in range(max_retries + 1):
+                try:
+                    income = stock.financials
+                    bal = stock.balance_sheet
+                    cf = stock.cashflow
+                    return income, bal, cf
+                except Exception as e:
+                    error_str = str(e).lower()
+                    if 'rate limit' in error_str or 'too many requests' in error_str or '429' in error_str:
+                        if attempt < max_retries:
+                            delay = 2.0 * (2 ** attempt)
+                            _logger.warning(f"yfinance rate limited, retry {attempt + 1}/{max_retries} after {delay:.1f}s")
+                            print(f"   [RETRY] Rate limited, waiting {delay:.1f}s...")
+                            time.sleep(delay)
+                        else:
+                            raise
+                    else:
+                        raise
+            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        
+        income_stmt, balance, cashflow = get_financials_with_retry()
+        
+        # Get historical prices (back to 1990 or IPO) with retry
+        print(f"   Fetching historical prices...")
+        historical_prices = pd.DataFrame()
+        for attempt in range(3):
+            try:
+                historical_prices = stock.history(period="max", start="1990-01-01")
+                break
+            except Exception as e:
+                if 'rate limit' in str(e).lower() or '429' in str(e):
+                    if attempt < 2:
+                        delay = 2.0 * (2 ** attempt)
+                        _logger.warning(f"yfinance history rate limited, retry after {delay:.1f}s")
+                        time.sleep(delay)
+                    else:
+                        _logger.error(f"Failed to fetch history after retries: {e}")
+                else:
+                    raise
+        
+        # Get current market data with explicit error handling and retry
+        info = {}
+        for attempt in range(3):
+            try:
+                info = stock.info
+                break
+            except Exception as e:
+                if 'rate limit' in str(e).lower() or '429' in str(e):
+                    if attempt < 2:
+                        delay = 2.0 * (2 ** attempt)
+                        _logger.warning(f"yfinance info rate limited, retry after {delay:.1f}s")
+                        time.sleep(delay)
+                    else:
+                        _logger.error(f"Failed to fetch info after retries: {e}")
+                        info = {}
+                else:
+                    raise
+        
+        return {
+            "income_statement": income_stmt,
+            "balance_sheet": balance,
+            "cash_flow": cashflow,
+            "historical_prices": historical_prices,
+            "info": info,
+        }
+    
     # ==========================================
     # 4. SMART EXTRACTION (Multi-Source)
     # ==========================================
     
+    @single_flight()
     def extract_financials(self, ticker: str, source: str = "auto", filing_types: List[str] = ["10-K"], 
                           include_quant: bool = False, fiscal_year_offset: int = 0,
-                          use_cache: bool = True) -> Dict:
+                          use_cache: bool = True, as_of: Optional[Any] = None) -> Dict:
         """
         Smart extractor that chooses best source automatically.
+        Concurrent calls with the same arguments (from any extractor instance)
+        wait for the one already running instead of extracting again.
+        
+        Results are cached per combination of arguments, and the upstream
+        payloads they are built from are cached per ticker (_raw_payload), so
+        switching filing types, fiscal year offset or quant for a ticker that
+        was already extracted is computed locally.
         
         Args:
             ticker: Stock symbol
             source: "sec", "yfinance", or "auto" (tries SEC first)
             filing_types: List of SEC filing types ["10-K"], ["10-Q"], ["10-K", "10-Q"]
             include_quant: If True, run Fama-French quant analysis
-            use_cache: If True, use cached data if available and not expired
+            use_cache: If True, use cached data (results and raw payloads) if available and not expired
+            as_of: Point-in-time view for backtesting: statements from SEC facts filed
+                   on or before this date only. Live sources (yfinance, FMP, Alpha
+                   Vantage, quant) are left out since they would leak later data;
+                   views are built from the cached fact table and not cached themselves.
             
         Returns:
             Comprehensive financial data dictionary
@@ -1056,19 +1257,26 @@ class USAFinancialExtractor:
         if ticker in PROBLEMATIC_TICKERS:
             _logger.warning(f"Ticker {ticker}: {PROBLEMATIC_TICKERS[ticker]}")
         
+        if as_of is not None:
+            return self._extract_as_of(ticker, source, filing_types, as_of, use_cache)
+        
         # Generate cache key based on parameters
-        cache_key = f"{ticker}_{source}_{','.join(filing_types)}_{include_quant}_{fiscal_year_offset}"
+        cache_key = self._extraction_cache_key(ticker, source, filing_types, include_quant, fiscal_year_offset)
         
-        # Check cache first (if enabled)
+        # Check cache first (if enabled); a stale result is served while it is re-extracted
         if use_cache:
-            cached_data = self._cache_get(cache_key)
+            cached_data = self._cache_get(
+                cache_key, cache_type="financials",
+                revalidate=lambda: self.extract_financials(ticker, source, filing_types, include_quant,
+                                                           fiscal_year_offset, use_cache=False))
             if cached_data:
                 _logger.info(f"Returning cached data for {ticker}")
                 print(f"[CACHE] Using cached data for {ticker}")
                 return cached_data
         
         # Capture overall start time for accurate extraction time
-        self._overall_start_time = time.time()
+        # (local, so concurrent extract_many() workers don't share it)
+        overall_start_time = time.time()
         
         # Validate ticker first
         is_valid, result = self.validate_ticker(ticker)
@@ -1079,70 +1287,61 @@ class USAFinancialExtractor:
         if source == "auto":
             print(f"\n[INFO] AUTO MODE: Extracting {ticker} ({result})")
             
-            # PARALLEL EXTRACTION: Run SEC and yfinance info fetch simultaneously
-            sec_data = None
-            yf_info = None
-            yf_market_data = None
-            
-            def fetch_sec():
-                return self.extract_from_sec(ticker, filing_types=filing_types)
-            
-            def fetch_yf_info():
-                if YFINANCE_AVAILABLE:
-                    try:
-                        # Use centralized cache to prevent rate limiting
-                        info = get_ticker_info(ticker)
-                        market_data = {
-                            'current_price': info.get('currentPrice') or info.get('regularMarketPrice'),
-                            'market_cap': info.get('marketCap'),
-                            'volume': info.get('volume'),
-                            'beta': info.get('beta'),
-                            'fifty_two_week_high': info.get('fiftyTwoWeekHigh'),
-                            'fifty_two_week_low': info.get('fiftyTwoWeekLow'),
-                            'shares_outstanding': info.get('sharesOutstanding'),
-                        }
-                        return info, market_data
-                    except Exception as e:
-                        print(f"   [PARALLEL] yfinance info fetch failed: {e}")
-                return None, None
+            # FAN-OUT: start every independent source at once (per-source timeouts),
+            # so a cold ticker costs roughly the slowest source, not the sum.
+            # FMP / AlphaVantage stay lazy (fetched by gap filling only when a
+            # field still needs them) - their free tiers allow a few dozen
+            # calls a day, which a warm-up run would spend in minutes.
+            fetchers = {'sec': lambda: self.extract_from_sec(ticker, filing_types=filing_types,
+                                                             use_cache=use_cache)}
+            if YFINANCE_AVAILABLE:
+                # Use centralized cache to prevent rate limiting
+                fetchers['yfinance_info'] = lambda: get_ticker_info(ticker)
+                # Statements are the fallback if SEC fails - fetched now so it costs no extra wait
+                fetchers['yfinance_statements'] = lambda: self.extract_from_yfinance(
+                    ticker, fiscal_year_offset=fiscal_year_offset, use_cache=use_cache)
             
-            print(f"   [PARALLEL] Starting parallel extraction (SEC + yfinance)...")
+            print(f"   [PARALLEL] Fetching {', '.join(fetchers)} concurrently...")
             parallel_start = time.time()
+            fetched = fan_out(fetchers, timeouts=self.SOURCE_TIMEOUTS)
+            print(f"   [PARALLEL] Fan-out completed in {time.time() - parallel_start:.2f}s")
             
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                sec_future = executor.submit(fetch_sec)
-                yf_future = executor.submit(fetch_yf_info)
-                
-                sec_data = sec_future.result()
-                yf_info, yf_market_data = yf_future.result()
-            
-            print(f"   [PARALLEL] Parallel extraction completed in {time.time() - parallel_start:.2f}s")
+            sec_result = fetched['sec']
+            sec_data = sec_result.value if sec_result.ok else None
             
             # Use SEC data if available
             if sec_data and ("status" not in sec_data or sec_data["status"] != "error"):
                 financials = sec_data
                 primary_source = "sec"
-                # Pre-populate yfinance info to avoid redundant call in _fill_data_gaps
-                if yf_info:
-                    financials['info'] = yf_info
-                    financials['market_data'] = yf_market_data
-                    print(f"   [PARALLEL] Pre-populated yfinance info ({len(yf_info)} fields)")
             else:
                 print("[WARN] SEC extraction failed, trying Yahoo Finance...")
-                # Fallback to yfinance
-                financials = self.extract_from_yfinance(ticker, fiscal_year_offset=fiscal_year_offset)
+                statements = fetched.get('yfinance_statements')
+                if statements is None:
+                    financials = self.extract_from_yfinance(ticker, fiscal_year_offset=fiscal_year_offset,
+                                                            use_cache=use_cache)
+                elif statements.ok:
+                    financials = statements.value
+                else:
+                    financials = {"status": "error", "message": f"yfinance extraction failed: {statements.error}"}
                 primary_source = "yfinance"
             
-            # PHASE 1: Field-level gap filling (skips yfinance call if info already present)
-            financials = self._fill_data_gaps(ticker, financials, primary_source)
+            # PHASE 1: Field-level gap filling from the already-fetched payloads
+            financials = self._fill_data_gaps(ticker, financials, primary_source, prefetched=fetched,
+                                              use_cache=use_cache)
+            if "status" not in financials or financials.get("status") != "error":
+                financials['_fetch_timings'] = {
+                    name: {'status': r.status, 'elapsed': round(r.elapsed, 3)}
+                    for name, r in fetched.items()
+                }
         
         # Manual source selection
         elif source == "sec":
-            financials = self.extract_from_sec(ticker, filing_types=filing_types)
+            financials = self.extract_from_sec(ticker, filing_types=filing_types, use_cache=use_cache)
             # Still run gap filling for SEC to get yfinance info and fill gaps
-            financials = self._fill_data_gaps(ticker, financials, "sec")
+            financials = self._fill_data_gaps(ticker, financials, "sec", use_cache=use_cache)
         elif source == "yfinance":
-            financials = self.extract_from_yfinance(ticker, fiscal_year_offset=fiscal_year_offset)
+            financials = self.extract_from_yfinance(ticker, fiscal_year_offset=fiscal_year_offset,
+                                                    use_cache=use_cache)
         else:
             return {"status": "error", "message": f"Unknown source: {source}"}
         
@@ -1150,28 +1349,157 @@ class USAFinancialExtractor:
         if include_quant and QUANT_ENGINE_AVAILABLE:
             try:
                 print(f"\n[QUANT] Running Quantitative Analysis (Fama-French)...")
-                quant = QuantEngine()
-                quant_results = quant.analyze_stock(ticker)
+                quant_results = self._raw_payload(
+                    'quant', ticker, lambda: QuantEngine().analyze_stock(ticker), use_cache=use_cache)
                 financials["quant_analysis"] = quant_results
             except Exception as e:
                 print(f"[WARN] Quant analysis failed: {e}")
                 financials["quant_analysis"] = {"status": "error", "message": str(e)}
         
         # Update extraction time to include quant analysis
-        if "extraction_time" in financials and hasattr(self, '_overall_start_time'):
-            financials["extraction_time"] = f"{time.time() - self._overall_start_time:.2f}s"
+        if "extraction_time" in financials:
+            financials["extraction_time"] = f"{time.time() - overall_start_time:.2f}s"
         
         # Validate extraction results
         if "status" not in financials or financials.get("status") != "error":
             validation_result = self.validate_extraction(financials)
             financials['_validation'] = validation_result
+            # Statements as one canonical field x period matrix (see utils.financials_panel)
+            financials['panel'] = FinancialsPanel.from_financials(financials)
             
             # Cache the results (only if successful)
-            self._cache_set(cache_key, financials, cache_type="financials")
+            self._cache_set(cache_key, financials, cache_type="financials", ticker=ticker)
             _logger.info(f"Cached financial data for {ticker}")
         
         return financials
     
+    def _extract_as_of(self, ticker: str, source: str, filing_types: List[str], as_of: Any,
+                       use_cache: bool = True) -> Dict:
+        """Point-in-time branch of extract_financials() (SEC facts filed by `as_of`)."""
+        if source not in ("auto", "sec"):
+            return {"status": "error", "message": f"as_of needs SEC data (source={source!r})"}
+        try:
+            pd.Timestamp(as_of)
+        except (ValueError, TypeError) as e:
+            return {"status": "error", "message": f"Invalid as_of date {as_of!r}: {e}"}
+        
+        financials = self.extract_from_sec(ticker, filing_types=filing_types, use_cache=use_cache, as_of=as_of)
+        if financials.get("status") != "error":
+            financials['_validation'] = self.validate_extraction(financials)
+            financials['panel'] = FinancialsPanel.from_financials(financials)
+        return financials
+    
+    @staticmethod
+    def _extraction_cache_key(ticker: str, source: str = "auto", filing_types: List[str] = ["10-K"],
+                              include_quant: bool = False, fiscal_year_offset: int = 0) -> str:
+        """Result cache key for an extract_financials() call (ticker already normalized)."""
+        return f"{ticker}_{source}_{','.join(filing_types)}_{include_quant}_{fiscal_year_offset}"
+    
+    # ==========================================
+    # 4A. BATCH EXTRACTION
+    # ==========================================
+    
+    def _prefetch_cached(self, tickers: List[str], source: str = "auto", filing_types: List[str] = ["10-K"],
+                         include_quant: bool = False, fiscal_year_offset: int = 0,
+                         use_cache: bool = True, as_of: Optional[Any] = None,
+                         **_ignored) -> Dict[str, Dict]:
+        """
+        Cached extraction results for many tickers in one lookup.
+        
+        L1/L2 are checked per key and everything else goes to Redis in a
+        single pipelined round-trip, instead of one round-trip per ticker.
+        Point-in-time (as_of) views are never cached as results, so nothing
+        is prefetched for them - the latest result would leak later data.
+        
+        Returns:
+            Dict of ticker -> cached financials (tickers not cached are left out)
+        """
+        if not use_cache or as_of is not None:
+            return {}
+        keys = {ticker: self._extraction_cache_key(normalize_ticker(ticker), source, filing_types,
+                                                   include_quant, fiscal_year_offset)
+                for ticker in tickers}
+        found = self._cache.get_many(keys.values(), category="financials")
+        return {ticker: found[key] for ticker, key in keys.items() if found.get(key)}
+    
+    def extract_many(self, tickers: Iterable[str], max_workers: int = BATCH_MAX_WORKERS,
+                     timeout: Optional[float] = BATCH_TICKER_TIMEOUT,
+                     **extract_kwargs) -> Iterator[BatchExtractionResult]:
+        """
+        Extract many tickers concurrently, yielding results as they finish.
+        
+        Tickers already in the result cache are looked up together and yielded
+        first. Failures are reported per ticker instead of aborting the batch. A ticker
+        running longer than `timeout` is reported as "timeout"; its worker thread
+        cannot be interrupted and finishes in the background.
+        
+        Args:
+            tickers: Stock symbols (duplicates are extracted once)
+            max_workers: Maximum tickers in flight at once
+            timeout: Per-ticker limit in seconds, measured from when it starts (None = no limit)
+            **extract_kwargs: Passed through to extract_financials()
+            
+        Yields:
+            BatchExtractionResult per ticker, in completion order
+        
+        Usage:
+            for result in extractor.extract_many(["AAPL", "MSFT", "JPM"], max_workers=4):
+                if result.ok:
+                    print(result.ticker, result.financials["extraction_time"])
+        """
+        unique = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+        if not unique:
+            return
+        
+        # Cached tickers come back from one batched lookup and skip the pool
+        cached = self._prefetch_cached(unique, **extract_kwargs)
+        for ticker, financials in cached.items():
+            yield BatchExtractionResult(ticker, "success", financials, elapsed=0.0)
+        unique = [ticker for ticker in unique if ticker not in cached]
+        if not unique:
+            return
+        
+        started: Dict[str, float] = {}
+        
+        def run(ticker: str) -> Dict:
+            started[ticker] = time.time()
+            return self.extract_financials(ticker, **extract_kwargs)
+        
+        _logger.info(f"Batch extraction: {len(unique)} tickers, {max_workers} workers")
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="extract_many")
+        pending = {executor.submit(run, ticker): ticker for ticker in unique}
+        
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=1.0 if timeout else None, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    ticker = pending.pop(future)
+                    elapsed = time.time() - started.get(ticker, time.time())
+                    try:
+                        financials = future.result()
+                    except Exception as e:
+                        _logger.error(f"Batch extraction failed for {ticker}: {e}")
+                        yield BatchExtractionResult(ticker, "error", error=str(e), elapsed=elapsed)
+                        continue
+                    if not financials or financials.get("status") == "error":
+                        message = (financials or {}).get("message", "No data returned")
+                        yield BatchExtractionResult(ticker, "error", financials, message, elapsed)
+                    else:
+                        yield BatchExtractionResult(ticker, "success", financials, elapsed=elapsed)
+                
+                if timeout:
+                    now = time.time()
+                    for future, ticker in list(pending.items()):
+                        if ticker in started and now - started[ticker] > timeout:
+                            del pending[future]
+                            _logger.warning(f"Batch extraction timed out for {ticker} after {timeout}s")
+                            yield BatchExtractionResult(ticker, "timeout", error=f"Timed out after {timeout}s",
+                                                        elapsed=now - started[ticker])
+        finally:
+            # Drop queued tickers if the caller stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     # ==========================================
     # 4B. DATAFRAME INDEX NORMALIZATION
     # ==========================================
@@ -1213,19 +1541,25 @@ class USAFinancialExtractor:
     # 4C. FIELD-LEVEL GAP FILLING (PHASE 1)
     # ==========================================
     
-    def _fill_data_gaps(self, ticker: str, financials: Dict, primary_source: str) -> Dict:
+    def _fill_data_gaps(self, ticker: str, financials: Dict, primary_source: str,
+                        prefetched: Optional[Dict] = None, use_cache: bool = True) -> Dict:
         """
         Fill missing fields by trying alternate sources (PHASE 1 + PHASE 2).
         
         Multi-source fusion:
         - Identifies gaps (missing/null values)
-        - Tries yfinance first, then FMP for remaining gaps
+        - Fills each gap from the first source in FIELD_SOURCE_PRIORITY that has it
+        - Derived metrics are calculated last from whatever is left
         - Tracks which source provided each field
         
         Args:
             ticker: Stock symbol
             financials: Primary extraction results
             primary_source: Which source was used ('sec' or 'yfinance')
+            prefetched: fan_out() results from extract_financials; sources not
+                in it are fetched on first use
+            use_cache: False to refetch lazily fetched payloads instead of
+                reading their raw cache
         
         Returns:
             financials dict with gaps filled
@@ -1234,6 +1568,13 @@ class USAFinancialExtractor:
         if '_sources' not in financials:
             financials['_sources'] = {}
         
+        payloads = {}
+        
+        def source_data(source: str) -> Dict:
+            if source not in payloads:
+                payloads[source] = self._gap_fill_payload(source, ticker, prefetched, use_cache)
+            return payloads[source]
+        
         # Fields to check for gaps (expanded list)
         critical_fields = [
             # Market data
@@ -1265,165 +1606,37 @@ class USAFinancialExtractor:
             if value is None or value == 'N/A' or value == '' or value == 0:
                 gaps.append(field)
         
+        # CRITICAL: Store full yfinance info dict for analysis modules to use
+        if YFINANCE_AVAILABLE and 'info' not in financials:
+            info = source_data('yfinance')
+            if info:
+                financials['info'] = info
+                if 'market_data' not in financials:
+                    financials['market_data'] = self._market_data_from_info(info)
+                print(f"   [GAP FILL] Added yfinance info ({len(info)} fields)")
+        
         if not gaps:
             print(f"   [GAP FILL] No gaps detected")
-            # Still need to fetch yfinance info for analysis modules even if no gaps
-            if YFINANCE_AVAILABLE and 'info' not in financials:
-                try:
-                    # Use centralized cache to prevent rate limiting
-                    info = get_ticker_info(ticker)
-                    if info:
-                        financials['info'] = info
-                        financials['market_data'] = {
-                            'current_price': info.get('currentPrice') or info.get('regularMarketPrice'),
-                            'market_cap': info.get('marketCap'),
-                            'volume': info.get('volume'),
-                            'beta': info.get('beta'),
-                            'fifty_two_week_high': info.get('fiftyTwoWeekHigh'),
-                            'fifty_two_week_low': info.get('fiftyTwoWeekLow'),
-                        }
-                        print(f"   [GAP FILL] Added yfinance info ({len(info)} fields)")
-                except Exception as e:
-                    print(f"   [GAP FILL] Could not fetch yfinance info: {e}")
             return financials
         
         print(f"   [GAP FILL] Found {len(gaps)} gaps: {', '.join(gaps[:5])}{'...' if len(gaps) > 5 else ''}")
         
-        gaps_filled_yf = 0
-        gaps_filled_fmp = 0
-        remaining_gaps = gaps.copy()
-        
-        # ========== STEP 1: Try yfinance for gaps ==========
-        if YFINANCE_AVAILABLE and primary_source != 'yfinance':
-            try:
-                # Use centralized cache to prevent rate limiting
-                info = get_ticker_info(ticker)
-                
-                # CRITICAL: Store full info dict for analysis modules to use
-                if info and 'info' not in financials:
-                    financials['info'] = info
-                    print(f"   [GAP FILL] Added yfinance info dict ({len(info)} fields)")
-                
-                # Also populate market_data if not present
-                if 'market_data' not in financials:
-                    financials['market_data'] = {
-                        'current_price': info.get('currentPrice') or info.get('regularMarketPrice'),
-                        'market_cap': info.get('marketCap'),
-                        'volume': info.get('volume'),
-                        'beta': info.get('beta'),
-                        'fifty_two_week_high': info.get('fiftyTwoWeekHigh'),
-                        'fifty_two_week_low': info.get('fiftyTwoWeekLow'),
-                    }
-                    print(f"   [GAP FILL] Added market_data dict")
-                
-                # Use class-level FIELD_ALIASES for comprehensive mapping
-                yf_field_map = {
-                    'current_price': ['currentPrice', 'regularMarketPrice', 'price'],
-                    'market_cap': ['marketCap', 'marketCapitalization'],
-                    'pe_ratio': ['trailingPE', 'peRatio'],
-                    'forward_pe': ['forwardPE', 'forwardPriceEarningsRatio'],
-                    'peg_ratio': ['pegRatio'],
-                    'price_to_book': ['priceToBook', 'pbRatio'],
-                    'price_to_sales': ['priceToSalesTrailing12Months', 'psRatio'],
-                    'ev_to_ebitda': ['enterpriseToEbitda'],
-                    'ev_to_sales': ['enterpriseToRevenue'],
-                    'roe': ['returnOnEquity'],
-                    'roa': ['returnOnAssets'],
-                    'roic': ['returnOnCapital'],
-                    'debt_to_equity': ['debtToEquity', 'totalDebtToEquity'],
-                    'current_ratio': ['currentRatio'],
-                    'quick_ratio': ['quickRatio'],
-                    'interest_coverage': ['interestCoverage'],
-                    'revenue_growth': ['revenueGrowth', 'revenueQuarterlyGrowth'],
-                    'earnings_growth': ['earningsGrowth', 'earningsQuarterlyGrowth'],
-                    'dividend_yield': ['dividendYield', 'trailingAnnualDividendYield'],
-                    'dividend_per_share': ['dividendRate', 'trailingAnnualDividendRate'],
-                    'payout_ratio': ['payoutRatio'],
-                    'beta': ['beta'],
-                    'sector': ['sector', 'gicsSector'],
-                    'industry': ['industry', 'gicsSubIndustry'],
-                    'employees': ['fullTimeEmployees'],
-                    'fifty_two_week_high': ['fiftyTwoWeekHigh', '52WeekHigh'],
-                    'fifty_two_week_low': ['fiftyTwoWeekLow', '52WeekLow'],
-                    'shares_outstanding': ['sharesOutstanding', 'impliedSharesOutstanding'],
-                    'target_price': ['targetMeanPrice', 'targetMedianPrice'],
-                    'target_price_avg': ['targetMeanPrice'],
-                    'recommendation': ['recommendationKey', 'recommendationMean'],
-                    'eps_estimate_avg': ['forwardEps'],
-                    'enterprise_value': ['enterpriseValue'],
-                    'average_volume': ['averageVolume', 'averageDailyVolume10Day'],
-                    'gross_margin': ['grossMargins'],
-                    'operating_margin': ['operatingMargins'],
-                    'profit_margin': ['profitMargins'],
-                    'ebitda': ['ebitda'],
-                    'free_cash_flow': ['freeCashflow', 'operatingCashflow'],
-                    'eps': ['trailingEps'],
-                    'eps_diluted': ['trailingEps'],
-                    'website': ['website'],
-                    'description': ['longBusinessSummary', 'description'],
-                    'company_name': ['longName', 'shortName'],
-                }
-                
-                for field in gaps:
-                    yf_keys = yf_field_map.get(field, [field])
-                    for yf_key in yf_keys:
-                        value = info.get(yf_key)
-                        if value is not None and value != '' and value != 0:
-                            financials[field] = value
-                            financials['_sources'][field] = 'yfinance'
-                            gaps_filled_yf += 1
-                            if field in remaining_gaps:
-                                remaining_gaps.remove(field)
-                            break
-                
-                if gaps_filled_yf > 0:
-                    print(f"   [GAP FILL] Filled {gaps_filled_yf} gaps from yfinance")
-                
-            except Exception as e:
-                print(f"   [GAP FILL] yfinance fallback failed: {e}")
+        # ========== STEPS 1-3: First source (by field priority) with a value wins ==========
+        filled_by = {}
+        remaining_gaps = []
+        for field in gaps:
+            for source in self._gap_fill_order(field, primary_source):
+                value = self._source_value(source, source_data(source), field)
+                if value is not None and value != '' and value != 0:
+                    financials[field] = value
+                    financials['_sources'][field] = source
+                    filled_by[source] = filled_by.get(source, 0) + 1
+                    break
+            else:
+                remaining_gaps.append(field)
         
-        # ========== STEP 2: Try FMP for remaining gaps (if available) ==========
-        if FMP_AVAILABLE and remaining_gaps:
-            try:
-                fmp = get_fmp_extractor()
-                if fmp.available:
-                    fmp_data = fmp.extract_all(ticker)
-                    
-                    if fmp_data and len(fmp_data) > 0:
-                        for field in list(remaining_gaps):
-                            value = fmp_data.get(field)
-                            if value is not None and value != '' and value != 0:
-                                financials[field] = value
-                                financials['_sources'][field] = 'fmp'
-                                gaps_filled_fmp += 1
-                                remaining_gaps.remove(field)
-                        
-                        if gaps_filled_fmp > 0:
-                            print(f"   [GAP FILL] Filled {gaps_filled_fmp} gaps from FMP")
-            except Exception:
-                pass  # FMP failed silently
-        
-        # ========== STEP 3: Try Alpha Vantage for remaining gaps ==========
-        gaps_filled_av = 0
-        if ALPHAVANTAGE_AVAILABLE and remaining_gaps:
-            try:
-                av = get_alphavantage_extractor()
-                if av.available:
-                    av_data = av.extract_all(ticker)
-                    
-                    if av_data and len(av_data) > 0:
-                        for field in list(remaining_gaps):
-                            value = av_data.get(field)
-                            if value is not None and value != '' and value != 0:
-                                financials[field] = value
-                                financials['_sources'][field] = 'alphavantage'
-                                gaps_filled_av += 1
-                                remaining_gaps.remove(field)
-                        
-                        if gaps_filled_av > 0:
-                            print(f"   [GAP FILL] Filled {gaps_filled_av} gaps from Alpha Vantage")
-            except Exception:
-                pass  # Alpha Vantage failed silently
+        for source, count in filled_by.items():
+            print(f"   [GAP FILL] Filled {count} gaps from {source}")
         
         # ========== STEP 4: Calculate derived metrics from existing data ==========
         gaps_filled_calc = 0
@@ -1432,7 +1645,7 @@ class USAFinancialExtractor:
             if gaps_filled_calc > 0:
                 print(f"   [GAP FILL] Calculated {gaps_filled_calc} gaps from existing data")
         
-        total_filled = gaps_filled_yf + gaps_filled_fmp + gaps_filled_av + gaps_filled_calc
+        total_filled = sum(filled_by.values()) + gaps_filled_calc
         if total_filled > 0:
             print(f"   [GAP FILL] Total: {total_filled}/{len(gaps)} gaps filled")
         
@@ -1442,6 +1655,69 @@ class USAFinancialExtractor:
         
         return financials
     
+    def _gap_fill_order(self, field: str, primary_source: str) -> List[str]:
+        """Fetchable sources for a field: FIELD_SOURCE_PRIORITY order, then the rest as last resort."""
+        listed = [s for s in self.FIELD_SOURCE_PRIORITY.get(field, []) if s in self.GAP_FILL_SOURCES]
+        order = listed + [s for s in self.GAP_FILL_SOURCES if s not in listed]
+        if primary_source == 'yfinance':
+            order.remove('yfinance')
+        return order
+    
+    def _source_value(self, source: str, data: Dict, field: str) -> Any:
+        """Look up one field in a source payload (yfinance info uses its own key names)."""
+        if source == 'yfinance':
+            for yf_key in self.YF_FIELD_MAP.get(field, [field]):
+                value = data.get(yf_key)
+                if value is not None and value != '' and value != 0:
+                    return value
+            return None
+        return data.get(field)
+    
+    def _gap_fill_payload(self, source: str, ticker: str, prefetched: Optional[Dict],
+                          use_cache: bool = True) -> Dict:
+        """
+        Payload of one gap-fill source: the fan-out result if it was prefetched
+        (a timed-out/failed source is not retried), otherwise fetched now.
+        """
+        key = 'yfinance_info' if source == 'yfinance' else source
+        if prefetched is not None and key in prefetched:
+            result = prefetched[key]
+            return (result.value or {}) if result.ok else {}
+        
+        try:
+            if source == 'yfinance' and YFINANCE_AVAILABLE:
+                # Use centralized cache to prevent rate limiting
+                return get_ticker_info(ticker) or {}
+            if source == 'fmp' and FMP_AVAILABLE:
+                return self._raw_payload('fmp', ticker, lambda: self._fetch_fmp(ticker), use_cache=use_cache)
+            if source == 'alphavantage' and ALPHAVANTAGE_AVAILABLE:
+                av = get_alphavantage_extractor()
+                if not av.available:
+                    return {}
+                return self._raw_payload('alphavantage_all', ticker, lambda: av.extract_all(ticker) or {},
+                                         use_cache=use_cache)
+        except Exception as e:
+            print(f"   [GAP FILL] {source} fallback failed: {e}")
+        return {}
+    
+    @staticmethod
+    def _fetch_fmp(ticker: str) -> Dict:
+        fmp = get_fmp_extractor()
+        return (fmp.extract_all(ticker) or {}) if fmp.available else {}
+    
+    @staticmethod
+    def _market_data_from_info(info: Dict) -> Dict:
+        """market_data block built from a yfinance info dict."""
+        return {
+            'current_price': info.get('currentPrice') or info.get('regularMarketPrice'),
+            'market_cap': info.get('marketCap'),
+            'volume': info.get('volume'),
+            'beta': info.get('beta'),
+            'fifty_two_week_high': info.get('fiftyTwoWeekHigh'),
+            'fifty_two_week_low': info.get('fiftyTwoWeekLow'),
+            'shares_outstanding': info.get('sharesOutstanding'),
+        }
+    
     def _calculate_missing_fields(self, financials: Dict, remaining_gaps: List[str]) -> int:
         """
         Calculate derived metrics from existing financial data.
@@ -1706,74 +1982,39 @@ class USAFinancialExtractor:
         try:
             # Get latest year data
             income = financials.get("income_statement", pd.DataFrame())
-            balance = financials.get("balance_sheet", pd.DataFrame())
-            cashflow = financials.get("cash_flow", pd.DataFrame())
             info = financials.get("info", {})  # Needed for market P/E and D/E
             
             if income.empty:
                 return {"status": "error", "message": "No income statement data"}
             
-            # Helper function to get metric value (handles both SEC and yfinance formats)
-            def get_metric(df, possible_names, default=0):
-                if df.empty:
-                    return default
-                
-                # yfinance format: metrics as index, dates as columns
-                if isinstance(df.index[0], str):
-                    for name in possible_names:
-                        if name in df.index:
-                            # Use fiscal_year_offset to select column
-                            col_idx = min(fiscal_year_offset, len(df.columns) - 1)
-                            val = df.loc[name].iloc[col_idx]
-                            return val if pd.notnull(val) else default
-                # SEC format: dates as index, metrics as columns
-                else:
-                    for name in possible_names:
-                        if name in df.columns:
-                            # Use fiscal_year_offset to select row
-                            row_idx = min(fiscal_year_offset, len(df) - 1)
-                            val = df.iloc[row_idx][name]
-                            return val if pd.notnull(val) else default
-                return default
-            
-            # Extract metrics with multiple possible field names
-            revenue = get_metric(income, ["Total Revenue", "Revenue", "Sales Revenue Net"])
-            gross_profit = get_metric(income, ["Gross Profit", "GrossProfit"])
-            operating_income = get_metric(income, ["Operating Income", "EBIT", "Operating Income Or Loss"])
-            net_income = get_metric(income, ["Net Income", "Normalized Income", "Net Income From Continuing Operation Net Minority Interest"])
-            
-            total_assets = get_metric(balance, ["Total Assets", "TotalAssets"])
-            total_equity = get_metric(balance, ["Stockholders Equity", "Total Equity", "Total Stockholders Equity"])
-            total_liabilities = get_metric(balance, ["Total Liabilities", "TotalLiabilitiesNetMinorityInterest", "Total Liabilities Net Minority Interest"])
-            total_debt = get_metric(balance, ["Total Debt", "TotalDebt", "Long Term Debt And Capital Lease Obligation"])
-            current_assets = get_metric(balance, ["Current Assets", "TotalCurrentAssets", "Total Current Assets"])
-            current_liabilities = get_metric(balance, ["Current Liabilities", "TotalCurrentLiabilities", "Total Current Liabilities"])
-            
-            op_cash_flow = get_metric(cashflow, ["Operating Cash Flow", "Cash Flow From Operating Activities"])
-            capex = get_metric(cashflow, ["Capital Expenditure", "Capex"])
-            free_cash_flow_direct = get_metric(cashflow, ["Free Cash Flow", "FreeCashFlow"])  # Try to get FCF directly
-            
-            # Calculate ratios (as decimals, not percentages)
-            if revenue > 0:
-                if gross_profit > 0:
-                    ratios["Gross_Margin"] = (gross_profit / revenue)
-                if operating_income > 0:
-                    ratios["Operating_Margin"] = (operating_income / revenue)
-                if net_income > 0:
-                    ratios["Net_Margin"] = (net_income / revenue)
-            
-            if total_equity > 0 and net_income > 0:
-                ratios["ROE"] = (net_income / total_equity)
-            
-            if total_assets > 0 and net_income > 0:
-                ratios["ROA"] = (net_income / total_assets)
+            # Every ratio for every period is computed once per result (see
+            # calculations/ratio_engine.py); a fiscal year is one column of it.
+            # Offsets past the oldest year read the oldest year.
+            frame = get_ratio_frame(financials)
+            column = frame.iloc[:, min(fiscal_year_offset, len(frame.columns) - 1)]
+            values = {name: float(value) for name, value in column.items() if pd.notna(value)}
+            
+            revenue = values["Revenue"]
+            gross_profit = values["Gross_Profit"]
+            operating_income = values["Operating_Income"]
+            net_income = values["Net_Income"]
+            total_assets = values["Total_Assets"]
+            total_equity = values["Total_Equity"]
+            total_liabilities = values["Total_Liabilities"]
+            total_debt = values["Total_Debt"]
+            current_assets = values["Current_Assets"]
+            current_liabilities = values["Current_Liabilities"]
+            op_cash_flow = values["Operating_Cash_Flow"]
+            capex = values["Capex"]
+            
+            # Statement ratios (as decimals, not percentages)
+            for key in ["Gross_Margin", "Operating_Margin", "Net_Margin", "ROE", "ROA"]:
+                if key in values:
+                    ratios[key] = values[key]
             
             # Debt to Equity - prefer market data, flag discrepancies
             market_de = info.get('debtToEquity')  # Yahoo Finance value (as percentage)
-            calculated_de = None
-            
-            if total_equity > 0 and total_liabilities > 0:
-                calculated_de = total_liabilities / total_equity
+            calculated_de = values.get("Debt_to_Equity")
             
             if market_de is not None and market_de > 0:
                 ratios["Debt_to_Equity"] = market_de / 100  # Convert from percentage
@@ -1789,20 +2030,14 @@ class USAFinancialExtractor:
             
             ratios["Debt_to_Equity_Timestamp"] = datetime.now().isoformat()
             
-            if current_liabilities > 0 and current_assets > 0:
-                ratios["Current_Ratio"] = current_assets / current_liabilities
-            
-            # Free Cash Flow: Try direct value first, then calculate
-            if free_cash_flow_direct != 0:
-                ratios["Free_Cash_Flow"] = free_cash_flow_direct
-            elif op_cash_flow != 0:  # Changed from > 0 to != 0 to handle banks with negative OCF
-                ratios["Free_Cash_Flow"] = op_cash_flow - abs(capex) if capex else op_cash_flow
+            # Current ratio; Free Cash Flow reported directly, else OCF - |CapEx|
+            for key in ["Current_Ratio", "Free_Cash_Flow"]:
+                if key in values:
+                    ratios[key] = values[key]
             
             # Get market data for valuation ratios (from yfinance)
             market_data = financials.get('market_data', {})
             current_price = market_data.get('current_price', 0)
-            market_cap = market_data.get('market_cap', 0)
-            shares_outstanding = market_data.get('shares_outstanding', 0)
             
             # Calculate valuation multiples if market data available
             if current_price > 0:
@@ -1810,12 +2045,7 @@ class USAFinancialExtractor:
                 
                 # PE Ratio - prefer trailing P/E from market
                 market_pe = info.get('trailingPE')  # Yahoo's calculated TTM P/E
-                calculated_pe = None
-                
-                if net_income > 0 and shares_outstanding > 0:
-                    eps = net_income / shares_outstanding
-                    if eps > 0:
-                        calculated_pe = current_price / eps
+                calculated_pe = values.get("PE_Ratio")
                 
                 # Prefer market P/E (uses TTM data)
                 if market_pe is not None and market_pe > 0:
@@ -1832,35 +2062,15 @@ class USAFinancialExtractor:
                 
                 ratios["PE_Ratio_Timestamp"] = datetime.now().isoformat()
                 
-                # Price to Book
-                if total_equity > 0 and shares_outstanding > 0:
-                    book_value_per_share = total_equity / shares_outstanding
-                    if book_value_per_share > 0:
-                        ratios["Price_to_Book"] = current_price / book_value_per_share
-                
-                # Price to Sales
-                if revenue > 0 and shares_outstanding > 0:
-                    sales_per_share = revenue / shares_outstanding
-                    if sales_per_share > 0:
-                        ratios["Price_to_Sales"] = current_price / sales_per_share
-            
-            # EV-based multiples (if we have debt and cash)
-            if market_cap > 0:
-                cash = get_metric(balance, ["Cash And Cash Equivalents", "Cash", "CashAndCashEquivalentsAtCarryingValue"])
-                enterprise_value = market_cap + total_debt - cash
-                
-                if enterprise_value > 0:
-                    # EV/Revenue
-                    if revenue > 0:
-                        ratios["EV_to_Sales"] = enterprise_value / revenue
-                    
-                    # EV/EBITDA (approximate EBITDA as Operating Income)
-                    if operating_income > 0:
-                        ratios["EV_to_EBITDA"] = enterprise_value / operating_income
-                    
-                    # EV/EBIT (same as EV/Operating Income)
-                    if operating_income > 0:
-                        ratios["EV_to_EBIT"] = enterprise_value / operating_income
+                # Price to Book, Price to Sales
+                for key in ["Price_to_Book", "Price_to_Sales"]:
+                    if key in values:
+                        ratios[key] = values[key]
+            
+            # EV-based multiples (EV = market cap + debt - cash)
+            for key in ["EV_to_Sales", "EV_to_EBITDA", "EV_to_EBIT"]:
+                if key in values:
+                    ratios[key] = values[key]
             
             # PEG Ratio (P/E / Growth Rate)
             pe_ratio = ratios.get("PE_Ratio")
@@ -1929,7 +2139,8 @@ class USAFinancialExtractor:
             period_type: "annual" (10-K) or "quarterly" (10-Q)
         
         Returns:
-            Dict with CAGR, YoY change, QoQ change (if quarterly)
+            Dict with full-history CAGR, 3/5/10-year CAGRs (where the history
+            reaches back that far), YoY change, QoQ change (if quarterly)
         """
         growth = {}
         is_quarterly = (period_type == "quarterly")
@@ -1939,26 +2150,42 @@ class USAFinancialExtractor:
             if income.empty:
                 return {"status": "error", "message": "No income statement data"}
             
-            # Helper to get time series for a metric
-            def get_time_series(df, possible_names):
-                if df.empty:
-                    return None
-                
-                # yfinance format: metrics as index, dates as columns
-                if isinstance(df.index[0], str):
-                    for name in possible_names:
-                        if name in df.index:
-                            # Get all columns (time series) for this metric
-                            series = df.loc[name]
-                            return series.dropna().sort_index()  # Sort by date
-                # SEC format: dates as index, metrics as columns
-                else:
+            # Growth of every statement line is computed once per result, in one
+            # pass (see calculations/growth_engine.py); the legacy keys below are
+            # picked out of that frame. Periods are matched by date, so CAGRs span
+            # the actual years between oldest and latest value.
+            panel = get_panel(financials)
+            frame = get_growth_frame(financials)
+            
+            def line_growth(statements, possible_names):
+                for statement in statements:
                     for name in possible_names:
-                        if name in df.columns:
-                            series = df[name]
-                            return series.dropna().sort_index(ascending=False)  # Most recent first
+                        row = panel.row(name, statement)
+                        if row is not None:
+                            return frame.iloc[row]
                 return None
             
+            def add_growth(metric_name, g, detailed=True):
+                """Legacy keys for one line - only when oldest and latest are both positive"""
+                if g is None or not (g["Periods"] >= 2 and g["Latest"] > 0 and g["Oldest"] > 0):
+                    return
+                if pd.notna(g["CAGR"]):
+                    growth[f"{metric_name}_CAGR"] = round(g["CAGR"], 2)
+                for window in GROWTH_WINDOWS:
+                    if pd.notna(g[f"CAGR_{window}Y"]):
+                        growth[f"{metric_name}_CAGR_{window}Y"] = round(g[f"CAGR_{window}Y"], 2)
+                if detailed:
+                    growth[f"{metric_name}_Dollar_Change"] = g["Dollar_Change"]
+                    if pd.notna(g["Pct_Change"]):
+                        growth[f"{metric_name}_Pct_Change"] = round(g["Pct_Change"], 2)
+                growth[f"{metric_name}_Latest_Value"] = g["Latest"]
+                growth[f"{metric_name}_Oldest_Value"] = g["Oldest"]
+                # For quarterly data, also QoQ and YoY (same quarter, previous year)
+                if detailed and is_quarterly:
+                    for measure in ["QoQ", "YoY"]:
+                        if pd.notna(g[measure]):
+                            growth[f"{metric_name}_{measure}"] = round(g[measure], 2)
+            
             # Calculate CAGR for key metrics (comprehensive list)
             metrics_map = {
                 "Total_Revenue": ["Total Revenue", "Revenue", "Sales Revenue Net"],
@@ -1970,164 +2197,53 @@ class USAFinancialExtractor:
                 "Net_Income": ["Net Income", "Normalized Income", "Net Income From Continuing Operation Net Minority Interest"]
             }
             
-            # Store operating profit series for NOPAT calculation later
-            operating_profit_series = None
-            tax_expense_series = None
-            
             for metric_name, possible_names in metrics_map.items():
-                series = get_time_series(income, possible_names)
-                
-                # Store operating profit for NOPAT calculation
-                if metric_name == "Operating_Profit" and series is not None:
-                    operating_profit_series = series
-                
-                if series is not None and len(series) >= 2:
-                    # Most recent vs oldest
-                    latest = series.iloc[-1] if isinstance(income.index[0], str) else series.iloc[0]
-                    oldest = series.iloc[0] if isinstance(income.index[0], str) else series.iloc[-1]
-                    n_years = len(series) - 1
-                    
-                    if oldest > 0 and latest > 0 and n_years > 0:
-                        # Calculate CAGR (always useful)
-                        cagr = ((latest / oldest) ** (1 / n_years) - 1) * 100
-                        
-                        # Cap extreme values (likely data errors)
-                        if abs(cagr) > 1000:  # More than 1000% is likely an error
-                            cagr = None
-                        
-                        if cagr is not None:
-                            growth[f"{metric_name}_CAGR"] = round(cagr, 2)
-                        
-                        # Calculate dollar change and percent change
-                        dollar_change = latest - oldest
-                        pct_change = ((latest / oldest) - 1) * 100
-                        
-                        # Cap percent change too
-                        if abs(pct_change) > 1000:
-                            pct_change = None
-                        
-                        growth[f"{metric_name}_Dollar_Change"] = dollar_change
-                        if pct_change is not None:
-                            growth[f"{metric_name}_Pct_Change"] = round(pct_change, 2)
-                        growth[f"{metric_name}_Latest_Value"] = latest
-                        growth[f"{metric_name}_Oldest_Value"] = oldest
-                        
-                        # For quarterly data, also calculate QoQ and YoY
-                        if is_quarterly and len(series) >= 2:
-                            # Quarter-over-Quarter (most recent vs previous quarter)
-                            if len(series) >= 2:
-                                current_q = series.iloc[-1] if isinstance(income.index[0], str) else series.iloc[0]
-                                prev_q = series.iloc[-2] if isinstance(income.index[0], str) else series.iloc[1]
-                                
-                                if prev_q > 0:
-                                    qoq_growth = ((current_q / prev_q) - 1) * 100
-                                    growth[f"{metric_name}_QoQ"] = round(qoq_growth, 2)
-                            
-                            # Year-over-Year (same quarter, previous year)
-                            if len(series) >= 5:  # Need at least 5 quarters (1 year + 1 quarter)
-                                current_q = series.iloc[-1] if isinstance(income.index[0], str) else series.iloc[0]
-                                yoy_q = series.iloc[-5] if isinstance(income.index[0], str) else series.iloc[4]
-                                
-                                if yoy_q > 0:
-                                    yoy_growth = ((current_q / yoy_q) - 1) * 100
-                                    growth[f"{metric_name}_YoY"] = round(yoy_growth, 2)
+                add_growth(metric_name, line_growth(["income_statement"], possible_names))
             
             # ==========================================
             # CALCULATE NOPAT (Net Operating Profit After Tax)
             # NOPAT = Operating Income × (1 - Tax Rate)
             # ==========================================
-            if operating_profit_series is not None and len(operating_profit_series) >= 2:
-                # Get tax expense to calculate effective tax rate
-                tax_expense_series = get_time_series(income, ["Tax Provision", "Income Tax Expense", "Tax Expense"])
-                pretax_income_series = get_time_series(income, ["Pretax Income", "Income Before Tax", "EBT"])
-                
-                # Calculate effective tax rate (use 21% default if not available)
+            operating = line_growth(["income_statement"], metrics_map["Operating_Profit"])
+            if operating is not None and operating["Periods"] >= 2 and operating["Latest"] > 0 and operating["Oldest"] > 0:
+                # Effective tax rate from the latest tax and pretax income (21% default)
+                tax = line_growth(["income_statement"], ["Tax Provision", "Income Tax Expense", "Tax Expense"])
+                pretax = line_growth(["income_statement"], ["Pretax Income", "Income Before Tax", "EBT"])
                 effective_tax_rate = 0.21  # Default US corporate rate
-                if tax_expense_series is not None and pretax_income_series is not None:
-                    try:
-                        latest_tax = tax_expense_series.iloc[-1] if isinstance(income.index[0], str) else tax_expense_series.iloc[0]
-                        latest_pretax = pretax_income_series.iloc[-1] if isinstance(income.index[0], str) else pretax_income_series.iloc[0]
-                        if latest_pretax > 0 and latest_tax > 0:
-                            effective_tax_rate = latest_tax / latest_pretax
-                            effective_tax_rate = min(max(effective_tax_rate, 0.10), 0.40)  # Cap between 10-40%
-                    except (KeyError, IndexError, TypeError, ZeroDivisionError):
-                        # Use default US corporate tax rate if calculation fails
-                        effective_tax_rate = 0.21
+                if tax is not None and pretax is not None and pretax["Latest"] > 0 and tax["Latest"] > 0:
+                    effective_tax_rate = min(max(tax["Latest"] / pretax["Latest"], 0.10), 0.40)  # Cap between 10-40%
                 
-                # Calculate NOPAT series
-                nopat_series = operating_profit_series * (1 - effective_tax_rate)
-                
-                if len(nopat_series) >= 2:
-                    latest_nopat = nopat_series.iloc[-1] if isinstance(income.index[0], str) else nopat_series.iloc[0]
-                    oldest_nopat = nopat_series.iloc[0] if isinstance(income.index[0], str) else nopat_series.iloc[-1]
-                    n_years = len(nopat_series) - 1
-                    
-                    if oldest_nopat > 0 and latest_nopat > 0 and n_years > 0:
-                        # CAGR
-                        nopat_cagr = ((latest_nopat / oldest_nopat) ** (1 / n_years) - 1) * 100
-                        if abs(nopat_cagr) <= 1000:
-                            growth["NOPAT_CAGR"] = round(nopat_cagr, 2)
-                        
-                        # Dollar and percent change
-                        growth["NOPAT_Dollar_Change"] = latest_nopat - oldest_nopat
-                        pct_change = ((latest_nopat / oldest_nopat) - 1) * 100
-                        if abs(pct_change) <= 1000:
-                            growth["NOPAT_Pct_Change"] = round(pct_change, 2)
-                        growth["NOPAT_Latest_Value"] = latest_nopat
-                        growth["NOPAT_Oldest_Value"] = oldest_nopat
-                        growth["NOPAT_Effective_Tax_Rate"] = round(effective_tax_rate * 100, 1)
+                # A constant tax rate scales both ends, so NOPAT grows like operating income
+                latest_nopat = operating["Latest"] * (1 - effective_tax_rate)
+                oldest_nopat = operating["Oldest"] * (1 - effective_tax_rate)
+                if pd.notna(operating["CAGR"]):
+                    growth["NOPAT_CAGR"] = round(operating["CAGR"], 2)
+                growth["NOPAT_Dollar_Change"] = latest_nopat - oldest_nopat
+                if pd.notna(operating["Pct_Change"]):
+                    growth["NOPAT_Pct_Change"] = round(operating["Pct_Change"], 2)
+                growth["NOPAT_Latest_Value"] = latest_nopat
+                growth["NOPAT_Oldest_Value"] = oldest_nopat
+                growth["NOPAT_Effective_Tax_Rate"] = round(effective_tax_rate * 100, 1)
             
             # ==========================================
             # CALCULATE BALANCE SHEET CAGR (Total Assets, Total Equity)
             # ==========================================
-            balance = financials.get("balance_sheet", pd.DataFrame())
-            if not balance.empty:
-                balance_metrics = {
-                    "Total_Assets": ["Total Assets", "Assets", "Total_Assets"],
-                    "Total_Equity": ["Stockholders Equity", "Total Equity", "Total_Equity", "StockholdersEquity"],
-                    "Total_Debt": ["Total Debt", "Long Term Debt", "Total_Debt", "LongTermDebt"],
-                }
-                
-                for metric_name, possible_names in balance_metrics.items():
-                    series = get_time_series(balance, possible_names)
-                    
-                    if series is not None and len(series) >= 2:
-                        latest = series.iloc[-1] if isinstance(balance.index[0], str) else series.iloc[0]
-                        oldest = series.iloc[0] if isinstance(balance.index[0], str) else series.iloc[-1]
-                        n_years = len(series) - 1
-                        
-                        if oldest > 0 and latest > 0 and n_years > 0:
-                            cagr = ((latest / oldest) ** (1 / n_years) - 1) * 100
-                            if abs(cagr) <= 1000:
-                                growth[f"{metric_name}_CAGR"] = round(cagr, 2)
-                            
-                            growth[f"{metric_name}_Latest_Value"] = latest
-                            growth[f"{metric_name}_Oldest_Value"] = oldest
+            balance_metrics = {
+                "Total_Assets": ["Total Assets", "Assets", "Total_Assets"],
+                "Total_Equity": ["Stockholders Equity", "Total Equity", "Total_Equity", "StockholdersEquity"],
+                "Total_Debt": ["Total Debt", "Long Term Debt", "Total_Debt", "LongTermDebt"],
+            }
+            for metric_name, possible_names in balance_metrics.items():
+                add_growth(metric_name, line_growth(["balance_sheet"], possible_names), detailed=False)
             
             # ==========================================
             # CALCULATE EPS CAGR (per-share data)
             # ==========================================
-            # Try from income statement first (yfinance format)
-            eps_series = get_time_series(income, ["Basic EPS", "Diluted EPS", "Basic Eps", "Diluted Eps"])
-            
-            # If not found, try per_share_data
-            if eps_series is None:
-                per_share = financials.get("per_share_data", pd.DataFrame())
-                if not per_share.empty:
-                    eps_series = get_time_series(per_share, ["Basic_EPS", "Diluted_EPS", "EPS"])
-            
-            if eps_series is not None and len(eps_series) >= 2:
-                latest = eps_series.iloc[-1] if isinstance(eps_series.index[0], str) else eps_series.iloc[0]
-                oldest = eps_series.iloc[0] if isinstance(eps_series.index[0], str) else eps_series.iloc[-1]
-                n_years = len(eps_series) - 1
-                
-                if oldest > 0 and latest > 0 and n_years > 0:
-                    cagr = ((latest / oldest) ** (1 / n_years) - 1) * 100
-                    if abs(cagr) <= 1000:
-                        growth["EPS_CAGR"] = round(cagr, 2)
-                    
-                    growth["EPS_Latest_Value"] = latest
-                    growth["EPS_Oldest_Value"] = oldest
+            # Income statement first (yfinance format), then per_share_data (SEC)
+            eps = line_growth(["income_statement"], ["Basic EPS", "Diluted EPS", "Basic Eps", "Diluted Eps"])
+            if eps is None:
+                eps = line_growth(["per_share_data"], ["Basic_EPS", "Diluted_EPS", "EPS"])
+            add_growth("EPS", eps, detailed=False)
             
             return growth if growth else {"status": "error", "message": "Could not calculate growth rates"}
             
@@ -8,13 +8,25 @@ from .logging_config import EngineLogger, get_logger, log_error, log_warning, lo
 from .ticker_cache import (
     get_ticker, get_ticker_info, get_ticker_financials,
     get_ticker_holders, get_ticker_earnings, prefetch_ticker_data,
-    clear_ticker_cache, get_cache_stats
+    clear_ticker_cache, get_cache_stats, get_ticker_info_many
 )
 from .bank_metrics import is_bank, get_bank_metrics, get_bank_display_metrics, BANK_TICKERS
 from .ticker_mapper import (
     normalize_ticker, validate_ticker, quick_normalize,
     TICKER_ALIASES, PROBLEMATIC_TICKERS, TickerValidation
 )
+from .rate_limiter import TokenBucket, get_sec_limiter
+from .http_session import SessionRegistry, get_session, http_get
+from .async_fanout import SourceResult, fan_out
+from .single_flight import SingleFlight, single_flight, get_flight_group
+from .bounded_cache import BoundedTTLCache
+from .tiered_cache import TieredCache, get_result_cache
+from .cache_codec import CacheCodec, CodecError, get_codec
+from .cache_client import CacheClient, cache_key, get_cache_client
+from .revalidation import Revalidator, get_revalidator, stale_window
+from .ttl_policy import NYSECalendar, TTLPolicy, get_ttl_policy
+from .cache_warmer import CacheWarmer, get_cache_warmer, record_ticker_request
+from .financials_panel import FinancialsPanel, get_panel, CANONICAL_FIELDS
 
 __all__ = [
     # Security
@@ -24,11 +36,32 @@ __all__ = [
     # Ticker Cache
     'get_ticker', 'get_ticker_info', 'get_ticker_financials',
     'get_ticker_holders', 'get_ticker_earnings', 'prefetch_ticker_data',
-    'clear_ticker_cache', 'get_cache_stats',
+    'clear_ticker_cache', 'get_cache_stats', 'get_ticker_info_many',
     # Bank Metrics (M012)
     'is_bank', 'get_bank_metrics', 'get_bank_display_metrics', 'BANK_TICKERS',
     # Ticker Mapper (M011)
     'normalize_ticker', 'validate_ticker', 'quick_normalize',
-    'TICKER_ALIASES', 'PROBLEMATIC_TICKERS', 'TickerValidation'
+    'TICKER_ALIASES', 'PROBLEMATIC_TICKERS', 'TickerValidation',
+    # Rate Limiting
+    'TokenBucket', 'get_sec_limiter',
+    # HTTP Sessions
+    'SessionRegistry', 'get_session', 'http_get',
+    # Source Fan-Out
+    'SourceResult', 'fan_out',
+    # Request Coalescing
+    'SingleFlight', 'single_flight', 'get_flight_group',
+    # In-Memory Cache
+    'BoundedTTLCache', 'TieredCache', 'get_result_cache',
+    'CacheCodec', 'CodecError', 'get_codec',
+    # Cache Client
+    'CacheClient', 'cache_key', 'get_cache_client',
+    # Stale-While-Revalidate
+    'Revalidator', 'get_revalidator', 'stale_window',
+    # TTL Policy
+    'NYSECalendar', 'TTLPolicy', 'get_ttl_policy',
+    # Cache Warm-Up
+    'CacheWarmer', 'get_cache_warmer', 'record_ticker_request',
+    # Financials Panel
+    'FinancialsPanel', 'get_panel', 'CANONICAL_FIELDS'
 ]
 
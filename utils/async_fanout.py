@@ -0,0 +1,115 @@
+"""
+ASYNC FAN-OUT - Concurrent Source Fetches with Per-Source Timeouts
+==================================================================
+Starts every independent source request at once on an asyncio loop and
+collects whatever finished in time, so a cold extraction costs roughly the
+slowest source instead of the sum of all of them.
+
+The source clients are blocking (requests / yfinance), so each fetch runs
+on a shared worker pool; asyncio supervises timeouts. A timed-out fetch is
+reported as "timeout" and its worker finishes in the background.
+
+Usage:
+    from utils.async_fanout import fan_out
+    results = fan_out(
+        {"sec": lambda: fetch_sec(t), "fmp": lambda: fmp.extract_all(t)},
+        timeouts={"sec": 60, "fmp": 20},
+    )
+    if results["sec"].ok:
+        data = results["sec"].value
+
+Author: ATLAS Financial Intelligence
+"""
+
+import time
+import asyncio
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("AsyncFanout")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("AsyncFanout")
+
+
+DEFAULT_TIMEOUT = 30.0
+FANOUT_WORKERS = 32           # Shared pool: several tickers x several sources in flight
+
+# Not the loop's default executor: asyncio.run() would wait for timed-out
+# fetches when shutting that down.
+_executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="source_fetch")
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one source fetch."""
+    name: str
+    status: str                 # "ok", "timeout" or "error"
+    value: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+async def _run_source(name: str, fetch: Callable[[], Any], timeout: Optional[float]) -> SourceResult:
+    loop = asyncio.get_running_loop()
+    t0 = time.time()
+    try:
+        value = await asyncio.wait_for(loop.run_in_executor(_executor, fetch), timeout=timeout)
+        return SourceResult(name, "ok", value, elapsed=time.time() - t0)
+    except asyncio.TimeoutError:
+        _logger.warning(f"Source '{name}' timed out after {timeout}s")
+        return SourceResult(name, "timeout", error=f"Timed out after {timeout}s", elapsed=time.time() - t0)
+    except Exception as e:
+        _logger.warning(f"Source '{name}' failed: {e}")
+        return SourceResult(name, "error", error=str(e), elapsed=time.time() - t0)
+
+
+async def gather_sources(fetchers: Dict[str, Callable[[], Any]],
+                         timeouts: Optional[Dict[str, float]] = None,
+                         default_timeout: float = DEFAULT_TIMEOUT) -> Dict[str, SourceResult]:
+    """
+    Run all fetchers concurrently (coroutine form, for callers already in a loop).
+
+    Args:
+        fetchers: Source name -> zero-argument blocking callable
+        timeouts: Per-source timeout in seconds (None value = no limit)
+        default_timeout: Timeout for sources not listed in `timeouts`
+
+    Returns:
+        Source name -> SourceResult
+    """
+    timeouts = timeouts or {}
+    results = await asyncio.gather(*(
+        _run_source(name, fetch, timeouts.get(name, default_timeout))
+        for name, fetch in fetchers.items()
+    ))
+    return {result.name: result for result in results}
+
+
+def fan_out(fetchers: Dict[str, Callable[[], Any]],
+            timeouts: Optional[Dict[str, float]] = None,
+            default_timeout: float = DEFAULT_TIMEOUT) -> Dict[str, SourceResult]:
+    """
+    Blocking wrapper around gather_sources().
+
+    Works from plain threads (Streamlit script thread, extract_many workers)
+    and from inside a running event loop (runs on a helper thread).
+    """
+    if not fetchers:
+        return {}
+    coro = gather_sources(fetchers, timeouts, default_timeout)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Already inside an event loop (e.g. a notebook) - can't nest asyncio.run here
+    with ThreadPoolExecutor(max_workers=1) as helper:
+        return helper.submit(asyncio.run, coro).result()
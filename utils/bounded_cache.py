@@ -0,0 +1,314 @@
+"""
+BOUNDED CACHE - Size-Aware LRU + TTL In-Memory Cache
+====================================================
+In-process cache for large values (financials dicts full of DataFrames)
+that stays inside a byte budget for the life of the process.
+
+- Approximate entry sizes (DataFrame/Series/ndarray memory, nested dicts/lists)
+- LRU eviction when the byte budget (or optional entry cap) is exceeded
+- Per-entry TTL; expired entries are dropped on read and by a background sweep
+- Optional stale window past the TTL (stale-while-revalidate): get() misses,
+  get_entry() still returns the value with its freshness
+- Hit/miss/eviction/expiration statistics
+
+Usage:
+    from utils.bounded_cache import BoundedTTLCache
+    cache = BoundedTTLCache(max_bytes=256 * 1024 * 1024, name="extractor")
+    cache.set("AAPL_auto", financials, ttl=86400, category="financials")
+    financials = cache.get("AAPL_auto")
+    cache.stats()
+
+    # Keep serving for a day past the TTL while a refresh runs
+    cache.set("AAPL_auto", financials, ttl=86400, stale_ttl=86400)
+    value, fresh_until = cache.get_entry("AAPL_auto")
+
+Author: ATLAS Financial Intelligence
+"""
+
+import sys
+import time
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("BoundedCache")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("BoundedCache")
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024     # 256 MB
+DEFAULT_TTL = 3600                        # 1 hour
+SWEEP_INTERVAL = 60                       # Seconds between background sweeps
+
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """
+    Approximate in-memory size of a value in bytes.
+
+    DataFrames/Series use pandas' deep memory usage; containers are walked
+    recursively (shared objects counted once).
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_size(item, _seen) for item in obj)
+    nbytes = getattr(obj, "nbytes", None)       # Array-backed objects (e.g. FinancialsPanel)
+    if isinstance(nbytes, int):
+        return sys.getsizeof(obj) + nbytes
+    return sys.getsizeof(obj)
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "fresh_until", "category")
+
+    def __init__(self, value: Any, size: int, expires_at: float, category: str,
+                 fresh_until: Optional[float] = None):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at                 # Dropped after this
+        self.fresh_until = expires_at if fresh_until is None else fresh_until
+        self.category = category
+
+
+class BoundedTTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and a byte budget.
+
+    Args:
+        max_bytes: Approximate memory budget for all entries
+        max_entries: Optional cap on the number of entries
+        default_ttl: TTL (seconds) when set() isn't given one
+        name: Label used in logs and stats
+        sweep: Register with the background sweeper (expired entries freed
+            even if never read again)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: Optional[int] = None,
+                 default_ttl: float = DEFAULT_TTL, name: str = "cache", sweep: bool = True):
+        self.max_bytes = int(max_bytes)
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.name = name
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,       # Dropped to stay within budget (LRU)
+            "expirations": 0,     # Dropped because the TTL ran out
+            "rejected": 0,        # Single values larger than the whole budget
+            "stale_hits": 0,      # get_entry() served a value past its TTL
+        }
+
+        if sweep:
+            _sweeper.register(self)
+
+    # ==========================================
+    # INTERNALS (caller holds the lock)
+    # ==========================================
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _evict_to_fit(self, incoming: int) -> None:
+        while self._entries and (
+            self._bytes + incoming > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) >= self.max_entries)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._stats["evictions"] += 1
+            _logger.debug(f"[{self.name}] Evicted LRU entry: {key}")
+
+    # ==========================================
+    # PUBLIC API
+    # ==========================================
+
+    def _live_entry(self, key: Hashable, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove(key)
+            self._stats["expirations"] += 1
+            return None
+        return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Value for key, or default if missing/expired/stale (a hit refreshes LRU order)."""
+        now = time.time()
+        with self._lock:
+            entry = self._live_entry(key, now)
+            if entry is None or entry.fresh_until <= now:
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.value
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        (value, fresh_until) for key - including entries past their TTL but
+        inside their stale window - or None if missing/expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._live_entry(key, now)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits" if entry.fresh_until > now else "stale_hits"] += 1
+            return entry.value, entry.fresh_until
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            category: str = "default", stale_ttl: float = 0) -> bool:
+        """
+        Store a value. Returns False if it's larger than the whole budget
+        (not cached).
+
+        stale_ttl keeps the entry for that long past its TTL, readable
+        through get_entry() only.
+        """
+        size = estimate_size(value)
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                self._stats["rejected"] += 1
+                _logger.warning(f"[{self.name}] Not caching {key}: {size / 1e6:.1f} MB exceeds budget")
+                return False
+            self._evict_to_fit(size)
+            now = time.time()
+            self._entries[key] = _Entry(value, size, now + ttl + max(0, stale_ttl), category,
+                                        fresh_until=now + ttl)
+            self._bytes += size
+        return True
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+        return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """Drop all expired entries. Returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if e.expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self._stats["expirations"] += len(expired)
+        if expired:
+            _logger.debug(f"[{self.name}] Swept {len(expired)} expired entries")
+        return len(expired)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.fresh_until > time.time()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> Dict:
+        """Entry/byte counts (overall and per category) plus hit/miss/eviction counters."""
+        now = time.time()
+        with self._lock:
+            stats = dict(self._stats)
+            entries_by_type: Dict[str, int] = {}
+            bytes_by_type: Dict[str, int] = {}
+            expired = stale = 0
+            for entry in self._entries.values():
+                entries_by_type[entry.category] = entries_by_type.get(entry.category, 0) + 1
+                bytes_by_type[entry.category] = bytes_by_type.get(entry.category, 0) + entry.size
+                if entry.expires_at <= now:
+                    expired += 1
+                elif entry.fresh_until <= now:
+                    stale += 1
+            stats.update(
+                name=self.name,
+                total_entries=len(self._entries),
+                total_bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                entries_by_type=entries_by_type,
+                bytes_by_type=bytes_by_type,
+                expired_count=expired,
+                stale_count=stale,
+            )
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+# ==========================================
+# BACKGROUND SWEEPER
+# ==========================================
+
+class _Sweeper:
+    """One daemon thread sweeping every registered cache (held weakly)."""
+
+    def __init__(self, interval: float = SWEEP_INTERVAL):
+        self.interval = interval
+        self._caches: "weakref.WeakSet[BoundedTTLCache]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, cache: BoundedTTLCache) -> None:
+        with self._lock:
+            self._caches.add(cache)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="bounded_cache_sweeper", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                caches = list(self._caches)
+            for cache in caches:
+                try:
+                    cache.sweep()
+                except Exception as e:
+                    _logger.warning(f"Cache sweep failed for {cache.name}: {e}")
+            del caches
+
+
+_sweeper = _Sweeper()
@@ -0,0 +1,333 @@
+"""
+CACHE CLIENT - One Redis Client for Every Key/Value Cache
+=========================================================
+Single connection, key namespace and codec shared by utils/ticker_cache.py,
+utils/redis_cache.py and the tiered result cache.
+
+- Keys: "atlas:<kind>:<TICKER>" (see cache_key)
+- get_many(): one MGET round-trip for any number of keys
+- set_many(): pipelined SETEX, one round-trip
+- get_entries(): values plus freshness for stale-while-revalidate
+  (pipelined GET+PTTL, one round-trip)
+- Values encoded by the cache codec (versioned msgpack / Arrow)
+- Without Redis (no REDIS_URL / REDIS_HOST, or unreachable) a bounded
+  in-memory store is used; reconnects are retried after a cooldown
+- Round-trip, hit and miss counters via stats()
+
+Usage:
+    from utils.cache_client import get_cache_client, cache_key
+    client = get_cache_client()
+    infos = client.get_many([cache_key("info", t) for t in tickers])
+    client.set_many({cache_key("info", "AAPL"): info}, ttl=3600)
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import time
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.bounded_cache import BoundedTTLCache
+from utils.cache_codec import CacheCodec, CodecError, get_codec
+
+# === OPTIONAL DEPENDENCIES ===
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("CacheClient")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("CacheClient")
+
+
+NAMESPACE = "atlas"
+DEFAULT_TTL = 3600
+RECONNECT_COOLDOWN = 60          # Seconds before retrying an unreachable Redis
+MEMORY_FALLBACK_MB = 64
+
+
+def cache_key(kind: str, ticker: str) -> str:
+    """Namespaced key, e.g. cache_key("info", "aapl") -> "atlas:info:AAPL"."""
+    return f"{NAMESPACE}:{kind}:{ticker.upper()}"
+
+
+def _connect_from_env():
+    """Binary Redis client from REDIS_URL or REDIS_HOST/PORT/PASSWORD; None if not configured/reachable."""
+    if not REDIS_AVAILABLE:
+        return None
+    redis_url = os.environ.get("REDIS_URL")
+    host = os.environ.get("REDIS_HOST")
+    if not (redis_url or host):
+        return None
+    if redis_url:
+        client = redis.from_url(redis_url, decode_responses=False, socket_timeout=5)
+    else:
+        client = redis.Redis(
+            host=host,
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+            password=os.environ.get("REDIS_PASSWORD"),
+            decode_responses=False,
+            socket_timeout=5,
+        )
+    client.ping()
+    return client
+
+
+class CacheClient:
+    """
+    Namespaced key/value cache over Redis with an in-memory fallback.
+
+    Args:
+        redis_client: Binary Redis client; None connects from the environment
+        codec: Value codec (default: the shared cache codec)
+        connect: Try to connect from the environment when redis_client is None
+    """
+
+    def __init__(self, redis_client=None, codec: Optional[CacheCodec] = None, connect: bool = True):
+        self.codec = codec or get_codec()
+        self._redis = redis_client
+        self._connect = connect and redis_client is None
+        self._next_connect = 0.0
+        self._memory = BoundedTTLCache(max_bytes=MEMORY_FALLBACK_MB * 1024 * 1024, name="cache_client_memory")
+
+        self._lock = threading.Lock()
+        self._stats = {"round_trips": 0, "keys_requested": 0, "hits": 0, "misses": 0,
+                       "writes": 0, "errors": 0}
+
+    # ==========================================
+    # CONNECTION
+    # ==========================================
+
+    @property
+    def redis(self):
+        """The Redis connection, or None (memory fallback)."""
+        if self._redis is None and self._connect and time.time() >= self._next_connect:
+            with self._lock:
+                if self._redis is None and time.time() >= self._next_connect:
+                    try:
+                        self._redis = _connect_from_env()
+                        if self._redis is not None:
+                            _logger.info("Cache client connected to Redis")
+                        else:
+                            self._connect = False        # Not configured - don't keep trying
+                    except Exception as e:
+                        _logger.warning(f"Redis not available ({e}), using in-memory cache")
+                        self._next_connect = time.time() + RECONNECT_COOLDOWN
+        return self._redis
+
+    @property
+    def connected(self) -> bool:
+        return self.redis is not None
+
+    def _count(self, **increments) -> None:
+        with self._lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def _failed(self, op: str, e: Exception) -> None:
+        self._count(errors=1)
+        _logger.warning(f"Redis {op} failed: {e}")
+
+    def _decode(self, key: str, blob: Optional[bytes]) -> Any:
+        if blob is None:
+            return None
+        try:
+            return self.codec.decode(blob)
+        except CodecError as e:
+            _logger.debug(f"Dropping undecodable cache value {key}: {e}")
+            return None
+
+    # ==========================================
+    # SINGLE KEY
+    # ==========================================
+
+    def get(self, key: str) -> Any:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL, stale_ttl: int = 0) -> bool:
+        return self.set_many({key: value}, ttl=ttl, stale_ttl=stale_ttl)
+
+    def delete(self, *keys: str) -> int:
+        for key in keys:
+            self._memory.delete(key)
+        client = self.redis
+        if client is None or not keys:
+            return len(keys)
+        try:
+            self._count(round_trips=1)
+            return client.delete(*keys)
+        except Exception as e:
+            self._failed("delete", e)
+            return 0
+
+    # ==========================================
+    # BATCH
+    # ==========================================
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Values for every key found (missing/expired keys are left out;
+        entries inside their stale window are included - see get_entries).
+        One MGET round-trip regardless of the number of keys.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found: Dict[str, Any] = {}
+        client = self.redis
+        if client is not None:
+            try:
+                blobs = client.mget(keys)
+                self._count(round_trips=1)
+                for key, blob in zip(keys, blobs):
+                    value = self._decode(key, blob)
+                    if value is not None:
+                        found[key] = value
+            except Exception as e:
+                self._failed("mget", e)
+        else:
+            for key in keys:
+                entry = self._memory.get_entry(key)
+                value = self._decode(key, entry[0]) if entry else None
+                if value is not None:
+                    found[key] = value
+
+        self._count(keys_requested=len(keys), hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def get_entries(self, keys: Iterable[str], stale_ttl: int = 0) -> Dict[str, Tuple[Any, float]]:
+        """
+        (value, fresh_until) for every key found, for entries written with the
+        same stale_ttl. One pipelined GET+PTTL round-trip.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found: Dict[str, Tuple[Any, float]] = {}
+        client = self.redis
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for key in keys:
+                    pipe.get(key)
+                    pipe.pttl(key)
+                replies = pipe.execute()
+                self._count(round_trips=1)
+                now = time.time()
+                for key, blob, pttl in zip(keys, replies[0::2], replies[1::2]):
+                    value = self._decode(key, blob)
+                    if value is not None:
+                        remaining = pttl / 1000.0 if pttl and pttl > 0 else DEFAULT_TTL
+                        found[key] = (value, now + remaining - stale_ttl)
+            except Exception as e:
+                self._failed("get/pttl", e)
+        else:
+            for key in keys:
+                entry = self._memory.get_entry(key)
+                value = self._decode(key, entry[0]) if entry else None
+                if value is not None:
+                    found[key] = (value, entry[1])
+
+        self._count(keys_requested=len(keys), hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def set_many(self, mapping: Dict[str, Any], ttl: int = DEFAULT_TTL, stale_ttl: int = 0) -> bool:
+        """
+        Store every value with the same TTL (pipelined SETEX, one round-trip).
+        stale_ttl keeps values that long past the TTL for get_entries().
+        """
+        if not mapping:
+            return True
+        encoded = {}
+        for key, value in mapping.items():
+            try:
+                encoded[key] = self.codec.encode(value)
+            except (TypeError, ValueError, OverflowError) as e:
+                _logger.debug(f"Not caching {key}: {e}")
+
+        client = self.redis
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for key, blob in encoded.items():
+                    pipe.setex(key, max(1, int(ttl + stale_ttl)), blob)
+                pipe.execute()
+                self._count(round_trips=1, writes=len(encoded))
+                return len(encoded) == len(mapping)
+            except Exception as e:
+                self._failed("pipelined setex", e)
+
+        for key, blob in encoded.items():
+            self._memory.set(key, blob, ttl=ttl, stale_ttl=stale_ttl)
+        self._count(writes=len(encoded))
+        return len(encoded) == len(mapping)
+
+    def scan_delete(self, pattern: str = f"{NAMESPACE}:*") -> int:
+        """Delete every key matching a pattern (memory fallback: cleared entirely)."""
+        self._memory.clear()
+        client = self.redis
+        if client is None:
+            return 0
+        removed = 0
+        try:
+            batch: List[bytes] = []
+            for key in client.scan_iter(pattern, count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    removed += client.delete(*batch)
+                    batch = []
+            if batch:
+                removed += client.delete(*batch)
+        except Exception as e:
+            self._failed("scan/delete", e)
+        return removed
+
+    # ==========================================
+    # STATS
+    # ==========================================
+
+    def stats(self) -> Dict:
+        """Backend, round-trips vs. keys requested, hit rate, codec and Redis memory."""
+        with self._lock:
+            stats = dict(self._stats)
+        client = self.redis
+        stats["backend"] = "redis" if client is not None else "memory"
+        stats["connected"] = client is not None
+        stats["keys_per_round_trip"] = round(stats["keys_requested"] / stats["round_trips"], 2) if stats["round_trips"] else 0.0
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["memory_entries"] = len(self._memory)
+        stats["codec"] = self.codec.stats()
+        if client is not None:
+            try:
+                info = client.info("memory")
+                stats["redis_used_memory"] = info.get("used_memory_human", "unknown")
+                stats["redis_keys"] = client.dbsize()
+            except Exception:
+                pass
+        return stats
+
+
+# ==========================================
+# PROCESS-WIDE CLIENT
+# ==========================================
+
+_client: Optional[CacheClient] = None
+_client_lock = threading.Lock()
+
+
+def get_cache_client() -> CacheClient:
+    """Get the cache client shared by every cache module."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = CacheClient()
+    return _client
@@ -0,0 +1,383 @@
+"""
+CACHE CODEC - Versioned Binary Serialization for Cache Values
+=============================================================
+One encode/decode layer for every cache that stores bytes (Redis, disk).
+
+json.dumps(..., default=str) turned Timestamps into strings, couldn't hold
+DataFrames and was slow on large info blobs. Encoded values now carry a
+small header so formats can change without misreading old entries:
+
+    b"AC" | version | serializer id | compression id | payload
+
+- Serializers: msgpack (DataFrames/Series as Arrow IPC, Timestamps,
+  numpy arrays and scalars, FinancialsPanel as typed extensions) or JSON
+  when msgpack isn't installed
+- Compression: zstd if installed, else zlib, for payloads over 1 KB
+- Values without a header are read as legacy JSON (entries written before
+  the codec existed)
+- Encode/decode counts, sizes and timings via stats()
+
+Usage:
+    from utils.cache_codec import get_codec
+    codec = get_codec()
+    blob = codec.encode({"info": info, "income_statement": df})
+    value = codec.decode(blob)
+
+Author: ATLAS Financial Intelligence
+"""
+
+import json
+import time
+import zlib
+import struct
+import datetime as dt
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.financials_panel import FinancialsPanel
+
+# === OPTIONAL DEPENDENCIES ===
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("CacheCodec")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("CacheCodec")
+
+
+MAGIC = b"AC"
+CODEC_VERSION = 1
+_HEADER = struct.Struct(">2sBBB")         # magic, version, serializer id, compression id
+COMPRESS_MIN_BYTES = 1024
+
+
+class CodecError(ValueError):
+    """Blob can't be decoded (unknown version/serializer/compression, or corrupt)."""
+
+
+# ==========================================
+# MSGPACK EXTENSION TYPES
+# ==========================================
+
+EXT_FRAME = 1
+EXT_SERIES = 2
+EXT_TIMESTAMP = 3
+EXT_DATETIME = 4
+EXT_DATE = 5
+EXT_NDARRAY = 6
+EXT_NAT = 7
+EXT_TIMEDELTA = 8
+EXT_PANEL = 9
+
+_FRAME_ARROW = b"A"
+_FRAME_SPLIT = b"S"
+
+
+def _frame_to_bytes(df: pd.DataFrame) -> bytes:
+    """Arrow IPC stream when the frame converts cleanly, else msgpack 'split' layout."""
+    if PYARROW_AVAILABLE:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return _FRAME_ARROW + sink.getvalue().to_pybytes()
+        except (pa.ArrowException, TypeError, ValueError):
+            pass    # e.g. object columns mixing str and float
+    split = {"index": list(df.index), "columns": list(df.columns), "data": df.values.tolist()}
+    return _FRAME_SPLIT + _msgpack_dumps(split)
+
+
+def _frame_from_bytes(data: bytes) -> pd.DataFrame:
+    kind, body = data[:1], data[1:]
+    if kind == _FRAME_ARROW:
+        if not PYARROW_AVAILABLE:
+            raise CodecError("DataFrame was encoded with Arrow but pyarrow isn't installed")
+        return pa.ipc.open_stream(body).read_all().to_pandas()
+    split = _msgpack_loads(body)
+    return pd.DataFrame(split["data"], index=split["index"], columns=split["columns"])
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, pd.DataFrame):
+        return msgpack.ExtType(EXT_FRAME, _frame_to_bytes(obj))
+    if isinstance(obj, pd.Series):
+        frame = obj.to_frame(name="__series__")
+        return msgpack.ExtType(EXT_SERIES, _msgpack_dumps([obj.name, _frame_to_bytes(frame)]))
+    if obj is pd.NaT:
+        return msgpack.ExtType(EXT_NAT, b"")
+    if isinstance(obj, pd.Timestamp):
+        return msgpack.ExtType(EXT_TIMESTAMP, _msgpack_dumps([obj.value, str(obj.tz) if obj.tz else None]))
+    if isinstance(obj, pd.Timedelta):
+        return msgpack.ExtType(EXT_TIMEDELTA, struct.pack(">q", obj.value))
+    if isinstance(obj, dt.datetime):
+        return msgpack.ExtType(EXT_DATETIME, obj.isoformat().encode("utf-8"))
+    if isinstance(obj, dt.date):
+        return msgpack.ExtType(EXT_DATE, obj.isoformat().encode("utf-8"))
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            return obj.tolist()
+        return msgpack.ExtType(EXT_NDARRAY, _msgpack_dumps([obj.dtype.str, list(obj.shape), obj.tobytes()]))
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, FinancialsPanel):
+        return msgpack.ExtType(EXT_PANEL, _msgpack_dumps(obj.to_dict()))
+    raise TypeError(f"Cannot encode {type(obj).__name__} for the cache")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == EXT_FRAME:
+        return _frame_from_bytes(data)
+    if code == EXT_SERIES:
+        name, frame_bytes = _msgpack_loads(data)
+        return _frame_from_bytes(frame_bytes)["__series__"].rename(name)
+    if code == EXT_TIMESTAMP:
+        value, tz = _msgpack_loads(data)
+        ts = pd.Timestamp(value)
+        return ts.tz_localize("UTC").tz_convert(tz) if tz else ts
+    if code == EXT_NAT:
+        return pd.NaT
+    if code == EXT_TIMEDELTA:
+        return pd.Timedelta(struct.unpack(">q", data)[0])
+    if code == EXT_DATETIME:
+        return dt.datetime.fromisoformat(data.decode("utf-8"))
+    if code == EXT_DATE:
+        return dt.date.fromisoformat(data.decode("utf-8"))
+    if code == EXT_NDARRAY:
+        dtype, shape, raw = _msgpack_loads(data)
+        return np.frombuffer(raw, dtype=np.dtype(dtype)).reshape(shape).copy()
+    if code == EXT_PANEL:
+        return FinancialsPanel.from_dict(_msgpack_loads(data))
+    return msgpack.ExtType(code, data)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=_msgpack_default, use_bin_type=True, datetime=False)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
+
+
+# ==========================================
+# JSON (no msgpack installed)
+# ==========================================
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        raise TypeError("DataFrames need msgpack installed to be cached")
+    if isinstance(obj, (pd.Timestamp, dt.datetime, dt.date)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, FinancialsPanel):
+        return obj.to_dict()        # get_panel() rebuilds it from the dict
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, default=_json_default).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    return json.loads(data)
+
+
+# ==========================================
+# REGISTRIES
+# ==========================================
+
+# id -> (name, dumps, loads)
+SERIALIZERS: Dict[int, Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    0: ("json", _json_dumps, _json_loads),
+}
+if MSGPACK_AVAILABLE:
+    SERIALIZERS[1] = ("msgpack", _msgpack_dumps, _msgpack_loads)
+
+# id -> (name, compress(data, level), decompress(data))
+COMPRESSORS: Dict[int, Tuple[str, Callable[[bytes, int], bytes], Callable[[bytes], bytes]]] = {
+    0: ("none", lambda data, level: data, lambda data: data),
+    1: ("zlib", lambda data, level: zlib.compress(data, level), zlib.decompress),
+}
+if ZSTD_AVAILABLE:
+    COMPRESSORS[2] = (
+        "zstd",
+        lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+        lambda data: zstandard.ZstdDecompressor().decompress(data),
+    )
+
+DEFAULT_LEVELS = {"zlib": 6, "zstd": 3}
+
+
+def register_serializer(serializer_id: int, name: str, dumps: Callable[[Any], bytes],
+                        loads: Callable[[bytes], Any]) -> None:
+    """Add a serializer (ids are stored in every blob - never reuse one)."""
+    if serializer_id in SERIALIZERS and SERIALIZERS[serializer_id][0] != name:
+        raise ValueError(f"Serializer id {serializer_id} already used by {SERIALIZERS[serializer_id][0]}")
+    SERIALIZERS[serializer_id] = (name, dumps, loads)
+
+
+def _id_for(registry: Dict, name: str) -> int:
+    for key, entry in registry.items():
+        if entry[0] == name:
+            return key
+    raise ValueError(f"Unknown or unavailable codec component: {name}")
+
+
+# ==========================================
+# CODEC
+# ==========================================
+
+class CacheCodec:
+    """
+    Encode/decode cache values with a versioned header.
+
+    Args:
+        serializer: "msgpack", "json" or "auto" (msgpack when installed)
+        compression: "zstd", "zlib", "none" or "auto" (zstd when installed, else zlib)
+        level: Compression level (default per algorithm)
+        name: Label used in stats
+    """
+
+    def __init__(self, serializer: str = "auto", compression: str = "auto",
+                 level: Optional[int] = None, name: str = "default"):
+        if serializer == "auto":
+            serializer = "msgpack" if MSGPACK_AVAILABLE else "json"
+        if compression == "auto":
+            compression = "zstd" if ZSTD_AVAILABLE else "zlib"
+        self.serializer_id = _id_for(SERIALIZERS, serializer)
+        self.compression_id = _id_for(COMPRESSORS, compression)
+        self.level = level if level is not None else DEFAULT_LEVELS.get(compression, 0)
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._stats = {
+            "encoded": 0, "decoded": 0, "legacy_decoded": 0, "errors": 0,
+            "raw_bytes": 0,           # Serialized size before compression
+            "stored_bytes": 0,        # Size actually written (header + compressed payload)
+            "max_stored_bytes": 0,
+            "encode_seconds": 0.0, "decode_seconds": 0.0,
+        }
+
+    @property
+    def description(self) -> str:
+        return f"{SERIALIZERS[self.serializer_id][0]}+{COMPRESSORS[self.compression_id][0]}"
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize (and compress if large enough). Raises TypeError for unsupported values."""
+        t0 = time.perf_counter()
+        try:
+            raw = SERIALIZERS[self.serializer_id][1](value)
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        compression_id = self.compression_id if len(raw) >= COMPRESS_MIN_BYTES else 0
+        payload = COMPRESSORS[compression_id][1](raw, self.level)
+        blob = _HEADER.pack(MAGIC, CODEC_VERSION, self.serializer_id, compression_id) + payload
+
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self._stats["encoded"] += 1
+            self._stats["raw_bytes"] += len(raw)
+            self._stats["stored_bytes"] += len(blob)
+            self._stats["max_stored_bytes"] = max(self._stats["max_stored_bytes"], len(blob))
+            self._stats["encode_seconds"] += elapsed
+        return blob
+
+    def decode(self, blob: bytes) -> Any:
+        """Inverse of encode(); header-less blobs are read as legacy JSON."""
+        if isinstance(blob, str):
+            blob = blob.encode("utf-8")
+        t0 = time.perf_counter()
+        legacy = blob[:2] != MAGIC
+        try:
+            if legacy:
+                value = json.loads(blob)
+            else:
+                _, version, serializer_id, compression_id = _HEADER.unpack_from(blob)
+                if version != CODEC_VERSION:
+                    raise CodecError(f"Unsupported cache codec version {version}")
+                if serializer_id not in SERIALIZERS or compression_id not in COMPRESSORS:
+                    raise CodecError(f"Blob needs serializer {serializer_id} / compression {compression_id}, not available")
+                raw = COMPRESSORS[compression_id][2](blob[_HEADER.size:])
+                value = SERIALIZERS[serializer_id][2](raw)
+        except CodecError:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise CodecError(f"Corrupt cache value: {e}") from e
+
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            self._stats["legacy_decoded" if legacy else "decoded"] += 1
+            self._stats["decode_seconds"] += elapsed
+        return value
+
+    def stats(self) -> Dict:
+        """Payload sizes, compression ratio and encode/decode timings."""
+        with self._lock:
+            stats = dict(self._stats)
+        decodes = stats["decoded"] + stats["legacy_decoded"]
+        stats.update(
+            name=self.name,
+            codec=self.description,
+            version=CODEC_VERSION,
+            avg_stored_bytes=round(stats["stored_bytes"] / stats["encoded"]) if stats["encoded"] else 0,
+            compression_ratio=round(stats["raw_bytes"] / stats["stored_bytes"], 2) if stats["stored_bytes"] else 0.0,
+            avg_encode_ms=round(1000 * stats["encode_seconds"] / stats["encoded"], 3) if stats["encoded"] else 0.0,
+            avg_decode_ms=round(1000 * stats["decode_seconds"] / decodes, 3) if decodes else 0.0,
+        )
+        stats["encode_seconds"] = round(stats["encode_seconds"], 4)
+        stats["decode_seconds"] = round(stats["decode_seconds"], 4)
+        return stats
+
+
+# ==========================================
+# PROCESS-WIDE CODEC
+# ==========================================
+
+_codec: Optional[CacheCodec] = None
+_codec_lock = threading.Lock()
+
+
+def get_codec() -> CacheCodec:
+    """Get the codec shared by the Redis and disk caches."""
+    global _codec
+    if _codec is None:
+        with _codec_lock:
+            if _codec is None:
+                _codec = CacheCodec()
+                _logger.debug(f"Cache codec: {_codec.description}")
+    return _codec
@@ -0,0 +1,462 @@
+"""
+CACHE WARMER - Off-Peak Pre-Warming of Extraction, Info and Analysis Caches
+===========================================================================
+Removes the cold first visit (8-10s, see validation/performance_profile.md)
+by extracting the S&P 500 universe plus a watchlist ahead of time.
+
+- Runs only off-peak: while the NYSE is closed, or inside ATLAS_WARMUP_HOURS
+  (New York time, e.g. "20-7")
+- Order: watchlist, then most requested tickers (searches recorded by the
+  app), then the rest of the universe
+- Paced by its own token bucket on top of the SEC limiter used inside
+  extraction; backs off when a source reports rate limiting
+- Progress checkpointed to disk after every ticker: a restart resumes the
+  current cycle instead of starting over
+- Extraction results land in the shared result cache (memory/disk/Redis),
+  so a warmer running as a separate process warms the app too
+- Once a cycle has warmed everything, the S&P 500 fundamentals cube is
+  rebuilt from the (now cached) results of the tickers warmed that cycle
+
+Usage:
+    # In the app process (also warms the in-process analysis caches)
+    from utils.cache_warmer import get_cache_warmer, record_ticker_request
+    record_ticker_request("AAPL")        # on every user search
+    get_cache_warmer().start()
+
+    # Standalone (cron / sidecar)
+    python -m utils.cache_warmer --max 100 --watchlist AAPL,MSFT
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import json
+import time
+import argparse
+import importlib
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.rate_limiter import TokenBucket
+from utils.ttl_policy import NYSECalendar, NY_TZ
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("CacheWarmer")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("CacheWarmer")
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "data_sources", "cache")
+STATE_PATH = os.path.join(CACHE_DIR, "warmup_state.json")
+DEMAND_PATH = os.path.join(CACHE_DIR, "ticker_demand.json")
+
+# Same arguments as the app's cached_extract_financials() defaults, so warmed
+# results are the ones a first visit looks up
+EXTRACT_KWARGS = {"source": "auto", "filing_types": ["10-K", "10-Q"],
+                  "include_quant": False, "fiscal_year_offset": 0}
+
+# Streamlit-cached analyses, warmed when running inside the app process
+DEFAULT_ANALYSES: List[Tuple[str, str]] = [
+    ("dividend_analysis", "analyze_dividends"),
+    ("growth_quality", "analyze_growth_quality"),
+    ("management_effectiveness", "analyze_management_effectiveness"),
+    ("balance_sheet_health", "analyze_balance_sheet_health"),
+    ("cashflow_analysis", "analyze_cashflow"),
+    ("valuation_multiples", "analyze_valuation_multiples"),
+    ("earnings_analysis", "analyze_earnings_history"),
+    ("governance_analysis", "analyze_governance"),
+]
+
+WARMUP_RATE_PER_MINUTE = 12      # Tickers per minute (each is several SEC/yfinance calls)
+CYCLE_HOURS = 24                 # A full pass over the universe, then start again
+MAX_FAILURES = 2                 # Per ticker per cycle
+INFO_BATCH = 50                  # Tickers per batched info lookup
+RATE_LIMIT_BACKOFF = 300         # Seconds to pause after a source rate-limits us
+RUN_INTERVAL = 900               # Background loop: seconds between runs
+
+
+def _read_json(path: str) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, data: Dict) -> None:
+    """Atomic write (tmp file + replace) so a crash never leaves a torn file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+# ==========================================
+# DEMAND TRACKING
+# ==========================================
+
+class DemandTracker:
+    """
+    Per-ticker request counts, buffered in memory and merged into a JSON file.
+
+    Args:
+        path: Counts file (shared by the app and a standalone warmer)
+        flush_every: Flush after this many unflushed requests
+        flush_interval: ...or when the oldest unflushed request is this old (seconds)
+    """
+
+    def __init__(self, path: str = DEMAND_PATH, flush_every: int = 20, flush_interval: float = 300):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: Dict[str, int] = {}
+        self._pending_since = 0.0
+
+    def record(self, ticker: str) -> None:
+        if not ticker:
+            return
+        ticker = ticker.strip().upper()
+        with self._lock:
+            if not self._pending:
+                self._pending_since = time.time()
+            self._pending[ticker] = self._pending.get(ticker, 0) + 1
+            due = (sum(self._pending.values()) >= self.flush_every
+                   or time.time() - self._pending_since >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            counts = _read_json(self.path)
+            for ticker, n in pending.items():
+                counts[ticker] = counts.get(ticker, 0) + n
+            try:
+                _write_json(self.path, counts)
+            except OSError as e:
+                _logger.debug(f"Could not save ticker demand: {e}")
+
+    def counts(self) -> Dict[str, int]:
+        """Persisted counts plus anything not flushed yet."""
+        counts = _read_json(self.path)
+        with self._lock:
+            for ticker, n in self._pending.items():
+                counts[ticker] = counts.get(ticker, 0) + n
+        return counts
+
+
+_demand: Optional[DemandTracker] = None
+_demand_lock = threading.Lock()
+
+
+def get_demand_tracker() -> DemandTracker:
+    global _demand
+    if _demand is None:
+        with _demand_lock:
+            if _demand is None:
+                _demand = DemandTracker()
+    return _demand
+
+
+def record_ticker_request(ticker: str) -> None:
+    """Count a user request for a ticker (drives warm-up priority)."""
+    try:
+        get_demand_tracker().record(ticker)
+    except Exception as e:
+        _logger.debug(f"Demand tracking failed: {e}")
+
+
+# ==========================================
+# WARMER
+# ==========================================
+
+def _parse_hours(spec: Optional[str]) -> Optional[Tuple[int, int]]:
+    """"20-7" -> (20, 7); None/invalid -> None."""
+    try:
+        start, end = (int(part) % 24 for part in spec.split("-", 1))
+        return start, end
+    except (AttributeError, ValueError):
+        return None
+
+
+class CacheWarmer:
+    """
+    Pre-warms caches for a ticker universe during off-peak windows.
+
+    Args:
+        universe: Tickers to keep warm (default: S&P 500)
+        watchlist: Always warmed first (default: ATLAS_WARMUP_WATCHLIST, comma-separated)
+        state_path: Checkpoint file for resuming after a restart
+        demand: Request counts used for prioritisation
+        extract: ticker -> financials (default: USAFinancialExtractor with EXTRACT_KWARGS)
+        analyses: (module, function) pairs called with the ticker after extraction
+        rate_per_minute: Tickers started per minute
+        off_peak_hours: (start, end) hours in New York time; None = whenever the NYSE is closed
+        cube_root: Fundamentals cube rebuilt here after each completed cycle (None = no cube)
+    """
+
+    def __init__(self, universe: Optional[Sequence[str]] = None, watchlist: Optional[Sequence[str]] = None,
+                 state_path: str = STATE_PATH, demand: Optional[DemandTracker] = None,
+                 extract: Optional[Callable[[str], Dict]] = None,
+                 analyses: Optional[Sequence[Tuple[str, str]]] = None,
+                 rate_per_minute: float = WARMUP_RATE_PER_MINUTE,
+                 off_peak_hours: Optional[Tuple[int, int]] = None,
+                 cycle_hours: float = CYCLE_HOURS, cube_root: Optional[str] = None):
+        if universe is None:
+            from sp500_tickers import SP500_TICKERS
+            universe = SP500_TICKERS
+        if watchlist is None:
+            watchlist = [t for t in os.getenv("ATLAS_WARMUP_WATCHLIST", "").split(",") if t.strip()]
+        self.universe = [t.strip().upper() for t in universe]
+        self.watchlist = [t.strip().upper() for t in watchlist]
+        self.state_path = state_path
+        self.demand = demand or get_demand_tracker()
+        self._extract = extract
+        self.analyses = list(DEFAULT_ANALYSES if analyses is None else analyses)
+        self.off_peak_hours = off_peak_hours or _parse_hours(os.getenv("ATLAS_WARMUP_HOURS"))
+        self.cycle_seconds = cycle_hours * 3600
+        self.cube_root = cube_root
+        self.calendar = NYSECalendar()
+        self.bucket = TokenBucket(rate=rate_per_minute / 60.0, capacity=1, name="warmup")
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.state = self._load_state()
+
+    # ==========================================
+    # CHECKPOINT STATE
+    # ==========================================
+
+    def _load_state(self) -> Dict:
+        state = _read_json(self.state_path)
+        if not state or time.time() - state.get("cycle_started", 0) > self.cycle_seconds:
+            state = self._new_cycle(state)
+        state.setdefault("done", {})
+        state.setdefault("failures", {})
+        return state
+
+    @staticmethod
+    def _new_cycle(previous: Optional[Dict] = None) -> Dict:
+        cycles = (previous or {}).get("cycles", 0)
+        return {"cycle_started": time.time(), "cycles": cycles + 1, "done": {}, "failures": {}}
+
+    def _save_state(self) -> None:
+        try:
+            _write_json(self.state_path, self.state)
+        except OSError as e:
+            _logger.warning(f"Could not save warm-up checkpoint: {e}")
+
+    # ==========================================
+    # SCHEDULING
+    # ==========================================
+
+    def is_off_peak(self, now: Optional[datetime] = None) -> bool:
+        now = now.astimezone(NY_TZ) if now else datetime.now(NY_TZ)
+        if self.off_peak_hours:
+            start, end = self.off_peak_hours
+            hour = now.hour
+            return start <= hour < end if start < end else (hour >= start or hour < end)
+        return not self.calendar.is_open(now)
+
+    def queue(self) -> List[str]:
+        """Tickers still to warm this cycle, highest priority first."""
+        if time.time() - self.state["cycle_started"] > self.cycle_seconds:
+            self.state = self._new_cycle(self.state)
+        counts = self.demand.counts()
+        position = {t: i for i, t in enumerate(self.universe)}
+        requested = sorted((t for t in counts if t not in self.watchlist),
+                           key=lambda t: (-counts[t], position.get(t, len(position))))
+        ordered = list(dict.fromkeys(self.watchlist + requested + self.universe))
+        return [t for t in ordered
+                if t not in self.state["done"] and self.state["failures"].get(t, 0) < MAX_FAILURES]
+
+    # ==========================================
+    # WARMING
+    # ==========================================
+
+    def _extract_financials(self, ticker: str) -> Dict:
+        if self._extract is None:
+            from usa_backend import USAFinancialExtractor
+            extractor = USAFinancialExtractor()
+            self._extract = lambda t: extractor.extract_financials(t, **EXTRACT_KWARGS)
+        return self._extract(ticker)
+
+    def _run_analyses(self, ticker: str) -> None:
+        for module_name, function_name in self.analyses:
+            try:
+                getattr(importlib.import_module(module_name), function_name)(ticker)
+            except Exception as e:
+                _logger.debug(f"Warm-up analysis {function_name} failed for {ticker}: {e}")
+
+    def warm(self, ticker: str) -> bool:
+        """Warm every cache for one ticker. Returns True on success."""
+        financials = self._extract_financials(ticker)
+        if not financials or financials.get("status") == "error":
+            message = str((financials or {}).get("message", "no data"))
+            if "rate limit" in message.lower() or "429" in message:
+                self.bucket.penalize(RATE_LIMIT_BACKOFF)
+            raise RuntimeError(message)
+        self._run_analyses(ticker)
+        return True
+
+    def build_cube(self) -> Optional[int]:
+        """
+        Rebuild the fundamentals cube from this cycle's warmed universe
+        tickers (once per cycle). Watchlist tickers outside the universe (the
+        S&P 500 by default) stay out of the cube's percentiles and medians.
+        Returns the number of tickers in the cube, or None if nothing was built.
+        """
+        cycle = self.state.get("cycles", 1)
+        universe = set(self.universe)
+        tickers = [t for t in self.state["done"] if t in universe]
+        if self.cube_root is None or self.state.get("cube_cycle") == cycle or not tickers:
+            return None
+        try:
+            from data_sources.fundamentals_cube import build_cube
+            cube = build_cube(universe=tickers, extract=self._extract_financials, root=self.cube_root)
+        except Exception as e:
+            _logger.error(f"Fundamentals cube build failed: {e}")
+            return None
+        self.state["cube_cycle"] = cycle
+        self._save_state()
+        return len(cube) if cube is not None else None
+
+    def _warm_info(self, tickers: Iterable[str]) -> None:
+        try:
+            from utils.ticker_cache import get_ticker_info_many
+            get_ticker_info_many(tickers)
+        except Exception as e:
+            _logger.debug(f"Warm-up info batch failed: {e}")
+
+    def run(self, max_tickers: Optional[int] = None, force: bool = False) -> Dict:
+        """
+        Warm queued tickers until the queue is empty, max_tickers is reached,
+        the off-peak window ends (unless force) or stop() is called.
+
+        Returns:
+            Summary: warmed, failed, remaining, elapsed seconds
+        """
+        with self._lock:
+            start = time.time()
+            warmed, failed = [], []
+            pending = self.queue()
+            if max_tickers is not None:
+                pending = pending[:max_tickers]
+
+            for i in range(0, len(pending), INFO_BATCH):
+                batch = pending[i:i + INFO_BATCH]
+                if self._stop.is_set() or not (force or self.is_off_peak()):
+                    break
+                self._warm_info(batch)
+                for ticker in batch:
+                    if self._stop.is_set() or not (force or self.is_off_peak()):
+                        break
+                    self.bucket.acquire()
+                    try:
+                        self.warm(ticker)
+                        self.state["done"][ticker] = time.time()
+                        self.state["failures"].pop(ticker, None)
+                        warmed.append(ticker)
+                    except Exception as e:
+                        self.state["failures"][ticker] = self.state["failures"].get(ticker, 0) + 1
+                        failed.append(ticker)
+                        _logger.warning(f"Warm-up failed for {ticker}: {e}")
+                    self.state["last_run"] = time.time()
+                    self._save_state()
+
+            summary = {
+                "warmed": len(warmed),
+                "failed": len(failed),
+                "remaining": len(self.queue()),
+                "elapsed": round(time.time() - start, 1),
+                "cycle": self.state.get("cycles", 1),
+            }
+            if summary["remaining"] == 0 and not self._stop.is_set():
+                summary["cube"] = self.build_cube()
+        _logger.info(f"Warm-up run: {summary}")
+        return summary
+
+    # ==========================================
+    # BACKGROUND LOOP
+    # ==========================================
+
+    def start(self, interval: float = RUN_INTERVAL) -> None:
+        """Run in a daemon thread: a warm-up pass every `interval` seconds while off-peak."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                if self.is_off_peak():
+                    try:
+                        self.run()
+                    except Exception as e:
+                        _logger.error(f"Warm-up run crashed: {e}")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=loop, name="cache_warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            done = len(self.state["done"])
+        return {
+            "cycle": self.state.get("cycles", 1),
+            "cycle_started": self.state["cycle_started"],
+            "done": done,
+            "queued": len(self.queue()),
+            "off_peak": self.is_off_peak(),
+            "running": self._thread is not None and self._thread.is_alive(),
+            "rate_limiter": self.bucket.stats(),
+        }
+
+
+_warmer: Optional[CacheWarmer] = None
+_warmer_lock = threading.Lock()
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get the process-wide warmer (S&P 500 + ATLAS_WARMUP_WATCHLIST)."""
+    global _warmer
+    if _warmer is None:
+        with _warmer_lock:
+            if _warmer is None:
+                from data_sources.fundamentals_cube import cube_root
+                _warmer = CacheWarmer(cube_root=cube_root())
+    return _warmer
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Pre-warm ATLAS caches for the S&P 500 universe")
+    parser.add_argument("--max", type=int, default=None, help="Tickers to warm in this run")
+    parser.add_argument("--watchlist", default="", help="Comma-separated tickers warmed first")
+    parser.add_argument("--force", action="store_true", help="Run even during market hours")
+    parser.add_argument("--rate", type=float, default=WARMUP_RATE_PER_MINUTE, help="Tickers per minute")
+    args = parser.parse_args(argv)
+
+    watchlist = [t for t in args.watchlist.split(",") if t.strip()] or None
+    # Analysis caches are per-process (Streamlit) - pointless from a standalone run
+    from data_sources.fundamentals_cube import cube_root
+    warmer = CacheWarmer(watchlist=watchlist, analyses=[], rate_per_minute=args.rate,
+                         cube_root=cube_root())
+    summary = warmer.run(max_tickers=args.max, force=args.force)
+    print(json.dumps(summary, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,10 @@ without needing to update the mapper.
 Author: ATLAS Financial Intelligence
 """
 
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 import re
+import threading
 
 
 def _normalize_key(key: str) -> str:
@@ -881,6 +883,91 @@ for _canonical, _aliases in MASTER_ALIAS_MAP.items():
 KNOWN_ALIASES = MASTER_ALIAS_MAP
 
 
+# ============================================================================
+# COMPILED SCHEMA RESOLVERS - one per distinct key set
+# ============================================================================
+# A miss in get_field used to normalize every key of the dict. Pages call
+# get_field thousands of times against the same few dict layouts, so the
+# candidate keys for each field are worked out once per layout (schema) and
+# reused - including the "no such key" answer. Finding the resolver hashes
+# the dict's key tuple, so get_field only asks for one after the direct
+# alias probe misses.
+
+_ABSENT: Tuple[str, ...] = ()           # Cached "field not in this schema" marker
+RESOLVER_CACHE_SIZE = 256               # Distinct schemas kept (LRU)
+
+_RESOLVERS: "OrderedDict[Tuple, SchemaResolver]" = OrderedDict()
+_RESOLVERS_LOCK = threading.Lock()
+
+
+class SchemaResolver:
+    """
+    Field name -> candidate keys for one key set, in get_field's order.
+
+    Candidates are keys of the schema; the caller still checks their values,
+    so a dict with the same keys but different (or invalid) values resolves
+    exactly as the uncompiled lookup would.
+    """
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        # normalized key -> keys with that normalization, in dict order
+        self._by_normalized: Dict[str, List[str]] = {}
+        for key in keys:
+            if isinstance(key, str):
+                self._by_normalized.setdefault(_normalize_key(key), []).append(key)
+        self._key_set = key_set = set(keys)
+        # Every canonical field compiled up front: its aliases present, or _ABSENT
+        self.canonical: Dict[str, Tuple[str, ...]] = {
+            canonical: tuple(alias for alias in aliases if alias in key_set) or _ABSENT
+            for canonical, aliases in _NORMALIZED_ALIAS_MAP.items()
+        }
+        self._fields: Dict[str, Tuple[str, ...]] = {}
+
+    def candidates(self, field_name: str) -> Tuple[str, ...]:
+        """Keys to try for field_name (memoized, _ABSENT when none exist)."""
+        found = self._fields.get(field_name)
+        if found is None:
+            found = self._fields[field_name] = self._compile(field_name)
+        return found
+
+    def _compile(self, field_name: str) -> Tuple[str, ...]:
+        ordered: List[str] = []
+        if field_name in self._key_set:
+            ordered.append(field_name)
+        canonical = _REVERSE_LOOKUP.get(field_name) or _REVERSE_LOOKUP.get(field_name.lower())
+        if canonical:
+            ordered.extend(self.canonical[canonical])
+        normalized_request = _normalize_key(field_name)
+        canonical_from_norm = _NORMALIZED_LOOKUP.get(normalized_request)
+        if canonical_from_norm and canonical_from_norm != canonical:
+            ordered.extend(self.canonical[canonical_from_norm])
+        ordered.extend(self._by_normalized.get(normalized_request, ()))
+        return tuple(dict.fromkeys(ordered)) or _ABSENT
+
+
+def get_resolver(data: Dict) -> SchemaResolver:
+    """Compiled resolver for data's key set (built on first use, then shared)."""
+    signature = tuple(data)
+    with _RESOLVERS_LOCK:
+        resolver = _RESOLVERS.get(signature)
+        if resolver is not None:
+            _RESOLVERS.move_to_end(signature)
+            return resolver
+    resolver = SchemaResolver(signature)
+    with _RESOLVERS_LOCK:
+        _RESOLVERS[signature] = resolver
+        while len(_RESOLVERS) > RESOLVER_CACHE_SIZE:
+            _RESOLVERS.popitem(last=False)
+    return resolver
+
+
+def clear_resolver_cache():
+    """Drop all compiled resolvers"""
+    with _RESOLVERS_LOCK:
+        _RESOLVERS.clear()
+
+
 def get_field(data: Dict, field_name: str, default: Any = None) -> Any:
     """
     ULTRA-FAST field retrieval with O(1) lookups - STRICT matching only.
@@ -890,6 +977,11 @@ def get_field(data: Dict, field_name: str, default: Any = None) -> Any:
     2. Check if known alias → get canonical → try all aliases
     3. Normalized lookup (handles formatting differences)
     
+    Steps 1-2 probe the data directly (O(aliases), no per-call key scan);
+    only when they miss is step 3 resolved through the compiled resolver
+    for the key set (see SchemaResolver), so repeated misses against the
+    same dict layout don't rescan its keys either.
+    
     NO FUZZY/PARTIAL MATCHING - better to return N/A than wrong data!
     
     Performance: ~0.001ms per lookup (pre-computed hash tables)
@@ -920,46 +1012,24 @@ def get_field(data: Dict, field_name: str, default: Any = None) -> Any:
             return val
     
     # =========================================================================
-    # FAST PATH 2: Known alias → canonical → try all aliases (O(1) + O(n) where n = aliases)
+    # FAST PATH 2: Known alias → canonical → try all aliases (O(n) where n = aliases)
     # =========================================================================
-    canonical = _REVERSE_LOOKUP.get(field_name)
-    if not canonical:
-        canonical = _REVERSE_LOOKUP.get(field_name.lower())
-    
+    canonical = _REVERSE_LOOKUP.get(field_name) or _REVERSE_LOOKUP.get(field_name.lower())
     if canonical:
-        # Try all aliases for this canonical name (pre-computed list)
-        aliases = _NORMALIZED_ALIAS_MAP.get(canonical, [])
-        for alias in aliases:
+        for alias in _NORMALIZED_ALIAS_MAP.get(canonical, ()):
             if alias in data:
                 val = data[alias]
                 if _is_valid_value(val):
                     return val
     
     # =========================================================================
-    # FAST PATH 3: Normalized lookup (O(1) hash lookup)
-    # Handles: "Total_Revenue" == "Total Revenue" == "totalRevenue"
+    # COMPILED PATH: normalized names and data keys resolved once per
+    # schema - a field the schema lacks comes back as _ABSENT
     # =========================================================================
-    normalized_request = _normalize_key(field_name)
-    canonical_from_norm = _NORMALIZED_LOOKUP.get(normalized_request)
-    
-    if canonical_from_norm and canonical_from_norm != canonical:
-        # Found via normalization - try its aliases
-        aliases = _NORMALIZED_ALIAS_MAP.get(canonical_from_norm, [])
-        for alias in aliases:
-            if alias in data:
-                val = data[alias]
-                if _is_valid_value(val):
-                    return val
-    
-    # =========================================================================
-    # FALLBACK: Check data keys by normalization (only if not in our map)
-    # This catches new field names not yet in our alias map
-    # =========================================================================
-    for key in data.keys():
-        if _normalize_key(key) == normalized_request:
-            val = data[key]
-            if _is_valid_value(val):
-                return val
+    for key in get_resolver(data).candidates(field_name):
+        val = data[key]
+        if _is_valid_value(val):
+            return val
     
     # NOT FOUND - log for future map expansion (in debug mode)
     _log_unknown_field(field_name, data)
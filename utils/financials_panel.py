@@ -0,0 +1,419 @@
+"""
+FINANCIALS PANEL - Canonical Field x Period Matrix
+==================================================
+One float64 matrix for the statement data of an extraction, built once at
+the end of extract_financials() and stored next to the legacy DataFrames
+as financials["panel"].
+
+The legacy statements come in two orientations - SEC (fiscal years as
+rows, metric columns) and yfinance (metric rows, period-end columns) -
+with different labels for the same line item, so every consumer carried
+its own orientation branch and label scan. The panel normalizes both:
+
+- Rows: the CANONICAL_FIELDS vocabulary first, in a fixed order shared by
+  every ticker (NaN where a company doesn't report the field), then one
+  extra row per statement line with no canonical field
+- Columns: periods, most recent first (fiscal years for SEC, period-end
+  Timestamps for yfinance) - the union of every statement's periods, so
+  each statement also keeps the columns it reported and period positions
+  (0 = most recent) count within the row's own statement
+- Lookups by canonical id ("revenue"), source label ("Total Revenue",
+  "Total_Revenue") or normalized label are single dict hits
+
+Usage:
+    from utils.financials_panel import get_panel
+    panel = get_panel(financials)
+    panel.get("revenue")                             # latest period
+    panel.get("total_assets", period=1)              # prior period
+    panel.first(["EBIT", "Operating Income"], statement="income_statement")
+    panel.series("net_income")                       # all periods
+
+Author: ATLAS Financial Intelligence
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+STATEMENTS = ("income_statement", "balance_sheet", "cash_flow", "per_share_data")
+
+# ==========================================
+# CANONICAL FIELDS
+# ==========================================
+# canonical id -> (statements searched in order, source labels in preference order).
+# Labels are compared normalized (case, spaces, underscores ignored), so
+# "Total Revenue", "Total_Revenue" and "TotalRevenue" are the same label.
+
+_IS, _BS, _CF, _PS = STATEMENTS
+
+CANONICAL_FIELDS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    # Income statement
+    "revenue": ((_IS,), ("Total Revenue", "Revenue", "Revenues", "Operating Revenue",
+                         "Sales Revenue Net", "Net Sales", "Sales")),
+    "cost_of_revenue": ((_IS,), ("Cost Of Revenue", "Cost of Revenue", "Reconciled Cost Of Revenue",
+                                 "Cost Of Goods And Services Sold")),
+    "gross_profit": ((_IS,), ("Gross Profit",)),
+    "operating_expenses": ((_IS,), ("Operating Expense", "Operating Expenses")),
+    "operating_income": ((_IS,), ("Operating Income", "Operating Income Or Loss", "Total Operating Income As Reported")),
+    "ebit": ((_IS,), ("EBIT", "Operating Income", "Operating Income Or Loss")),
+    "ebitda": ((_IS,), ("EBITDA", "Normalized EBITDA")),
+    "interest_expense": ((_IS,), ("Interest Expense", "Interest Expense Non Operating")),
+    "pretax_income": ((_IS,), ("Pretax Income", "Income Before Tax")),
+    "tax_expense": ((_IS,), ("Tax Provision", "Tax Expense", "Income Tax Expense")),
+    "net_income": ((_IS,), ("Net Income", "Net Income Common Stockholders",
+                            "Net Income From Continuing Operation Net Minority Interest", "Normalized Income")),
+    "basic_eps": ((_PS, _IS), ("Basic EPS", "Basic_EPS")),
+    "diluted_eps": ((_PS, _IS), ("Diluted EPS", "Diluted_EPS")),
+    "shares_outstanding": ((_PS, _IS, _BS), ("Shares Outstanding", "Basic Average Shares",
+                                             "Ordinary Shares Number", "Share Issued")),
+    "diluted_shares": ((_IS, _PS), ("Diluted Average Shares",)),
+    # Balance sheet
+    "total_assets": ((_BS,), ("Total Assets",)),
+    "current_assets": ((_BS,), ("Current Assets", "Total Current Assets")),
+    "cash": ((_BS,), ("Cash", "Cash And Cash Equivalents", "Cash Cash Equivalents And Short Term Investments")),
+    "inventory": ((_BS,), ("Inventory",)),
+    "receivables": ((_BS,), ("Accounts Receivable", "Receivables")),
+    "total_liabilities": ((_BS,), ("Total Liabilities", "Total Liabilities Net Minority Interest")),
+    "current_liabilities": ((_BS,), ("Current Liabilities", "Total Current Liabilities")),
+    "total_debt": ((_BS,), ("Total Debt", "Long Term Debt And Capital Lease Obligation")),
+    "long_term_debt": ((_BS,), ("Long Term Debt",)),
+    "total_equity": ((_BS,), ("Stockholders Equity", "Total Equity", "Total Stockholders Equity",
+                              "Total Equity Gross Minority Interest")),
+    "retained_earnings": ((_BS,), ("Retained Earnings",)),
+    "working_capital": ((_BS,), ("Working Capital",)),
+    # Cash flow
+    "operating_cash_flow": ((_CF,), ("Operating Cash Flow", "Cash Flow From Continuing Operating Activities",
+                                     "Cash Flow From Operating Activities")),
+    "investing_cash_flow": ((_CF,), ("Investing Cash Flow", "Cash Flow From Continuing Investing Activities")),
+    "financing_cash_flow": ((_CF,), ("Financing Cash Flow", "Cash Flow From Continuing Financing Activities")),
+    "capital_expenditures": ((_CF,), ("Capital Expenditure", "Capex")),
+    "free_cash_flow": ((_CF,), ("Free Cash Flow",)),
+    "depreciation_and_amortization": ((_CF, _IS), ("Depreciation And Amortization",
+                                                   "Depreciation Amortization Depletion",
+                                                   "Reconciled Depreciation")),
+    "change_in_working_capital": ((_CF,), ("Change In Working Capital",)),
+    "dividends_paid": ((_CF,), ("Cash Dividends Paid", "Common Stock Dividend Paid")),
+    "share_repurchases": ((_CF,), ("Repurchase Of Capital Stock", "Common Stock Payments")),
+}
+
+CANONICAL_IDS: Tuple[str, ...] = tuple(CANONICAL_FIELDS)
+
+
+def normalize_label(label: Any) -> str:
+    """'Total_Revenue' / 'Total Revenue' / 'TotalRevenue' -> 'totalrevenue'."""
+    return re.sub(r"[^0-9a-z]", "", str(label).lower())
+
+
+def _field_id(label: Any) -> str:
+    """Readable id for a non-canonical row: 'Retained Earnings' -> 'retained_earnings'."""
+    return re.sub(r"[^0-9a-z]+", "_", str(label).lower()).strip("_")
+
+
+def _statement_rows(df: Any) -> Optional[Tuple[List[Any], List[Any], np.ndarray]]:
+    """
+    (labels, periods, values[label, period]) for a statement in either
+    orientation, or None if it holds no data.
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return None
+    # Same test every consumer used: string index -> yfinance layout (metric rows)
+    if not isinstance(df.index[0], str):
+        df = df.T
+    values = df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    return list(df.index), list(df.columns), values
+
+
+def _sorted_periods(periods: List[Any]) -> List[Any]:
+    unique = list(dict.fromkeys(periods))
+    try:
+        return sorted(unique, reverse=True)
+    except TypeError:
+        return unique      # Mixed label types - keep first-seen order
+
+
+# ==========================================
+# PANEL
+# ==========================================
+
+class FinancialsPanel:
+    """
+    Statement data as a (fields x periods) float64 matrix.
+
+    Attributes:
+        values: float64 array, NaN where a field has no value for a period
+        fields: Row ids - CANONICAL_IDS, then ids of the extra rows
+        periods: Column labels, most recent first
+        statements: Statement each row came from ("" for canonical fields not reported)
+        labels: Source label of each row ("" for canonical fields not reported)
+        statement_columns: Columns each statement reported, most recent first
+    """
+
+    def __init__(self, values: np.ndarray, fields: Sequence[str], periods: Sequence[Any],
+                 statements: Optional[Sequence[str]] = None, labels: Optional[Sequence[str]] = None,
+                 statement_columns: Optional[Dict[str, Sequence[int]]] = None):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.fields = tuple(fields)
+        self.periods = tuple(periods)
+        self.statements = tuple(statements) if statements is not None else ("",) * len(self.fields)
+        self.labels = tuple(labels) if labels is not None else ("",) * len(self.fields)
+        if statement_columns is None:
+            statement_columns = self._reported_columns()
+        self.statement_columns = {name: np.asarray(cols, dtype=np.int64)
+                                  for name, cols in statement_columns.items()}
+        self._build_index()
+
+    def _reported_columns(self) -> Dict[str, np.ndarray]:
+        """Columns holding any value of each statement (panels stored without statement_columns)."""
+        columns = {}
+        for name in dict.fromkeys(st for st in self.statements if st):
+            block = self.values[[row for row, st in enumerate(self.statements) if st == name]]
+            columns[name] = np.flatnonzero(~np.all(np.isnan(block), axis=0))
+        return columns
+
+    def _build_index(self) -> None:
+        self._rows: Dict[str, int] = {}
+        self._statement_rows: Dict[str, Dict[str, int]] = {name: {} for name in STATEMENTS}
+        for row, (field, statement, label) in enumerate(zip(self.fields, self.statements, self.labels)):
+            self._rows.setdefault(field, row)
+            if label:
+                key = normalize_label(label)
+                self._rows.setdefault(label, row)
+                self._rows.setdefault(key, row)
+                self._statement_rows.setdefault(statement, {}).setdefault(key, row)
+        # Canonical aliases that lost to a preferred label still resolve to the canonical row
+        for row, field in enumerate(self.fields[:len(CANONICAL_IDS)]):
+            if field in CANONICAL_FIELDS and self.labels[row]:
+                for alias in CANONICAL_FIELDS[field][1]:
+                    self._rows.setdefault(normalize_label(alias), row)
+        self._period_cols = {period: col for col, period in enumerate(self.periods)}
+
+    # ==========================================
+    # CONSTRUCTION
+    # ==========================================
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "FinancialsPanel":
+        """Build from statement DataFrames keyed by STATEMENTS names (either orientation)."""
+        parsed = {name: _statement_rows(frames.get(name)) for name in STATEMENTS}
+        parsed = {name: rows for name, rows in parsed.items() if rows is not None}
+
+        periods = _sorted_periods([p for _, cols, _ in parsed.values() for p in cols])
+        period_cols = {period: col for col, period in enumerate(periods)}
+
+        # Every (statement, label) row, with its values aligned to the panel periods
+        source: Dict[Tuple[str, str], Tuple[Any, np.ndarray]] = {}
+        statement_columns: Dict[str, np.ndarray] = {}
+        for name, (labels, cols, values) in parsed.items():
+            targets = np.array([period_cols[p] for p in cols], dtype=np.int64)
+            statement_columns[name] = np.sort(np.unique(targets))
+            for i, label in enumerate(labels):
+                key = (name, normalize_label(label))
+                if key in source:
+                    continue
+                aligned = np.full(len(periods), np.nan)
+                aligned[targets] = values[i]
+                source[key] = (label, aligned)
+
+        fields, statements, labels, rows = [], [], [], []
+        used = set()
+        for field, (searched, aliases) in CANONICAL_FIELDS.items():
+            match = next(((st, normalize_label(a)) for st in searched for a in aliases
+                          if (st, normalize_label(a)) in source), None)
+            fields.append(field)
+            if match is None:
+                statements.append("")
+                labels.append("")
+                rows.append(np.full(len(periods), np.nan))
+                continue
+            used.add(match)
+            label, aligned = source[match]
+            statements.append(match[0])
+            labels.append(str(label))
+            rows.append(aligned)
+
+        taken = set(fields)
+        for key, (label, aligned) in source.items():
+            if key in used:
+                continue
+            field = _field_id(label)
+            if field in taken:
+                field = f"{key[0]}.{field}"
+            taken.add(field)
+            fields.append(field)
+            statements.append(key[0])
+            labels.append(str(label))
+            rows.append(aligned)
+
+        values = np.vstack(rows) if rows else np.empty((0, len(periods)))
+        return cls(values, fields, periods, statements, labels, statement_columns)
+
+    @classmethod
+    def from_financials(cls, financials: Dict) -> "FinancialsPanel":
+        """Build from an extract_financials() result (its statement DataFrames)."""
+        return cls.from_frames({name: financials.get(name) for name in STATEMENTS})
+
+    # ==========================================
+    # LOOKUPS
+    # ==========================================
+
+    def __contains__(self, name: str) -> bool:
+        return self.row(name) is not None
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.values.nbytes)
+
+    def row(self, name: str, statement: Optional[str] = None) -> Optional[int]:
+        """
+        Row of a canonical id, row id or source label (None if absent).
+
+        Canonical rows a company doesn't report count as absent. With
+        `statement`, only rows from that statement match.
+        """
+        row = self._rows.get(name)
+        if row is None:
+            row = self._rows.get(normalize_label(name))
+        if row is None or not self.labels[row]:
+            row = None
+        if statement is not None and (row is None or self.statements[row] != statement):
+            return self._statement_rows.get(statement, {}).get(normalize_label(name))
+        return row
+
+    def period_index(self, period: Any) -> Optional[int]:
+        """Column of a period label (fiscal year or period-end Timestamp)."""
+        return self._period_cols.get(period)
+
+    def columns(self, statement: str) -> np.ndarray:
+        """Panel columns a statement reported, most recent first (all columns if unknown)."""
+        cols = self.statement_columns.get(statement)
+        return cols if cols is not None else np.arange(len(self.periods))
+
+    def get(self, name: str, period: int = 0, default: Optional[float] = None,
+            statement: Optional[str] = None, clamp: bool = False) -> Optional[float]:
+        """
+        Value of a field for a period position (0 = most recent).
+
+        Positions count within the row's own statement, so period=0 is the
+        latest income statement for revenue and the latest balance sheet for
+        total assets even when the two end on different dates. NaN and
+        positions past the statement's oldest period come back as `default`;
+        with clamp=True such positions read the oldest period instead (the
+        legacy fiscal_year_offset behaviour).
+        """
+        row = self.row(name, statement)
+        if row is None:
+            return default
+        cols = self.columns(self.statements[row])
+        if not len(cols):
+            return default
+        if period >= len(cols):
+            if not clamp:
+                return default
+            period = len(cols) - 1
+        value = self.values[row, cols[max(period, 0)]]
+        return default if np.isnan(value) else float(value)
+
+    def first(self, names: Iterable[str], period: int = 0, default: Optional[float] = None,
+              statement: Optional[str] = None, clamp: bool = False) -> Optional[float]:
+        """Value of the first name present in the panel (its NaN -> default, like a missing value)."""
+        for name in names:
+            if self.row(name, statement) is not None:
+                return self.get(name, period, default, statement, clamp)
+        return default
+
+    def position_periods(self) -> Tuple[Any, ...]:
+        """Period labels of by_position() columns: the longest statement's periods (earlier statements win ties)."""
+        reported = [name for name in STATEMENTS if len(self.statement_columns.get(name, ()))]
+        if not reported:
+            return ()
+        longest = max(reported, key=lambda name: len(self.statement_columns[name]))
+        return tuple(self.periods[col] for col in self.statement_columns[longest])
+
+    def by_position(self, clamp: bool = False) -> np.ndarray:
+        """
+        (fields x positions) matrix whose column k holds every row's k-th
+        period within its own statement, the layout get() reads.
+
+        Statements with fewer periods are NaN-padded, or with clamp=True
+        repeat their oldest period.
+        """
+        width = len(self.position_periods())
+        out = np.full((len(self.fields), width), np.nan)
+        for name, cols in self.statement_columns.items():
+            rows = self.statement_rows(name)
+            if not rows or not len(cols):
+                continue
+            if clamp:
+                out[rows] = self.values[np.ix_(rows, cols[np.minimum(np.arange(width), len(cols) - 1)])]
+            else:
+                out[np.ix_(rows, np.arange(len(cols)))] = self.values[np.ix_(rows, cols)]
+        return out
+
+    def series(self, name: str, statement: Optional[str] = None) -> Optional[np.ndarray]:
+        """All periods of a field (read-only view, most recent first)."""
+        row = self.row(name, statement)
+        if row is None:
+            return None
+        view = self.values[row]
+        view.flags.writeable = False
+        return view
+
+    def statement_rows(self, statement: str) -> List[int]:
+        """Rows that came from one statement, in panel order."""
+        return [row for row, st in enumerate(self.statements) if st == statement]
+
+    def to_frame(self, include_empty: bool = False) -> pd.DataFrame:
+        """fields x periods DataFrame (rows without any value dropped unless include_empty)."""
+        df = pd.DataFrame(self.values, index=pd.Index(self.fields, name="field"), columns=list(self.periods))
+        if include_empty:
+            return df
+        return df[~np.all(np.isnan(self.values), axis=1)] if len(self.periods) else df
+
+    # ==========================================
+    # SERIALIZATION
+    # ==========================================
+
+    def to_dict(self) -> Dict:
+        return {"values": self.values, "fields": list(self.fields), "periods": list(self.periods),
+                "statements": list(self.statements), "labels": list(self.labels),
+                "statement_columns": {name: cols.tolist() for name, cols in self.statement_columns.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FinancialsPanel":
+        return cls(np.asarray(data["values"], dtype=np.float64).reshape(len(data["fields"]), len(data["periods"])),
+                   data["fields"], data["periods"], data.get("statements"), data.get("labels"),
+                   data.get("statement_columns"))
+
+    def __repr__(self) -> str:
+        reported = sum(1 for label in self.labels if label)
+        return f"FinancialsPanel({reported} fields x {len(self.periods)} periods)"
+
+
+def get_panel(financials: Optional[Dict]) -> Optional[FinancialsPanel]:
+    """
+    Panel of an extraction result: the one built at extraction time, else
+    built from its statements now and stored as financials["panel"].
+
+    Returns:
+        FinancialsPanel, or None when financials has no statement data
+    """
+    if not isinstance(financials, dict):
+        return None
+    panel = financials.get("panel")
+    if isinstance(panel, FinancialsPanel):
+        return panel
+    if isinstance(panel, dict) and "values" in panel:
+        panel = FinancialsPanel.from_dict(panel)      # Decoded from a JSON cache entry
+    elif any(isinstance(financials.get(name), pd.DataFrame) and not financials[name].empty
+             for name in STATEMENTS):
+        panel = FinancialsPanel.from_financials(financials)
+    else:
+        return None
+    financials["panel"] = panel
+    return panel
@@ -0,0 +1,147 @@
+"""
+HTTP SESSION REGISTRY - Pooled Keep-Alive Connections
+=====================================================
+Shared requests.Session per host for every outbound data-source call.
+
+A bare requests.get opens (and TLS-negotiates) a new connection per call;
+for small JSON endpoints (SEC, FRED, FMP) the handshake costs more than
+the payload. The registry keeps one Session per scheme+host with:
+- A connection pool sized for concurrent extraction (extract_many)
+- Keep-alive and gzip/deflate by default
+- A consistent default timeout (connect, read) when callers don't pass one
+
+Retries stay with the callers (they already implement backoff).
+
+Usage:
+    from utils.http_session import http_get
+    resp = http_get("https://data.sec.gov/...", headers={...}, timeout=15)
+
+Author: ATLAS Financial Intelligence
+"""
+
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("HTTPSession")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("HTTPSession")
+
+
+DEFAULT_TIMEOUT = (5, 20)     # (connect, read) seconds
+POOL_MAXSIZE = 16             # Keep-alive connections per host (>= extract_many workers)
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class SessionRegistry:
+    """
+    One pooled requests.Session per scheme+host.
+
+    Usage:
+        registry = SessionRegistry()
+        resp = registry.get("https://api.stlouisfed.org/fred/...", params={...})
+        registry.stats()   # requests vs. connections opened per host
+    """
+
+    def __init__(self, pool_maxsize: int = POOL_MAXSIZE, timeout=DEFAULT_TIMEOUT):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._requests: Dict[str, int] = {}
+
+    def session_for(self, url: str) -> requests.Session:
+        """Get (or create) the pooled session for the URL's host."""
+        key = _host_key(url)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = requests.Session()
+                    session.headers.update(DEFAULT_HEADERS)
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize,
+                                          max_retries=0, pool_block=False)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._sessions[key] = session
+                    _logger.debug(f"Opened pooled session for {key}")
+        return session
+
+    def request(self, method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+        """Send a request on the host's pooled session (default timeout if none given)."""
+        key = _host_key(url)
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+        return self.session_for(url).request(method, url, timeout=timeout or self.timeout, **kwargs)
+
+    def get(self, url: str, timeout=None, **kwargs) -> requests.Response:
+        return self.request("GET", url, timeout=timeout, **kwargs)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-host request counts and connections opened (low connections = reuse working)."""
+        with self._lock:
+            sessions = dict(self._sessions)
+            counts = dict(self._requests)
+        stats = {}
+        for key, session in sessions.items():
+            connections = 0
+            adapter = session.get_adapter(key + "/")
+            for pool_key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(pool_key)
+                if pool is not None:
+                    connections += getattr(pool, "num_connections", 0)
+            stats[key] = {"requests": counts.get(key, 0), "connections_opened": connections}
+        return stats
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+# ==========================================
+# PROCESS-WIDE REGISTRY
+# ==========================================
+
+_registry: Optional[SessionRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_session_registry() -> SessionRegistry:
+    """Get or create the shared session registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SessionRegistry()
+    return _registry
+
+
+def get_session(url: str) -> requests.Session:
+    """Pooled session for the URL's host."""
+    return get_session_registry().session_for(url)
+
+
+def http_get(url: str, timeout=None, **kwargs) -> requests.Response:
+    """Drop-in for requests.get that reuses pooled keep-alive connections."""
+    return get_session_registry().get(url, timeout=timeout, **kwargs)
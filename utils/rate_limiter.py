@@ -0,0 +1,226 @@
+"""
+RATE LIMITER - Token Bucket for SEC Fair Access
+===============================================
+One limiter that every SEC-bound request goes through, so parallel
+extraction (extract_many, warm-up jobs, several Streamlit sessions) stays
+under SEC's 10 requests/second fair-access limit.
+
+- Thread-safe token bucket; callers reserve a slot and sleep outside the lock
+- Optional cross-process mode: bucket state lives in a small file guarded
+  by an advisory lock (POSIX only), so several workers on one host share it
+- 429 / Retry-After responses pause the whole bucket (penalize)
+- Queueing-delay metrics via stats()
+
+Capacity + rate bounds the requests in any 1-second window, so the SEC
+defaults (8/s, burst 2) never exceed 10 in any second.
+
+Usage:
+    from utils.rate_limiter import get_sec_limiter
+    get_sec_limiter().acquire()      # blocks until a request may be sent
+    resp = requests.get(url, ...)
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+
+# === OPTIONAL DEPENDENCIES ===
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("RateLimiter")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("RateLimiter")
+
+
+SEC_RATE_PER_SECOND = 8.0     # Sustained SEC request rate
+SEC_BURST = 2                 # Extra requests allowed after an idle period
+SEC_RATE_ENV_VAR = "ATLAS_SEC_RATE_PER_SECOND"
+SEC_LOCK_ENV_VAR = "ATLAS_SEC_RATE_LOCK"      # Path of a shared state file -> cross-process mode
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens/second, holding at most `capacity`.
+
+    Args:
+        rate: Sustained requests per second
+        capacity: Burst size (tokens available after an idle period)
+        name: Label used in logs and stats
+        state_path: Optional file shared by processes on this host (POSIX)
+
+    Usage:
+        bucket = TokenBucket(rate=8, capacity=2, name="sec")
+        waited = bucket.acquire()
+    """
+
+    def __init__(self, rate: float, capacity: float = 1, name: str = "default",
+                 state_path: Optional[str] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(max(capacity, 1))
+        self.name = name
+
+        if state_path and not FCNTL_AVAILABLE:
+            _logger.warning(f"Rate limiter '{name}': cross-process mode needs fcntl, using per-process bucket")
+            state_path = None
+        self.state_path = state_path
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._paused_until = 0.0
+
+        self._stats = {
+            "acquired": 0,
+            "delayed": 0,              # Requests that had to wait
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "penalties": 0,            # 429 / Retry-After pauses
+        }
+
+    # ==========================================
+    # BUCKET STATE
+    # ==========================================
+
+    def _reserve(self, state: Dict, tokens: float, now: float) -> float:
+        """Refill, take `tokens` (may go negative) and return the wait before they're usable."""
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(self.capacity, state["tokens"] + elapsed * self.rate)
+        state["updated"] = now
+        state["tokens"] -= tokens
+
+        wait = -state["tokens"] / self.rate if state["tokens"] < 0 else 0.0
+        return max(wait, state["paused_until"] - now)
+
+    def _reserve_local(self, tokens: float) -> float:
+        state = {"tokens": self._tokens, "updated": self._updated, "paused_until": self._paused_until}
+        wait = self._reserve(state, tokens, time.time())
+        self._tokens, self._updated = state["tokens"], state["updated"]
+        return wait
+
+    def _reserve_shared(self, tokens: float) -> float:
+        """Same as _reserve_local, with the state kept in an flock-guarded file."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        with open(self.state_path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                state.setdefault("tokens", self.capacity)
+                state.setdefault("updated", now)
+                state["paused_until"] = max(state.get("paused_until", 0.0), self._paused_until)
+                wait = self._reserve(state, tokens, now)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait
+
+    # ==========================================
+    # PUBLIC API
+    # ==========================================
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Block until `tokens` may be spent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            if self.state_path:
+                try:
+                    wait = self._reserve_shared(tokens)
+                except OSError as e:
+                    _logger.warning(f"Rate limiter '{self.name}' state file unusable ({e}), using per-process bucket")
+                    self.state_path = None
+                    wait = self._reserve_local(tokens)
+            else:
+                wait = self._reserve_local(tokens)
+
+            self._stats["acquired"] += 1
+            if wait > 0:
+                self._stats["delayed"] += 1
+                self._stats["total_wait_seconds"] += wait
+                self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], wait)
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, seconds: float) -> None:
+        """Pause the bucket, e.g. after HTTP 429 with Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.time() + seconds)
+            self._stats["penalties"] += 1
+        _logger.warning(f"Rate limiter '{self.name}' paused for {seconds:.1f}s")
+
+    def stats(self) -> Dict:
+        """Queueing-delay metrics since process start."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_wait_ms"] = round(1000 * stats["total_wait_seconds"] / stats["acquired"], 2) if stats["acquired"] else 0.0
+        stats["total_wait_seconds"] = round(stats["total_wait_seconds"], 3)
+        stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 3)
+        stats.update(name=self.name, rate=self.rate, capacity=self.capacity,
+                     shared=bool(self.state_path))
+        return stats
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Seconds from a Retry-After header (delta-seconds form); default if missing/unparseable."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+# ==========================================
+# PROCESS-WIDE SEC LIMITER
+# ==========================================
+
+_sec_limiter: Optional[TokenBucket] = None
+_sec_limiter_lock = threading.Lock()
+
+
+def get_sec_limiter() -> TokenBucket:
+    """
+    Get the limiter shared by every SEC-bound request.
+
+    Rate can be lowered with ATLAS_SEC_RATE_PER_SECOND; set ATLAS_SEC_RATE_LOCK
+    to a file path to share the budget across processes on the same host.
+    """
+    global _sec_limiter
+    if _sec_limiter is None:
+        with _sec_limiter_lock:
+            if _sec_limiter is None:
+                try:
+                    rate = float(os.getenv(SEC_RATE_ENV_VAR, SEC_RATE_PER_SECOND))
+                except ValueError:
+                    rate = SEC_RATE_PER_SECOND
+                _sec_limiter = TokenBucket(
+                    rate=min(rate, SEC_RATE_PER_SECOND),
+                    capacity=SEC_BURST,
+                    name="sec",
+                    state_path=os.getenv(SEC_LOCK_ENV_VAR) or None,
+                )
+    return _sec_limiter
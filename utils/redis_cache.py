@@ -2,7 +2,10 @@
 REDIS CACHE - Persistent Financial Data Caching
 ================================================
 Provides Redis-based caching for yfinance data to prevent rate limiting.
-Falls back to in-memory dict if Redis is not available.
+Falls back to in-memory cache if Redis is not available.
+
+Thin wrapper over utils/cache_client.py: same connection, key namespace
+and codec as utils/ticker_cache.py.
 
 Setup:
     1. pip install redis
@@ -21,22 +24,14 @@ Usage:
     cache_ticker_info("AAPL", info_dict, ttl=3600)
 """
 
-import os
-import json
-import time
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, Optional
 from datetime import datetime
 
-logger = logging.getLogger(__name__)
+from utils.cache_client import get_cache_client, cache_key
+from utils.revalidation import stale_window
 
-# Try to import redis
-try:
-    import redis
-    REDIS_AVAILABLE = True
-except ImportError:
-    REDIS_AVAILABLE = False
-    logger.warning("Redis not installed. Using in-memory fallback cache.")
+logger = logging.getLogger(__name__)
 
 # Try to import yfinance
 try:
@@ -50,47 +45,9 @@ except ImportError:
 # REDIS CONNECTION
 # =============================================================================
 
-_redis_client: Optional[Any] = None
-_memory_cache: Dict[str, Dict] = {}  # Fallback cache
-
 def get_redis_client():
-    """Get or create Redis client connection."""
-    global _redis_client
-    
-    if _redis_client is not None:
-        return _redis_client
-    
-    if not REDIS_AVAILABLE:
-        return None
-    
-    try:
-        # Try REDIS_URL first (Railway, Heroku, Redis Cloud format)
-        redis_url = os.environ.get("REDIS_URL")
-        if redis_url:
-            _redis_client = redis.from_url(redis_url, decode_responses=True)
-            _redis_client.ping()  # Test connection
-            logger.info(f"Connected to Redis via URL")
-            return _redis_client
-        
-        # Try individual env vars
-        host = os.environ.get("REDIS_HOST", "localhost")
-        port = int(os.environ.get("REDIS_PORT", 6379))
-        password = os.environ.get("REDIS_PASSWORD")
-        
-        _redis_client = redis.Redis(
-            host=host,
-            port=port,
-            password=password,
-            decode_responses=True,
-            socket_timeout=5
-        )
-        _redis_client.ping()  # Test connection
-        logger.info(f"Connected to Redis at {host}:{port}")
-        return _redis_client
-        
-    except Exception as e:
-        logger.warning(f"Redis connection failed: {e}. Using in-memory cache.")
-        return None
+    """Get the shared Redis connection (None when using the memory fallback)."""
+    return get_cache_client().redis
 
 
 # =============================================================================
@@ -99,65 +56,22 @@ def get_redis_client():
 
 def _get_cache_key(prefix: str, ticker: str) -> str:
     """Generate cache key."""
-    return f"atlas:{prefix}:{ticker.upper()}"
+    return cache_key(prefix, ticker)
 
 
 def cache_get(key: str) -> Optional[Dict]:
     """Get value from cache (Redis or memory fallback)."""
-    client = get_redis_client()
-    
-    if client:
-        try:
-            data = client.get(key)
-            if data:
-                return json.loads(data)
-        except Exception as e:
-            logger.warning(f"Redis get failed: {e}")
-    
-    # Fallback to memory cache
-    cached = _memory_cache.get(key)
-    if cached:
-        # Check TTL for memory cache
-        if cached.get('_expires', 0) > time.time():
-            return cached.get('data')
-        else:
-            del _memory_cache[key]
-    
-    return None
+    return get_cache_client().get(key)
 
 
 def cache_set(key: str, data: Dict, ttl: int = 3600) -> bool:
     """Set value in cache with TTL (default 1 hour)."""
-    client = get_redis_client()
-    
-    if client:
-        try:
-            client.setex(key, ttl, json.dumps(data, default=str))
-            return True
-        except Exception as e:
-            logger.warning(f"Redis set failed: {e}")
-    
-    # Fallback to memory cache
-    _memory_cache[key] = {
-        'data': data,
-        '_expires': time.time() + ttl
-    }
-    return True
+    return get_cache_client().set(key, data, ttl)
 
 
 def cache_delete(key: str) -> bool:
     """Delete value from cache."""
-    client = get_redis_client()
-    
-    if client:
-        try:
-            client.delete(key)
-        except Exception:
-            pass
-    
-    if key in _memory_cache:
-        del _memory_cache[key]
-    
+    get_cache_client().delete(key)
     return True
 
 
@@ -176,36 +90,18 @@ def get_cached_ticker_info(ticker: str, ttl: int = 3600) -> Dict:
     Returns:
         Stock info dictionary
     """
-    key = _get_cache_key("info", ticker)
-    
-    # Try cache first
-    cached = cache_get(key)
-    if cached:
-        logger.debug(f"Cache HIT for {ticker}")
-        return cached
-    
-    # Cache miss - fetch from Yahoo
     if not YFINANCE_AVAILABLE:
-        return {}
+        info = cache_get(_get_cache_key("info", ticker))
+        return info or {}
     
-    try:
-        logger.debug(f"Cache MISS for {ticker} - fetching from Yahoo")
-        stock = yf.Ticker(ticker.upper())
-        info = stock.info or {}
-        
-        # Cache the result
-        cache_set(key, info, ttl)
-        
-        return info
-    except Exception as e:
-        logger.warning(f"Failed to fetch {ticker}: {e}")
-        return {}
+    from utils.ticker_cache import get_ticker_info
+    return get_ticker_info(ticker, ttl)
 
 
 def cache_ticker_info(ticker: str, info: Dict, ttl: int = 3600) -> bool:
-    """Manually cache ticker info."""
+    """Manually cache ticker info (kept through the same stale window as ticker_cache)."""
     key = _get_cache_key("info", ticker)
-    return cache_set(key, info, ttl)
+    return get_cache_client().set(key, info, ttl, stale_ttl=stale_window("market_data"))
 
 
 def get_cached_financials(ticker: str, ttl: int = 3600) -> Dict:
@@ -250,39 +146,14 @@ def get_cached_financials(ticker: str, ttl: int = 3600) -> Dict:
 def clear_ticker_cache(ticker: str = None):
     """Clear cache for a specific ticker or all tickers."""
     if ticker:
-        cache_delete(_get_cache_key("info", ticker))
-        cache_delete(_get_cache_key("financials", ticker))
+        get_cache_client().delete(_get_cache_key("info", ticker), _get_cache_key("financials", ticker))
     else:
-        # Clear all - only works with Redis
-        client = get_redis_client()
-        if client:
-            try:
-                for key in client.scan_iter("atlas:*"):
-                    client.delete(key)
-            except Exception:
-                pass
-        _memory_cache.clear()
+        get_cache_client().scan_delete()
 
 
 def get_cache_stats() -> Dict:
     """Get cache statistics."""
-    client = get_redis_client()
-    
-    stats = {
-        'backend': 'redis' if client else 'memory',
-        'connected': client is not None,
-        'memory_cache_size': len(_memory_cache)
-    }
-    
-    if client:
-        try:
-            info = client.info('memory')
-            stats['redis_used_memory'] = info.get('used_memory_human', 'unknown')
-            stats['redis_keys'] = client.dbsize()
-        except Exception:
-            pass
-    
-    return stats
+    return get_cache_client().stats()
 
 
 # =============================================================================
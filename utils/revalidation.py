@@ -0,0 +1,137 @@
+"""
+REVALIDATION - Stale-While-Revalidate Windows and Background Refresh
+====================================================================
+When a cache entry's TTL runs out, the stale value keeps being served for a
+per-category window while one background refresh replaces it, so users never
+wait on yfinance/SEC at a TTL boundary.
+
+- STALE_WINDOWS: how long past its TTL an entry may still be served
+- Revalidator: small worker pool; one refresh per key at a time
+- Override a window with ATLAS_STALE_<CATEGORY>_SECONDS (0 disables it)
+
+Usage:
+    from utils.revalidation import get_revalidator, stale_window
+    cache.set(key, info, ttl=3600, stale_ttl=stale_window("market_data"))
+    ...
+    value, fresh_until = cache.get_entry(key)
+    if fresh_until <= time.time():
+        get_revalidator().submit(key, refresh)      # returns immediately
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Set
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("Revalidation")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("Revalidation")
+
+
+# Seconds past the TTL a value may still be served while it is refreshed
+STALE_WINDOWS: Dict[str, int] = {
+    "market_data": 6 * 3600,        # Prices move - only bridge the refresh, not a whole day
+    "financials": 7 * 86400,        # Statements change once a quarter
+    "company_info": 30 * 86400,     # Sector, description, officers
+    "default": 3600,
+}
+
+REVALIDATE_WORKERS = 4
+
+
+def stale_window(category: str) -> int:
+    """Stale window for a cache category (ATLAS_STALE_<CATEGORY>_SECONDS overrides)."""
+    default = STALE_WINDOWS.get(category, STALE_WINDOWS["default"])
+    try:
+        return max(0, int(os.getenv(f"ATLAS_STALE_{category.upper()}_SECONDS", default)))
+    except ValueError:
+        return default
+
+
+class Revalidator:
+    """
+    Runs cache refreshes in the background, at most one per key.
+
+    Args:
+        max_workers: Refreshes running at once
+        name: Label used in logs and stats
+    """
+
+    def __init__(self, max_workers: int = REVALIDATE_WORKERS, name: str = "revalidate"):
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending: Set[Hashable] = set()
+        self._stats = {"submitted": 0, "deduplicated": 0, "refreshed": 0, "failed": 0}
+        self._total_seconds = 0.0
+
+    def submit(self, key: Hashable, refresh: Callable[[], object]) -> bool:
+        """
+        Schedule refresh() unless one is already pending for key.
+        Returns True if a new refresh was scheduled.
+        """
+        with self._lock:
+            if key in self._pending:
+                self._stats["deduplicated"] += 1
+                return False
+            self._pending.add(key)
+            self._stats["submitted"] += 1
+        try:
+            self._executor.submit(self._run, key, refresh)
+        except RuntimeError:                     # Interpreter shutting down
+            with self._lock:
+                self._pending.discard(key)
+            return False
+        _logger.debug(f"[{self.name}] Revalidating {key}")
+        return True
+
+    def _run(self, key: Hashable, refresh: Callable[[], object]) -> None:
+        start = time.time()
+        try:
+            refresh()
+            outcome = "refreshed"
+        except Exception as e:
+            _logger.warning(f"[{self.name}] Background refresh failed for {key}: {e}")
+            outcome = "failed"
+        with self._lock:
+            self._pending.discard(key)
+            self._stats[outcome] += 1
+            self._total_seconds += time.time() - start
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            done = stats["refreshed"] + stats["failed"]
+            stats["avg_refresh_seconds"] = round(self._total_seconds / done, 3) if done else 0.0
+            stats["pending"] = len(self._pending)
+        stats["windows"] = {category: stale_window(category) for category in STALE_WINDOWS}
+        return stats
+
+
+# ==========================================
+# PROCESS-WIDE REVALIDATOR
+# ==========================================
+
+_revalidator = None
+_revalidator_lock = threading.Lock()
+
+
+def get_revalidator() -> Revalidator:
+    """Get the revalidator shared by every cache in this process."""
+    global _revalidator
+    if _revalidator is None:
+        with _revalidator_lock:
+            if _revalidator is None:
+                _revalidator = Revalidator()
+    return _revalidator
@@ -0,0 +1,195 @@
+"""
+SINGLE FLIGHT - In-Flight Request Coalescing
+============================================
+Concurrent callers asking for the same thing share one computation.
+
+When several Streamlit sessions open a popular ticker at once, every one of
+them misses the cache and starts its own extraction before the first one
+has stored anything. A flight group lets the first caller (the leader) run
+the function while the others wait for its result - or its exception.
+
+- Keys are built from the call arguments; like st.cache_data, parameters
+  whose names start with "_" (and `self`) are left out of the key
+- Nothing is cached: once the leader finishes, the next call starts fresh
+- Re-entrant calls from the leader's own thread run directly (no deadlock)
+
+Usage:
+    from utils.single_flight import single_flight
+
+    @single_flight()
+    def analyze_cashflow(ticker: str, _financials: Dict = None) -> Dict:
+        ...
+
+    @single_flight(key=lambda ticker, ttl=3600: ticker.upper())
+    def get_ticker_info(ticker: str, ttl: int = 3600) -> Dict:
+        ...
+
+Author: ATLAS Financial Intelligence
+"""
+
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("SingleFlight")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("SingleFlight")
+
+
+class _Call:
+    """One in-flight computation and the callers waiting on it."""
+    __slots__ = ("done", "result", "error", "leader", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.leader = threading.get_ident()
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Group of in-flight calls keyed by an arbitrary hashable key.
+
+    Usage:
+        group = SingleFlight("extract")
+        result = group.do(("AAPL", "auto"), extractor.extract_financials, "AAPL")
+    """
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) unless a call with the same key is already
+        in flight, in which case wait for it and return its result (or raise
+        its exception).
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None and call.leader != threading.get_ident():
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+                leader = False
+            elif call is not None:
+                # Re-entrant call from the leader thread - waiting would deadlock
+                leader = None
+            else:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+                leader = True
+
+        if leader is None:
+            return fn(*args, **kwargs)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+            if call.waiters:
+                _logger.debug(f"[{self.name}] {key!r}: result shared with {call.waiters} waiting caller(s)")
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        """Calls seen, functions actually executed, and calls served by another caller's run."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["name"] = self.name
+        return stats
+
+
+# ==========================================
+# DECORATOR
+# ==========================================
+
+def _freeze(value: Any) -> Hashable:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _default_key(func: Callable) -> Callable:
+    """Key builder: function name + bound arguments, minus self and _-prefixed params."""
+    signature = inspect.signature(func)
+    qualname = f"{func.__module__}.{func.__qualname__}"
+
+    def build(*args, **kwargs) -> Hashable:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return (qualname,) + tuple(
+            (name, _freeze(value)) for name, value in bound.arguments.items()
+            if name != "self" and not name.startswith("_")
+        )
+
+    return build
+
+
+def single_flight(key: Optional[Callable[..., Hashable]] = None,
+                  group: Optional[SingleFlight] = None) -> Callable:
+    """
+    Decorator: coalesce concurrent calls with the same key into one execution.
+
+    Args:
+        key: Builds the key from the call's arguments (default: all arguments
+            except self and _-prefixed ones)
+        group: Flight group to use (default: the process-wide group)
+    """
+    def decorator(func: Callable) -> Callable:
+        key_fn = key or _default_key(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            flight_key = key_fn(*args, **kwargs)
+            if key is not None:
+                flight_key = (func.__module__, func.__qualname__, flight_key)
+            return (group or get_flight_group()).do(flight_key, func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ==========================================
+# PROCESS-WIDE GROUP
+# ==========================================
+
+_flight_group: Optional[SingleFlight] = None
+_flight_group_lock = threading.Lock()
+
+
+def get_flight_group() -> SingleFlight:
+    """Get or create the flight group shared by all @single_flight functions."""
+    global _flight_group
+    if _flight_group is None:
+        with _flight_group_lock:
+            if _flight_group is None:
+                _flight_group = SingleFlight("default")
+    return _flight_group
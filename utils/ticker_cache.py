@@ -1,23 +1,37 @@
 """
 TICKER CACHE - Centralized yfinance Ticker Caching with Redis
 ===============================================================
-Uses Redis for persistent caching, falls back to Streamlit cache if unavailable.
+Uses the shared cache client (Redis, or a bounded in-memory store when
+Redis is unavailable). Keys live in the "atlas:<kind>:<TICKER>" namespace.
+
+Ticker info expires by the market-hours TTL policy (short intraday, until
+the next open when the market is closed) and is stale-while-revalidate: past its TTL the cached info is
+still returned at once (within the "market_data" stale window) while a
+background refresh fetches the new one.
 
 Usage:
-    from utils.ticker_cache import get_ticker_info, prefetch_ticker_data
+    from utils.ticker_cache import get_ticker_info, get_ticker_info_many, prefetch_ticker_data
     
     # Get cached stock info
     info = get_ticker_info("AAPL")
+    
+    # Many tickers: one Redis round-trip for the lookups, one for the writes
+    infos = get_ticker_info_many(["AAPL", "MSFT", "GOOGL"])
 """
 
-import os
-import json
+import time
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Optional, Any
 from datetime import datetime
 
 import yfinance as yf
 
+from utils.single_flight import single_flight
+from utils.async_fanout import fan_out
+from utils.cache_client import get_cache_client, cache_key as _key
+from utils.revalidation import get_revalidator, stale_window
+from utils.ttl_policy import get_ttl_policy
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -27,106 +41,117 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+INFO_FETCH_TIMEOUT = 20     # Seconds per ticker when fetching batch misses
+INFO_CATEGORY = "market_data"   # Stale window used for ticker info
+
+
 # =============================================================================
-# REDIS CONNECTION
+# CACHE OPERATIONS
 # =============================================================================
 
-_redis_client = None
-_redis_available = False
+def _cache_get(key: str) -> Optional[Dict]:
+    """Get from the shared cache."""
+    return get_cache_client().get(key)
 
-def _init_redis():
-    """Initialize Redis connection if available."""
-    global _redis_client, _redis_available
-    
-    if _redis_client is not None:
-        return _redis_available
-    
-    try:
-        import redis
-        redis_url = os.environ.get("REDIS_URL")
-        
-        if redis_url:
-            _redis_client = redis.from_url(redis_url, decode_responses=True)
-            _redis_client.ping()
-            _redis_available = True
-            print(f"[CACHE] ✅ Redis connected successfully")
-            return True
-    except Exception as e:
-        print(f"[CACHE] ⚠️ Redis not available: {e}")
-        _redis_available = False
-    
-    return False
 
-# Try to connect on module load
-_init_redis()
+def _cache_set(key: str, data: Dict, ttl: int = 3600) -> bool:
+    """Set in the shared cache with TTL."""
+    return get_cache_client().set(key, data, ttl)
 
 
 # =============================================================================
-# CACHE OPERATIONS
+# TICKER INFO (Main function used by app)
 # =============================================================================
 
-def _cache_get(key: str) -> Optional[Dict]:
-    """Get from Redis cache."""
-    if not _redis_available or not _redis_client:
-        return None
+@single_flight(key=lambda ticker: ticker.upper())
+def _fetch_info(ticker: str) -> Dict:
+    """Fetch info from Yahoo. Concurrent calls for the same ticker share one request."""
     try:
-        data = _redis_client.get(key)
-        if data:
-            return json.loads(data)
+        logger.debug(f"[CACHE] MISS for {ticker} - fetching from Yahoo")
+        return yf.Ticker(ticker.upper()).info or {}
     except Exception as e:
-        logger.debug(f"Redis get failed: {e}")
-    return None
+        logger.warning(f"Failed to get info for {ticker}: {e}")
+        return {}
 
 
-def _cache_set(key: str, data: Dict, ttl: int = 3600) -> bool:
-    """Set in Redis cache with TTL."""
-    if not _redis_available or not _redis_client:
-        return False
-    try:
-        _redis_client.setex(key, ttl, json.dumps(data, default=str))
-        return True
-    except Exception as e:
-        logger.debug(f"Redis set failed: {e}")
-        return False
+def _info_ttl(ttl: Optional[int]) -> int:
+    return get_ttl_policy().ttl(INFO_CATEGORY) if ttl is None else ttl
 
 
-# =============================================================================
-# TICKER INFO (Main function used by app)
-# =============================================================================
+def _store_info(infos: Dict[str, Dict], ttl: Optional[int]) -> None:
+    """Cache non-empty infos (one pipelined write), kept through the stale window."""
+    ttl = _info_ttl(ttl)
+    get_cache_client().set_many({_key("info", t): info for t, info in infos.items() if info},
+                                ttl=ttl, stale_ttl=stale_window(INFO_CATEGORY))
 
-def get_ticker_info(ticker: str, ttl: int = 3600) -> Dict:
+
+def _revalidate_info(ticker: str, ttl: Optional[int]) -> None:
+    """Refresh a stale info entry in the background (at most one refresh per ticker)."""
+    def refresh():
+        _store_info({ticker: _fetch_info(ticker)}, ttl)
+    get_revalidator().submit(_key("info", ticker), refresh)
+
+
+def get_ticker_info(ticker: str, ttl: Optional[int] = None) -> Dict:
     """
     Get stock info with Redis caching.
+    Concurrent calls for the same ticker share one Yahoo request; an
+    expired entry is returned immediately and refreshed in the background.
     
     Args:
         ticker: Stock symbol
-        ttl: Cache TTL in seconds (default 1 hour)
+        ttl: Cache TTL in seconds (default: market-hours policy)
         
     Returns:
         Stock info dictionary
     """
-    ticker = ticker.upper()
-    cache_key = f"atlas:info:{ticker}"
+    return get_ticker_info_many([ticker], ttl).get(ticker.upper(), {})
+
+
+def get_ticker_info_many(tickers: Iterable[str], ttl: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Get stock info for many tickers.
     
-    # Try Redis first
-    cached = _cache_get(cache_key)
-    if cached:
-        logger.debug(f"[CACHE] Redis HIT for {ticker}")
-        return cached
+    Cached entries come back from a single Redis round-trip (stale ones are
+    returned as-is and refreshed in the background); misses are fetched from
+    Yahoo concurrently and written back with one pipelined SETEX.
     
-    # Cache miss - fetch from Yahoo
-    try:
-        logger.debug(f"[CACHE] MISS for {ticker} - fetching from Yahoo")
-        stock = yf.Ticker(ticker)
-        info = stock.info or {}
-        
-        # Cache in Redis
-        _cache_set(cache_key, info, ttl)
+    Args:
+        tickers: Stock symbols (duplicates ignored)
+        ttl: Cache TTL in seconds (default: market-hours policy)
         
-        return info
-    except Exception as e:
-        logger.warning(f"Failed to get info for {ticker}: {e}")
+    Returns:
+        Dict of upper-cased ticker -> info ({} when unavailable)
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+    if not tickers:
         return {}
+    
+    cached = get_cache_client().get_entries([_key("info", t) for t in tickers],
+                                            stale_ttl=stale_window(INFO_CATEGORY))
+    now = time.time()
+    infos = {}
+    for t in tickers:
+        entry = cached.get(_key("info", t))
+        if entry and entry[0]:
+            infos[t] = entry[0]
+            if entry[1] <= now:
+                logger.debug(f"[CACHE] STALE for {t} - serving cached, refreshing in background")
+                _revalidate_info(t, ttl)
+    misses = [t for t in tickers if t not in infos]
+    
+    if misses:
+        logger.debug(f"[CACHE] {len(tickers) - len(misses)}/{len(tickers)} info hits, fetching {len(misses)}")
+        if len(misses) == 1:
+            fetched = {misses[0]: _fetch_info(misses[0])}
+        else:
+            results = fan_out({t: (lambda t=t: _fetch_info(t)) for t in misses},
+                              default_timeout=INFO_FETCH_TIMEOUT)
+            fetched = {t: results[t].value for t in misses if results[t].ok}
+        infos.update({t: fetched.get(t) or {} for t in misses})
+        _store_info(fetched, ttl)
+    
+    return infos
 
 
 def get_ticker(ticker: str) -> yf.Ticker:
@@ -144,7 +169,7 @@ def get_ticker(ticker: str) -> yf.Ticker:
 def get_ticker_financials(ticker: str, ttl: int = 3600) -> Dict[str, Any]:
     """Get all financial statements with Redis caching."""
     ticker = ticker.upper()
-    cache_key = f"atlas:financials:{ticker}"
+    cache_key = _key("financials", ticker)
     
     cached = _cache_get(cache_key)
     if cached:
@@ -191,7 +216,7 @@ def get_ticker_financials(ticker: str, ttl: int = 3600) -> Dict[str, Any]:
 def get_ticker_holders(ticker: str, ttl: int = 3600) -> Dict[str, Any]:
     """Get holder data with Redis caching."""
     ticker = ticker.upper()
-    cache_key = f"atlas:holders:{ticker}"
+    cache_key = _key("holders", ticker)
     
     cached = _cache_get(cache_key)
     if cached:
@@ -231,7 +256,7 @@ def get_ticker_holders(ticker: str, ttl: int = 3600) -> Dict[str, Any]:
 def get_ticker_earnings(ticker: str, ttl: int = 3600) -> Dict[str, Any]:
     """Get earnings data with Redis caching."""
     ticker = ticker.upper()
-    cache_key = f"atlas:earnings:{ticker}"
+    cache_key = _key("earnings", ticker)
     
     cached = _cache_get(cache_key)
     if cached:
@@ -284,43 +309,21 @@ def prefetch_ticker_data(ticker: str) -> bool:
 
 def clear_ticker_cache(ticker: str = None):
     """Clear cached data for a ticker or all tickers."""
-    if not _redis_available or not _redis_client:
-        return
-    
-    try:
-        if ticker:
-            ticker = ticker.upper()
-            _redis_client.delete(f"atlas:info:{ticker}")
-            _redis_client.delete(f"atlas:financials:{ticker}")
-            _redis_client.delete(f"atlas:holders:{ticker}")
-            _redis_client.delete(f"atlas:earnings:{ticker}")
-        else:
-            # Clear all atlas keys
-            for key in _redis_client.scan_iter("atlas:*"):
-                _redis_client.delete(key)
-    except Exception as e:
-        logger.warning(f"Failed to clear cache: {e}")
+    client = get_cache_client()
+    if ticker:
+        client.delete(*(_key(kind, ticker) for kind in ("info", "financials", "holders", "earnings")))
+    else:
+        # Clear all atlas keys
+        client.scan_delete()
 
 
 def get_cache_stats() -> Dict:
     """Get cache statistics."""
-    stats = {
-        'backend': 'redis' if _redis_available else 'none',
-        'connected': _redis_available,
-        'ttl': '3600s'
-    }
-    
-    if _redis_available and _redis_client:
-        try:
-            info = _redis_client.info('memory')
-            stats['used_memory'] = info.get('used_memory_human', 'unknown')
-            stats['keys'] = _redis_client.dbsize()
-        except Exception:
-            pass
-    
+    stats = get_cache_client().stats()
+    stats['ttl'] = '3600s'
     return stats
 
 
 def is_redis_connected() -> bool:
     """Check if Redis is connected."""
-    return _redis_available
+    return get_cache_client().connected
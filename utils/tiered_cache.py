@@ -0,0 +1,487 @@
+"""
+TIERED CACHE - L1 Memory / L2 Local Disk / L3 Redis
+===================================================
+Cache for full extraction payloads (financials dicts with DataFrames) that
+survives restarts and is shared between replicas.
+
+- L1: in-process BoundedTTLCache (byte budget, LRU)
+- L2: one file per key on local disk (survives restarts; byte budget, oldest pruned)
+- L3: Redis (shared by every replica / container pointing at REDIS_URL),
+  over the shared cache client connection
+
+Reads go L1 -> L2 -> L3; a lower-tier hit is promoted into the tiers above
+it with its remaining TTL. Writes go to every tier. Any tier failing
+(disk full, Redis down) only costs that tier.
+
+Entries written with a stale_ttl outlive their TTL by that window:
+get() treats them as misses, get_entry() returns them with their
+freshness so callers can serve stale and revalidate in the background.
+
+Values are stored with the versioned cache codec (msgpack + Arrow IPC for
+DataFrames); entries the codec can't encode stay in memory only.
+
+Usage:
+    from utils.tiered_cache import get_result_cache
+    cache = get_result_cache()
+    cache.set("AAPL_auto_10-K", financials, ttl=86400, category="financials")
+    financials = cache.get("AAPL_auto_10-K")
+    found = cache.get_many(["AAPL_auto_10-K", "MSFT_auto_10-K"])   # one Redis round-trip
+    cache.stats()["tiers"]      # hits per tier
+    value, fresh_until = cache.get_entry("AAPL_auto_10-K")          # includes stale entries
+
+Author: ATLAS Financial Intelligence
+"""
+
+import os
+import time
+import struct
+import hashlib
+import threading
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from utils.bounded_cache import BoundedTTLCache
+from utils.cache_codec import CacheCodec, get_codec
+from utils.cache_client import get_cache_client
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("TieredCache")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("TieredCache")
+
+
+RESULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "data_sources", "cache", "results")
+L1_MAX_MB = 256                # Override with ATLAS_EXTRACTOR_CACHE_MB
+L2_MAX_MB = 2048               # Override with ATLAS_RESULT_CACHE_DISK_MB
+REDIS_KEY_PREFIX = "atlas:result:"
+PRUNE_EVERY_WRITES = 50        # L2 size check frequency
+
+# Prefixed to every L2 file and L3 value
+_ENTRY_HEADER = struct.Struct(">4sdd")    # magic, expires_at, fresh_until (unix seconds)
+_ENTRY_MAGIC = b"ATC3"
+
+
+def _env_megabytes(name: str, default: float) -> int:
+    try:
+        return int(float(os.getenv(name, default)) * 1024 * 1024)
+    except ValueError:
+        return int(default * 1024 * 1024)
+
+
+class TieredCache:
+    """
+    Read-through L1/L2/L3 cache with the BoundedTTLCache interface.
+
+    Args:
+        l1: In-memory tier
+        disk_dir: L2 directory (None disables L2)
+        disk_max_bytes: L2 budget; oldest files are pruned beyond it
+        redis_client: Binary (decode_responses=False) Redis client, or None
+        codec: Serialization for L2/L3 (default: the shared cache codec)
+        name: Label used in logs and stats
+    """
+
+    def __init__(self, l1: Optional[BoundedTTLCache] = None, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = L2_MAX_MB * 1024 * 1024, redis_client=None,
+                 codec: Optional[CacheCodec] = None, name: str = "results"):
+        self.l1 = l1 or BoundedTTLCache(name=f"{name}_l1")
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.redis = redis_client
+        self.codec = codec or get_codec()
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._stats = {
+            "l1_hits": 0, "l2_hits": 0, "l3_hits": 0, "stale_hits": 0, "misses": 0,
+            "l2_errors": 0, "l3_errors": 0, "unserializable": 0,
+        }
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    # ==========================================
+    # SERIALIZATION
+    # ==========================================
+
+    def _dumps(self, value: Any) -> bytes:
+        return self.codec.encode(value)
+
+    def _loads(self, blob: bytes) -> Any:
+        return self.codec.decode(blob)
+
+    @staticmethod
+    def _pack_entry(blob: bytes, expires_at: float, fresh_until: float) -> bytes:
+        return _ENTRY_HEADER.pack(_ENTRY_MAGIC, expires_at, fresh_until) + blob
+
+    def _unpack_entry(self, data: bytes) -> Tuple[Any, float, float]:
+        """(value, expires_at, fresh_until) from an L2/L3 entry; ValueError on a bad header."""
+        try:
+            magic, expires_at, fresh_until = _ENTRY_HEADER.unpack_from(data)
+        except struct.error:
+            magic = None
+        if magic != _ENTRY_MAGIC:
+            raise ValueError("bad header")
+        return self._loads(data[_ENTRY_HEADER.size:]), expires_at, fresh_until
+
+    def _l1_set(self, key: Hashable, value: Any, expires_at: float, fresh_until: float,
+                category: str) -> None:
+        now = time.time()
+        self.l1.set(key, value, ttl=fresh_until - now, category=category,
+                    stale_ttl=expires_at - fresh_until)
+
+    # ==========================================
+    # L2 - LOCAL DISK
+    # ==========================================
+
+    def _disk_path(self, key: Hashable) -> str:
+        digest = hashlib.sha1(str(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.bin")
+
+    def _disk_get(self, key: Hashable) -> Optional[Tuple[Any, float, float]]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            value, expires_at, fresh_until = self._unpack_entry(data)
+            if expires_at <= time.time():
+                os.remove(path)
+                return None
+            return value, expires_at, fresh_until
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            _logger.debug(f"[{self.name}] L2 read failed for {key}: {e}")
+            self._count("l2_errors")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _disk_set(self, key: Hashable, entry: bytes) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(entry)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            _logger.debug(f"[{self.name}] L2 write failed for {key}: {e}")
+            self._count("l2_errors")
+            return
+
+        with self._lock:
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= PRUNE_EVERY_WRITES
+            if due:
+                self._writes_since_prune = 0
+        if due:
+            self.prune_disk()
+
+    def prune_disk(self) -> int:
+        """Remove expired L2 files, then the oldest ones beyond the byte budget."""
+        if not self.disk_dir or not os.path.isdir(self.disk_dir):
+            return 0
+        now = time.time()
+        files, removed = [], 0
+        for entry in os.scandir(self.disk_dir):
+            if not entry.name.endswith(".bin"):
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    _, expires_at, _ = _ENTRY_HEADER.unpack(f.read(_ENTRY_HEADER.size))
+                stat = entry.stat()
+            except (OSError, struct.error):
+                continue
+            if expires_at <= now:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+            else:
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+                total -= size
+            except OSError:
+                pass
+        return removed
+
+    # ==========================================
+    # L3 - REDIS
+    # ==========================================
+
+    def _redis_get_many(self, keys) -> Dict[Hashable, Tuple[Any, float, float]]:
+        """(value, expires_at, fresh_until) for each key in Redis - one MGET round-trip."""
+        if self.redis is None or not keys:
+            return {}
+        try:
+            replies = self.redis.mget([REDIS_KEY_PREFIX + str(key) for key in keys])
+        except Exception as e:
+            _logger.debug(f"[{self.name}] L3 read failed for {len(keys)} key(s): {e}")
+            self._count("l3_errors")
+            return {}
+
+        found = {}
+        for key, data in zip(keys, replies):
+            if data is None:
+                continue
+            try:
+                found[key] = self._unpack_entry(data)
+            except Exception as e:
+                _logger.debug(f"[{self.name}] L3 value for {key} unreadable: {e}")
+                self._count("l3_errors")
+        return found
+
+    def _redis_set(self, key: Hashable, entry: bytes, ttl: float) -> None:
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(REDIS_KEY_PREFIX + str(key), max(1, int(ttl)), entry)
+        except Exception as e:
+            _logger.debug(f"[{self.name}] L3 write failed for {key}: {e}")
+            self._count("l3_errors")
+
+    def _promote(self, key: Hashable, value: Any, expires_at: float, fresh_until: float,
+                 category: str) -> None:
+        """Copy an L3 hit into L1 and L2 with its remaining TTL."""
+        self._l1_set(key, value, expires_at, fresh_until, category)
+        try:
+            self._disk_set(key, self._pack_entry(self._dumps(value), expires_at, fresh_until))
+        except Exception as e:
+            _logger.debug(f"[{self.name}] L2 promotion failed for {key}: {e}")
+            self._count("l2_errors")
+
+    def _lookup(self, key: Hashable, category: str) -> Optional[Tuple[Any, float, str]]:
+        """
+        (value, fresh_until, tier) from the first tier holding a fresh entry,
+        else the freshest stale entry found (tier "stale"), else None.
+        Whatever is returned has been promoted into the tiers above it.
+        """
+        now = time.time()
+        stale = None
+
+        entry = self.l1.get_entry(key)
+        if entry is not None:
+            if entry[1] > now:
+                return entry[0], entry[1], "l1"
+            stale = entry
+
+        found = self._disk_get(key)
+        if found is not None:
+            value, expires_at, fresh_until = found
+            if stale is None or fresh_until > stale[1]:
+                self._l1_set(key, value, expires_at, fresh_until, category)
+                stale = (value, fresh_until)
+            if fresh_until > now:
+                return value, fresh_until, "l2"
+
+        found = self._redis_get_many([key]).get(key)
+        if found is not None:
+            value, expires_at, fresh_until = found
+            if stale is None or fresh_until > stale[1]:
+                self._promote(key, value, expires_at, fresh_until, category)
+                stale = (value, fresh_until)
+            if fresh_until > now:
+                return value, fresh_until, "l3"
+
+        return (stale[0], stale[1], "stale") if stale is not None else None
+
+    # ==========================================
+    # PUBLIC API (same shape as BoundedTTLCache)
+    # ==========================================
+
+    def get(self, key: Hashable, default: Any = None, category: str = "default") -> Any:
+        """Fresh value from the first tier that has it (promoted into the tiers above)."""
+        found = self._lookup(key, category)
+        if found is None or found[2] == "stale":
+            self._count("misses")
+            return default
+        self._count(f"{found[2]}_hits")
+        return found[0]
+
+    def get_entry(self, key: Hashable, category: str = "default") -> Optional[Tuple[Any, float]]:
+        """
+        (value, fresh_until), including an entry past its TTL but inside its
+        stale window (a fresh copy in any tier wins), or None.
+        """
+        found = self._lookup(key, category)
+        if found is None:
+            self._count("misses")
+            return None
+        self._count("stale_hits" if found[2] == "stale" else f"{found[2]}_hits")
+        return found[0], found[1]
+
+    def get_many(self, keys: Iterable[Hashable], category: str = "default") -> Dict[Hashable, Any]:
+        """
+        Fresh values for every key found in any tier (missing/stale keys are left out).
+
+        L1 and L2 are checked per key; whatever is left goes to Redis in one
+        MGET round-trip. Hits are promoted like get().
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found: Dict[Hashable, Any] = {}
+        remaining = []
+        for key in keys:
+            entry = self.l1.get_entry(key)
+            if entry is not None and entry[1] > now:
+                self._count("l1_hits")
+                found[key] = entry[0]
+                continue
+            on_disk = self._disk_get(key)
+            if on_disk is not None and on_disk[2] > now:
+                value, expires_at, fresh_until = on_disk
+                self._count("l2_hits")
+                self._l1_set(key, value, expires_at, fresh_until, category)
+                found[key] = value
+            else:
+                remaining.append(key)
+
+        for key, (value, expires_at, fresh_until) in self._redis_get_many(remaining).items():
+            if fresh_until <= now:
+                continue
+            self._count("l3_hits")
+            self._promote(key, value, expires_at, fresh_until, category)
+            found[key] = value
+
+        with self._lock:
+            self._stats["misses"] += len(keys) - len(found)
+        return found
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            category: str = "default", stale_ttl: float = 0) -> bool:
+        """
+        Store in every tier. Returns False if no tier accepted the value.
+        stale_ttl keeps it readable through get_entry() that long past the TTL.
+        """
+        ttl = self.l1.default_ttl if ttl is None else ttl
+        stale_ttl = max(0, stale_ttl)
+        stored = self.l1.set(key, value, ttl=ttl, category=category, stale_ttl=stale_ttl)
+        try:
+            blob = self._dumps(value)
+        except Exception as e:
+            _logger.debug(f"[{self.name}] {key} not serializable, memory tier only: {e}")
+            self._count("unserializable")
+            return stored
+        now = time.time()
+        entry = self._pack_entry(blob, now + ttl + stale_ttl, now + ttl)
+        self._disk_set(key, entry)
+        self._redis_set(key, entry, ttl + stale_ttl)
+        return True
+
+    def delete(self, key: Hashable) -> bool:
+        found = self.l1.delete(key)
+        if self.disk_dir:
+            try:
+                os.remove(self._disk_path(key))
+                found = True
+            except OSError:
+                pass
+        if self.redis is not None:
+            try:
+                found = bool(self.redis.delete(REDIS_KEY_PREFIX + str(key))) or found
+            except Exception:
+                self._count("l3_errors")
+        return found
+
+    def clear(self, shared: bool = False) -> int:
+        """
+        Clear L1 and L2, and with shared=True also every L3 entry of this
+        cache. L3 is shared with other replicas, so it is only cleared when
+        asked; otherwise the next read promotes its entries back.
+
+        Returns:
+            Number of L3 keys deleted
+        """
+        self.l1.clear()
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith(".bin"):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+        if not shared or self.redis is None:
+            return 0
+        deleted = 0
+        try:
+            batch = []
+            for key in self.redis.scan_iter(match=REDIS_KEY_PREFIX + "*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += self.redis.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += self.redis.delete(*batch)
+        except Exception as e:
+            _logger.warning(f"[{self.name}] L3 clear failed: {e}")
+            self._count("l3_errors")
+        return deleted
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.l1
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+    def stats(self) -> Dict:
+        """L1 stats at the top level plus hit/error counts per tier and codec sizes/timings."""
+        stats = self.l1.stats()
+        with self._lock:
+            tiers = dict(self._stats)
+        lookups = (tiers["l1_hits"] + tiers["l2_hits"] + tiers["l3_hits"]
+                   + tiers["stale_hits"] + tiers["misses"])
+        tiers["hit_rate"] = round((lookups - tiers["misses"]) / lookups, 3) if lookups else 0.0
+        tiers["l2_enabled"] = bool(self.disk_dir)
+        tiers["l3_enabled"] = self.redis is not None
+        stats["tiers"] = tiers
+        stats["codec"] = self.codec.stats()
+        return stats
+
+
+# ==========================================
+# PROCESS-WIDE RESULT CACHE
+# ==========================================
+
+_result_cache: Optional[TieredCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> TieredCache:
+    """
+    Get the tiered cache shared by every extractor in this process.
+
+    L2 lives in ATLAS_RESULT_CACHE_DIR (default data_sources/cache/results);
+    L3 uses the shared cache client's Redis connection when one is available.
+    """
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                _result_cache = TieredCache(
+                    l1=BoundedTTLCache(max_bytes=_env_megabytes("ATLAS_EXTRACTOR_CACHE_MB", L1_MAX_MB),
+                                       name="results_l1"),
+                    disk_dir=os.getenv("ATLAS_RESULT_CACHE_DIR") or RESULT_CACHE_DIR,
+                    disk_max_bytes=_env_megabytes("ATLAS_RESULT_CACHE_DISK_MB", L2_MAX_MB),
+                    redis_client=get_cache_client().redis,
+                )
+    return _result_cache
@@ -0,0 +1,310 @@
+"""
+TTL POLICY - Market-Hours and Earnings-Aware Cache Expiration
+=============================================================
+Computes cache TTLs per category from the NYSE calendar and each company's
+earnings calendar instead of fixed durations.
+
+- market_data: short TTL while the market is open (never past the close);
+  after the close and over weekends/holidays, cached until the next open
+- financials: statements only change when a 10-Q/10-K is filed - short TTL
+  in the weeks after an earnings release (filing pending), long TTL in the
+  quiet part of the quarter, and never past the next earnings release
+- company_info / default: fixed TTLs
+
+The NYSE calendar is rule-based (full-day holidays and 1 PM early closes),
+so it needs no data files or network.
+
+Usage:
+    from utils.ttl_policy import get_ttl_policy, NYSECalendar
+    policy = get_ttl_policy()
+    ttl = policy.ttl("market_data")                 # e.g. 900 intraday, ~65h on Friday night
+    ttl = policy.ttl("financials", info=financials["info"])   # earnings-aware, no lookup
+    NYSECalendar().is_open()
+
+Author: ATLAS Financial Intelligence
+"""
+
+import threading
+from datetime import date, datetime, time as dtime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+# Import centralized logging
+try:
+    from utils.logging_config import EngineLogger
+    _logger = EngineLogger.get_logger("TTLPolicy")
+except ImportError:
+    import logging
+    _logger = logging.getLogger("TTLPolicy")
+
+
+NY_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+EARLY_CLOSE = dtime(13, 0)
+
+# Base TTLs (seconds) - the fixed values the policy refines
+BASE_TTLS: Dict[str, int] = {
+    "market_data": 3600,
+    "financials": 86400,
+    "company_info": 604800,
+    "default": 3600,
+}
+
+INTRADAY_TTL = 900               # Market data while the market is open
+POST_CLOSE_SETTLE = 1800         # Keep refreshing this long after the close (closing prints)
+MIN_TTL = 60
+FILING_WINDOW_DAYS = 45          # 10-Q due 40-45 days after quarter end; usually days after earnings
+FILING_WINDOW_TTL = 6 * 3600     # Financials while a filing is expected
+QUIET_TTL = 3 * 86400            # Financials with no release or filing expected
+EARNINGS_GRACE = 3600            # Expire this long after a scheduled release
+
+
+# ==========================================
+# NYSE CALENDAR
+# ==========================================
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th weekday (Mon=0) of a month; n=-1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+
+def _observed(day: date) -> date:
+    """Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=64)
+def nyse_holidays(year: int) -> Set[date]:
+    """Full-day NYSE closures for a year."""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),                 # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),                 # Washington's Birthday
+        _easter(year) - timedelta(days=2),           # Good Friday
+        _nth_weekday(year, 5, 0, -1),                # Memorial Day
+        _observed(date(year, 7, 4)),                 # Independence Day
+        _nth_weekday(year, 9, 0, 1),                 # Labor Day
+        _nth_weekday(year, 11, 3, 4),                # Thanksgiving
+        _observed(date(year, 12, 25)),               # Christmas
+    }
+    # New Year's Day: not observed on the prior Friday (Dec 31) when it falls on a Saturday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))   # Juneteenth
+    return holidays
+
+
+@lru_cache(maxsize=64)
+def nyse_early_closes(year: int) -> Set[date]:
+    """1 PM closes: day before Independence Day, day after Thanksgiving, Christmas Eve."""
+    candidates = [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+    holidays = nyse_holidays(year)
+    return {d for d in candidates if d.weekday() < 5 and d not in holidays}
+
+
+class NYSECalendar:
+    """Trading days and session times for the NYSE (America/New_York)."""
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+    def session(self, day: date) -> Optional[Tuple[datetime, datetime]]:
+        """(open, close) as aware datetimes, or None on weekends/holidays."""
+        if not self.is_trading_day(day):
+            return None
+        close = EARLY_CLOSE if day in nyse_early_closes(day.year) else MARKET_CLOSE
+        return (datetime.combine(day, MARKET_OPEN, NY_TZ), datetime.combine(day, close, NY_TZ))
+
+    def is_open(self, when: Optional[datetime] = None) -> bool:
+        when = _ny(when)
+        session = self.session(when.date())
+        return session is not None and session[0] <= when < session[1]
+
+    def next_open(self, when: Optional[datetime] = None) -> datetime:
+        """Next session open strictly after `when`."""
+        when = _ny(when)
+        day = when.date()
+        for _ in range(15):
+            session = self.session(day)
+            if session is not None and session[0] > when:
+                return session[0]
+            day += timedelta(days=1)
+        raise RuntimeError("No NYSE session within 15 days")  # Unreachable with real calendars
+
+    def last_close(self, when: Optional[datetime] = None) -> Optional[datetime]:
+        """Most recent session close at or before `when` (within the last 15 days)."""
+        when = _ny(when)
+        day = when.date()
+        for _ in range(15):
+            session = self.session(day)
+            if session is not None and session[1] <= when:
+                return session[1]
+            day -= timedelta(days=1)
+        return None
+
+
+def _ny(when: Optional[datetime]) -> datetime:
+    if when is None:
+        return datetime.now(NY_TZ)
+    if when.tzinfo is None:
+        return when.replace(tzinfo=NY_TZ)
+    return when.astimezone(NY_TZ)
+
+
+# ==========================================
+# EARNINGS CALENDAR
+# ==========================================
+
+_EARNINGS_FIELDS = ("earningsTimestamp", "earningsTimestampStart", "earningsTimestampEnd")
+
+
+def earnings_dates_from_info(info: Optional[Dict]) -> List[datetime]:
+    """
+    Earnings release times from a yfinance info dict the caller already has
+    (empty if unknown). Never fetches: TTLs are computed on cache writes.
+    """
+    if not isinstance(info, dict):
+        return []
+    dates = set()
+    for field in _EARNINGS_FIELDS:
+        value = info.get(field)
+        if isinstance(value, (int, float)) and value > 0:
+            dates.add(datetime.fromtimestamp(value, NY_TZ))
+    return sorted(dates)
+
+
+# ==========================================
+# POLICY
+# ==========================================
+
+class TTLPolicy:
+    """
+    Expiration policy per cache category.
+
+    Args:
+        calendar: Trading calendar (default NYSE)
+        base_ttls: Fixed TTLs per category (used where no rule applies)
+        earnings_dates: ticker -> earnings release datetimes, used when ttl() gets no
+            info dict (default: none - the base financials TTL applies)
+        intraday_ttl: Market data TTL while the market is open
+    """
+
+    def __init__(self, calendar: Optional[NYSECalendar] = None, base_ttls: Optional[Dict[str, int]] = None,
+                 earnings_dates: Optional[Callable[[str], List[datetime]]] = None,
+                 intraday_ttl: int = INTRADAY_TTL):
+        self.calendar = calendar or NYSECalendar()
+        self.base_ttls = dict(BASE_TTLS, **(base_ttls or {}))
+        self.earnings_dates = earnings_dates
+        self.intraday_ttl = intraday_ttl
+
+    def ttl(self, category: str, ticker: Optional[str] = None, now: Optional[datetime] = None,
+            info: Optional[Dict] = None) -> int:
+        """
+        TTL in seconds for an entry of `category` written at `now`.
+
+        Financials are earnings-aware when `info` (the yfinance info already
+        in hand, e.g. financials["info"]) carries earnings timestamps.
+        """
+        now = _ny(now)
+        if category == "market_data":
+            return self._market_data_ttl(now)
+        if category == "financials" and (ticker or info):
+            return self._financials_ttl(ticker, now, info)
+        return self.base_ttls.get(category, self.base_ttls["default"])
+
+    def expires_at(self, category: str, ticker: Optional[str] = None,
+                   now: Optional[datetime] = None) -> datetime:
+        now = _ny(now)
+        return now + timedelta(seconds=self.ttl(category, ticker, now))
+
+    def _market_data_ttl(self, now: datetime) -> int:
+        session = self.calendar.session(now.date())
+        if session is not None and session[0] <= now < session[1]:
+            # Open: short TTL, but refresh right after the close
+            to_close = (session[1] - now).total_seconds()
+            return int(max(MIN_TTL, min(self.intraday_ttl, to_close + MIN_TTL)))
+        last_close = self.calendar.last_close(now)
+        if last_close is not None and (now - last_close).total_seconds() < POST_CLOSE_SETTLE:
+            return self.intraday_ttl            # Closing prints still settling
+        # Closed: nothing changes until the next open
+        return int(max(MIN_TTL, (self.calendar.next_open(now) - now).total_seconds()))
+
+    def _financials_ttl(self, ticker: Optional[str], now: datetime, info: Optional[Dict] = None) -> int:
+        base = self.base_ttls["financials"]
+        releases = earnings_dates_from_info(info)
+        if not releases and self.earnings_dates is not None and ticker:
+            try:
+                releases = self.earnings_dates(ticker)
+            except Exception as e:
+                _logger.debug(f"Earnings calendar lookup failed for {ticker}: {e}")
+                releases = []
+        if not releases:
+            return base
+
+        past = [d for d in releases if d <= now]
+        upcoming = [d for d in releases if d > now]
+        if past and (now - max(past)).days < FILING_WINDOW_DAYS:
+            ttl = FILING_WINDOW_TTL            # Release out, 10-Q/10-K may land any day
+        else:
+            ttl = max(base, QUIET_TTL)         # Nothing due until the next release
+        if upcoming:
+            # Never carry statements past the next release
+            until_release = (min(upcoming) - now).total_seconds() + EARNINGS_GRACE
+            ttl = min(ttl, until_release)
+        return int(max(MIN_TTL, ttl))
+
+    def describe(self, ticker: Optional[str] = None, now: Optional[datetime] = None) -> Dict:
+        """Current TTL per category (for stats / debugging)."""
+        now = _ny(now)
+        return {
+            "market_open": self.calendar.is_open(now),
+            "ttls": {category: self.ttl(category, ticker, now) for category in self.base_ttls},
+        }
+
+
+# ==========================================
+# PROCESS-WIDE POLICY
+# ==========================================
+
+_policy: Optional[TTLPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_ttl_policy() -> TTLPolicy:
+    """Get the TTL policy shared by every cache in this process."""
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = TTLPolicy()
+    return _policy
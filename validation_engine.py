@@ -417,12 +417,16 @@ class DataValidator:
     # BATCH VALIDATION
     # ==========================================
     
-    def validate_batch(self, tickers: List[str]) -> pd.DataFrame:
+    def validate_batch(self, tickers: List[str], max_workers: int = 6) -> pd.DataFrame:
         """
         Validate multiple tickers and return summary DataFrame
         
+        Tickers are extracted concurrently (USAFinancialExtractor.extract_many);
+        rows keep the order of `tickers`.
+        
         Args:
             tickers: List of ticker symbols
+            max_workers: Maximum tickers extracted at once
             
         Returns:
             DataFrame with validation results
@@ -431,47 +435,52 @@ class DataValidator:
         from usa_backend import USAFinancialExtractor
         
         extractor = USAFinancialExtractor()
-        results = []
+        results = {}
+        
+        status_emoji = {
+            'PASS': '✅',
+            'WARN': '⚠️',
+            'FAIL': '❌'
+        }
         
-        for ticker in tickers:
+        for result in extractor.extract_many(tickers, max_workers=max_workers):
+            ticker = result.ticker
             print(f"\n[VALIDATING] {ticker}...")
             
             try:
-                # Extract
-                financials = extractor.extract_financials(ticker)
+                if result.status == "timeout":
+                    raise TimeoutError(result.error)
+                if result.financials is None:
+                    raise RuntimeError(result.error)
                 
                 # Validate
-                validation = self.validate_extraction(ticker, financials)
+                validation = self.validate_extraction(ticker, result.financials)
                 
-                results.append({
+                results[ticker] = {
                     'Ticker': ticker,
                     'Status': validation['overall_status'],
                     'Quality_Score': validation['quality_score'],
                     'Warnings': len(validation['warnings']),
                     'Errors': len(validation['errors']),
                     'Checks_Passed': sum(1 for v in validation['checks'].values() if v == 'PASS')
-                })
+                }
                 
                 # Print summary
-                status_emoji = {
-                    'PASS': '✅',
-                    'WARN': '⚠️',
-                    'FAIL': '❌'
-                }
                 print(f"{status_emoji[validation['overall_status']]} {ticker}: {validation['quality_score']}/100 (Errors: {len(validation['errors'])}, Warnings: {len(validation['warnings'])})")
                 
             except Exception as e:
                 print(f"❌ {ticker}: Extraction failed - {str(e)}")
-                results.append({
+                results[ticker] = {
                     'Ticker': ticker,
                     'Status': 'FAIL',
                     'Quality_Score': 0,
                     'Warnings': 0,
                     'Errors': 1,
                     'Checks_Passed': 0
-                })
+                }
         
-        return pd.DataFrame(results)
+        ordered = dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip())
+        return pd.DataFrame([results[t] for t in ordered if t in results])
     
     # ==========================================
     # REPORT GENERATION